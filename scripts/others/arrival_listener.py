@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Push-Based Arrival Detection on the Target Database
+===================================================
+
+Deteksi row yang sudah sampai di target tanpa polling:
+- Trigger AFTER INSERT OR UPDATE pada tabel orders memanggil pg_notify
+- Monitor menerima notifikasi lewat asyncpg add_listener
+- Payload berisi id, waktu row ditulis (server clock) dan _synced_at
+
+The trigger is installed on demand and removed again by stop(); it is the
+only object this module creates on the target.
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, Optional
+
+ARRIVAL_CHANNEL = 'cdc_orders_arrival'
+TRIGGER_FUNCTION = 'cdc_notify_orders_arrival'
+TRIGGER_NAME = 'cdc_orders_arrival_notify'
+
+
+def _parse_synced_at(value) -> Optional[float]:
+    """Epoch seconds from the _synced_at value rendered by to_jsonb"""
+    if value in (None, ''):
+        return None
+    try:
+        return float(value) / 1000  # epoch millis stored as a number
+    except (TypeError, ValueError):
+        pass
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class TargetArrivalListener:
+    def __init__(self, conn, table: str = 'orders', channel: str = ARRIVAL_CHANNEL,
+                 max_tracked: int = 1000000):
+        """Listen for replicated rows on a dedicated target connection"""
+        self.conn = conn
+        self.table = table
+        self.channel = channel
+        self.max_tracked = max_tracked
+        self.arrivals = {}
+        # Every distinct id, uncapped: upserts and redeliveries notify the same row again
+        self.arrived_ids = set()
+        self.notification_count = 0
+        self.callbacks = []
+        self.installed = False
+        self.listening = False
+        self._changed = asyncio.Event()
+
+    async def install(self):
+        """Create the notify trigger on the target table"""
+        await self.conn.execute(f"""
+            CREATE OR REPLACE FUNCTION {TRIGGER_FUNCTION}() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{self.channel}', json_build_object(
+                    'id', NEW.id,
+                    'landed_at', extract(epoch from clock_timestamp()),
+                    'synced_at', to_jsonb(NEW)->>'_synced_at'
+                )::text);
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        await self.conn.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {self.table}")
+        await self.conn.execute(f"""
+            CREATE TRIGGER {TRIGGER_NAME}
+            AFTER INSERT OR UPDATE ON {self.table}
+            FOR EACH ROW EXECUTE FUNCTION {TRIGGER_FUNCTION}()
+        """)
+        self.installed = True
+
+    async def uninstall(self):
+        """Drop the notify trigger and its function"""
+        await self.conn.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {self.table}")
+        await self.conn.execute(f"DROP FUNCTION IF EXISTS {TRIGGER_FUNCTION}()")
+        self.installed = False
+
+    async def start(self, install: bool = True):
+        """Install the trigger (optionally) and start receiving notifications"""
+        if install:
+            await self.install()
+        await self.conn.add_listener(self.channel, self._on_notify)
+        self.listening = True
+
+    async def stop(self, uninstall: bool = True):
+        """Stop listening and remove the trigger"""
+        if self.listening:
+            await self.conn.remove_listener(self.channel, self._on_notify)
+            self.listening = False
+        if uninstall and self.installed:
+            await self.uninstall()
+
+    def add_callback(self, callback: Callable[[int, float, Optional[float]], None]):
+        """Register callback(row_id, received_at, synced_at) for every arrival"""
+        self.callbacks.append(callback)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        """asyncpg listener callback: record the arrival time of one row"""
+        received_at = time.time()
+        try:
+            data = json.loads(payload)
+            row_id = int(data['id'])
+            synced_at = _parse_synced_at(data.get('synced_at'))
+        except (ValueError, KeyError, TypeError):
+            return
+        self.notification_count += 1
+        self.arrived_ids.add(row_id)
+        if row_id in self.arrivals or len(self.arrivals) < self.max_tracked:
+            self.arrivals[row_id] = {
+                'received_at': received_at,
+                'landed_at': float(data['landed_at']) if data.get('landed_at') is not None else None,
+                'synced_at': synced_at
+            }
+        for callback in self.callbacks:
+            callback(row_id, received_at, synced_at)
+        self._changed.set()
+
+    @property
+    def arrival_count(self) -> int:
+        """Distinct rows that arrived since start()"""
+        return len(self.arrived_ids)
+
+    async def wait_changed(self, timeout: float):
+        """Wait until the next arrival (or timeout)"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._changed.clear()
+
+    async def wait_for_count(self, count: int, timeout: float) -> Dict[str, Any]:
+        """Wait until count distinct rows arrived since start(); used as a catch-up check"""
+        started = time.time()
+        deadline = started + timeout
+        while self.arrival_count < count and time.time() < deadline:
+            await self.wait_changed(deadline - time.time())
+        return {
+            'expected': count,
+            'arrived': self.arrival_count,
+            'notifications': self.notification_count,
+            'caught_up': self.arrival_count >= count,
+            'wait_seconds': round(time.time() - started, 3)
+        }
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Order Batch Generators
+======================
+
+Generator data batch untuk workload insert orders:
+- PythonOrderBatchGenerator: loop per-row (random.choice / random.randint)
+- VectorizedOrderBatchGenerator: kolom di-draw sebagai array NumPy
+- Micro-benchmark rows/sec per core untuk memisahkan biaya generator dari database
+
+Usage:
+    python batch_generator.py [--rows 1000000] [--batch-size 5000]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, date
+from typing import Dict, List, Any, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the Python generator is always available
+    np = None
+
+GENERATORS = ('numpy', 'python')
+
+
+class OrderBatch:
+    """Column-oriented batch of orders sharing a single order_date"""
+
+    __slots__ = ('order_date', 'purchaser', 'quantity', 'product_id')
+
+    def __init__(self, order_date: date, purchaser: List[int], quantity: List[int], product_id: List[int]):
+        self.order_date = order_date
+        self.purchaser = purchaser
+        self.quantity = quantity
+        self.product_id = product_id
+
+    def __len__(self) -> int:
+        return len(self.purchaser)
+
+    def rows(self) -> List[tuple]:
+        """Row tuples in ORDER_COLUMNS order, for drivers that need records"""
+        dates = [self.order_date] * len(self.purchaser)
+        return list(zip(dates, self.purchaser, self.quantity, self.product_id))
+
+
+class PythonOrderBatchGenerator:
+    def __init__(self, customer_ids: List[int], product_ids: List[int], seed: Optional[int] = None):
+        """Per-row generator using the random module"""
+        self.customer_ids = list(customer_ids)
+        self.product_ids = list(product_ids)
+        self.random = random.Random(seed)
+
+    def generate(self, size: int) -> OrderBatch:
+        """Draw one batch, one row at a time"""
+        purchasers, quantities, products = [], [], []
+        for i in range(size):
+            purchasers.append(self.random.choice(self.customer_ids))
+            products.append(self.random.choice(self.product_ids))
+            quantities.append(self.random.randint(1, 10))
+        return OrderBatch(datetime.now().date(), purchasers, quantities, products)
+
+
+class VectorizedOrderBatchGenerator:
+    def __init__(self, customer_ids: List[int], product_ids: List[int], seed: Optional[int] = None):
+        """Column generator drawing whole arrays with NumPy"""
+        if np is None:
+            raise ImportError("numpy is required for the vectorized batch generator")
+        self.customer_ids = np.asarray(customer_ids, dtype=np.int64)
+        self.product_ids = np.asarray(product_ids, dtype=np.int64)
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, size: int) -> OrderBatch:
+        """Draw one batch as three integer columns"""
+        # tolist() converts to Python ints in C; asyncpg does not encode numpy scalars
+        return OrderBatch(
+            datetime.now().date(),
+            self.rng.choice(self.customer_ids, size).tolist(),
+            self.rng.integers(1, 11, size).tolist(),
+            self.rng.choice(self.product_ids, size).tolist()
+        )
+
+
+def create_batch_generator(kind: str, customer_ids: List[int], product_ids: List[int],
+                           seed: Optional[int] = None):
+    """Create a batch generator, falling back to Python when NumPy is missing"""
+    if kind == 'numpy' and np is not None:
+        return VectorizedOrderBatchGenerator(customer_ids, product_ids, seed)
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown generator '{kind}' (choose from {', '.join(GENERATORS)})")
+    return PythonOrderBatchGenerator(customer_ids, product_ids, seed)
+
+
+def benchmark_generator(generator, rows: int, batch_size: int, materialize_rows: bool) -> Dict[str, Any]:
+    """Measure rows generated per CPU-second (a single core) for one generator"""
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    generated = 0
+    while generated < rows:
+        batch = generator.generate(min(batch_size, rows - generated))
+        if materialize_rows:
+            batch.rows()
+        generated += len(batch)
+    cpu_seconds = time.process_time() - cpu_start
+    wall_seconds = time.perf_counter() - wall_start
+    return {
+        'rows': generated,
+        'cpu_seconds': round(cpu_seconds, 4),
+        'wall_seconds': round(wall_seconds, 4),
+        'rows_per_core_second': round(generated / cpu_seconds) if cpu_seconds > 0 else 0
+    }
+
+
+def run_benchmark(rows: int = 1000000, batch_size: int = 5000) -> Dict[str, Any]:
+    """Benchmark every available generator, as columns and as row tuples"""
+    customer_ids = list(range(1001, 1101))
+    product_ids = list(range(101, 201))
+    results = {}
+    for kind in GENERATORS:
+        if kind == 'numpy' and np is None:
+            results[kind] = {'error': 'numpy not installed'}
+            continue
+        generator = create_batch_generator(kind, customer_ids, product_ids, seed=42)
+        results[kind] = {
+            'columns': benchmark_generator(generator, rows, batch_size, materialize_rows=False),
+            'rows': benchmark_generator(generator, rows, batch_size, materialize_rows=True)
+        }
+    return results
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark for order batch generators")
+    parser.add_argument('--rows', type=int, default=1000000, help="Rows to generate per run")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per batch")
+    args = parser.parse_args()
+
+    print(f"🧪 Generating {args.rows:,} rows in batches of {args.batch_size:,}")
+    results = run_benchmark(args.rows, args.batch_size)
+
+    print(f"\n{'Generator':<12} {'Output':<10} {'Rows/core-sec':>15} {'CPU s':>10}")
+    print("-" * 50)
+    for kind, modes in results.items():
+        if 'error' in modes:
+            print(f"{kind:<12} {'-':<10} {modes['error']:>26}")
+            continue
+        for mode, stats in modes.items():
+            print(f"{kind:<12} {mode:<10} {stats['rows_per_core_second']:>15,} {stats['cpu_seconds']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
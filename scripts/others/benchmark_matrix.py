@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Parameter-Sweep Benchmark Matrix
+================================
+
+Menjalankan mass insert untuk setiap kombinasi parameter:
+- Sweep record_count × batch_size × concurrency (× strategy) × repetisi
+- Warm-up per cell (tidak diukur) dan cool-down setelahnya
+- Menunggu pipeline drain sebelum dan sesudah cell (jumlah row di atas
+  watermark id sama di source dan target)
+- Tabel gabungan: ingest ops/s, CDC drain rate, percentile latency per cell
+- Operating point terbaik dipilih otomatis (drain rate tertinggi dalam
+  batas latency p99)
+
+Cells run in shuffled order within each repetition so slow drift of the
+environment (WAL growth, table bloat, a warming page cache) is spread over
+all cells instead of favouring whichever runs first. The drain rate is the
+end-to-end rate: rows that reached the target divided by the time from the
+first insert until the target caught up.
+
+Usage:
+    python benchmark_matrix.py [--spec sweep.yaml] [--records 10000,100000]
+                               [--batch-sizes 500,5000] [--concurrency 1,4] [--repetitions 3]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import yaml
+
+from latency_histogram import LatencyHistogram, merge_histograms
+from mass_insert_monitor import INSERT_STRATEGIES, CDCMassInsertMonitor
+from row_counts import replication_progress, rows_since
+from run_metadata import collect_run_metadata
+
+DEFAULT_SPEC = {
+    'record_counts': [10000],
+    'batch_sizes': [500, 5000],
+    'concurrency': [1, 4],
+    'strategies': ['executemany'],
+    'repetitions': 3,
+    'generator': 'numpy',
+    'warmup_records': 2000,  # inserted before every cell and not measured (0 disables)
+    'cooldown_seconds': 5,
+    'drain_timeout_seconds': 300,
+    'shuffle': True,
+    'seed': None
+}
+
+LATENCY_KEYS = ('kafka_latency', 'apply_latency', 'total_latency')
+TABLE_COLUMNS = ('record_count', 'batch_size', 'concurrency', 'strategy', 'runs', 'failures',
+                 'ingest_ops_per_second', 'ingest_ops_stdev', 'drain_rows_per_second', 'drain_rows_stdev',
+                 'drain_after_insert_seconds', 'apply_p50_ms', 'apply_p90_ms', 'apply_p99_ms', 'kafka_p99_ms')
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return statistics.fmean(values) if values else None
+
+
+def _stdev(values: List[float]) -> Optional[float]:
+    return statistics.stdev(values) if len(values) > 1 else None
+
+
+class BenchmarkMatrix:
+    def __init__(self, monitor: CDCMassInsertMonitor, spec: Dict[str, Any], max_p99_ms: Optional[float] = None):
+        """Sweep of mass insert cells run through monitor's pools and insert path"""
+        self.monitor = monitor
+        self.spec = spec
+        self.max_p99_ms = max_p99_ms
+        self.runs = []
+
+    def cells(self) -> List[Dict[str, Any]]:
+        """Every parameter combination of the spec"""
+        return [
+            {'record_count': records, 'batch_size': batch_size, 'concurrency': concurrency, 'strategy': strategy}
+            for records, batch_size, concurrency, strategy in itertools.product(
+                self.spec['record_counts'], self.spec['batch_sizes'],
+                self.spec['concurrency'], self.spec['strategies'])
+        ]
+
+    async def progress(self, since_id: Optional[int] = None) -> Dict[str, Any]:
+        """Source and target id watermarks, or row counts above since_id"""
+        async with self.monitor.db_pools.acquire('source') as source_conn:
+            async with self.monitor.db_pools.acquire('target') as target_conn:
+                if since_id is not None:
+                    return await rows_since(source_conn, target_conn, since_id)
+                return await replication_progress(source_conn, target_conn)
+
+    async def wait_for_drain(self, timeout: float, since_id: Optional[int] = None,
+                             poll_interval: float = 0.5) -> Dict[str, Any]:
+        """Wait until the target has every row the source has (every row above since_id if given)"""
+        # With several writers ids commit out of order, so the target can hold the max id while
+        # lower ids are still in flight; counting the rows above the watermark is complete
+        start = time.time()
+        progress = await self.progress(since_id)
+        while not progress['caught_up'] and time.time() - start < timeout:
+            await asyncio.sleep(poll_interval)
+            progress = await self.progress(since_id)
+        progress['drained_at'] = time.time()
+        progress['wait_seconds'] = round(progress['drained_at'] - start, 3)
+        return progress
+
+    async def warm_up(self, cell: Dict[str, Any]):
+        """Unmeasured insert with the cell's settings, then drain"""
+        records = int(self.spec.get('warmup_records') or 0)
+        if records <= 0:
+            return
+        print(f"  🔥 Warm-up: {records:,} orders")
+        watermark = (await self.progress())['source_max_id'] or 0
+        await self.monitor.mass_insert_orders(records, min(cell['batch_size'], records), cell['strategy'],
+                                              cell['concurrency'], generator_kind=self.spec['generator'])
+        await self.wait_for_drain(float(self.spec['drain_timeout_seconds']), since_id=watermark)
+
+    async def measure(self, cell: Dict[str, Any], repetition: int) -> Dict[str, Any]:
+        """One measured run of a cell: insert with marker latency, then wait for the target to catch up"""
+        drain_timeout = float(self.spec['drain_timeout_seconds'])
+        before = await self.wait_for_drain(drain_timeout)
+        if not before['caught_up']:
+            print(f"  ⚠️  Pipeline still {before['ids_behind']:,} ids behind before the cell starts")
+        await self.warm_up(cell)
+
+        stop_markers = asyncio.Event()
+
+        async def insert_then_stop_markers():
+            try:
+                return await self.monitor.mass_insert_orders(
+                    cell['record_count'], cell['batch_size'], cell['strategy'], cell['concurrency'],
+                    generator_kind=self.spec['generator'])
+            finally:
+                stop_markers.set()
+
+        # Every id above the watermark belongs to this cell (and its marker rows)
+        watermark = (await self.progress())['source_max_id'] or 0
+        insert_start = time.time()
+        insert_results, marker_latency = await asyncio.gather(
+            insert_then_stop_markers(), self.monitor.track_marker_latency(stop_markers)
+        )
+        insert_end = insert_start + insert_results.get('total_time_seconds', time.time() - insert_start)
+        drained = await self.wait_for_drain(drain_timeout, since_id=watermark)
+
+        replicated = drained['target_rows']
+        elapsed = drained['drained_at'] - insert_start
+        run = {
+            **cell,
+            'repetition': repetition,
+            'start_time': datetime.fromtimestamp(insert_start).isoformat(),
+            'error': insert_results.get('error'),
+            'ingest_ops_per_second': insert_results.get('avg_ops_per_second'),
+            'total_inserted': insert_results.get('total_inserted', 0),
+            'batch_time_percentiles': insert_results.get('batch_time_percentiles'),
+            'caught_up': drained['caught_up'],
+            'rows_replicated': replicated,
+            'drain_rows_per_second': replicated / elapsed if drained['caught_up'] and elapsed > 0 else None,
+            'drain_after_insert_seconds': round(drained['drained_at'] - insert_end, 3) if drained['caught_up'] else None,
+            'marker_latency': {key: marker_latency.get(key) for key in LATENCY_KEYS if key in marker_latency},
+            'marker_histograms': marker_latency.get('histograms', {})
+        }
+        if not drained['caught_up']:
+            run['error'] = run['error'] or f"target still {drained['rows_behind']:,} rows behind after {drain_timeout:.0f}s"
+        return run
+
+    def summarize_cell(self, cell: Dict[str, Any]) -> Dict[str, Any]:
+        """Aggregate of every repetition of one cell"""
+        runs = [run for run in self.runs if all(run[key] == value for key, value in cell.items())]
+        ok = [run for run in runs if not run['error']]
+        ingest = [run['ingest_ops_per_second'] for run in ok if run['ingest_ops_per_second'] is not None]
+        drain = [run['drain_rows_per_second'] for run in ok if run['drain_rows_per_second'] is not None]
+        drain_after = [run['drain_after_insert_seconds'] for run in ok if run['drain_after_insert_seconds'] is not None]
+        # Percentiles over every marker of every repetition, not an average of per-run percentiles
+        latency = {}
+        for key in LATENCY_KEYS:
+            histograms = [LatencyHistogram.from_dict(run['marker_histograms'][key])
+                          for run in ok if run['marker_histograms'].get(key)]
+            latency[key] = merge_histograms(histograms).summary()
+        apply, kafka = latency['apply_latency'], latency['kafka_latency']
+        return {
+            **cell,
+            'runs': len(runs),
+            'failures': len(runs) - len(ok),
+            'ingest_ops_per_second': _mean(ingest),
+            'ingest_ops_stdev': _stdev(ingest),
+            'drain_rows_per_second': _mean(drain),
+            'drain_rows_stdev': _stdev(drain),
+            'drain_after_insert_seconds': _mean(drain_after),
+            'apply_p50_ms': apply.get('p50_ms'),
+            'apply_p90_ms': apply.get('p90_ms'),
+            'apply_p99_ms': apply.get('p99_ms'),
+            'kafka_p99_ms': kafka.get('p99_ms'),
+            'latency': latency,
+            'errors': sorted({run['error'] for run in runs if run['error']})
+        }
+
+    def best_cell(self, table: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Highest drain rate among cells without failures and within the p99 latency budget"""
+        candidates = [row for row in table if not row['failures'] and row['drain_rows_per_second'] is not None]
+        if self.max_p99_ms is not None:
+            candidates = [row for row in candidates
+                          if row['apply_p99_ms'] is None or row['apply_p99_ms'] <= self.max_p99_ms]
+        return max(candidates, key=lambda row: row['drain_rows_per_second'], default=None)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every repetition of every cell"""
+        cells = self.cells()
+        repetitions = int(self.spec['repetitions'])
+        seed = self.spec.get('seed')
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        shuffler = random.Random(seed)
+        print(f"🧮 {len(cells)} cell(s) × {repetitions} repetition(s) = {len(cells) * repetitions} run(s)")
+
+        started_at = datetime.now().isoformat()
+        for repetition in range(1, repetitions + 1):
+            order = list(cells)
+            if self.spec.get('shuffle', True):
+                shuffler.shuffle(order)
+            for number, cell in enumerate(order, 1):
+                print(f"\n📐 Repetition {repetition}/{repetitions}, cell {number}/{len(order)}: "
+                      f"{cell['record_count']:,} records, batch {cell['batch_size']:,}, "
+                      f"{cell['concurrency']} writer(s), {cell['strategy']}")
+                try:
+                    run = await self.measure(cell, repetition)
+                except Exception as e:
+                    print(f"  ❌ Cell failed: {e}")
+                    run = {**cell, 'repetition': repetition, 'error': str(e), 'ingest_ops_per_second': None,
+                           'drain_rows_per_second': None, 'drain_after_insert_seconds': None, 'marker_histograms': {}}
+                self.runs.append(run)
+                if not run['error']:
+                    drain = run['drain_rows_per_second']
+                    print(f"  📊 ingest {run['ingest_ops_per_second']:,.0f} ops/s, drain "
+                          f"{drain:,.0f} rows/s, caught up {run['drain_after_insert_seconds']:.1f}s after the insert")
+                else:
+                    print(f"  ❌ {run['error']}")
+
+                cooldown = float(self.spec.get('cooldown_seconds') or 0)
+                if cooldown > 0:
+                    await asyncio.sleep(cooldown)
+
+        table = [self.summarize_cell(cell) for cell in cells]
+        return {
+            'spec': {**self.spec, 'seed': seed},
+            'started_at': started_at,
+            'completed_at': datetime.now().isoformat(),
+            'max_p99_ms': self.max_p99_ms,
+            'table': table,
+            'best': self.best_cell(table),
+            'runs': [{key: value for key, value in run.items() if key != 'marker_histograms'} for run in self.runs]
+        }
+
+
+def print_table(results: Dict[str, Any]):
+    """Consolidated per-cell table"""
+    print(f"\n🎯 BENCHMARK MATRIX")
+    print("=" * 110)
+    print(f"{'records':>9} {'batch':>7} {'writers':>7} {'strategy':<12} {'ingest ops/s':>13} {'drain rows/s':>13} "
+          f"{'drain +s':>9} {'apply p50':>10} {'p90':>9} {'p99':>9} {'fail':>5}")
+
+    def number(value, fmt):
+        return format(value, fmt) if value is not None else 'n/a'
+
+    best = results.get('best')
+    for row in results['table']:
+        marker = '⭐' if best is not None and row is best else '  '
+        print(f"{row['record_count']:>9,} {row['batch_size']:>7,} {row['concurrency']:>7} {row['strategy']:<12} "
+              f"{number(row['ingest_ops_per_second'], ',.0f'):>13} {number(row['drain_rows_per_second'], ',.0f'):>13} "
+              f"{number(row['drain_after_insert_seconds'], '.1f'):>9} {number(row['apply_p50_ms'], '.0f'):>10} "
+              f"{number(row['apply_p90_ms'], '.0f'):>9} {number(row['apply_p99_ms'], '.0f'):>9} "
+              f"{row['failures']:>5} {marker}")
+    if best is not None:
+        budget = f" within p99 ≤ {results['max_p99_ms']:.0f}ms" if results.get('max_p99_ms') is not None else ""
+        print(f"\n⭐ Best operating point{budget}: batch {best['batch_size']:,} with {best['concurrency']} writer(s) "
+              f"({best['strategy']}, {best['record_count']:,} records): "
+              f"{best['drain_rows_per_second']:,.0f} rows/s end-to-end")
+    else:
+        print(f"\n⚠️  No cell completed without failures within the latency budget")
+
+
+def save_results(results: Dict[str, Any], directory: str) -> str:
+    """benchmark_matrix_<timestamp>.json plus the table as CSV"""
+    os.makedirs(directory, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_path = os.path.join(directory, f"benchmark_matrix_{timestamp}.json")
+    with open(json_path, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    with open(os.path.join(directory, f"benchmark_matrix_{timestamp}.csv"), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results['table'])
+    return json_path
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Sweep mass insert parameters and find the best operating point")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--spec', help="YAML sweep spec (keys of benchmark_matrix in config.yaml)")
+    parser.add_argument('--records', type=_int_list, help="Record counts, comma separated")
+    parser.add_argument('--batch-sizes', type=_int_list, help="Batch sizes, comma separated")
+    parser.add_argument('--concurrency', type=_int_list, help="Writer counts, comma separated")
+    parser.add_argument('--strategies', type=lambda value: value.split(','),
+                        help=f"Load strategies, comma separated ({', '.join(INSERT_STRATEGIES)})")
+    parser.add_argument('--repetitions', type=int)
+    parser.add_argument('--max-p99-ms', type=float, default=None,
+                        help="Apply-latency p99 budget for the best cell (default: performance.max_acceptable_lag_ms)")
+    parser.add_argument('--dry-run', action='store_true', help="Only list the cells")
+    return parser.parse_args()
+
+
+async def main():
+    """Main function"""
+    args = parse_args()
+    monitor = CDCMassInsertMonitor(args.config)
+
+    spec = {**DEFAULT_SPEC, **(monitor.config.get('benchmark_matrix') or {})}
+    if args.spec:
+        with open(args.spec, 'r') as f:
+            spec.update(yaml.safe_load(f) or {})
+    for key, value in (('record_counts', args.records), ('batch_sizes', args.batch_sizes),
+                       ('concurrency', args.concurrency), ('strategies', args.strategies),
+                       ('repetitions', args.repetitions)):
+        if value is not None:
+            spec[key] = value
+    unknown = set(spec['strategies']) - set(INSERT_STRATEGIES)
+    if unknown:
+        raise SystemExit(f"Unknown strategies: {', '.join(sorted(unknown))}")
+
+    max_p99_ms = args.max_p99_ms
+    if max_p99_ms is None:
+        max_p99_ms = (monitor.config.get('performance') or {}).get('max_acceptable_lag_ms')
+
+    matrix = BenchmarkMatrix(monitor, spec, float(max_p99_ms) if max_p99_ms is not None else None)
+    if args.dry_run:
+        for cell in matrix.cells():
+            print(cell)
+        return
+
+    print("🎯 CDC Benchmark Matrix")
+    print("=" * 40)
+    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    run_metadata = await collect_run_metadata(monitor.config, {'kind': 'benchmark_matrix', 'spec': spec})
+    try:
+        results = await matrix.run()
+    finally:
+        await monitor.db_pools.close()
+    results['run_metadata'] = run_metadata
+
+    print_table(results)
+    path = save_results(results, monitor.results_config.get('directory', 'testing-results'))
+    print(f"\n💾 Results saved to: {path} (table also as .csv)")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n⚠️  Benchmark interrupted by user")
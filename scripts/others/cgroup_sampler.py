@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Direct cgroup v2 Resource Sampler
+=================================
+
+Sampler resource container langsung dari file cgroup v2 (/sys/fs/cgroup):
+- cpu.stat, memory.current, memory.max, memory.stat dan io.stat
+- CPU% dan IO rate dihitung dari delta counter antar sample
+- Cukup murah untuk 10-100 Hz (pread pada file descriptor yang tetap terbuka)
+
+Container cgroups are located from the full container ID reported by
+`docker inspect`, for both the systemd (system.slice/docker-<id>.scope) and
+cgroupfs (docker/<id>) cgroup drivers. The host must use the unified (v2)
+hierarchy and the monitor must run on the Docker host, not in a container.
+
+Usage:
+    python cgroup_sampler.py [--hz 20] [--duration 10] [container ...]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import subprocess
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from docker_api_stats import format_binary_bytes
+
+DEFAULT_CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Cgroup locations used by the systemd and cgroupfs drivers (rootful and rootless)
+CGROUP_PATH_PATTERNS = (
+    'system.slice/docker-{id}.scope',
+    'docker/{id}',
+    'user.slice/user-*.slice/user@*.service/docker-{id}.scope',
+    'docker.slice/docker-{id}.scope',
+)
+
+
+def is_cgroup_v2(root: str = DEFAULT_CGROUP_ROOT) -> bool:
+    """True when root is a unified (v2) cgroup hierarchy"""
+    return os.path.exists(os.path.join(root, 'cgroup.controllers'))
+
+
+def inspect_container_ids(container_names: List[str]) -> Dict[str, str]:
+    """Full container IDs for the given names, from a single `docker inspect` call"""
+    result = subprocess.run(
+        ['docker', 'inspect', '--format', '{{.Name}} {{.Id}}', *container_names],
+        capture_output=True, text=True, timeout=10
+    )
+    # docker inspect exits non-zero if any name is unknown but still prints the rest
+    ids = {}
+    for line in result.stdout.strip().split('\n'):
+        if ' ' in line:
+            name, container_id = line.split(' ', 1)
+            ids[name.lstrip('/')] = container_id.strip()
+    return ids
+
+
+def find_cgroup_path(container_id: str, root: str = DEFAULT_CGROUP_ROOT) -> Optional[str]:
+    """Cgroup directory of a container, or None if it cannot be found"""
+    for pattern in CGROUP_PATH_PATTERNS:
+        matches = glob.glob(os.path.join(root, pattern.format(id=container_id)))
+        for match in matches:
+            if os.path.exists(os.path.join(match, 'cpu.stat')):
+                return match
+    return None
+
+
+def parse_flat_keyed(text: str) -> Dict[str, int]:
+    """Parse 'key value' lines (cpu.stat, memory.stat)"""
+    values = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            try:
+                values[parts[0]] = int(parts[1])
+            except ValueError:
+                pass
+    return values
+
+
+def parse_io_stat(text: str) -> Dict[str, int]:
+    """Sum 'MAJ:MIN rbytes=.. wbytes=.. rios=.. wios=..' lines over all devices"""
+    totals = {'rbytes': 0, 'wbytes': 0, 'rios': 0, 'wios': 0}
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition('=')
+            if key in totals:
+                try:
+                    totals[key] += int(value)
+                except ValueError:
+                    pass
+    return totals
+
+
+class _CgroupFiles:
+    """Open file descriptors for one container's cgroup, re-read with pread"""
+
+    FILES = ('cpu.stat', 'memory.current', 'memory.max', 'memory.stat', 'io.stat')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fds = {}
+        for name in self.FILES:
+            try:
+                self.fds[name] = os.open(os.path.join(path, name), os.O_RDONLY)
+            except OSError:
+                pass  # io.stat is missing when the io controller is not enabled
+
+    def read(self, name: str) -> Optional[str]:
+        fd = self.fds.get(name)
+        if fd is None:
+            return None
+        # Reading from offset 0 makes the kernel regenerate the file contents
+        return os.pread(fd, 65536, 0).decode('ascii', 'replace')
+
+    def close(self):
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds = {}
+
+
+class CgroupSampler:
+    def __init__(self, cgroup_paths: Dict[str, str], history_size: int = 6000):
+        """Sample the cgroups in cgroup_paths ({container_name: cgroup directory})"""
+        self.files = {name: _CgroupFiles(path) for name, path in cgroup_paths.items()}
+        self.previous = {}
+        self.latest = {}
+        self.history = {name: deque(maxlen=history_size) for name in cgroup_paths}
+        self.sample_count = 0
+        self.sampling_seconds = 0.0
+
+    @classmethod
+    def for_containers(cls, container_names: List[str], root: str = DEFAULT_CGROUP_ROOT,
+                       container_ids: Optional[Dict[str, str]] = None,
+                       history_size: int = 6000) -> 'CgroupSampler':
+        """Build a sampler from container names (IDs via docker inspect unless given)"""
+        if not is_cgroup_v2(root):
+            raise RuntimeError(f"{root} is not a cgroup v2 hierarchy")
+        if container_ids is None:
+            container_ids = inspect_container_ids(container_names)
+        paths = {}
+        for name in container_names:
+            container_id = container_ids.get(name)
+            path = find_cgroup_path(container_id, root) if container_id else None
+            if path:
+                paths[name] = path
+        if not paths:
+            raise RuntimeError("No container cgroups found")
+        return cls(paths, history_size)
+
+    def read_counters(self, name: str) -> Dict[str, Any]:
+        """Raw counters for one container"""
+        files = self.files[name]
+        cpu = parse_flat_keyed(files.read('cpu.stat') or '')
+        memory_stat = parse_flat_keyed(files.read('memory.stat') or '')
+        memory_max = (files.read('memory.max') or 'max').strip()
+        io = parse_io_stat(files.read('io.stat') or '')
+        return {
+            'time': time.monotonic(),
+            'cpu_usage_usec': cpu.get('usage_usec', 0),
+            'cpu_throttled_usec': cpu.get('throttled_usec', 0),
+            'memory_current': int((files.read('memory.current') or '0').strip() or 0),
+            'memory_max': None if memory_max == 'max' else int(memory_max),
+            'memory_inactive_file': memory_stat.get('inactive_file', 0),
+            'io_read_bytes': io['rbytes'],
+            'io_write_bytes': io['wbytes']
+        }
+
+    def sample(self) -> Dict[str, Dict[str, Any]]:
+        """Read every cgroup once and derive rates from the previous sample"""
+        started = time.perf_counter()
+        timestamp = datetime.now().isoformat()
+        for name in self.files:
+            try:
+                counters = self.read_counters(name)
+            except OSError as e:
+                self.latest[name] = {'error': str(e), 'timestamp': timestamp}
+                continue
+            previous = self.previous.get(name)
+            self.previous[name] = counters
+            if previous is None:
+                continue  # rates need two samples
+
+            elapsed = counters['time'] - previous['time']
+            if elapsed <= 0:
+                continue
+            # usage_usec counts CPU time over all CPUs, so 100% = one full core (as docker stats)
+            cpu_pct = (counters['cpu_usage_usec'] - previous['cpu_usage_usec']) / (elapsed * 1e6) * 100
+            memory_usage = max(counters['memory_current'] - counters['memory_inactive_file'], 0)
+            memory_limit = counters['memory_max'] or 0
+            stats = {
+                'cpu_pct': round(cpu_pct, 2),
+                'cpu_throttled_pct': round(
+                    (counters['cpu_throttled_usec'] - previous['cpu_throttled_usec']) / (elapsed * 1e6) * 100, 2),
+                'memory_usage_bytes': memory_usage,
+                'memory_limit_bytes': memory_limit,
+                'memory_pct': round(memory_usage / memory_limit * 100, 2) if memory_limit else None,
+                'io_read_bytes_per_sec': round((counters['io_read_bytes'] - previous['io_read_bytes']) / elapsed, 1),
+                'io_write_bytes_per_sec': round((counters['io_write_bytes'] - previous['io_write_bytes']) / elapsed, 1),
+                'io_read_bytes': counters['io_read_bytes'],
+                'io_write_bytes': counters['io_write_bytes'],
+                'timestamp': timestamp
+            }
+            # Same string fields extract_container_stats reads from docker stats
+            stats['cpu_percent'] = f"{stats['cpu_pct']:.2f}%"
+            stats['memory_usage'] = f"{format_binary_bytes(memory_usage)} / " + \
+                (format_binary_bytes(memory_limit) if memory_limit else 'unlimited')
+            stats['memory_percent'] = f"{stats['memory_pct']:.2f}%" if memory_limit else 'N/A'
+            self.latest[name] = stats
+            self.history[name].append((time.time(), stats['cpu_pct'], memory_usage,
+                                       stats['io_read_bytes_per_sec'], stats['io_write_bytes_per_sec']))
+        self.sample_count += 1
+        self.sampling_seconds += time.perf_counter() - started
+        return self.latest
+
+    async def run(self, stop_event: asyncio.Event, hz: float = 20.0):
+        """Sample at hz until stop_event is set, on a fixed schedule"""
+        interval = 1.0 / hz
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tick = 0
+        while not stop_event.is_set():
+            self.sample()
+            tick += 1
+            delay = start + tick * interval - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-container min/avg/max over the retained history plus sampler overhead"""
+        containers = {}
+        for name, samples in self.history.items():
+            if not samples:
+                containers[name] = {'samples': 0}
+                continue
+            cpu = [s[1] for s in samples]
+            memory = [s[2] for s in samples]
+            containers[name] = {
+                'samples': len(samples),
+                'cpu_pct': {'min': min(cpu), 'avg': round(sum(cpu) / len(cpu), 2), 'max': max(cpu)},
+                'memory_usage_bytes': {'min': min(memory), 'avg': round(sum(memory) / len(memory)),
+                                       'max': max(memory)},
+                'io_read_bytes_per_sec_max': max(s[3] for s in samples),
+                'io_write_bytes_per_sec_max': max(s[4] for s in samples)
+            }
+        return {
+            'sample_count': self.sample_count,
+            'avg_sample_cost_ms': round(self.sampling_seconds / self.sample_count * 1000, 4)
+            if self.sample_count else 0,
+            'containers': containers
+        }
+
+    def close(self):
+        """Close every open cgroup file"""
+        for files in self.files.values():
+            files.close()
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Sample container cgroup v2 counters")
+    parser.add_argument('containers', nargs='*', default=[
+        "debezium-cdc-mirroring-postgres-1",
+        "debezium-cdc-mirroring-kafka-1",
+        "debezium-cdc-mirroring-target-postgres-1",
+        "tutorial-connect-1"
+    ])
+    parser.add_argument('--hz', type=float, default=20.0, help="Samples per second (10-100)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to sample")
+    parser.add_argument('--root', default=DEFAULT_CGROUP_ROOT, help="cgroup v2 mount point")
+    args = parser.parse_args()
+
+    sampler = CgroupSampler.for_containers(args.containers, args.root)
+    stop_event = asyncio.Event()
+    asyncio.get_running_loop().call_later(args.duration, stop_event.set)
+    try:
+        await sampler.run(stop_event, args.hz)
+    finally:
+        sampler.close()
+    print(json.dumps(sampler.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
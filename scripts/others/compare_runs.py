@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+Cross-Run Comparison and Regression Detection
+=============================================
+
+Membaca kembali semua report di testing-results/ dan membandingkan antar run:
+- Index report mass_insert_test_*.json dan comprehensive_performance_report_*.json
+  (report JSON penuh maupun pointer ke results store SQLite)
+- Run dikelompokkan per workload: parameter test + hash config connector
+- Delta throughput, percentile latency, dan CPU/memory per container
+- Welch t-test untuk signifikansi statistik (antar run, atau antar sample
+  dalam run bila tiap sisi hanya punya satu run)
+- Baseline disimpan di testing-results/baselines/ dan regresi ditandai
+- Perbedaan plugin (versi / hash jar) dan config connector ikut dilaporkan
+
+Percentile metrics are tested across runs only: a p99 from one run is a
+single observation. Mean metrics (marker latency, sampled container CPU) also
+carry their per-sample values, so one run against one run still gets a
+p-value, but it only covers noise within those runs, not between runs.
+Repeat runs (--last N) for conclusions about a plugin upgrade.
+
+Usage:
+    python compare_runs.py list
+    python compare_runs.py baseline testing-results/mass_insert_test_20250801_120000.json
+    python compare_runs.py baseline --workload <id> --last 3
+    python compare_runs.py compare [--last 3] [--against REPORT ...] [REPORT ...]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import re
+import statistics
+import sys
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import yaml
+
+from results_store import ResultsReader
+from run_metadata import comprehensive_workload, mass_insert_workload, stable_hash, workload_fingerprint
+
+REPORT_PATTERNS = ('mass_insert_test_*.json', 'comprehensive_performance_report_*.json')
+BASELINE_DIRECTORY = 'baselines'
+
+# Throughput-style metrics; everything else (latency, CPU, memory) is better when lower
+HIGHER_IS_BETTER_PATTERN = re.compile(r'ops_per_second|rate_ops|rows_per_second')
+
+# Deltas smaller than this (in the metric's unit) are never flagged, whatever the percentage
+ABSOLUTE_FLOORS = {'_ms': 1.0, '_seconds': 0.1, 'cpu_pct': 1.0, '_mib': 8.0}
+
+LATENCY_KEYS = ('kafka_latency', 'apply_latency', 'total_latency')
+PERCENTILE_KEYS = ('p50_ms', 'p90_ms', 'p99_ms')
+SAMPLED_CONTAINER_METRICS = re.compile(r'^docker\.(?P<container>.+)\.(?P<metric>cpu_percent|memory_percent)$')
+SIZE_UNITS = {'b': 1, 'kb': 1000, 'kib': 1024, 'mb': 1000 ** 2, 'mib': 1024 ** 2,
+              'gb': 1000 ** 3, 'gib': 1024 ** 3, 'tb': 1000 ** 4, 'tib': 1024 ** 4}
+
+
+def _beta_continued_fraction(a: float, b: float, x: float, max_iterations: int = 300,
+                             epsilon: float = 3e-14) -> float:
+    """Continued fraction of the incomplete beta function (modified Lentz)"""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, max_iterations + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= d * c
+        if abs(d * c - 1.0) < epsilon:
+            break
+    return fraction
+
+
+def regularized_incomplete_beta(a: float, b: float, x: float) -> float:
+    """I_x(a, b)"""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _beta_continued_fraction(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _beta_continued_fraction(b, a, 1.0 - x) / b
+
+
+def welch_t_test(baseline: List[float], candidate: List[float]) -> Optional[Dict[str, float]]:
+    """Two-sided Welch t-test (unequal variances); None with fewer than two values per side"""
+    n1, n2 = len(baseline), len(candidate)
+    if n1 < 2 or n2 < 2:
+        return None
+    mean1, mean2 = statistics.fmean(baseline), statistics.fmean(candidate)
+    var1, var2 = statistics.variance(baseline), statistics.variance(candidate)
+    standard_error_sq = var1 / n1 + var2 / n2
+    if standard_error_sq == 0:
+        # No spread at all: any difference is exact
+        return {'t': 0.0 if mean1 == mean2 else math.copysign(math.inf, mean2 - mean1),
+                'df': float(n1 + n2 - 2), 'p_value': 1.0 if mean1 == mean2 else 0.0}
+    t = (mean2 - mean1) / math.sqrt(standard_error_sq)
+    df = standard_error_sq ** 2 / ((var1 / n1) ** 2 / (n1 - 1) + (var2 / n2) ** 2 / (n2 - 1))
+    p_value = regularized_incomplete_beta(df / 2.0, 0.5, df / (df + t * t))
+    return {'t': round(t, 4), 'df': round(df, 2), 'p_value': min(max(p_value, 0.0), 1.0)}
+
+
+def parse_size(value: Any) -> Optional[float]:
+    """Bytes from docker-style sizes ('123.4MiB', or the used part of '123.4MiB / 1.9GiB')"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.match(r'\s*([\d.]+)\s*([a-zA-Z]+)', str(value or ''))
+    if not match or match.group(2).lower() not in SIZE_UNITS:
+        return None
+    return float(match.group(1)) * SIZE_UNITS[match.group(2).lower()]
+
+
+def parse_percent(value: Any) -> Optional[float]:
+    """Float from docker-style '12.34%' strings"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except (TypeError, ValueError):
+        return None
+
+
+def higher_is_better(metric: str) -> bool:
+    return bool(HIGHER_IS_BETTER_PATTERN.search(metric))
+
+
+def absolute_floor(metric: str) -> float:
+    for suffix, floor in ABSOLUTE_FLOORS.items():
+        if metric.endswith(suffix):
+            return floor
+    return 0.0
+
+
+class RunReport:
+    def __init__(self, path: str, report: Dict[str, Any]):
+        """One indexed run; the results store (if any) is only opened when metrics are needed"""
+        self.path = path
+        self.report = report
+        self.kind = 'mass_insert' if 'test_info' in report else 'comprehensive'
+        self._results = None
+        self._metrics = None
+
+    @classmethod
+    def load(cls, path: str) -> 'RunReport':
+        with open(path, 'r') as f:
+            return cls(path, json.load(f))
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def run_metadata(self) -> Dict[str, Any]:
+        return self.report.get('run_metadata') or {}
+
+    @property
+    def started_at(self) -> str:
+        info = self.report.get('test_info') or self.report.get('monitoring_info') or {}
+        return self.run_metadata.get('captured_at') or info.get('start_time') or ''
+
+    def store_path(self) -> Optional[str]:
+        """Results store of a pointer report, looked up next to the report if it was moved"""
+        store = self.report.get('results_store')
+        if not store:
+            return None
+        if os.path.exists(store):
+            return store
+        local = os.path.join(os.path.dirname(self.path), os.path.basename(store))
+        return local if os.path.exists(local) else store
+
+    def results(self) -> Dict[str, Any]:
+        """Full results: the report itself, or the sections read back from its results store"""
+        if self._results is not None:
+            return self._results
+        store = self.store_path()
+        if store is None:
+            self._results = self.report
+            return self._results
+        results = {'phase_data': {}, 'time_series': {}}
+        with ResultsReader(store) as reader:
+            for section, phase in reader.sections():
+                if section == 'phase':
+                    results['phase_data'][phase] = reader.document('phase', phase)
+                elif phase is None:
+                    results[section] = reader.document(section)
+            # Only the per-container samples are needed for comparisons
+            for metric in reader.metrics():
+                if SAMPLED_CONTAINER_METRICS.match(metric):
+                    _, values = reader.metric(metric)
+                    results['time_series'][metric] = {'values': values}
+        self._results = {**results, **{key: value for key, value in self.report.items() if key not in results}}
+        return self._results
+
+    def workload(self) -> Dict[str, Any]:
+        """Workload parameters, reconstructed from the test info for reports without run metadata"""
+        if self.run_metadata.get('workload'):
+            return self.run_metadata['workload']
+        if self.kind == 'mass_insert':
+            info = self.report.get('test_info') or {}
+            return mass_insert_workload(info.get('record_count', 0), info.get('batch_size', 0),
+                                        info.get('strategy', 'executemany'), info.get('concurrency', 1),
+                                        info.get('open_loop'))
+        info = self.report.get('monitoring_info') or {}
+        load = ((self.results().get('phase_data') or {}).get('processing') or {}).get('open_loop_load') or {}
+        test_settings = {}
+        if load.get('target_rate_ops'):
+            test_settings = {'open_loop_rate': load['target_rate_ops'],
+                             'open_loop_ramp_to': load.get('ramp_to_rate_ops'),
+                             'open_loop_duration_seconds': load.get('duration_seconds', 30),
+                             'open_loop_rows_per_op': load.get('rows_per_op', 1),
+                             'concurrency': load.get('concurrency', 1)}
+        return comprehensive_workload(info.get('duration_minutes', 0), test_settings)
+
+    def connectors(self) -> Dict[str, Dict[str, Any]]:
+        return self.run_metadata.get('connectors') or {}
+
+    def plugins(self) -> Dict[str, Dict[str, Any]]:
+        return (self.run_metadata.get('plugins') or {}).get('plugins') or {}
+
+    def group_key(self, ignore_connectors: bool = False) -> str:
+        """Runs that are comparable share this key"""
+        if ignore_connectors:
+            return stable_hash({'workload': self.workload()})
+        if self.run_metadata.get('workload_id'):
+            return self.run_metadata['workload_id']
+        return workload_fingerprint(self.workload(), self.connectors())
+
+    def describe_workload(self) -> str:
+        workload = self.workload()
+        details = [f"{key}={value}" for key, value in workload.items() if key != 'kind' and value is not None]
+        return f"{workload.get('kind')} " + ' '.join(details)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """{metric: {'value': float, 'samples': [float] or None}} of this run"""
+        if self._metrics is None:
+            results = self.results()
+            self._metrics = (self._mass_insert_metrics(results) if self.kind == 'mass_insert'
+                             else self._comprehensive_metrics(results))
+        return self._metrics
+
+    @staticmethod
+    def _add(metrics: Dict[str, Dict[str, Any]], name: str, value: Any, samples: Optional[List[float]] = None):
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            metrics[name] = {'value': float(value), 'samples': samples if samples and len(samples) > 1 else None}
+
+    def _latency_metrics(self, metrics: Dict[str, Dict[str, Any]], prefix: str, latency: Dict[str, Any]):
+        """Percentiles and mean of marker (or legacy polling) latency measurements"""
+        if not isinstance(latency, dict) or 'error' in latency:
+            return
+        statistics_block = latency.get('statistics') or {}
+        measurements = [m for m in latency.get('measurements') or [] if m.get('status') == 'success']
+        keys = [key for key in LATENCY_KEYS if (latency.get(key) or {}).get('count')] or ['total_latency', 'cdc_latency']
+        for key in keys:
+            summary = latency.get(key) or statistics_block.get(f'{key}_percentiles') or {}
+            if not summary.get('count'):
+                continue
+            for percentile in PERCENTILE_KEYS:
+                self._add(metrics, f'{prefix}.{key}_{percentile}', summary.get(percentile))
+            samples = [m[f'{key}_ms'] for m in measurements if isinstance(m.get(f'{key}_ms'), (int, float))]
+            self._add(metrics, f'{prefix}.{key}_avg_ms', summary.get('avg_ms'), samples)
+
+    def _container_metrics(self, metrics: Dict[str, Dict[str, Any]], docker_stats: Dict[str, Any]):
+        """CPU and memory of every container in a processing-phase snapshot"""
+        for container, stats in (docker_stats or {}).items():
+            if not isinstance(stats, dict) or 'error' in stats:
+                continue
+            cpu = stats.get('cpu_pct', parse_percent(stats.get('cpu_percent')))
+            memory = stats.get('memory_usage_bytes', parse_size(stats.get('memory_usage')))
+            self._add(metrics, f'container.{container}.cpu_pct', cpu)
+            if memory is not None:
+                self._add(metrics, f'container.{container}.memory_mib', memory / 1024 ** 2)
+
+    def _mass_insert_metrics(self, results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        metrics = {}
+        insert = results.get('insert_results') or {}
+        if 'error' not in insert:
+            self._add(metrics, 'insert.avg_ops_per_second', insert.get('avg_ops_per_second'))
+            self._add(metrics, 'insert.insert_ops_per_second', insert.get('insert_ops_per_second'))
+            self._add(metrics, 'insert.achieved_rate_ops', insert.get('achieved_rate_ops'))
+            batch_times = insert.get('batch_time_percentiles') or {}
+            insert_latency = insert.get('latency') or {}
+            for percentile in PERCENTILE_KEYS:
+                self._add(metrics, f'insert.batch_time_{percentile}', batch_times.get(percentile))
+                self._add(metrics, f'insert.latency_{percentile}', insert_latency.get(percentile))
+        self._latency_metrics(metrics, 'cdc', results.get('marker_latency') or {})
+        catch_up = results.get('catch_up') or {}
+        if catch_up.get('caught_up'):
+            self._add(metrics, 'cdc.catch_up_seconds', catch_up.get('wait_seconds'))
+        processing = (results.get('phase_data') or {}).get('processing') or {}
+        self._container_metrics(metrics, processing.get('docker_stats'))
+        return metrics
+
+    def _comprehensive_metrics(self, results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        metrics = {}
+        processing = (results.get('phase_data') or {}).get('processing') or {}
+        self._latency_metrics(metrics, 'cdc', processing.get('latency_analysis') or {})
+        load = processing.get('open_loop_load') or {}
+        if load and 'error' not in load:
+            self._add(metrics, 'insert.achieved_rate_ops', load.get('achieved_rate_ops'))
+            for percentile in PERCENTILE_KEYS:
+                self._add(metrics, f'insert.latency_{percentile}', (load.get('latency') or {}).get(percentile))
+        self._container_metrics(metrics, processing.get('docker_metrics'))
+        # Sampled for the whole run: means with per-sample values for the significance test
+        for name, series in (results.get('time_series') or {}).items():
+            match = SAMPLED_CONTAINER_METRICS.match(name)
+            values = [v for v in (series or {}).get('values') or [] if isinstance(v, (int, float))]
+            if match and values:
+                metric = 'cpu_pct' if match.group('metric') == 'cpu_percent' else 'memory_pct'
+                self._add(metrics, f"container.{match.group('container')}.{metric}_avg",
+                          statistics.fmean(values), values)
+        return metrics
+
+
+def index_runs(directory: str) -> List[RunReport]:
+    """Every readable report in directory, oldest first"""
+    runs = []
+    for pattern in REPORT_PATTERNS:
+        for path in glob.glob(os.path.join(directory, pattern)):
+            try:
+                runs.append(RunReport.load(path))
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Skipping unreadable report {path}: {e}", file=sys.stderr)
+    return sorted(runs, key=lambda run: (run.started_at, run.name))
+
+
+def group_runs(runs: List[RunReport], ignore_connectors: bool = False) -> Dict[str, List[RunReport]]:
+    groups = {}
+    for run in runs:
+        groups.setdefault(run.group_key(ignore_connectors), []).append(run)
+    return groups
+
+
+def baseline_path(directory: str, group_key: str) -> str:
+    return os.path.join(directory, BASELINE_DIRECTORY, f"{group_key}.json")
+
+
+def create_baseline(runs: List[RunReport], group_key: str) -> Dict[str, Any]:
+    """Baseline document: metric values of the given runs plus what they ran on"""
+    return {
+        'group_key': group_key,
+        'created_at': datetime.now().isoformat(),
+        'workload': runs[-1].workload(),
+        'connectors': runs[-1].connectors(),
+        'runs': [{'report': run.path, 'started_at': run.started_at,
+                  'plugins': {name: plugin.get('version') for name, plugin in run.plugins().items()},
+                  'plugins_fingerprint': (run.run_metadata.get('plugins') or {}).get('fingerprint'),
+                  'git': run.run_metadata.get('git')} for run in runs],
+        'plugins': runs[-1].plugins(),
+        'metrics': [run.metrics() for run in runs]
+    }
+
+
+def load_baseline(directory: str, group_key: str) -> Optional[Dict[str, Any]]:
+    path = baseline_path(directory, group_key)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_metric(metric: str, baseline: List[Dict[str, Any]], candidate: List[Dict[str, Any]],
+                   threshold_pct: float, alpha: float) -> Optional[Dict[str, Any]]:
+    """Delta and significance of one metric between two sets of runs"""
+    baseline_values = [run[metric]['value'] for run in baseline if metric in run]
+    candidate_values = [run[metric]['value'] for run in candidate if metric in run]
+    if not baseline_values or not candidate_values:
+        return None
+    baseline_mean = statistics.fmean(baseline_values)
+    candidate_mean = statistics.fmean(candidate_values)
+    delta = candidate_mean - baseline_mean
+    delta_pct = delta / abs(baseline_mean) * 100 if baseline_mean else None
+
+    test, basis = welch_t_test(baseline_values, candidate_values), 'runs'
+    if test is None:
+        baseline_samples = [s for run in baseline if metric in run for s in run[metric].get('samples') or []]
+        candidate_samples = [s for run in candidate if metric in run for s in run[metric].get('samples') or []]
+        test, basis = welch_t_test(baseline_samples, candidate_samples), 'samples'
+    if test is None:
+        basis = None
+    significant = test is not None and test['p_value'] < alpha
+
+    worse_pct = None
+    if delta_pct is not None:
+        worse_pct = -delta_pct if higher_is_better(metric) else delta_pct
+    if worse_pct is None or abs(delta) < absolute_floor(metric) or abs(worse_pct) < threshold_pct:
+        status = 'unchanged'
+    elif test is not None and not significant:
+        status = 'within_noise'
+    elif worse_pct > 0:
+        status = 'regression' if significant else 'possible_regression'
+    else:
+        status = 'improvement' if significant else 'possible_improvement'
+
+    return {
+        'metric': metric,
+        'baseline': round(baseline_mean, 3),
+        'candidate': round(candidate_mean, 3),
+        'delta': round(delta, 3),
+        'delta_pct': round(delta_pct, 2) if delta_pct is not None else None,
+        'baseline_runs': len(baseline_values),
+        'candidate_runs': len(candidate_values),
+        'higher_is_better': higher_is_better(metric),
+        'p_value': round(test['p_value'], 5) if test is not None else None,
+        'test_basis': basis,
+        'significant': significant,
+        'status': status
+    }
+
+
+def plugin_changes(baseline_plugins: Dict[str, Dict[str, Any]],
+                   candidate_runs: List[RunReport]) -> List[Dict[str, Any]]:
+    """Plugins whose version or jars differ between the baseline and the candidate runs"""
+    changes = []
+    candidate_plugins = candidate_runs[-1].plugins()
+    for name in sorted(set(baseline_plugins) | set(candidate_plugins)):
+        before, after = baseline_plugins.get(name), candidate_plugins.get(name)
+        if before is None or after is None:
+            changes.append({'plugin': name, 'change': 'added' if before is None else 'removed',
+                            'version': (after or before).get('version')})
+        elif before.get('fingerprint') != after.get('fingerprint'):
+            jars_before, jars_after = before.get('jars') or {}, after.get('jars') or {}
+            changes.append({
+                'plugin': name,
+                'change': 'version' if before.get('version') != after.get('version') else 'jars',
+                'from_version': before.get('version'),
+                'to_version': after.get('version'),
+                'jars_added': sorted(set(jars_after) - set(jars_before)),
+                'jars_removed': sorted(set(jars_before) - set(jars_after)),
+                'jars_changed': sorted(jar for jar in set(jars_before) & set(jars_after)
+                                       if jars_before[jar] != jars_after[jar])
+            })
+    return changes
+
+
+def connector_changes(baseline_connectors: Dict[str, Dict[str, Any]],
+                      candidate_runs: List[RunReport]) -> Dict[str, Dict[str, Any]]:
+    """Config keys that differ per connector (only possible with --ignore-connectors)"""
+    changes = {}
+    candidate_connectors = candidate_runs[-1].connectors()
+    for name in sorted(set(baseline_connectors) | set(candidate_connectors)):
+        before = (baseline_connectors.get(name) or {}).get('config') or {}
+        after = (candidate_connectors.get(name) or {}).get('config') or {}
+        diff = {key: {'from': before.get(key), 'to': after.get(key)}
+                for key in sorted(set(before) | set(after)) if key != 'name' and before.get(key) != after.get(key)}
+        if diff:
+            changes[name] = diff
+    return changes
+
+
+def compare(baseline: Dict[str, Any], candidate_runs: List[RunReport], threshold_pct: float,
+            alpha: float) -> Dict[str, Any]:
+    """Compare candidate runs against a baseline document"""
+    candidate_metrics = [run.metrics() for run in candidate_runs]
+    names = sorted({name for run in baseline['metrics'] + candidate_metrics for name in run})
+    metrics = [result for result in (compare_metric(name, baseline['metrics'], candidate_metrics, threshold_pct, alpha)
+                                     for name in names) if result is not None]
+    return {
+        'group_key': baseline.get('group_key'),
+        'workload': candidate_runs[-1].describe_workload(),
+        'baseline_runs': [run['report'] for run in baseline['runs']],
+        'candidate_runs': [run.path for run in candidate_runs],
+        'plugin_changes': plugin_changes(baseline.get('plugins') or {}, candidate_runs),
+        'connector_changes': connector_changes(baseline.get('connectors') or {}, candidate_runs),
+        'threshold_pct': threshold_pct,
+        'alpha': alpha,
+        'metrics': metrics,
+        'regressions': [m['metric'] for m in metrics if m['status'] == 'regression'],
+        'possible_regressions': [m['metric'] for m in metrics if m['status'] == 'possible_regression']
+    }
+
+
+STATUS_ICONS = {'regression': '❌', 'possible_regression': '⚠️ ', 'improvement': '✅',
+                'possible_improvement': '➕', 'within_noise': '〰️', 'unchanged': '  '}
+
+
+def print_comparison(comparison: Dict[str, Any], show_all: bool = False):
+    print(f"\n🔬 {comparison['workload']}  [{comparison['group_key']}]")
+    print(f"   baseline: {len(comparison['baseline_runs'])} run(s)  candidate: "
+          f"{', '.join(os.path.basename(path) for path in comparison['candidate_runs'])}")
+    for change in comparison['plugin_changes']:
+        if change['change'] == 'version':
+            print(f"   🔌 {change['plugin']}: {change['from_version']} → {change['to_version']}")
+        elif change['change'] == 'jars':
+            jars = change['jars_added'] + change['jars_removed'] + change['jars_changed']
+            print(f"   🔌 {change['plugin']}: jars changed ({', '.join(jars)})")
+        else:
+            print(f"   🔌 {change['plugin']}: {change['change']} ({change['version']})")
+    for connector, diff in comparison['connector_changes'].items():
+        for key, values in diff.items():
+            print(f"   ⚙️  {connector}.{key}: {values['from']} → {values['to']}")
+
+    print(f"   {'metric':<58} {'baseline':>12} {'candidate':>12} {'delta':>9} {'p':>8}")
+    for metric in comparison['metrics']:
+        if not show_all and metric['status'] == 'unchanged':
+            continue
+        delta = f"{metric['delta_pct']:+.1f}%" if metric['delta_pct'] is not None else 'n/a'
+        p_value = f"{metric['p_value']:.3f}" if metric['p_value'] is not None else '-'
+        basis = '*' if metric['test_basis'] == 'samples' else ' '
+        print(f" {STATUS_ICONS[metric['status']]} {metric['metric']:<58} {metric['baseline']:>12,.2f} "
+              f"{metric['candidate']:>12,.2f} {delta:>9} {p_value:>7}{basis}")
+    if comparison['regressions']:
+        print(f"   ❌ {len(comparison['regressions'])} significant regression(s)")
+    elif comparison['possible_regressions']:
+        print(f"   ⚠️  {len(comparison['possible_regressions'])} possible regression(s); "
+              f"repeat runs to test significance")
+    else:
+        print(f"   ✅ No regressions beyond {comparison['threshold_pct']:g}%")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Compare runs in testing-results/ and detect regressions")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--directory', default=None, help="Results directory (default: results.directory)")
+    parser.add_argument('--ignore-connectors', action='store_true',
+                        help="Group runs by workload only, so connector config changes can be compared")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="Index runs grouped by workload")
+
+    baseline = commands.add_parser('baseline', help="Store the baseline of a workload")
+    baseline.add_argument('reports', nargs='*', help="Reports of the same workload to use as baseline")
+    baseline.add_argument('--workload', help="Workload id (from 'list') when no reports are given")
+    baseline.add_argument('--last', type=int, default=1, help="Use the last N runs of --workload")
+
+    compare_parser = commands.add_parser('compare', help="Compare runs against the stored baselines")
+    compare_parser.add_argument('reports', nargs='*', help="Candidate reports (default: latest runs per workload)")
+    compare_parser.add_argument('--last', type=int, default=1, help="Latest N runs per workload as candidate")
+    compare_parser.add_argument('--against', nargs='+', help="Compare against these reports instead of a baseline")
+    compare_parser.add_argument('--threshold', type=float, default=None,
+                                help="Flag changes larger than this percentage (default: config or 5)")
+    compare_parser.add_argument('--alpha', type=float, default=None,
+                                help="Significance level (default: config or 0.05)")
+    compare_parser.add_argument('--all', action='store_true', help="Also print unchanged metrics")
+    compare_parser.add_argument('--output', help="Write the comparison as JSON to this file")
+    return parser.parse_args()
+
+
+def _resolve_reports(paths: List[str], runs: List[RunReport]) -> List[RunReport]:
+    by_path = {os.path.abspath(run.path): run for run in runs}
+    return [by_path.get(os.path.abspath(path)) or RunReport.load(path) for path in paths]
+
+
+def main() -> int:
+    """Main function"""
+    args = parse_args()
+    try:
+        with open(args.config, 'r') as f:
+            config = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        config = {}
+    results_config = config.get('results') or {}
+    directory = args.directory or results_config.get('directory', 'testing-results')
+
+    runs = index_runs(directory)
+    groups = group_runs(runs, args.ignore_connectors)
+
+    if args.command == 'list':
+        print(f"📂 {len(runs)} run(s) in {directory}, {len(groups)} workload(s)")
+        for group_key, group in groups.items():
+            has_baseline = '📌 baseline' if os.path.exists(baseline_path(directory, group_key)) else ''
+            print(f"\n🔬 [{group_key}] {group[-1].describe_workload()} {has_baseline}")
+            for run in group:
+                plugins = ', '.join(f"{name} {plugin.get('version')}" for name, plugin in run.plugins().items())
+                print(f"   {run.started_at[:19]:<19}  {run.name:<52} {plugins or 'plugins unknown'}")
+        return 0
+
+    if args.command == 'baseline':
+        if args.reports:
+            selected = _resolve_reports(args.reports, runs)
+        elif args.workload:
+            selected = groups.get(args.workload, [])[-args.last:]
+        else:
+            print("❌ Give reports or --workload (see 'list')")
+            return 2
+        if not selected:
+            print(f"❌ No runs found for workload {args.workload}")
+            return 2
+        keys = {run.group_key(args.ignore_connectors) for run in selected}
+        if len(keys) > 1:
+            print(f"❌ Reports belong to different workloads ({', '.join(sorted(keys))})")
+            return 2
+        group_key = keys.pop()
+        path = baseline_path(directory, group_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(create_baseline(selected, group_key), f, indent=2, default=str)
+        print(f"📌 Baseline for {selected[-1].describe_workload()} ({len(selected)} run(s)) saved to: {path}")
+        return 0
+
+    threshold = args.threshold if args.threshold is not None else float(results_config.get('regression_threshold_percent', 5))
+    alpha = args.alpha if args.alpha is not None else float(results_config.get('significance_level', 0.05))
+
+    candidates = group_runs(_resolve_reports(args.reports, runs), args.ignore_connectors) if args.reports else groups
+
+    comparisons = []
+    if args.against:
+        reference = _resolve_reports(args.against, runs)
+        baseline = create_baseline(reference, reference[-1].group_key(args.ignore_connectors))
+        if not args.reports:
+            # Later runs of the reference workload
+            reference_paths = {os.path.abspath(run.path) for run in reference}
+            candidates = {baseline['group_key']: [run for run in groups.get(baseline['group_key'], [])
+                                                  if os.path.abspath(run.path) not in reference_paths]}
+        for group_key, group in candidates.items():
+            if not group:
+                continue
+            if group_key != baseline['group_key']:
+                print(f"⚠️  {group[-1].describe_workload()} is a different workload than the reference runs")
+            comparisons.append(compare(baseline, group[-args.last:], threshold, alpha))
+    else:
+        for group_key, group in candidates.items():
+            baseline = load_baseline(directory, group_key)
+            if baseline is None:
+                if args.reports:
+                    print(f"⚠️  No baseline for {group[-1].describe_workload()} [{group_key}]; "
+                          f"create one with: compare_runs.py baseline --workload {group_key}")
+                continue
+            baseline_reports = {os.path.abspath(run['report']) for run in baseline['runs']}
+            # Without explicit reports, the latest runs that are not part of the baseline
+            if not args.reports:
+                group = [run for run in group if os.path.abspath(run.path) not in baseline_reports]
+            if group:
+                comparisons.append(compare(baseline, group[-args.last:], threshold, alpha))
+
+    if not comparisons:
+        print("ℹ️  Nothing to compare (store a baseline first, or use --against)")
+        return 0
+    for comparison in comparisons:
+        print_comparison(comparison, args.all)
+    if any(m['test_basis'] == 'samples' for comparison in comparisons for m in comparison['metrics']):
+        print("\n* p-value from samples within single runs; repeat runs for run-to-run variance")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(comparisons, f, indent=2, default=str)
+        print(f"\n💾 Comparison saved to: {args.output}")
+
+    # Non-zero exit status lets CI fail on significant regressions
+    return 1 if any(comparison['regressions'] for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,7 +17,6 @@ Date: August 2025
 """
 
 import asyncio
-import asyncpg
 import json
 import time
 import yaml
@@ -31,12 +30,34 @@ from typing import Dict, List, Any, Optional
 import threading
 from collections import defaultdict, deque
 
+from open_loop_load import OpenLoopLoadGenerator, fetch_reference_ids
+from marker_latency import MarkerLatencyTracker
+from arrival_listener import TargetArrivalListener
+from latency_histogram import LatencyHistogram
+from docker_api_stats import DEFAULT_SOCKET_PATH, DockerStatsCollector, docker_api_available
+from cgroup_sampler import DEFAULT_CGROUP_ROOT, CgroupSampler
+from kafka_admin_metrics import DEFAULT_BOOTSTRAP_SERVERS, MAIN_TOPIC, KafkaAdminMetricsCollector, kafka_client_available
+from connect_client import DEFAULT_CONNECT_URL, ConnectRestClient, connect_client_available
+from slot_lag import SLOT_NAME, SlotLagTracker
+from row_counts import RowCounter
+from consumer_lag import SINK_GROUP, ConsumerLagTracker, group_detail_from_records, parse_consumer_group_describe
+from db_pools import DatabasePoolManager
+from log_tailer import LogTailer, analyze_lines
+from results_store import ResultsStore
+from run_metadata import collect_run_metadata, comprehensive_workload
+
+# pg_stat_database counters recorded by the continuous sampler
+SAMPLED_DATABASE_STATS = ('numbackends', 'xact_commit', 'xact_rollback', 'tup_inserted', 'tup_updated',
+                          'blks_read', 'blks_hit')
+
 class CDCPerformanceMonitor:
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize the comprehensive performance monitor"""
         self.config = self._load_config(config_path)
         self.monitoring_active = False
-        self.metrics_history = defaultdict(deque)
+        # Bounded ring buffer of (timestamp, value) samples per metric
+        self.history_size = int((self.config.get('monitoring') or {}).get('history_size', 3600))
+        self.metrics_history = defaultdict(lambda: deque(maxlen=self.history_size))
         self.container_names = [
             "debezium-cdc-mirroring-postgres-1",
             "debezium-cdc-mirroring-kafka-1", 
@@ -44,8 +65,38 @@ class CDCPerformanceMonitor:
             "debezium-cdc-mirroring-target-postgres-1",
             "tutorial-connect-1"
         ]
-        self.kafka_connect_url = "http://localhost:8083"
+        docker_config = self.config.get('docker') or {}
+        self.docker_socket_path = docker_config.get('socket_path', DEFAULT_SOCKET_PATH)
+        self.docker_stats_source = docker_config.get('stats_source', 'api')
+        self.docker_collector = None
+        self.docker_stats_backend = None  # 'api' or 'cli', whichever answered last
+        self.cgroup_sampler = None
+        kafka_config = self.config.get('kafka') or {}
+        self.kafka_bootstrap_servers = kafka_config.get('bootstrap_servers', DEFAULT_BOOTSTRAP_SERVERS)
+        self.kafka_metrics_source = kafka_config.get('metrics_source', 'protocol')
+        self.kafka_collector = None
+        self.consumer_lag = ConsumerLagTracker(kafka_config.get('sink_group', SINK_GROUP), MAIN_TOPIC,
+                                               max_samples=self.history_size)
+        self.kafka_connect_url = (self.config.get('kafka_connect') or {}).get('url', DEFAULT_CONNECT_URL)
+        # Connect REST latency per endpoint, accumulated over the whole run
+        self.connect_api_histograms = defaultdict(LatencyHistogram)
+        self.connect_client = None
+        # 'estimate' (catalog statistics + id watermark) or 'exact' (COUNT(*))
+        self.row_counter = RowCounter((self.config.get('monitoring') or {}).get('row_count_mode', 'estimate'))
+        self.slot_lag = SlotLagTracker((self.config.get('monitoring') or {}).get('replication_slot', SLOT_NAME),
+                                       max_samples=self.history_size)
+        # Upper bound for any single phase collector; a hung one is recorded as a timeout and
+        # its docker/kafka CLI children are killed at the same deadline (run_cli)
+        self.collector_timeout = float((self.config.get('monitoring') or {}).get('collector_timeout_seconds', 30))
+        # Source/target pools shared by every collector, opened on first use and closed at the end of the run
+        self.db_pools = DatabasePoolManager.from_config(self.config)
+        self.log_tailer = None
+        # 'sqlite' streams samples and phases to an append-only store; 'json' writes one file at the end
+        self.results_config = self.config.get('results') or {}
+        self.results_store = None
         self.results = {}
+        self.docker_sample_task = None  # Docker collection of the continuous sampler, while it runs
+        psutil.cpu_percent(interval=None)  # prime the CPU counter for get_system_metrics
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
@@ -76,7 +127,7 @@ class CDCPerformanceMonitor:
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get host system metrics"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)  # since the previous call, no blocking sleep
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             network = psutil.net_io_counters()
@@ -110,16 +161,25 @@ class CDCPerformanceMonitor:
         except Exception as e:
             return {'error': str(e)}
 
+    def run_cli(self, args: List[str], timeout: float, deadline: Optional[float] = None) -> subprocess.CompletedProcess:
+        """subprocess.run bounded by the collector deadline; the child is killed when it passes"""
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+            if timeout <= 0:
+                raise subprocess.TimeoutExpired(args, 0)
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+
     def get_detailed_docker_stats(self) -> Dict[str, Any]:
         """Get comprehensive Docker container statistics"""
         stats = {}
+        deadline = time.monotonic() + self.collector_timeout
         
         try:
             # Get detailed stats for all containers
-            result = subprocess.run(
+            result = self.run_cli(
                 ['docker', 'stats', '--no-stream', '--format', 
                  '{{.Name}};{{.CPUPerc}};{{.MemUsage}};{{.MemPerc}};{{.NetIO}};{{.BlockIO}};{{.PIDs}}'],
-                capture_output=True, text=True, timeout=15
+                timeout=15, deadline=deadline
             )
             
             if result.returncode == 0:
@@ -144,9 +204,9 @@ class CDCPerformanceMonitor:
                 if container in stats:
                     try:
                         # Get container inspect info
-                        inspect_result = subprocess.run(
+                        inspect_result = self.run_cli(
                             ['docker', 'inspect', container],
-                            capture_output=True, text=True, timeout=10
+                            timeout=10, deadline=deadline
                         )
                         if inspect_result.returncode == 0:
                             inspect_data = json.loads(inspect_result.stdout)[0]
@@ -163,8 +223,77 @@ class CDCPerformanceMonitor:
             
         return stats
 
+    async def collect_docker_stats(self, include_info: bool = True) -> Dict[str, Any]:
+        """Docker stats via the Engine API socket, falling back to the docker CLI"""
+        self.open_docker_collector()
+        if self.docker_collector is not None:
+            try:
+                stats = await self.docker_collector.collect(self.container_names, include_info)
+                self.docker_stats_backend = 'api'
+                return stats
+            except Exception as e:
+                print(f"⚠️  Docker API error ({e}), falling back to docker CLI")
+                await self.close_docker_collector()
+                self.docker_stats_source = 'cli'
+        self.docker_stats_backend = 'cli'
+        return await asyncio.to_thread(self.get_detailed_docker_stats)
+
+    def open_docker_collector(self):
+        """Open the Docker API session when stats_source is 'api' and the socket answers"""
+        if self.docker_collector is None and self.docker_stats_source == 'api' \
+                and docker_api_available(self.docker_socket_path):
+            self.docker_collector = DockerStatsCollector(self.docker_socket_path)
+        return self.docker_collector
+
+    async def close_docker_collector(self):
+        """Close the Docker API session if one was opened"""
+        if self.docker_collector is not None:
+            await self.docker_collector.close()
+            self.docker_collector = None
+
+    async def start_cgroup_sampler(self):
+        """Start high-frequency cgroup v2 sampling if monitoring.cgroup_sampling_hz is set"""
+        monitoring = self.config.get('monitoring') or {}
+        hz = float(monitoring.get('cgroup_sampling_hz', 0) or 0)
+        if hz <= 0:
+            return None
+        try:
+            container_ids = None
+            # Runs before the first Docker collection, so the API session is opened here
+            if self.open_docker_collector() is not None:
+                infos = await asyncio.gather(
+                    *(self.docker_collector.container_info(name) for name in self.container_names),
+                    return_exceptions=True
+                )
+                container_ids = {name: info['id'] for name, info in zip(self.container_names, infos)
+                                 if not isinstance(info, Exception)}
+            self.cgroup_sampler = await asyncio.to_thread(
+                CgroupSampler.for_containers, self.container_names,
+                monitoring.get('cgroup_root', DEFAULT_CGROUP_ROOT), container_ids
+            )
+        except Exception as e:
+            print(f"⚠️  cgroup sampling disabled: {e}")
+            return None
+        stop_event = asyncio.Event()
+        task = asyncio.create_task(self.cgroup_sampler.run(stop_event, hz))
+        print(f"📈 cgroup v2 sampling at {hz:g} Hz for {len(self.cgroup_sampler.files)} containers")
+        return stop_event, task
+
+    async def stop_cgroup_sampler(self, handle) -> Optional[Dict[str, Any]]:
+        """Stop the cgroup sampler and return its summary"""
+        if handle is None:
+            return None
+        stop_event, task = handle
+        stop_event.set()
+        await task
+        summary = self.cgroup_sampler.summary()
+        self.cgroup_sampler.close()
+        self.cgroup_sampler = None
+        return summary
+
     def get_kafka_comprehensive_metrics(self) -> Dict[str, Any]:
         """Get comprehensive Kafka metrics"""
+        deadline = time.monotonic() + self.collector_timeout
         try:
             kafka_metrics = {
                 'topics': {},
@@ -174,10 +303,10 @@ class CDCPerformanceMonitor:
             }
             
             # List all topics
-            topics_result = subprocess.run(
+            topics_result = self.run_cli(
                 ['docker', 'exec', 'debezium-cdc-mirroring-kafka-1', 
                  'kafka-topics', '--bootstrap-server', 'localhost:9092', '--list'],
-                capture_output=True, text=True, timeout=15
+                timeout=15, deadline=deadline
             )
             
             if topics_result.returncode == 0:
@@ -189,18 +318,18 @@ class CDCPerformanceMonitor:
                 main_topic = "dbserver1.inventory.orders"
                 if main_topic in topics:
                     # Get topic description
-                    desc_result = subprocess.run(
+                    desc_result = self.run_cli(
                         ['docker', 'exec', 'debezium-cdc-mirroring-kafka-1',
                          'kafka-topics', '--bootstrap-server', 'localhost:9092',
                          '--describe', '--topic', main_topic],
-                        capture_output=True, text=True, timeout=15
+                        timeout=15, deadline=deadline
                     )
                     
                     # Get consumer group info
-                    groups_result = subprocess.run(
+                    groups_result = self.run_cli(
                         ['docker', 'exec', 'debezium-cdc-mirroring-kafka-1',
                          'kafka-consumer-groups', '--bootstrap-server', 'localhost:9092', '--list'],
-                        capture_output=True, text=True, timeout=15
+                        timeout=15, deadline=deadline
                     )
                     
                     kafka_metrics['topics'][main_topic] = {
@@ -216,20 +345,22 @@ class CDCPerformanceMonitor:
                         # Get group details for connect groups
                         for group in groups:
                             if 'connect' in group.lower():
-                                group_detail = subprocess.run(
+                                group_detail = self.run_cli(
                                     ['docker', 'exec', 'debezium-cdc-mirroring-kafka-1',
                                      'kafka-consumer-groups', '--bootstrap-server', 'localhost:9092',
                                      '--describe', '--group', group],
-                                    capture_output=True, text=True, timeout=15
+                                    timeout=15, deadline=deadline
                                 )
                                 if group_detail.returncode == 0:
-                                    kafka_metrics['consumer_groups'][group] = group_detail.stdout
+                                    kafka_metrics['consumer_groups'][group] = group_detail_from_records(
+                                        parse_consumer_group_describe(group_detail.stdout)
+                                    )
             
             # Get broker info
-            broker_result = subprocess.run(
+            broker_result = self.run_cli(
                 ['docker', 'exec', 'debezium-cdc-mirroring-kafka-1',
                  'kafka-broker-api-versions', '--bootstrap-server', 'localhost:9092'],
-                capture_output=True, text=True, timeout=10
+                timeout=10, deadline=deadline
             )
             
             kafka_metrics['broker_info'] = {
@@ -242,6 +373,50 @@ class CDCPerformanceMonitor:
         except Exception as e:
             return {'error': str(e)}
 
+    async def collect_kafka_metrics(self, include_log_dirs: bool = True) -> Dict[str, Any]:
+        """Kafka metrics over the Kafka protocol, falling back to docker exec CLI tools"""
+        if self.kafka_collector is None and self.kafka_metrics_source == 'protocol' and kafka_client_available():
+            self.kafka_collector = KafkaAdminMetricsCollector(self.kafka_bootstrap_servers)
+        if self.kafka_collector is not None:
+            try:
+                return await asyncio.to_thread(self.kafka_collector.collect, include_log_dirs)
+            except Exception as e:
+                print(f"⚠️  Kafka protocol collector error ({e}), falling back to docker exec")
+                self.close_kafka_collector()
+                self.kafka_metrics_source = 'cli'
+        return await asyncio.to_thread(self.get_kafka_comprehensive_metrics)
+
+    def close_kafka_collector(self):
+        """Close the Kafka admin/consumer clients if they were opened"""
+        if self.kafka_collector is not None:
+            try:
+                self.kafka_collector.close()
+            except Exception:
+                pass
+            self.kafka_collector = None
+
+    def _timed_connect_get(self, endpoint: str, path: str):
+        """GET a Connect REST path, recording its latency under endpoint"""
+        request_start = time.perf_counter()
+        try:
+            return requests.get(f"{self.kafka_connect_url}{path}", timeout=10)
+        finally:
+            self.connect_api_histograms[endpoint].record_seconds(time.perf_counter() - request_start)
+
+    async def collect_connect_status(self, include_task_status: bool = True) -> Dict[str, Any]:
+        """Connect status over the pooled async client, falling back to requests"""
+        if self.connect_client is None and connect_client_available():
+            self.connect_client = ConnectRestClient(self.kafka_connect_url, histograms=self.connect_api_histograms)
+        if self.connect_client is not None:
+            return await self.connect_client.cluster_status(include_task_status)
+        return await asyncio.to_thread(self.get_kafka_connect_status)
+
+    async def close_connect_client(self):
+        """Close the Connect REST session if one was opened"""
+        if self.connect_client is not None:
+            await self.connect_client.close()
+            self.connect_client = None
+
     def get_kafka_connect_status(self) -> Dict[str, Any]:
         """Get Kafka Connect cluster and connector status"""
         try:
@@ -253,7 +428,7 @@ class CDCPerformanceMonitor:
             
             # Get cluster info
             try:
-                cluster_response = requests.get(f"{self.kafka_connect_url}/", timeout=10)
+                cluster_response = self._timed_connect_get('/', '/')
                 if cluster_response.status_code == 200:
                     connect_status['cluster'] = cluster_response.json()
                     connect_status['cluster']['accessible'] = True
@@ -266,7 +441,7 @@ class CDCPerformanceMonitor:
             
             # Get connectors list
             try:
-                connectors_response = requests.get(f"{self.kafka_connect_url}/connectors", timeout=10)
+                connectors_response = self._timed_connect_get('/connectors', '/connectors')
                 if connectors_response.status_code == 200:
                     connectors_list = connectors_response.json()
                     connect_status['connectors']['list'] = connectors_list
@@ -275,9 +450,8 @@ class CDCPerformanceMonitor:
                     # Get detailed status for each connector
                     for connector_name in connectors_list:
                         try:
-                            status_response = requests.get(
-                                f"{self.kafka_connect_url}/connectors/{connector_name}/status", 
-                                timeout=10
+                            status_response = self._timed_connect_get(
+                                '/connectors/{name}/status', f"/connectors/{connector_name}/status"
                             )
                             if status_response.status_code == 200:
                                 connect_status['connectors'][connector_name] = status_response.json()
@@ -286,127 +460,198 @@ class CDCPerformanceMonitor:
             except Exception as e:
                 connect_status['connectors']['error'] = str(e)
             
+            connect_status['api_latency'] = {
+                endpoint: histogram.summary() for endpoint, histogram in self.connect_api_histograms.items()
+            }
             return connect_status
             
         except Exception as e:
             return {'error': str(e)}
 
     async def get_database_comprehensive_metrics(self, db_config: Dict[str, Any], db_name: str) -> Dict[str, Any]:
-        """Get comprehensive database metrics"""
+        """Get comprehensive database metrics (db_config is kept for callers; the pool holds the settings)"""
         try:
-            conn = await asyncpg.connect(
-                host=db_config['host'],
-                port=db_config['port'],
-                user=db_config['user'],
-                password=db_config['password'],
-                database=db_config['database']
-            )
+            async with self.db_pools.acquire(db_name) as conn:
+                return await self._database_metrics(conn, db_name)
+        except Exception as e:
+            print(f"❌ Database connection error ({db_name}): {e}")
+            return {'error': str(e), 'connection': {'status': 'failed'}}
+
+    async def _database_metrics(self, conn, db_name: str) -> Dict[str, Any]:
+        """Table, replication and performance metrics on a pooled connection"""
+        metrics = {
+            'connection': {'status': 'connected'},
+            'tables': {},
+            'performance': {},
+            'replication': {},
+            'error': None
+        }
+        
+        # Table metrics
+        if db_name == "source":
+            # Source database queries
+            table_counts = await self.row_counter.count_tables(conn, {
+                'orders': 'inventory.orders',
+                'customers': 'inventory.customers',
+                'products': 'inventory.products'
+            })
+            metrics['tables'] = {name: count['rows'] for name, count in table_counts.items()}
+            metrics['table_counts'] = table_counts
             
-            metrics = {
-                'connection': {'status': 'connected'},
-                'tables': {},
-                'performance': {},
-                'replication': {},
-                'error': None
-            }
+            # Replication slot info
+            try:
+                replication_slots = await conn.fetch_monitoring('replication_slots')
+                metrics['replication']['slots'] = [dict(row) for row in replication_slots]
+            except Exception as e:
+                metrics['replication']['slots_error'] = str(e)
             
-            # Table metrics
-            if db_name == "source":
-                # Source database queries
-                orders_count = await conn.fetchval("SELECT COUNT(*) FROM inventory.orders")
-                customers_count = await conn.fetchval("SELECT COUNT(*) FROM inventory.customers")
-                products_count = await conn.fetchval("SELECT COUNT(*) FROM inventory.products")
-                
-                metrics['tables'] = {
-                    'orders': orders_count,
-                    'customers': customers_count,
-                    'products': products_count
+            # Debezium slot lag in bytes (also feeds the slot lag time series)
+            slot_sample = await self.slot_lag.sample(conn)
+            if slot_sample:
+                metrics['replication']['slot_lag'] = {
+                    key: slot_sample[key] for key in
+                    ('slot_name', 'active', 'confirmed_lag_bytes', 'retained_wal_bytes', 'wal_status')
                 }
+            
+            # WAL status
+            try:
+                wal_status = await conn.fetchrow_monitoring('wal_status')
+                metrics['replication']['wal'] = dict(wal_status) if wal_status else {}
+            except Exception as e:
+                metrics['replication']['wal_error'] = str(e)
                 
-                # Replication slot info
-                try:
-                    replication_slots = await conn.fetch("""
-                        SELECT slot_name, plugin, slot_type, database, active, 
-                               restart_lsn, confirmed_flush_lsn 
-                        FROM pg_replication_slots
-                    """)
-                    metrics['replication']['slots'] = [dict(row) for row in replication_slots]
-                except Exception as e:
-                    metrics['replication']['slots_error'] = str(e)
-                
-                # WAL status
-                try:
-                    wal_status = await conn.fetchrow("""
-                        SELECT pg_current_wal_lsn() as current_lsn,
-                               pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0') as wal_bytes
-                    """)
-                    metrics['replication']['wal'] = dict(wal_status) if wal_status else {}
-                except Exception as e:
-                    metrics['replication']['wal_error'] = str(e)
-                    
-            else:
-                # Target database queries  
+        else:
+            # Target database queries  
+            try:
+                orders_count = await self.row_counter.count(conn, 'orders')
+                metrics['tables']['orders'] = orders_count['rows']
+                metrics['table_counts'] = {'orders': orders_count}
+            except Exception as e:
+                # Try with schema prefix if table not found
                 try:
-                    orders_count = await conn.fetchval("SELECT COUNT(*) FROM orders")
-                    metrics['tables']['orders'] = orders_count
-                except Exception as e:
-                    # Try with schema prefix if table not found
-                    try:
-                        orders_count = await conn.fetchval("SELECT COUNT(*) FROM public.orders")
-                        metrics['tables']['orders'] = orders_count
-                    except Exception as e2:
-                        metrics['tables']['orders_error'] = f"{str(e)} | {str(e2)}"
+                    orders_count = await self.row_counter.count(conn, 'public.orders')
+                    metrics['tables']['orders'] = orders_count['rows']
+                    metrics['table_counts'] = {'orders': orders_count}
+                except Exception as e2:
+                    metrics['tables']['orders_error'] = f"{str(e)} | {str(e2)}"
+        
+        # Performance metrics
+        try:
+            db_stats = await conn.fetchrow_monitoring('database_stats')
             
-            # Performance metrics
-            try:
-                db_stats = await conn.fetchrow("""
-                    SELECT datname, numbackends, xact_commit, xact_rollback,
-                           blks_read, blks_hit, tup_returned, tup_fetched,
-                           tup_inserted, tup_updated, tup_deleted
-                    FROM pg_stat_database 
-                    WHERE datname = current_database()
-                """)
+            if db_stats:
+                metrics['performance']['database_stats'] = dict(db_stats)
                 
-                if db_stats:
-                    metrics['performance']['database_stats'] = dict(db_stats)
+                # Calculate cache hit ratio
+                total_reads = db_stats['blks_read'] + db_stats['blks_hit']
+                if total_reads > 0:
+                    cache_hit_ratio = (db_stats['blks_hit'] / total_reads) * 100
+                    metrics['performance']['cache_hit_ratio'] = round(cache_hit_ratio, 2)
                     
-                    # Calculate cache hit ratio
-                    total_reads = db_stats['blks_read'] + db_stats['blks_hit']
-                    if total_reads > 0:
-                        cache_hit_ratio = (db_stats['blks_hit'] / total_reads) * 100
-                        metrics['performance']['cache_hit_ratio'] = round(cache_hit_ratio, 2)
-                        
-            except Exception as e:
-                metrics['performance']['stats_error'] = str(e)
+        except Exception as e:
+            metrics['performance']['stats_error'] = str(e)
+        
+        # Connection info
+        try:
+            connections = await conn.fetch_monitoring('connections_by_state')
+            metrics['performance']['connections'] = {row['state']: row['count'] for row in connections}
+        except Exception as e:
+            metrics['performance']['connections_error'] = str(e)
+        
+        # Database size
+        try:
+            db_size = await conn.fetchval_monitoring('database_size')
+            metrics['performance']['database_size'] = db_size
+        except Exception as e:
+            metrics['performance']['size_error'] = str(e)
             
-            # Connection info
-            try:
-                connections = await conn.fetch("""
-                    SELECT state, count(*) as count 
-                    FROM pg_stat_activity 
-                    WHERE datname = current_database()
-                    GROUP BY state
-                """)
-                metrics['performance']['connections'] = {row['state']: row['count'] for row in connections}
-            except Exception as e:
-                metrics['performance']['connections_error'] = str(e)
+        return metrics
+
+    async def acquire_source_and_target(self):
+        """One pooled connection from each database; give both back with db_pools.release()"""
+        source_conn = await self.db_pools.acquire_connection('source')
+        try:
+            target_conn = await self.db_pools.acquire_connection('target')
+        except Exception:
+            await self.db_pools.release('source', source_conn)
+            raise
+        return source_conn, target_conn
+
+    async def measure_marker_latency(self) -> Dict[str, Any]:
+        """Measure per-row CDC latency with marker rows looked up by primary key"""
+        monitoring = self.config.get('monitoring') or {}
+        duration = float(monitoring.get('marker_duration_seconds', 10))
+        rate = float(monitoring.get('marker_rate_per_second', 20))
+        try:
+            source_conn, target_conn = await self.acquire_source_and_target()
             
-            # Database size
+            arrival_listener = None
             try:
-                db_size = await conn.fetchval("SELECT pg_size_pretty(pg_database_size(current_database()))")
-                metrics['performance']['database_size'] = db_size
-            except Exception as e:
-                metrics['performance']['size_error'] = str(e)
+                if monitoring.get('arrival_detection', 'poll') == 'notify':
+                    # Push-based detection: pg_notify trigger instead of polling the target
+                    try:
+                        arrival_listener = TargetArrivalListener(target_conn)
+                        await arrival_listener.start()
+                    except Exception as e:
+                        print(f"      ⚠️  Arrival notifications unavailable, polling instead: {e}")
+                        arrival_listener = None
                 
-            await conn.close()
-            return metrics
+                reference_ids = await fetch_reference_ids(source_conn, limit=1)
+                tracker = MarkerLatencyTracker(
+                    source_conn, target_conn,
+                    reference_ids['customer_ids'][0], reference_ids['product_ids'][0],
+                    arrival_listener=arrival_listener
+                )
+                
+                stop_event = asyncio.Event()
+                asyncio.get_running_loop().call_later(duration, stop_event.set)
+                latency_results = await tracker.measure(
+                    stop_event, rate_per_second=rate,
+                    drain_timeout=float(monitoring.get('marker_drain_timeout_seconds', 30))
+                )
+            finally:
+                if arrival_listener is not None:
+                    try:
+                        await arrival_listener.stop()
+                    except Exception as e:
+                        print(f"      ⚠️  Could not remove arrival trigger: {e}")
+                await self.db_pools.release('source', source_conn)
+                await self.db_pools.release('target', target_conn)
+            
+            latency_results['test_start'] = latency_results['measurements'][0]['insert_timestamp'] \
+                if latency_results['measurements'] else datetime.now().isoformat()
+            
+            # Keep the legacy statistics block: cdc latency is commit -> Kafka when _synced_at exists
+            cdc_key = 'kafka_latency' if latency_results['kafka_latency'].get('count') else 'apply_latency'
+            total = latency_results['total_latency']
+            cdc = latency_results[cdc_key]
+            for number, measurement in enumerate(latency_results['measurements'], 1):
+                measurement['test_number'] = number
+                measurement['cdc_latency_ms'] = measurement.get(f'{cdc_key}_ms', 0)
+            if total.get('count'):
+                latency_results['statistics'] = {
+                    'successful_tests': latency_results['markers_arrived'],
+                    'failed_tests': latency_results['markers_missing'],
+                    'avg_total_latency_ms': total['avg_ms'],
+                    'min_total_latency_ms': total['min_ms'],
+                    'max_total_latency_ms': total['max_ms'],
+                    'avg_cdc_latency_ms': cdc.get('avg_ms', 0),
+                    'min_cdc_latency_ms': cdc.get('min_ms', 0),
+                    'max_cdc_latency_ms': cdc.get('max_ms', 0),
+                    'cdc_latency_source': cdc_key,
+                    'total_latency_percentiles': total,
+                    'cdc_latency_percentiles': cdc
+                }
+            return latency_results
             
         except Exception as e:
-            print(f"❌ Database connection error ({db_name}): {e}")
-            return {'error': str(e), 'connection': {'status': 'failed'}}
+            return {'error': str(e)}
 
     async def measure_end_to_end_latency(self) -> Dict[str, Any]:
         """Measure end-to-end CDC latency"""
+        if (self.config.get('monitoring') or {}).get('latency_mode', 'marker') == 'marker':
+            return await self.measure_marker_latency()
+            
         try:
             latency_results = {
                 'test_start': datetime.now().isoformat(),
@@ -414,88 +659,85 @@ class CDCPerformanceMonitor:
             }
             
             # Get initial counts
-            source_conn = await asyncpg.connect(
-                host=self.config['database']['host'],
-                port=self.config['database']['port'],
-                user=self.config['database']['user'],
-                password=self.config['database']['password'],
-                database=self.config['database']['database']
-            )
-            
-            target_conn = await asyncpg.connect(
-                host=self.config['target_database']['host'],
-                port=self.config['target_database']['port'],
-                user=self.config['target_database']['user'],
-                password=self.config['target_database']['password'],
-                database=self.config['target_database']['database']
-            )
-            
-            initial_source = await source_conn.fetchval("SELECT COUNT(*) FROM inventory.orders")
-            initial_target = await target_conn.fetchval("SELECT COUNT(*) FROM orders")
+            source_conn, target_conn = await self.acquire_source_and_target()
+            try:
+                exact_counts = self.row_counter.mode == 'exact'
+                if exact_counts:
+                    initial_target = await target_conn.fetchval("SELECT COUNT(*) FROM orders")
             
-            # Perform test inserts and measure latency
-            for i in range(5):
-                insert_start = time.time()
+                # Perform test inserts and measure latency
+                for i in range(5):
+                    insert_start = time.time()
                 
-                # Insert a test record
-                customers = await source_conn.fetch("SELECT id FROM inventory.customers LIMIT 10")
-                products = await source_conn.fetch("SELECT id FROM inventory.products LIMIT 10")
+                    # Insert a test record
+                    customers = await source_conn.fetch("SELECT id FROM inventory.customers LIMIT 10")
+                    products = await source_conn.fetch("SELECT id FROM inventory.products LIMIT 10")
                 
-                if customers and products:
-                    customer_id = customers[0]['id']
-                    product_id = products[0]['id']
+                    if customers and products:
+                        customer_id = customers[0]['id']
+                        product_id = products[0]['id']
                     
-                    await source_conn.execute("""
-                        INSERT INTO inventory.orders (order_date, purchaser, quantity, product_id)
-                        VALUES ($1, $2, $3, $4)
-                    """, datetime.now().date(), customer_id, 1, product_id)
+                        inserted_id = await source_conn.fetchval("""
+                            INSERT INTO inventory.orders (order_date, purchaser, quantity, product_id)
+                            VALUES ($1, $2, $3, $4)
+                            RETURNING id
+                        """, datetime.now().date(), customer_id, 1, product_id)
                     
-                    insert_time = time.time()
+                        insert_time = time.time()
                     
-                    # Wait for CDC to propagate (max 30 seconds)
-                    propagated = False
-                    timeout = 30
-                    start_wait = time.time()
+                        # Wait for CDC to propagate (max 30 seconds)
+                        propagated = False
+                        timeout = 30
+                        start_wait = time.time()
                     
-                    while time.time() - start_wait < timeout:
-                        current_target = await target_conn.fetchval("SELECT COUNT(*) FROM orders")
-                        if current_target > initial_target + i:
-                            propagated = True
-                            propagation_time = time.time()
-                            break
-                        await asyncio.sleep(0.5)
+                        while time.time() - start_wait < timeout:
+                            if exact_counts:
+                                current_target = await target_conn.fetchval("SELECT COUNT(*) FROM orders")
+                                arrived = current_target > initial_target + i
+                            else:
+                                # Primary-key watermark: an index lookup instead of a full scan
+                                arrived = (await self.row_counter.max_id(target_conn, 'orders') or 0) >= inserted_id
+                            if arrived:
+                                propagated = True
+                                propagation_time = time.time()
+                                break
+                            await asyncio.sleep(0.5)
                     
-                    if propagated:
-                        total_latency = propagation_time - insert_start
-                        cdc_latency = propagation_time - insert_time
+                        if propagated:
+                            total_latency = propagation_time - insert_start
+                            cdc_latency = propagation_time - insert_time
                         
-                        latency_results['measurements'].append({
-                            'test_number': i + 1,
-                            'insert_timestamp': datetime.fromtimestamp(insert_start).isoformat(),
-                            'propagation_timestamp': datetime.fromtimestamp(propagation_time).isoformat(),
-                            'total_latency_ms': round(total_latency * 1000, 2),
-                            'cdc_latency_ms': round(cdc_latency * 1000, 2),
-                            'status': 'success'
-                        })
-                    else:
-                        latency_results['measurements'].append({
-                            'test_number': i + 1,
-                            'insert_timestamp': datetime.fromtimestamp(insert_start).isoformat(),
-                            'status': 'timeout',
-                            'timeout_seconds': timeout
-                        })
+                            latency_results['measurements'].append({
+                                'test_number': i + 1,
+                                'insert_timestamp': datetime.fromtimestamp(insert_start).isoformat(),
+                                'propagation_timestamp': datetime.fromtimestamp(propagation_time).isoformat(),
+                                'total_latency_ms': round(total_latency * 1000, 2),
+                                'cdc_latency_ms': round(cdc_latency * 1000, 2),
+                                'status': 'success'
+                            })
+                        else:
+                            latency_results['measurements'].append({
+                                'test_number': i + 1,
+                                'insert_timestamp': datetime.fromtimestamp(insert_start).isoformat(),
+                                'status': 'timeout',
+                                'timeout_seconds': timeout
+                            })
                 
-                # Wait between tests
-                await asyncio.sleep(2)
-            
-            await source_conn.close()
-            await target_conn.close()
+                    # Wait between tests
+                    await asyncio.sleep(2)
+            finally:
+                await self.db_pools.release('source', source_conn)
+                await self.db_pools.release('target', target_conn)
             
             # Calculate statistics
             successful_measurements = [m for m in latency_results['measurements'] if m['status'] == 'success']
             if successful_measurements:
                 latencies = [m['total_latency_ms'] for m in successful_measurements]
                 cdc_latencies = [m['cdc_latency_ms'] for m in successful_measurements]
+                total_histogram = LatencyHistogram()
+                total_histogram.record_many(latencies)
+                cdc_histogram = LatencyHistogram()
+                cdc_histogram.record_many(cdc_latencies)
                 
                 latency_results['statistics'] = {
                     'successful_tests': len(successful_measurements),
@@ -505,7 +747,13 @@ class CDCPerformanceMonitor:
                     'max_total_latency_ms': round(max(latencies), 2),
                     'avg_cdc_latency_ms': round(sum(cdc_latencies) / len(cdc_latencies), 2),
                     'min_cdc_latency_ms': round(min(cdc_latencies), 2),
-                    'max_cdc_latency_ms': round(max(cdc_latencies), 2)
+                    'max_cdc_latency_ms': round(max(cdc_latencies), 2),
+                    'total_latency_percentiles': total_histogram.summary(),
+                    'cdc_latency_percentiles': cdc_histogram.summary()
+                }
+                latency_results['histograms'] = {
+                    'total_latency': total_histogram.to_dict(),
+                    'cdc_latency': cdc_histogram.to_dict()
                 }
             
             return latency_results
@@ -513,6 +761,33 @@ class CDCPerformanceMonitor:
         except Exception as e:
             return {'error': str(e)}
 
+    async def start_log_tailer(self):
+        """Follow container logs for the whole run unless monitoring.enable_docker_logs is false"""
+        monitoring = self.config.get('monitoring') or {}
+        if not monitoring.get('enable_docker_logs', True):
+            return
+        self.log_tailer = LogTailer(
+            self.container_names,
+            interval_seconds=float(monitoring.get('log_interval_seconds', 10)),
+            backlog_lines=int(monitoring.get('log_backlog_lines', 100))
+        )
+        await self.log_tailer.start()
+
+    async def stop_log_tailer(self) -> Optional[Dict[str, Any]]:
+        """Stop following logs and return per-interval event counts"""
+        if self.log_tailer is None:
+            return None
+        await self.log_tailer.stop()
+        summary = self.log_tailer.summary()
+        self.log_tailer = None
+        return summary
+
+    async def collect_logs_analysis(self) -> Dict[str, Any]:
+        """Log counts since the previous phase from the tailer, or a one-shot read without it"""
+        if self.log_tailer is not None:
+            return self.log_tailer.snapshot()
+        return await asyncio.to_thread(self.get_docker_logs_analysis)
+
     def get_docker_logs_analysis(self) -> Dict[str, Any]:
         """Analyze Docker logs for errors and patterns"""
         logs_analysis = {
@@ -520,32 +795,20 @@ class CDCPerformanceMonitor:
             'error_summary': {},
             'timestamp': datetime.now().isoformat()
         }
+        deadline = time.monotonic() + self.collector_timeout
         
         for container in self.container_names:
             try:
                 # Get recent logs
-                result = subprocess.run(
+                result = self.run_cli(
                     ['docker', 'logs', '--tail', '100', '--since', '10m', container],
-                    capture_output=True, text=True, timeout=15
+                    timeout=15, deadline=deadline
                 )
                 
                 if result.returncode == 0:
                     logs = result.stdout + result.stderr
-                    lines = logs.split('\n')
-                    
-                    # Analyze logs
-                    error_count = sum(1 for line in lines if 'ERROR' in line.upper())
-                    warn_count = sum(1 for line in lines if 'WARN' in line.upper())
-                    info_count = sum(1 for line in lines if 'INFO' in line.upper())
-                    
-                    logs_analysis['containers'][container] = {
-                        'total_lines': len(lines),
-                        'error_count': error_count,
-                        'warning_count': warn_count,
-                        'info_count': info_count,
-                        'recent_errors': [line for line in lines if 'ERROR' in line.upper()][-5:],
-                        'recent_warnings': [line for line in lines if 'WARN' in line.upper()][-5:]
-                    }
+                    # Level tokens and CDC event patterns, as in the streaming tailer
+                    logs_analysis['containers'][container] = analyze_lines(container, logs.split('\n'))
                 else:
                     logs_analysis['containers'][container] = {'error': 'Could not retrieve logs'}
                     
@@ -575,18 +838,168 @@ class CDCPerformanceMonitor:
         
         return logs_analysis
 
-    async def run_comprehensive_monitoring(self, duration_minutes: int = 5):
+    def _parse_percent(self, value: Any) -> Optional[float]:
+        """Parse docker-style '12.34%' strings (or plain numbers) into floats"""
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return float(str(value).strip().rstrip('%'))
+        except (TypeError, ValueError):
+            return None
+
+    def record_metric(self, name: str, value: Any, timestamp: float):
+        """Append one numeric sample to the metric's ring buffer"""
+        if value is None or isinstance(value, bool):
+            return
+        if isinstance(value, (int, float)):
+            self.metrics_history[name].append((timestamp, value))
+            if self.results_store is not None:
+                self.results_store.record(name, timestamp, value)
+
+    async def _sample_database(self, db_name: str, timestamp: float):
+        """Sample cheap pg_stat_database counters on a pooled connection"""
+        async with self.db_pools.acquire(db_name) as conn:
+            stats = await conn.fetchrow_monitoring('database_stats')
+            if stats:
+                for key in SAMPLED_DATABASE_STATS:
+                    self.record_metric(f'db.{db_name}.{key}', stats[key], timestamp)
+            if db_name == 'source':
+                slot_sample = await self.slot_lag.sample(conn, timestamp)
+                if slot_sample:
+                    self.record_metric('slot.confirmed_lag_bytes', slot_sample['confirmed_lag_bytes'], timestamp)
+                    self.record_metric('slot.retained_wal_bytes', slot_sample['retained_wal_bytes'], timestamp)
+
+    async def sample_once(self, db_names: List[str] = ('source', 'target')) -> float:
+        """Collect one sample of system, Docker, database and Connect metrics"""
+        timestamp = time.time()
+        
+        # System metrics (non-blocking: CPU since the previous sample)
+        memory = psutil.virtual_memory()
+        network = psutil.net_io_counters()
+        self.record_metric('system.cpu_percent', psutil.cpu_percent(interval=None), timestamp)
+        self.record_metric('system.memory_percent', memory.percent, timestamp)
+        self.record_metric('system.net_bytes_sent', network.bytes_sent, timestamp)
+        self.record_metric('system.net_bytes_recv', network.bytes_recv, timestamp)
+        
+        async def sample_docker():
+            # docker stats --no-stream can outlast the tick; never start a second one next to it
+            if self.docker_sample_task is not None and not self.docker_sample_task.done():
+                self.metrics_history['sampler.errors'].append((timestamp, 'docker sample still running, skipped'))
+                return
+            self.docker_sample_task = asyncio.create_task(self.collect_docker_stats(include_info=False))
+            # Retrieve the outcome even when the tick timed out and nobody awaits the task any more
+            self.docker_sample_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            docker_stats = await asyncio.shield(self.docker_sample_task)
+            for container, stats in docker_stats.items():
+                # Numeric fields come from the Engine API; the CLI only gives strings
+                self.record_metric(f'docker.{container}.cpu_percent',
+                                   stats.get('cpu_pct', self._parse_percent(stats.get('cpu_percent'))), timestamp)
+                self.record_metric(f'docker.{container}.memory_percent',
+                                   stats.get('memory_pct', self._parse_percent(stats.get('memory_percent'))), timestamp)
+                self.record_metric(f'docker.{container}.net_rx_bytes', stats.get('net_rx_bytes'), timestamp)
+                self.record_metric(f'docker.{container}.blkio_write_bytes', stats.get('blkio_write_bytes'), timestamp)
+        
+        async def sample_connect():
+            connect_status = await self.collect_connect_status(include_task_status=False)
+            connectors = connect_status.get('connectors', {})
+            running = failed_tasks = 0
+            for name in connectors.get('list', []):
+                status = connectors.get(name, {})
+                if status.get('connector', {}).get('state') == 'RUNNING':
+                    running += 1
+                failed_tasks += sum(1 for task in status.get('tasks', []) if task.get('state') == 'FAILED')
+            self.record_metric('connect.connectors_running', running, timestamp)
+            self.record_metric('connect.tasks_failed', failed_tasks, timestamp)
+        
+        async def sample_kafka():
+            if self.kafka_metrics_source != 'protocol' or not kafka_client_available():
+                return  # docker exec is far too expensive to run every interval
+            kafka_metrics = await self.collect_kafka_metrics(include_log_dirs=False)
+            main_topic = kafka_metrics.get('topics', {}).get(MAIN_TOPIC, {})
+            self.record_metric('kafka.main_topic.end_offset_total', main_topic.get('end_offset_total'), timestamp)
+            for group, detail in kafka_metrics.get('consumer_groups', {}).items():
+                if isinstance(detail, dict):
+                    self.record_metric(f'kafka.{group}.total_lag', detail.get('total_lag'), timestamp)
+            self.consumer_lag.add_native_metrics(kafka_metrics, timestamp)
+        
+        collectors = [sample_docker(), sample_connect(), sample_kafka()]
+        collectors += [self._sample_database(name, timestamp) for name in db_names]
+        results = await asyncio.gather(*collectors, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.metrics_history['sampler.errors'].append((timestamp, str(result)))
+        
+        sample_seconds = time.time() - timestamp
+        self.record_metric('sampler.duration_ms', round(sample_seconds * 1000, 2), timestamp)
+        return sample_seconds
+
+    async def run_continuous_sampler(self, duration_seconds: float, interval_seconds: float):
+        """Sample every interval_seconds for the whole monitoring duration"""
+        db_names = []
+        for db_name in ('source', 'target'):
+            try:
+                await self.db_pools.pool(db_name)
+                db_names.append(db_name)
+            except Exception as e:
+                print(f"  ⚠️  Sampler cannot reach {db_name} database: {e}")
+        
+        psutil.cpu_percent(interval=None)  # prime the CPU counter
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tick = 0
+        while loop.time() - start < duration_seconds:
+            try:
+                await asyncio.wait_for(self.sample_once(db_names), timeout=max(interval_seconds, 1) * 2)
+            except asyncio.TimeoutError:
+                self.metrics_history['sampler.errors'].append((time.time(), 'sample timeout'))
+            tick += 1
+            # Fixed schedule: a slow sample shortens the next sleep instead of drifting
+            next_tick = start + tick * interval_seconds
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(min(delay, max(duration_seconds - (loop.time() - start), 0)))
+
+    def export_time_series(self) -> Dict[str, Any]:
+        """Columnar time series of every sampled metric"""
+        return {
+            name: {
+                'timestamps': [round(ts, 3) for ts, _ in samples],
+                'values': [value for _, value in samples]
+            }
+            for name, samples in sorted(self.metrics_history.items())
+        }
+
+    async def run_comprehensive_monitoring(self, duration_minutes: int = 5,
+                                           sampling_interval: Optional[float] = None):
         """Run comprehensive performance monitoring with 3-phase data collection"""
+        if sampling_interval is None:
+            sampling_interval = float((self.config.get('monitoring') or {}).get('sampling_interval_seconds', 5))
         print(f"🎯 CDC Comprehensive Performance Monitoring")
         print("=" * 50)
         print(f"⏱️  Duration: {duration_minutes} minutes")
+        if sampling_interval > 0:
+            print(f"📈 Continuous sampling every {sampling_interval:g}s")
         print(f"🚀 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         start_time = time.time()
+        self.open_results_store()
+        run_metadata = await self.capture_run_metadata(
+            comprehensive_workload(duration_minutes, self.config.get('test_settings') or {})
+        )
+        
+        # Continuous time-series sampling runs for the whole duration, alongside the phases
+        sampler_task = None
+        if sampling_interval > 0:
+            sampler_task = asyncio.create_task(
+                self.run_continuous_sampler(duration_minutes * 60, sampling_interval)
+            )
+        cgroup_handle = await self.start_cgroup_sampler()
+        await self.start_log_tailer()
         
         # Phase 1: IDLE - Collect baseline metrics
         print(f"\n📸 PHASE 1: IDLE STATE - Baseline Metrics")
         idle_phase = await self.collect_phase_metrics("idle")
+        self.store_phase(idle_phase)
         
         # Wait between phases
         await asyncio.sleep(2)
@@ -598,24 +1011,22 @@ class CDCPerformanceMonitor:
         processing_start = time.time()
         
         async def simulate_load_and_monitor():
+            # Open-loop insert load at a fixed rate, if configured
+            test_settings = self.config.get('test_settings') or {}
+            if test_settings.get('open_loop_rate'):
+                return await self.run_open_loop_phase(test_settings)
+                
             # Do some database activity to create load
             try:
-                source_conn = await asyncpg.connect(
-                    host=self.config['database']['host'],
-                    port=self.config['database']['port'],
-                    user=self.config['database']['user'],
-                    password=self.config['database']['password'],
-                    database=self.config['database']['database']
-                )
-                
-                # Generate some load with queries
-                for i in range(10):
-                    await source_conn.fetchval("SELECT COUNT(*) FROM inventory.orders")
-                    await source_conn.fetchval("SELECT COUNT(*) FROM inventory.customers") 
-                    await source_conn.fetchval("SELECT COUNT(*) FROM inventory.products")
-                    await asyncio.sleep(0.1)
-                    
-                await source_conn.close()
+                async with self.db_pools.acquire('source') as source_conn:
+                    # Generate some load with queries (cheap estimates unless row_count_mode is exact)
+                    for i in range(10):
+                        await self.row_counter.count_tables(source_conn, {
+                            'orders': 'inventory.orders',
+                            'customers': 'inventory.customers',
+                            'products': 'inventory.products'
+                        })
+                        await asyncio.sleep(0.1)
             except Exception as e:
                 print(f"  ⚠️  Load simulation error: {e}")
             
@@ -624,6 +1035,7 @@ class CDCPerformanceMonitor:
             return await self.collect_phase_metrics("processing")
         
         processing_phase = await simulate_load_and_monitor()
+        self.store_phase(processing_phase)
         processing_time = time.time() - processing_start
         
         # Wait for system to settle
@@ -633,6 +1045,16 @@ class CDCPerformanceMonitor:
         # Phase 3: FINAL - Collect final state metrics
         print(f"\n� PHASE 3: FINAL STATE - Post-Load")
         final_phase = await self.collect_phase_metrics("final")
+        self.store_phase(final_phase)
+        
+        # Keep sampling until the requested duration has elapsed
+        if sampler_task is not None:
+            remaining = duration_minutes * 60 - (time.time() - start_time)
+            if remaining > 0:
+                print(f"\n📈 Continuous sampling for another {remaining:.0f}s...")
+            await sampler_task
+        cgroup_summary = await self.stop_cgroup_sampler(cgroup_handle)
+        log_events = await self.stop_log_tailer()
         
         # Compile comprehensive results
         monitoring_time = time.time() - start_time
@@ -641,17 +1063,39 @@ class CDCPerformanceMonitor:
             'monitoring_info': {
                 'start_time': datetime.now().isoformat(),
                 'duration_minutes': duration_minutes,
+                'sampling_interval_seconds': sampling_interval,
+                'history_size': self.history_size,
+                'docker_stats_backend': self.docker_stats_backend,
                 'total_monitoring_time_seconds': round(monitoring_time, 2),
                 'processing_time_seconds': round(processing_time, 2)
             },
+            'run_metadata': run_metadata,
             'phase_data': {
                 'idle': idle_phase,
                 'processing': processing_phase,
                 'final': final_phase
             },
-            'comparison': self.compare_phases(idle_phase, processing_phase, final_phase)
+            'comparison': self.compare_phases(idle_phase, processing_phase, final_phase),
+            'histograms': {
+                'connect_api': {
+                    endpoint: histogram.to_dict() for endpoint, histogram in self.connect_api_histograms.items()
+                },
+                'cdc_propagation': processing_phase.get('latency_analysis', {}).get('histograms', {}),
+                'insert_latency': processing_phase.get('open_loop_load', {}).get('histograms', {})
+            },
+            'time_series': self.export_time_series(),
+            'cgroup_sampling': cgroup_summary,
+            'consumer_lag': self.consumer_lag.summary(),
+            'slot_lag': self.slot_lag.summary(),
+            'database_pools': self.db_pools.metrics(),
+            'log_events': log_events
         }
         
+        await self.db_pools.close()
+        await self.close_docker_collector()
+        self.close_kafka_collector()
+        await self.close_connect_client()
+        
         # Generate summary after results are set
         self.results['summary'] = await self.generate_summary()
         
@@ -661,6 +1105,44 @@ class CDCPerformanceMonitor:
         # Print summary
         self.print_comprehensive_summary()
 
+    async def run_open_loop_phase(self, test_settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Drive an open-loop insert load and collect processing metrics while it runs"""
+        rate = float(test_settings['open_loop_rate'])
+        duration = float(test_settings.get('open_loop_duration_seconds', 30))
+        ramp_to = test_settings.get('open_loop_ramp_to')
+        concurrency = int(test_settings.get('concurrency', 1))
+        print(f"  🚀 Open-loop load: {rate:,.0f} ops/sec for {duration:.0f}s"
+              + (f" ramping to {float(ramp_to):,.0f} ops/sec" if ramp_to is not None else ""))
+        
+        load_results = {}
+        processing_phase = None
+        try:
+            # Writers get their own pool so its size bounds the load's concurrency
+            self.db_pools.register('writers', 'database', concurrency, concurrency)
+            pool = await self.db_pools.pool('writers')
+            async with self.db_pools.acquire('source') as conn:
+                reference_ids = await fetch_reference_ids(conn)
+            generator = OpenLoopLoadGenerator(
+                pool, reference_ids['customer_ids'], reference_ids['product_ids'],
+                rate=rate, duration_seconds=duration,
+                ramp_to_rate=float(ramp_to) if ramp_to is not None else None,
+                rows_per_op=int(test_settings.get('open_loop_rows_per_op', 1))
+            )
+            load_task = asyncio.create_task(generator.run())
+            
+            # Collect metrics while the load is running
+            await asyncio.sleep(min(2, duration / 2))
+            processing_phase = await self.collect_phase_metrics("processing")
+            load_results = await load_task
+        except Exception as e:
+            print(f"  ⚠️  Open-loop load error: {e}")
+            load_results = {'error': str(e)}
+            if processing_phase is None:
+                processing_phase = await self.collect_phase_metrics("processing")
+        
+        processing_phase['open_loop_load'] = load_results
+        return processing_phase
+
     async def collect_phase_metrics(self, phase_name: str) -> Dict[str, Any]:
         """Collect comprehensive metrics for a specific phase"""
         print(f"  🔍 Collecting {phase_name} phase metrics...")
@@ -670,43 +1152,32 @@ class CDCPerformanceMonitor:
             'timestamp': datetime.now().isoformat()
         }
         
-        # System metrics
-        print(f"    🖥️  System metrics...")
-        phase_data['system_metrics'] = self.get_system_metrics()
-        
-        # Docker metrics
-        print(f"    🐳 Docker metrics...")
-        phase_data['docker_metrics'] = self.get_detailed_docker_stats()
-        
-        # Kafka metrics
-        print(f"    📨 Kafka metrics...")
-        phase_data['kafka_metrics'] = self.get_kafka_comprehensive_metrics()
-        
-        # Kafka Connect status
-        print(f"    🔗 Kafka Connect status...")
-        phase_data['connect_status'] = self.get_kafka_connect_status()
-        
-        # Database metrics
-        print(f"    🗄️  Database metrics...")
-        try:
-            phase_data['source_database'] = await self.get_database_comprehensive_metrics(
-                self.config['database'], 'source'
-            )
-        except Exception as e:
-            print(f"      ❌ Source DB error: {e}")
-            phase_data['source_database'] = {'error': str(e)}
-            
-        try:
-            phase_data['target_database'] = await self.get_database_comprehensive_metrics(
-                self.config['target_database'], 'target'
-            )
-        except Exception as e:
-            print(f"      ❌ Target DB error: {e}")
-            phase_data['target_database'] = {'error': str(e)}
-        
-        # Log analysis
-        print(f"    📋 Log analysis...")
-        phase_data['logs_analysis'] = self.get_docker_logs_analysis()
+        # All collectors run at once so the snapshot describes one moment, not a sequence
+        print(f"    🔍 System, Docker, Kafka, Connect, database and log collectors (concurrent)...")
+        collectors = {
+            'system_metrics': asyncio.to_thread(self.get_system_metrics),
+            'docker_metrics': self.collect_docker_stats(),
+            'kafka_metrics': self.collect_kafka_metrics(),
+            'connect_status': self.collect_connect_status(),
+            'source_database': self.get_database_comprehensive_metrics(self.config['database'], 'source'),
+            'target_database': self.get_database_comprehensive_metrics(self.config['target_database'], 'target'),
+            'logs_analysis': self.collect_logs_analysis()
+        }
+        window_start = time.perf_counter()
+        outcomes = await asyncio.gather(*(self._run_collector(name, coro) for name, coro in collectors.items()))
+        phase_data['collector_timings'] = {}
+        for name, (value, timing) in zip(collectors, outcomes):
+            phase_data[name] = value
+            phase_data['collector_timings'][name] = timing
+            if timing['status'] != 'ok':
+                print(f"      ❌ {name} {timing['status']}: {value.get('error')}")
+        phase_data['collection_window_ms'] = round((time.perf_counter() - window_start) * 1000, 1)
+        print(f"    ⏱️  Snapshot collected in {phase_data['collection_window_ms']:.0f} ms "
+              f"(slowest: {max(phase_data['collector_timings'].items(), key=lambda item: item[1]['duration_ms'])[0]})")
+
+        if self.cgroup_sampler is not None:
+            phase_data['cgroup_metrics'] = {name: dict(stats) for name, stats in self.cgroup_sampler.latest.items()}
+        self.consumer_lag.add_native_metrics(phase_data['kafka_metrics'])
         
         # Only do latency measurement in processing phase
         if phase_name == "processing":
@@ -715,6 +1186,27 @@ class CDCPerformanceMonitor:
         
         return phase_data
 
+    async def _run_collector(self, name: str, coro, timeout: Optional[float] = None):
+        """Await one collector with a timeout; returns (value, timing record)"""
+        started_at = datetime.now().isoformat()
+        started = time.perf_counter()
+        status = 'ok'
+        try:
+            value = await asyncio.wait_for(coro, timeout=timeout or self.collector_timeout)
+        except asyncio.TimeoutError:
+            status = 'timeout'
+            value = {'error': f"{name} did not finish within {timeout or self.collector_timeout:.0f}s"}
+        except Exception as e:
+            status = 'error'
+            value = {'error': str(e)}
+        timing = {
+            'start': started_at,
+            'end': datetime.now().isoformat(),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            'status': status
+        }
+        return value, timing
+
     def compare_phases(self, idle: Dict[str, Any], processing: Dict[str, Any], final: Dict[str, Any]) -> Dict[str, Any]:
         """Compare metrics across phases"""
         comparison = {
@@ -731,6 +1223,11 @@ class CDCPerformanceMonitor:
                 'processing': self.extract_container_stats(processing.get('docker_metrics', {}), container_name),
                 'final': self.extract_container_stats(final.get('docker_metrics', {}), container_name)
             }
+            if any('cgroup_metrics' in phase for phase in (idle, processing, final)):
+                comparison['container_usage'][container_name]['cgroup'] = {
+                    phase_name: self.extract_container_stats(phase.get('cgroup_metrics', {}), container_name)
+                    for phase_name, phase in (('idle', idle), ('processing', processing), ('final', final))
+                }
         
         # Compare database counts
         comparison['database_changes'] = {
@@ -817,6 +1314,13 @@ class CDCPerformanceMonitor:
                     alerts.append(f"⚠️  Connector {conn_name} is {conn_state}")
                     health_score -= 15
         
+        # Check replication slot lag trend
+        slot_lag = self.results.get('slot_lag', {})
+        if slot_lag.get('falling_behind'):
+            alerts.append(f"⚠️  Replication slot {slot_lag['slot_name']} is falling behind "
+                          f"({slot_lag['confirmed_lag_bytes'] / 1024**2:,.1f} MiB lag)")
+            health_score -= 15
+        
         # Check latency (from processing phase)
         processing_phase = self.results.get('phase_data', {}).get('processing', {})
         latency_stats = processing_phase.get('latency_analysis', {}).get('statistics', {})
@@ -826,12 +1330,19 @@ class CDCPerformanceMonitor:
                 alerts.append(f"⚠️  High latency: {avg_latency:.0f}ms")
                 health_score -= 10
                 
-        # Check errors in logs
+        # Check errors in logs (whole run when the tailer followed the logs)
         logs_summary = final_phase.get('logs_analysis', {}).get('error_summary', {})
-        total_errors = logs_summary.get('total_errors', 0)
+        total_errors = logs_summary.get('run_total_errors', logs_summary.get('total_errors', 0))
         if total_errors > 5:
             alerts.append(f"⚠️  {total_errors} errors found in logs")
             health_score -= 10
+        log_events = (self.results.get('log_events') or {}).get('events', {})
+        for event, label, penalty in [('task_failure', 'Connect task failure', 15),
+                                      ('slot_error', 'replication slot error', 10),
+                                      ('jdbc_batch_failure', 'JDBC batch failure', 10)]:
+            if log_events.get(event):
+                alerts.append(f"⚠️  {log_events[event]} {label}(s) in container logs")
+                health_score -= penalty
         
         # Determine health
         if health_score >= 90:
@@ -848,8 +1359,13 @@ class CDCPerformanceMonitor:
         
         # Key metrics
         summary['key_metrics'] = {
-            'source_orders_count': final_phase.get('source_database', {}).get('tables', {}).get('orders', 0),
-            'target_orders_count': final_phase.get('target_database', {}).get('tables', {}).get('orders', 0),
+            'source_orders_count': final_phase.get('source_database', {}).get('tables', {}).get('orders') or 0,
+            'target_orders_count': final_phase.get('target_database', {}).get('tables', {}).get('orders') or 0,
+            'row_count_mode': self.row_counter.mode,
+            'source_orders_max_id': final_phase.get('source_database', {}).get('table_counts', {})
+                                               .get('orders', {}).get('max_id'),
+            'target_orders_max_id': final_phase.get('target_database', {}).get('table_counts', {})
+                                               .get('orders', {}).get('max_id'),
             'avg_latency_ms': latency_stats.get('avg_total_latency_ms', 0),
             'total_errors': total_errors,
             'connectors_running': len([
@@ -860,18 +1376,69 @@ class CDCPerformanceMonitor:
         
         return summary
 
+    async def capture_run_metadata(self, workload: Dict[str, Any]) -> Dict[str, Any]:
+        """Workload, connector configs and plugin versions, for comparing runs with compare_runs.py"""
+        run_metadata = await collect_run_metadata(self.config, workload)
+        plugins = run_metadata['plugins'].get('plugins', {})
+        if plugins:
+            versions = [f"{name} {plugin.get('version')}" for name, plugin in plugins.items()]
+            print(f"🔌 Plugins: {', '.join(versions)}")
+        if self.results_store is not None:
+            self.results_store.set_meta('run_metadata', run_metadata)
+        return run_metadata
+
+    def open_results_store(self):
+        """Start streaming results to an append-only store when results.format is 'sqlite'"""
+        if self.results_config.get('format', 'sqlite') != 'sqlite':
+            return
+        try:
+            self.results_store = ResultsStore.create(
+                self.results_config.get('directory', 'testing-results'), 'comprehensive_performance',
+                flush_interval=float(self.results_config.get('flush_interval_seconds', 1)),
+                blob_threshold=int(self.results_config.get('blob_threshold_bytes', 4096))
+            )
+            print(f"💾 Streaming results to {self.results_store.path}")
+        except Exception as e:
+            print(f"⚠️  Results store unavailable, writing JSON at the end: {e}")
+            self.results_store = None
+
+    def store_phase(self, phase_data: Dict[str, Any]):
+        """Persist a completed phase right away so a crash does not lose it"""
+        if self.results_store is not None:
+            self.results_store.put_document('phase', phase_data, phase=phase_data.get('phase'))
+
     async def save_results(self):
-        """Save monitoring results to JSON file"""
+        """Save monitoring results to the results store, or to one JSON file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"comprehensive_performance_report_{timestamp}.json"
         
         # Create testing-results directory if it doesn't exist
-        os.makedirs("testing-results", exist_ok=True)
-        filepath = os.path.join("testing-results", filename)
+        directory = self.results_config.get('directory', 'testing-results')
+        os.makedirs(directory, exist_ok=True)
+        filepath = os.path.join(directory, filename)
+        
+        report = self.results
+        if self.results_store is not None:
+            try:
+                # Phases and time series are already in the store
+                for section, data in self.results.items():
+                    if section not in ('phase_data', 'time_series'):
+                        self.results_store.put_document(section, data)
+                self.results_store.close()
+                print(f"\n💾 Results store saved to: {self.results_store.path}")
+                report = {
+                    'results_store': self.results_store.path,
+                    'run_metadata': self.results.get('run_metadata'),
+                    'monitoring_info': self.results.get('monitoring_info'),
+                    'summary': self.results.get('summary')
+                }
+            except Exception as e:
+                print(f"❌ Error writing results store, falling back to full JSON: {e}")
+            self.results_store = None
         
         try:
             with open(filepath, 'w') as f:
-                json.dump(self.results, f, indent=2, default=str)
+                json.dump(report, f, indent=2, default=str)
             print(f"\n💾 Comprehensive report saved to: {filepath}")
         except Exception as e:
             print(f"❌ Error saving report: {e}")
@@ -921,6 +1488,8 @@ class CDCPerformanceMonitor:
                 print("-" * 75)
                 
                 for phase_name, stats in phases.items():
+                    if phase_name == 'cgroup':
+                        continue  # per-phase cgroup stats, printed below
                     if isinstance(stats, dict) and 'cpu_percent' in stats:
                         cpu = stats.get('cpu_percent', 'N/A')
                         mem_pct = stats.get('memory_percent', 'N/A')
@@ -937,6 +1506,15 @@ class CDCPerformanceMonitor:
                         print(f"{phase_name:<12} {cpu:<8} {mem_pct:<10} {mem_usage:<20} {network_io:<15} {pids:<6}")
                     else:
                         print(f"{phase_name:<12} {'ERROR':<8} {'N/A':<10} {'N/A':<20} {'N/A':<15} {'N/A':<6}")
+                
+                if 'cgroup' in phases:
+                    print(f"  🧬 cgroup v2 sampler:")
+                    for phase_name, stats in phases['cgroup'].items():
+                        if 'cpu_percent' in stats:
+                            print(f"{phase_name:<12} {stats['cpu_percent']:<8} {stats['memory_percent']:<10} "
+                                  f"{stats['memory_usage']:<20} {'N/A':<15} {'N/A':<6}")
+                        else:
+                            print(f"{phase_name:<12} {'ERROR':<8} {'N/A':<10} {'N/A':<20} {'N/A':<15} {'N/A':<6}")
         
         # System resources detailed analysis by phase
         system_changes = comparison.get('system_changes', {})
@@ -1035,7 +1613,47 @@ class CDCPerformanceMonitor:
                 print(f"Consumer Groups: {len(groups)} active")
                 for group in groups:
                     if 'connect' in group.lower():
-                        print(f"  🔗 Connect Group: {group}")
+                        group_detail = consumer_groups.get(group)
+                        lag = f" (lag {group_detail['total_lag']:,})" if isinstance(group_detail, dict) else ""
+                        print(f"  🔗 Connect Group: {group}{lag}")
+            
+            # Replication slot lag over time
+            slot_lag = self.results.get('slot_lag', {})
+            if slot_lag.get('samples'):
+                print(f"Replication Slot ({slot_lag['slot_name']}, {slot_lag['samples']} samples):")
+                print(f"  Lag: {slot_lag['confirmed_lag_bytes'] / 1024:,.0f} KiB "
+                      f"(max {slot_lag['max_confirmed_lag_bytes'] / 1024:,.0f} KiB) | "
+                      f"Retained WAL: {slot_lag['retained_wal_bytes'] / 1024**2:,.1f} MiB")
+                if slot_lag.get('wal_rate_bytes_per_sec') is not None:
+                    print(f"  WAL rate: {slot_lag['wal_rate_bytes_per_sec'] / 1024:,.1f} KiB/s | "
+                          f"Confirm rate: {slot_lag['confirm_rate_bytes_per_sec'] / 1024:,.1f} KiB/s")
+                if slot_lag.get('falling_behind'):
+                    exhaust = slot_lag.get('seconds_to_wal_exhaustion')
+                    print(f"  ⚠️  Slot is falling behind"
+                          + (f" (WAL limit reached in ~{exhaust:,.0f}s)" if exhaust is not None else ""))
+            
+            # Sink consumer lag over time
+            consumer_lag = self.results.get('consumer_lag', {})
+            if consumer_lag.get('samples'):
+                drain = consumer_lag.get('drain_rate_msgs_per_sec')
+                produce = consumer_lag.get('produce_rate_msgs_per_sec')
+                ttz = consumer_lag.get('time_to_zero_lag_seconds')
+                print(f"Sink Lag ({consumer_lag['group']}, {consumer_lag['samples']} samples):")
+                print(f"  Latest: {consumer_lag['latest_lag']:,} | Max: {consumer_lag['max_lag']:,}")
+                if drain is not None:
+                    print(f"  Drain: {drain:,.1f} msg/s | Produce: {produce:,.1f} msg/s | "
+                          f"Time to zero lag: {f'{ttz:,.0f}s' if ttz is not None else 'not shrinking'}")
+                if consumer_lag.get('sink_is_bottleneck'):
+                    print(f"  ⚠️  Lag is growing: the JDBC sink, not Debezium, is the bottleneck")
+            
+            # Connect REST API latency
+            api_latency = connect_status.get('api_latency', {})
+            if api_latency:
+                print(f"Connect API Latency:")
+                for endpoint, pcts in api_latency.items():
+                    if pcts.get('count'):
+                        print(f"  {endpoint:<30} p50={pcts['p50_ms']:.1f}ms p99={pcts['p99_ms']:.1f}ms "
+                              f"p99.9={pcts['p99_9_ms']:.1f}ms max={pcts['max_ms']:.1f}ms (n={pcts['count']})")
             
             # Connector status details
             connectors = connect_status.get('connectors', {})
@@ -1076,6 +1694,11 @@ class CDCPerformanceMonitor:
                 print(f"Average Total Latency: {statistics.get('avg_total_latency_ms', 0):.1f}ms")
                 print(f"Average CDC Latency: {statistics.get('avg_cdc_latency_ms', 0):.1f}ms")
                 print(f"Latency Range: {statistics.get('min_total_latency_ms', 0):.1f}ms - {statistics.get('max_total_latency_ms', 0):.1f}ms")
+                for label, key in [('Total', 'total_latency_percentiles'), ('CDC', 'cdc_latency_percentiles')]:
+                    pcts = statistics.get(key, {})
+                    if pcts.get('count'):
+                        print(f"{label} Percentiles: p50={pcts['p50_ms']:.1f}ms p90={pcts['p90_ms']:.1f}ms "
+                              f"p99={pcts['p99_ms']:.1f}ms p99.9={pcts['p99_9_ms']:.1f}ms max={pcts['max_ms']:.1f}ms")
                 
                 # Latency quality assessment
                 avg_latency = statistics.get('avg_total_latency_ms', 0)
@@ -1104,6 +1727,21 @@ class CDCPerformanceMonitor:
                         status_icon = "✅" if status == "success" else "❌"
                         print(f"#{test_num:<5} {status_icon}{status:<9} {total_lat:<15.1f} {cdc_lat:<12.1f}")
         
+        # Open-loop load results (if the processing phase ran one)
+        open_loop_load = processing_phase.get('open_loop_load', {})
+        if open_loop_load and 'error' not in open_loop_load:
+            print(f"\n🚀 OPEN-LOOP LOAD:")
+            print("=" * 70)
+            latency = open_loop_load.get('latency', {})
+            lag = open_loop_load.get('schedule_lag', {})
+            print(f"Scheduled/Completed Ops: {open_loop_load.get('scheduled_ops', 0):,} / "
+                  f"{open_loop_load.get('completed_ops', 0):,} ({open_loop_load.get('failed_ops', 0)} failed)")
+            print(f"Offered/Achieved Rate: {open_loop_load.get('offered_rate_ops', 0):.0f} / "
+                  f"{open_loop_load.get('achieved_rate_ops', 0):.0f} ops/sec")
+            print(f"Insert Latency (from intended send): p50={latency.get('p50_ms', 0):.1f}ms "
+                  f"p99={latency.get('p99_ms', 0):.1f}ms max={latency.get('max_ms', 0):.1f}ms")
+            print(f"Schedule Lag: avg={lag.get('avg_ms', 0):.1f}ms max={lag.get('max_ms', 0):.1f}ms")
+        
         # Error Analysis
         if 'final' in phase_data:
             logs_analysis = phase_data['final'].get('logs_analysis', {})
@@ -1120,6 +1758,14 @@ class CDCPerformanceMonitor:
                 print(f"Total Errors: {total_errors}")
                 print(f"Total Warnings: {total_warnings}")
                 print(f"Containers with Errors: {containers_with_errors}")
+                log_events = self.results.get('log_events') or {}
+                if log_events:
+                    print(f"Run Totals: {log_events['totals'].get('lines', 0):,} lines, "
+                          f"{log_events['totals'].get('error', 0)} errors, "
+                          f"{log_events['totals'].get('warn', 0)} warnings")
+                    events = {name: count for name, count in log_events.get('events', {}).items() if count}
+                    print(f"CDC Events: " + (", ".join(f"{name}={count}" for name, count in events.items())
+                                             if events else "none"))
                 
                 # Container-specific errors
                 containers = logs_analysis.get('containers', {})
@@ -1175,6 +1821,20 @@ class CDCPerformanceMonitor:
         else:
             print(f"\n✅ NO ALERTS - ALL SYSTEMS NOMINAL")
         
+        # Time series overview
+        time_series = self.results.get('time_series', {})
+        if time_series:
+            print(f"\n📈 TIME SERIES ({len(time_series)} metrics):")
+            print("=" * 70)
+            print(f"{'Metric':<55} {'Samples':>7} {'Min':>10} {'Avg':>10} {'Max':>10}")
+            print("-" * 95)
+            for name, series in time_series.items():
+                values = [v for v in series.get('values', []) if isinstance(v, (int, float))]
+                if not values or name.startswith(('system.net_', 'db.')):
+                    continue
+                print(f"{name:<55} {len(values):>7} {min(values):>10.1f} "
+                      f"{sum(values) / len(values):>10.1f} {max(values):>10.1f}")
+        
         # Monitoring summary
         monitoring_info = self.results.get('monitoring_info', {})
         print(f"\n📋 MONITORING SESSION SUMMARY:")
@@ -1183,6 +1843,12 @@ class CDCPerformanceMonitor:
         print(f"Processing Time: {monitoring_info.get('processing_time_seconds', 0):.1f} seconds")
         print(f"Duration Setting: {monitoring_info.get('duration_minutes', 0)} minutes")
         print(f"Report Generated: {monitoring_info.get('start_time', 'N/A')}")
+        for pool_name, pool_metrics in self.results.get('database_pools', {}).items():
+            wait = pool_metrics.get('acquire_wait', {})
+            if wait.get('count'):
+                print(f"DB Pool {pool_name}: {pool_metrics['acquires']} acquires, "
+                      f"{pool_metrics['connections_opened']} connections opened, "
+                      f"wait p50={wait['p50_ms']:.2f}ms p99={wait['p99_ms']:.2f}ms max={wait['max_ms']:.2f}ms")
         
         # Database sync status
         source_count = key_metrics.get('source_orders_count', 0)
@@ -1190,11 +1856,16 @@ class CDCPerformanceMonitor:
         if source_count and target_count:
             sync_diff = abs(source_count - target_count)
             sync_pct = (min(source_count, target_count) / max(source_count, target_count)) * 100 if max(source_count, target_count) > 0 else 100
-            print(f"\n🔄 FINAL SYNC STATUS:")
+            print(f"\n🔄 FINAL SYNC STATUS ({key_metrics.get('row_count_mode', 'exact')} counts):")
             print(f"  📊 Sync Percentage: {sync_pct:.1f}%")
             print(f"  📊 Record Difference: {sync_diff:,}")
+            source_max_id = key_metrics.get('source_orders_max_id')
+            target_max_id = key_metrics.get('target_orders_max_id')
+            if source_max_id is not None and target_max_id is not None:
+                print(f"  📊 ID Watermark: source={source_max_id:,} target={target_max_id:,} "
+                      f"(behind {max(source_max_id - target_max_id, 0):,})")
         
-        print(f"\n🔍 Full JSON details saved in testing-results/")
+        print(f"\n🔍 Full details saved in {self.results_config.get('directory', 'testing-results')}/")
         print("=" * 70)
 
 async def main():
@@ -1206,8 +1877,15 @@ async def main():
         except ValueError:
             print("Invalid duration, using default 5 minutes")
     
+    sampling_interval = None  # default from monitoring.sampling_interval_seconds
+    if len(sys.argv) > 2:
+        try:
+            sampling_interval = float(sys.argv[2])
+        except ValueError:
+            print("Invalid sampling interval, using config value")
+    
     monitor = CDCPerformanceMonitor()
-    await monitor.run_comprehensive_monitoring(duration)
+    await monitor.run_comprehensive_monitoring(duration, sampling_interval)
 
 if __name__ == "__main__":
     try:
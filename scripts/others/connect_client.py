@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Pooled Async Kafka Connect REST Client
+======================================
+
+Client REST Kafka Connect dengan connection pool (keep-alive) dan asyncio:
+- Status semua connector dalam satu request: /connectors?expand=status&expand=info
+- Request status per task dijalankan bersamaan
+- Histogram latency per endpoint (template path, bukan nama connector)
+- Create / delete / update config connector untuk harness tuning
+
+`requests.get` without a session opens a new TCP connection per call, and the
+old status loop queried connectors one after another, so connection setup
+dominated the reported "API latency". Here one aiohttp session is reused for
+every call and independent requests are issued concurrently.
+
+Usage:
+    python connect_client.py [--url http://localhost:8083]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; callers fall back to requests
+    aiohttp = None
+
+from latency_histogram import LatencyHistogram
+
+DEFAULT_CONNECT_URL = 'http://localhost:8083'
+
+# Config keys worth keeping in reports (connector configs also hold credentials)
+INFO_CONFIG_KEYS = ('connector.class', 'tasks.max', 'topics', 'topic.prefix', 'database.server.name')
+
+
+class ConnectRestError(Exception):
+    """Non-2xx response from the Kafka Connect REST API"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Connect REST API returned {status}: {message}")
+        self.status = status
+
+
+def connect_client_available() -> bool:
+    """True when aiohttp is installed"""
+    return aiohttp is not None
+
+
+class ConnectRestClient:
+    def __init__(self, base_url: str = DEFAULT_CONNECT_URL, timeout: float = 10.0,
+                 max_connections: int = 20, histograms: Optional[Dict[str, LatencyHistogram]] = None):
+        """Keep-alive Connect REST client; histograms may be shared with the caller"""
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the async Connect REST client")
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.histograms = histograms if histograms is not None else defaultdict(LatencyHistogram)
+        self.session = None
+
+    async def open(self):
+        """Open the pooled HTTP session"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def request(self, method: str, endpoint: str, path: str, payload: Any = None,
+                      params: Optional[Any] = None) -> Any:
+        """Send one request, record its latency under endpoint and decode the JSON body
+
+        endpoint is the path template (method-prefixed for writes), so latency
+        is grouped per API call rather than per connector name.
+        """
+        await self.open()
+        request_start = time.perf_counter()
+        try:
+            async with self.session.request(method, f"{self.base_url}{path}", json=payload,
+                                            params=params) as response:
+                body = await response.text()
+        finally:
+            self.histograms[endpoint].record_seconds(time.perf_counter() - request_start)
+        if response.status >= 400:
+            try:
+                message = json.loads(body).get('message', body)
+            except (ValueError, AttributeError):
+                message = body
+            raise ConnectRestError(response.status, str(message)[:300])
+        return json.loads(body) if body else None
+
+    async def cluster_info(self) -> Dict[str, Any]:
+        """Worker version and Kafka cluster id (GET /)"""
+        return await self.request('GET', '/', '/')
+
+    async def connectors_expanded(self) -> Dict[str, Any]:
+        """Status and info of every connector in a single call"""
+        result = await self.request('GET', '/connectors?expand', '/connectors',
+                                    params=[('expand', 'status'), ('expand', 'info')])
+        if isinstance(result, list):
+            # Workers without ?expand support (Kafka < 2.3) return plain names
+            statuses = await asyncio.gather(*(self.connector_status(name) for name in result))
+            return {name: {'status': status} for name, status in zip(result, statuses)}
+        return result
+
+    async def connector_status(self, name: str) -> Dict[str, Any]:
+        return await self.request('GET', '/connectors/{name}/status', f"/connectors/{name}/status")
+
+    async def task_status(self, name: str, task_id: int) -> Dict[str, Any]:
+        return await self.request('GET', '/connectors/{name}/tasks/{id}/status',
+                                  f"/connectors/{name}/tasks/{task_id}/status")
+
+    async def get_connector_config(self, name: str) -> Dict[str, Any]:
+        return await self.request('GET', '/connectors/{name}/config', f"/connectors/{name}/config")
+
+    async def create_connector(self, name: str, config: Dict[str, Any],
+                               initial_state: Optional[str] = None) -> Dict[str, Any]:
+        """POST /connectors; initial_state (Kafka 3.7+) is RUNNING, PAUSED or STOPPED"""
+        payload = {'name': name, 'config': config}
+        if initial_state is not None:
+            payload['initial_state'] = initial_state
+        return await self.request('POST', 'POST /connectors', '/connectors', payload)
+
+    async def put_connector_config(self, name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or update a connector (PUT /connectors/{name}/config)"""
+        return await self.request('PUT', 'PUT /connectors/{name}/config', f"/connectors/{name}/config", config)
+
+    async def delete_connector(self, name: str, missing_ok: bool = True):
+        """DELETE /connectors/{name}"""
+        try:
+            await self.request('DELETE', 'DELETE /connectors/{name}', f"/connectors/{name}")
+        except ConnectRestError as e:
+            if not (missing_ok and e.status == 404):
+                raise
+
+    async def restart_connector(self, name: str, include_tasks: bool = True):
+        """POST /connectors/{name}/restart"""
+        await self.request('POST', 'POST /connectors/{name}/restart', f"/connectors/{name}/restart",
+                           params={'includeTasks': str(include_tasks).lower()})
+
+    async def stop_connector(self, name: str):
+        """PUT /connectors/{name}/stop (Kafka 3.5+; tasks shut down, config kept)"""
+        await self.request('PUT', 'PUT /connectors/{name}/stop', f"/connectors/{name}/stop")
+
+    async def reset_connector_offsets(self, name: str) -> Dict[str, Any]:
+        """DELETE /connectors/{name}/offsets (Kafka 3.6+; the connector must be STOPPED)"""
+        return await self.request('DELETE', 'DELETE /connectors/{name}/offsets', f"/connectors/{name}/offsets")
+
+    async def wait_for_running(self, name: str, timeout: float = 60.0, poll_interval: float = 1.0) -> bool:
+        """Wait until the connector and all its tasks are RUNNING (False as soon as one FAILED)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                status = await self.connector_status(name)
+                tasks = status.get('tasks', [])
+                states = [status.get('connector', {}).get('state')] + [task.get('state') for task in tasks]
+                if 'FAILED' in states:
+                    return False
+                if tasks and all(state == 'RUNNING' for state in states):
+                    return True
+            except ConnectRestError as e:
+                if e.status != 404:
+                    raise
+            await asyncio.sleep(poll_interval)
+        return False
+
+    async def cluster_status(self, include_task_status: bool = True) -> Dict[str, Any]:
+        """Cluster info and connector/task status in the get_kafka_connect_status layout"""
+        connect_status = {
+            'cluster': {},
+            'connectors': {},
+            'error': None,
+            'timestamp': datetime.now().isoformat()
+        }
+        started = time.perf_counter()
+        cluster, expanded = await asyncio.gather(
+            self.cluster_info(), self.connectors_expanded(), return_exceptions=True
+        )
+
+        if isinstance(cluster, Exception):
+            connect_status['cluster'] = {'accessible': False, 'error': str(cluster)}
+        else:
+            connect_status['cluster'] = {**cluster, 'accessible': True}
+
+        if isinstance(expanded, Exception):
+            connect_status['connectors']['error'] = str(expanded)
+        else:
+            names = sorted(expanded)
+            connect_status['connectors']['list'] = names
+            connect_status['connectors']['count'] = len(names)
+            for name in names:
+                status = dict(expanded[name].get('status') or {})
+                info = expanded[name].get('info') or {}
+                if info:
+                    config = info.get('config', {})
+                    status['info'] = {
+                        'type': info.get('type'),
+                        'tasks': len(info.get('tasks', [])),
+                        'config': {key: config[key] for key in INFO_CONFIG_KEYS if key in config}
+                    }
+                connect_status['connectors'][name] = status
+
+            if include_task_status:
+                # Task-level requests fan out concurrently across every connector
+                task_refs = [(name, task['id']) for name in names
+                             for task in connect_status['connectors'][name].get('tasks', [])]
+                task_results = await asyncio.gather(
+                    *(self.task_status(name, task_id) for name, task_id in task_refs), return_exceptions=True
+                )
+                for (name, task_id), result in zip(task_refs, task_results):
+                    for task in connect_status['connectors'][name].get('tasks', []):
+                        if task['id'] == task_id:
+                            if isinstance(result, Exception):
+                                task['status_error'] = str(result)
+                            else:
+                                task.update(result)
+
+        connect_status['collect_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        connect_status['api_latency'] = self.latency_summary()
+        return connect_status
+
+    def latency_summary(self) -> Dict[str, Any]:
+        """Latency percentiles per endpoint template"""
+        return {endpoint: histogram.summary() for endpoint, histogram in self.histograms.items()}
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Query Kafka Connect over a pooled REST client")
+    parser.add_argument('--url', default=DEFAULT_CONNECT_URL)
+    parser.add_argument('--repeat', type=int, default=1, help="Number of status captures")
+    args = parser.parse_args()
+
+    async with ConnectRestClient(args.url) as client:
+        for _ in range(args.repeat):
+            status = await client.cluster_status()
+        print(json.dumps(status, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Connector Variant Building and Redeployment
+===========================================
+
+Dasar bersama harness tuning connector (sink dan source):
+- Template connector dari file JSON (pg-sink.json, inventory-source.json)
+- Override per variant: set / hapus key, dan chain SMT on/off atau subset
+- Variant dari file YAML, section config.yaml, atau sweep CLI (key=v1,v2)
+- Redeploy lewat Connect REST API: delete, create, tunggu RUNNING
+- End offset topic Kafka untuk menunggu workload selesai dipublish
+- ConnectorTuningHarness: loop variant x repetisi, ranking, CLI dan file
+  hasil; subclass hanya mengukur satu variant dan menentukan urutan ranking
+
+Variants are applied to a copy of the template, so a variant never inherits
+overrides from the one before it. The harnesses redeploy the unmodified
+template when they finish, leaving the pipeline as they found it.
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import yaml
+
+from connect_client import DEFAULT_CONNECT_URL, ConnectRestClient, ConnectRestError, connect_client_available
+from kafka_admin_metrics import DEFAULT_BOOTSTRAP_SERVERS, MAIN_TOPIC, KafkaAdminMetricsCollector, kafka_client_available
+from mass_insert_monitor import CDCMassInsertMonitor
+from run_metadata import collect_run_metadata
+
+# Override key that edits the transforms chain instead of setting a config key
+SMT_OVERRIDE = 'smt'
+# Status poll interval while a redeployed connector starts; startup_seconds is only this precise
+STARTUP_POLL_SECONDS = 0.1
+
+
+def load_connector_template(path: str) -> Tuple[str, Dict[str, Any]]:
+    """(name, config) from a connector definition file"""
+    with open(path, 'r') as f:
+        definition = json.load(f)
+    return definition['name'], dict(definition['config'])
+
+
+def set_transforms(config: Dict[str, Any], keep: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the listed transforms (in chain order); None or [] removes the chain"""
+    chain = [alias.strip() for alias in config.get('transforms', '').split(',') if alias.strip()]
+    keep = [alias for alias in chain if alias in (keep or [])]
+    removed = [alias for alias in chain if alias not in keep]
+    result = {key: value for key, value in config.items()
+              if not any(key.startswith(f'transforms.{alias}.') for alias in removed)}
+    if keep:
+        result['transforms'] = ','.join(keep)
+    else:
+        result.pop('transforms', None)
+    return result
+
+
+def apply_overrides(config: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Template config with overrides applied; a None value removes the key"""
+    result = dict(config)
+    for key, value in overrides.items():
+        if key == SMT_OVERRIDE:
+            if value is True:
+                continue  # the template's chain unchanged
+            result = set_transforms(result, [] if value is False else list(value))
+        elif value is None:
+            result.pop(key, None)
+        else:
+            # Connect stores every config value as a string
+            result[key] = str(value).lower() if isinstance(value, bool) else str(value)
+    return result
+
+
+def describe_overrides(overrides: Dict[str, Any]) -> str:
+    """Short label of a variant"""
+    if not overrides:
+        return 'template'
+    parts = []
+    for key, value in overrides.items():
+        if key == SMT_OVERRIDE and not isinstance(value, bool):
+            value = '+'.join(value) if value else 'off'
+        elif key == SMT_OVERRIDE:
+            value = 'on' if value else 'off'
+        parts.append(f"{key}={value}")
+    return ' '.join(parts)
+
+
+def parse_sweep(expression: str) -> List[Dict[str, Any]]:
+    """'tasks.max=1,2,4' -> one override set per value ('smt=unwrap+extractKey' or 'smt=off' for SMTs)"""
+    key, _, values = expression.partition('=')
+    if not values:
+        raise ValueError(f"Sweep '{expression}' must look like key=value1,value2")
+    variants = []
+    for value in values.split(','):
+        value = value.strip()
+        if key == SMT_OVERRIDE:
+            value = value.lower() in ('on', 'true') or ([] if value.lower() in ('off', 'false') else value.split('+'))
+        variants.append({key: value})
+    return variants
+
+
+def load_variants(path: Optional[str] = None, section: Optional[Dict[str, Any]] = None,
+                  sweeps: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """[{'name', 'overrides'}] from CLI sweeps, a YAML file, or a config.yaml section (first one given)"""
+    if sweeps:
+        override_sets = [overrides for expression in sweeps for overrides in parse_sweep(expression)]
+        entries = [{'overrides': overrides} for overrides in override_sets]
+    elif path:
+        with open(path, 'r') as f:
+            loaded = yaml.safe_load(f) or {}
+        entries = loaded.get('variants', loaded) if isinstance(loaded, dict) else loaded
+    else:
+        entries = (section or {}).get('variants') or [{'overrides': {}}]
+
+    variants = []
+    for entry in entries:
+        overrides = entry.get('overrides', {}) if isinstance(entry, dict) else {}
+        variants.append({'name': entry.get('name') or describe_overrides(overrides), 'overrides': overrides})
+    return variants
+
+
+class TopicOffsetProbe:
+    def __init__(self, kafka_config: Optional[Dict[str, Any]] = None, topic: str = MAIN_TOPIC):
+        """End offsets of one topic; disabled when kafka-python is missing or the brokers are unreachable"""
+        self.collector = None
+        if kafka_client_available():
+            self.collector = KafkaAdminMetricsCollector(
+                (kafka_config or {}).get('bootstrap_servers', DEFAULT_BOOTSTRAP_SERVERS), topic
+            )
+
+    @property
+    def available(self) -> bool:
+        return self.collector is not None
+
+    async def end_offset(self) -> Optional[int]:
+        """Sum of the topic's partition end offsets, or None when Kafka cannot be read"""
+        if self.collector is None:
+            return None
+        try:
+            metrics = await asyncio.to_thread(self.collector.collect, False)
+            return metrics['topics'].get(self.collector.main_topic, {}).get('end_offset_total')
+        except Exception as e:
+            print(f"  ⚠️  Kafka offsets unavailable: {e}")
+            self.close()
+            return None
+
+    async def wait_for_growth(self, start_offset: Optional[int], records: int, timeout: float,
+                              poll_interval: float = 0.5) -> Optional[int]:
+        """Wait until records more messages are in the topic; returns how many arrived"""
+        if start_offset is None:
+            return None
+        deadline = time.time() + timeout
+        offset = start_offset
+        while offset - start_offset < records and time.time() < deadline:
+            await asyncio.sleep(poll_interval)
+            offset = await self.end_offset()
+            if offset is None:
+                return None
+        return offset - start_offset
+
+    def close(self):
+        if self.collector is not None:
+            self.collector.close()
+            self.collector = None
+
+
+async def redeploy_connector(client: ConnectRestClient, name: str, config: Dict[str, Any],
+                             timeout: float = 60.0, settle_seconds: float = 1.0,
+                             before_create=None, poll_interval: float = STARTUP_POLL_SECONDS) -> Dict[str, Any]:
+    """Delete the connector, create it with config and wait until it and its tasks are RUNNING
+
+    before_create is an optional coroutine function run between the two,
+    e.g. to drop a replication slot once the old tasks have released it.
+    """
+    start = time.perf_counter()
+    await client.delete_connector(name, missing_ok=True)
+    # The worker finishes stopping tasks asynchronously after the DELETE returns
+    await asyncio.sleep(settle_seconds)
+    if before_create is not None:
+        await before_create()
+    deleted = time.perf_counter()
+    created_at = time.time()
+    try:
+        await client.create_connector(name, config)
+    except ConnectRestError as e:
+        return {'deployed': False, 'running': False, 'error': str(e),
+                'delete_seconds': round(deleted - start, 3)}
+    running = await client.wait_for_running(name, timeout, poll_interval)
+    result = {
+        'deployed': True,
+        'running': running,
+        'created_at': created_at,
+        'delete_seconds': round(deleted - start, 3),
+        'startup_seconds': round(time.perf_counter() - deleted, 3),
+        'error': None
+    }
+    if not running:
+        try:
+            status = await client.connector_status(name)
+            traces = [task.get('trace', '') for task in status.get('tasks', []) if task.get('state') == 'FAILED']
+            result['status'] = status
+            result['error'] = (traces[0].splitlines()[0] if traces and traces[0]
+                               else f"not RUNNING after {timeout:.0f}s")
+        except ConnectRestError as e:
+            result['error'] = str(e)
+    return result
+
+
+class ConnectorTuningHarness:
+    # Set by subclasses: config.yaml section (also the results file prefix), banner and workload noun
+    section = None
+    title = None
+    workload = 'workload'
+    default_settings = {}
+
+    def __init__(self, monitor: CDCMassInsertMonitor, client: ConnectRestClient, name: str,
+                 template: Dict[str, Any], settings: Dict[str, Any], deploy_only: bool = False,
+                 topic: str = MAIN_TOPIC):
+        """Runs connector variants with the monitor's insert path, pools and marker latency tracking"""
+        self.monitor = monitor
+        self.client = client
+        self.name = name
+        self.template = template
+        self.settings = settings
+        self.deploy_only = deploy_only
+        self.offsets = TopicOffsetProbe(monitor.config.get('kafka'), topic)
+
+    @classmethod
+    def settings_from_args(cls, args: argparse.Namespace) -> Dict[str, Any]:
+        """Harness specific settings given on the command line"""
+        return {}
+
+    async def run_variant(self, variant: Dict[str, Any], repetition: int) -> Dict[str, Any]:
+        """Deploy one variant and measure it; the result has at least 'variant' and 'error'"""
+        raise NotImplementedError
+
+    async def restore_template(self) -> Dict[str, Any]:
+        """Deploy the unmodified template again"""
+        raise NotImplementedError
+
+    async def after_failed_variant(self, result: Dict[str, Any]):
+        """Clean up what a failed variant left behind before the next one starts"""
+
+    def summarize_runs(self, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Ranking metrics of the successful runs of one variant"""
+        raise NotImplementedError
+
+    def ranking_key(self, row: Dict[str, Any]):
+        """Sort key of a ranking row, best first"""
+        raise NotImplementedError
+
+    def print_variant(self, result: Dict[str, Any]):
+        raise NotImplementedError
+
+    def print_ranking(self, ranking: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    async def run(self, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Every variant, repeated; the template is redeployed at the end"""
+        runs = []
+        repetitions = int(self.settings['repetitions'])
+        try:
+            for repetition in range(1, repetitions + 1):
+                for number, variant in enumerate(variants, 1):
+                    print(f"\n🔧 Variant {number}/{len(variants)} (repetition {repetition}/{repetitions}): "
+                          f"{variant['name']}")
+                    try:
+                        result = await self.run_variant(variant, repetition)
+                    except Exception as e:
+                        result = {'variant': variant['name'], 'overrides': variant['overrides'],
+                                  'repetition': repetition, 'error': str(e)}
+                    runs.append(result)
+                    self.print_variant(result)
+                    if result['error'] and not self.deploy_only:
+                        await self.after_failed_variant(result)
+        finally:
+            print(f"\n♻️  Redeploying the template connector {self.name}")
+            try:
+                restored = await self.restore_template()
+            except Exception as e:
+                # Must not replace an exception already propagating from the variants
+                print(f"❌ Template not redeployed: {e}")
+                restored = {'running': False, 'error': str(e)}
+            self.offsets.close()
+        return {'runs': runs, 'restored': restored['running'], 'restore_error': restored.get('error'),
+                'ranking': self.rank_variants(runs)}
+
+    def rank_variants(self, runs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One row per variant, ordered by ranking_key"""
+        by_variant = {}
+        for run in runs:
+            by_variant.setdefault(run['variant'], []).append(run)
+        ranking = []
+        for name, variant_runs in by_variant.items():
+            ok = [run for run in variant_runs if not run['error']]
+            ranking.append({
+                'variant': name,
+                'runs': len(variant_runs),
+                'failures': len(variant_runs) - len(ok),
+                **self.summarize_runs(ok),
+                'errors': sorted({run['error'] for run in variant_runs if run['error']})
+            })
+        return sorted(ranking, key=self.ranking_key)
+
+
+def tuning_argument_parser(harness_class, description: str, sweep_example: str) -> argparse.ArgumentParser:
+    """Command line options shared by the tuning harnesses"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--template', default=None,
+                        help=f"Connector definition (default: {harness_class.section}.template)")
+    parser.add_argument('--variants', default=None, help="YAML file with a 'variants' list of overrides")
+    parser.add_argument('--sweep', action='append', default=None,
+                        help=f"One variant per value, e.g. {sweep_example}")
+    parser.add_argument('--connect-url', default=None, help="Kafka Connect REST URL (default: kafka_connect.url)")
+    parser.add_argument('--records', type=int, default=None,
+                        help=f"Rows in the {harness_class.workload} of every variant")
+    parser.add_argument('--repetitions', type=int, default=None)
+    parser.add_argument('--deploy-only', action='store_true',
+                        help="Only redeploy each variant and time its startup (e.g. against fake_connect.py)")
+    return parser
+
+
+async def run_tuning_harness(harness_class, args: argparse.Namespace) -> str:
+    """Build settings and variants from config.yaml and args, run the harness and save the results"""
+    if not connect_client_available():
+        raise SystemExit("❌ aiohttp is required to drive the Connect REST API")
+    monitor = CDCMassInsertMonitor(args.config)
+    section = monitor.config.get(harness_class.section) or {}
+    settings = {**harness_class.default_settings, **{key: value for key, value in section.items() if key != 'variants'}}
+    for key in ('template', 'records', 'repetitions'):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    settings.update(harness_class.settings_from_args(args))
+    name, template = load_connector_template(settings['template'])
+    variants = load_variants(args.variants, section, args.sweep)
+    connect_url = args.connect_url or (monitor.config.get('kafka_connect') or {}).get('url', DEFAULT_CONNECT_URL)
+
+    print(f"🎯 {harness_class.title}")
+    print("=" * 40)
+    print(f"🔌 Connector {name} from {settings['template']} via {connect_url}")
+    if args.deploy_only:
+        print(f"🧪 Deploy-only: {len(variants)} variant(s), no {harness_class.workload}")
+    else:
+        print(f"📈 {harness_class.workload.capitalize()}: {int(settings['records']):,} rows per variant, "
+              f"{len(variants)} variant(s)")
+
+    run_metadata = await collect_run_metadata(monitor.config, {'kind': harness_class.section, 'settings': settings,
+                                                               'variants': variants})
+    async with ConnectRestClient(connect_url) as client:
+        harness = harness_class(monitor, client, name, template, settings, args.deploy_only)
+        try:
+            results = await harness.run(variants)
+        finally:
+            await monitor.db_pools.close()
+
+    harness.print_ranking(results['ranking'])
+    directory = monitor.results_config.get('directory', 'testing-results')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{harness_class.section}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump({'connector': name, 'settings': settings, 'variants': variants, 'run_metadata': run_metadata,
+                   'connect_api_latency': client.latency_summary(), **results}, f, indent=2, default=str)
+    print(f"\n💾 Results saved to: {path}")
+    return path
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Parallel Chunked Source vs Target Consistency Verifier
+======================================================
+
+Verifikasi isi inventory.orders (source) terhadap orders (target):
+- Tabel dibagi menjadi range primary key (chunk_size id per range)
+- Per range: jumlah row dan hash aggregate dihitung di dalam masing-masing
+  database (sum dari md5 per row), jadi data tidak ditarik ke client
+- Banyak range dibandingkan bersamaan (pool koneksi khusus per database)
+- Hanya range yang berbeda yang dipecah lagi (fanout), rekursif sampai
+  leaf_size, lalu dibandingkan per row: missing, extra, berbeda
+- Row yang berbeda dicek ulang sekali setelah recheck_seconds supaya
+  replikasi yang masih berjalan tidak dilaporkan sebagai error
+
+Equal row counts can hide rows that are missing on one side and duplicated
+or stale on the other. The per-range checksum is an order independent sum of
+64-bit row hashes over the primary-key index range, so matching ranges cost
+one index range scan per database and only mismatching ranges are refined.
+Column values are normalized by each side's own type before hashing: a DATE
+on the source and the epoch-day integer Debezium writes to an auto-created
+target column hash the same, as do timestamps and epoch microseconds.
+
+Usage:
+    python consistency_check.py [--chunk-size 100000] [--concurrency 8] [--from-id 1] [--until-id 5000000]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import yaml
+
+from db_pools import DatabasePoolManager
+
+DEFAULT_SETTINGS = {
+    'source_table': 'inventory.orders',
+    'target_table': 'orders',
+    'id_column': 'id',
+    'ignore_columns': ['_synced_at'],  # added on the target by the sink's addTS SMT
+    'chunk_size': 100000,
+    'fanout': 10,
+    'leaf_size': 1000,
+    'concurrency': 8,
+    'recheck_seconds': 5,
+    'max_reported_rows': 1000,
+    'sample_rows': 10
+}
+
+# Dedicated pools, sized to the concurrency, so the monitors' pools are left alone
+POOL_NAMES = {'source': 'verify_source', 'target': 'verify_target'}
+
+COLUMNS_SQL = """
+    SELECT column_name, data_type
+    FROM information_schema.columns
+    WHERE table_schema = $1 AND table_name = $2
+    ORDER BY ordinal_position
+"""
+
+RANGE_CHECKSUM_SQL = """
+    SELECT count(*) AS rows,
+           coalesce(sum(('x' || substr(md5({row_text}), 1, 16))::bit(64)::bigint), 0)::text AS checksum
+    FROM {table}
+    WHERE {id} >= $1 AND {id} < $2
+"""
+
+ROW_HASHES_SQL = "SELECT {id} AS id, md5({row_text}) AS row_hash FROM {table} WHERE {id} >= $1 AND {id} < $2"
+
+ROW_VALUES_SQL = "SELECT {id} AS id, {columns} FROM {table} WHERE {id} = ANY($1::bigint[]) ORDER BY {id}"
+
+BOUNDS_SQL = "SELECT min({id}) AS min_id, max({id}) AS max_id FROM {table}"
+
+DIFFERENCE_KINDS = ('missing_in_target', 'extra_in_target', 'different')
+
+
+def split_table(table: str) -> Tuple[str, str]:
+    """('schema', 'table') with public as the default schema"""
+    schema, _, name = table.rpartition('.')
+    return schema or 'public', name
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def normalized_column(column: str, data_type: str) -> str:
+    """SQL expression rendering column as text comparable across the source and target types"""
+    quoted = quote_identifier(column)
+    if data_type == 'date':
+        # io.debezium.time.Date: days since the epoch
+        return f"({quoted} - DATE '1970-01-01')::text"
+    if data_type.startswith('timestamp'):
+        # io.debezium.time.MicroTimestamp: microseconds since the epoch
+        return f"(extract(epoch FROM {quoted}) * 1000000)::bigint::text"
+    return f"{quoted}::text"
+
+
+def row_text(columns: List[Tuple[str, str]]) -> str:
+    """One text value per row; NULL renders as \\N so it differs from an empty string"""
+    return "concat_ws('|', " + ', '.join(
+        f"coalesce({normalized_column(name, data_type)}, '\\N')" for name, data_type in columns) + ")"
+
+
+def split_range(low: int, high: int, parts: int) -> List[Tuple[int, int]]:
+    """[low, high) in at most parts contiguous, non-empty sub-ranges"""
+    width = max(1, -(-(high - low) // parts))
+    return [(start, min(start + width, high)) for start in range(low, high, width)]
+
+
+class ConsistencyChecker:
+    def __init__(self, db_pools: DatabasePoolManager, settings: Dict[str, Any]):
+        """Range checksums computed in both databases, refined only where they differ"""
+        self.db_pools = db_pools
+        self.settings = settings
+        self.id_column = settings['id_column']
+        self.tables = {'source': settings['source_table'], 'target': settings['target_table']}
+        self.semaphore = asyncio.Semaphore(int(settings['concurrency']))
+        self.columns = {}
+        self.sql = {}
+        self.schema_notes = []
+        self.differences = {kind: set() for kind in DIFFERENCE_KINDS}
+        self.transient_rows = 0
+        self.stats = {'ranges_compared': 0, 'ranges_mismatched': 0, 'leaf_ranges': 0, 'rows_compared': 0,
+                      'source_rows': 0, 'target_rows': 0, 'queries': 0}
+        for side in POOL_NAMES:
+            self.db_pools.register(POOL_NAMES[side], 'database' if side == 'source' else 'target_database',
+                                   int(settings['concurrency']), int(settings['concurrency']))
+
+    async def _fetch(self, side: str, method: str, sql: str, *args):
+        async with self.db_pools.acquire(POOL_NAMES[side]) as conn:
+            self.stats['queries'] += 1
+            return await getattr(conn, method)(sql, *args)
+
+    async def prepare(self) -> Dict[str, Any]:
+        """Discover the compared columns and build the per-side queries"""
+        discovered = {}
+        for side, table in self.tables.items():
+            rows = await self._fetch(side, 'fetch', COLUMNS_SQL, *split_table(table))
+            if not rows:
+                raise RuntimeError(f"table {table} not found on the {side} database")
+            discovered[side] = {row['column_name']: row['data_type'] for row in rows}
+
+        ignored = set(self.settings['ignore_columns'])
+        names = [name for name in discovered['source'] if name in discovered['target'] and name not in ignored]
+        if self.id_column not in names:
+            raise RuntimeError(f"primary key column {self.id_column} missing on one side")
+        for name in discovered['source']:
+            if name not in discovered['target'] and name not in ignored:
+                self.schema_notes.append(f"column {name} missing on the target (not compared)")
+        for name in discovered['target']:
+            if name not in discovered['source'] and name not in ignored:
+                self.schema_notes.append(f"column {name} only on the target (not compared)")
+
+        id_column = quote_identifier(self.id_column)
+        for side, table in self.tables.items():
+            self.columns[side] = [(name, discovered[side][name]) for name in names]
+            text = row_text(self.columns[side])
+            self.sql[side] = {
+                'checksum': RANGE_CHECKSUM_SQL.format(row_text=text, table=table, id=id_column),
+                'hashes': ROW_HASHES_SQL.format(row_text=text, table=table, id=id_column),
+                'values': ROW_VALUES_SQL.format(
+                    columns=', '.join(f"{normalized_column(name, data_type)} AS {quote_identifier(name)}"
+                                      for name, data_type in self.columns[side] if name != self.id_column),
+                    table=table, id=id_column),
+                'bounds': BOUNDS_SQL.format(table=table, id=id_column)
+            }
+        return {'columns': names, 'notes': self.schema_notes}
+
+    async def bounds(self) -> Optional[Tuple[int, int]]:
+        """[low, high) covering the ids of both tables, None when both are empty"""
+        results = await asyncio.gather(*(self._fetch(side, 'fetchrow', self.sql[side]['bounds'])
+                                         for side in self.tables))
+        lows = [row['min_id'] for row in results if row['min_id'] is not None]
+        highs = [row['max_id'] for row in results if row['max_id'] is not None]
+        if not lows:
+            return None
+        return min(lows), max(highs) + 1
+
+    async def range_checksums(self, low: int, high: int) -> Dict[str, Any]:
+        """(rows, checksum) of [low, high) on both sides, computed concurrently"""
+        async with self.semaphore:
+            source, target = await asyncio.gather(
+                self._fetch('source', 'fetchrow', self.sql['source']['checksum'], low, high),
+                self._fetch('target', 'fetchrow', self.sql['target']['checksum'], low, high)
+            )
+        self.stats['ranges_compared'] += 1
+        return {'source': (source['rows'], source['checksum']), 'target': (target['rows'], target['checksum'])}
+
+    async def row_differences(self, low: int, high: int) -> Dict[str, set]:
+        """Ids of [low, high) missing on the target, only on the target, or with different values"""
+        async with self.semaphore:
+            source, target = await asyncio.gather(
+                self._fetch('source', 'fetch', self.sql['source']['hashes'], low, high),
+                self._fetch('target', 'fetch', self.sql['target']['hashes'], low, high)
+            )
+        source = {row['id']: row['row_hash'] for row in source}
+        target = {row['id']: row['row_hash'] for row in target}
+        return {
+            'missing_in_target': source.keys() - target.keys(),
+            'extra_in_target': target.keys() - source.keys(),
+            'different': {key for key in source.keys() & target.keys() if source[key] != target[key]}
+        }
+
+    async def check_leaf(self, low: int, high: int):
+        """Row-by-row comparison, rechecked once so rows still replicating are not reported"""
+        self.stats['leaf_ranges'] += 1
+        found = await self.row_differences(low, high)
+        recheck_seconds = float(self.settings['recheck_seconds'])
+        if recheck_seconds > 0 and any(found.values()):
+            await asyncio.sleep(recheck_seconds)
+            again = await self.row_differences(low, high)
+            persisting = {kind: found[kind] & again[kind] for kind in DIFFERENCE_KINDS}
+            self.transient_rows += sum(len(found[kind] - persisting[kind]) for kind in DIFFERENCE_KINDS)
+            found = persisting
+        for kind in DIFFERENCE_KINDS:
+            self.differences[kind] |= found[kind]
+
+    async def check_range(self, low: int, high: int, checksums: Optional[Dict[str, Any]] = None):
+        """Compare [low, high); split and recurse only when it does not match"""
+        if checksums is None:
+            checksums = await self.range_checksums(low, high)
+        if checksums['source'] == checksums['target']:
+            return
+        self.stats['ranges_mismatched'] += 1
+        if high - low <= int(self.settings['leaf_size']):
+            await self.check_leaf(low, high)
+            return
+        await asyncio.gather(*(self.check_range(start, end)
+                               for start, end in split_range(low, high, int(self.settings['fanout']))))
+
+    async def check_top_range(self, low: int, high: int):
+        """Top-level range: its row counts feed the totals"""
+        checksums = await self.range_checksums(low, high)
+        self.stats['source_rows'] += checksums['source'][0]
+        self.stats['target_rows'] += checksums['target'][0]
+        self.stats['rows_compared'] += max(checksums['source'][0], checksums['target'][0])
+        await self.check_range(low, high, checksums)
+
+    async def samples(self) -> List[Dict[str, Any]]:
+        """Normalized values of a few differing rows from both sides"""
+        ids = sorted(self.differences['different'])[:int(self.settings['sample_rows'])]
+        if not ids:
+            return []
+        source, target = await asyncio.gather(
+            self._fetch('source', 'fetch', self.sql['source']['values'], ids),
+            self._fetch('target', 'fetch', self.sql['target']['values'], ids)
+        )
+        target = {row['id']: dict(row) for row in target}
+        return [{'id': row['id'], 'source': dict(row), 'target': target.get(row['id'])} for row in source]
+
+    async def run(self, from_id: Optional[int] = None, until_id: Optional[int] = None,
+                  progress=None) -> Dict[str, Any]:
+        """Verify [from_id, until_id] (default: every id on either side)"""
+        start = time.perf_counter()
+        schema = await self.prepare()
+        bounds = await self.bounds()
+        result = {'tables': self.tables, 'schema': schema, 'settings': self.settings}
+        if bounds is None:
+            return {**result, 'consistent': True, 'range': None, 'stats': self.stats,
+                    'elapsed_seconds': round(time.perf_counter() - start, 3)}
+        low = bounds[0] if from_id is None else from_id
+        high = bounds[1] if until_id is None else until_id + 1
+
+        chunks = split_range(low, high, max(1, -(-(high - low) // int(self.settings['chunk_size']))))
+        done = 0
+
+        async def check_chunk(chunk_low: int, chunk_high: int):
+            nonlocal done
+            await self.check_top_range(chunk_low, chunk_high)
+            done += 1
+            if progress is not None:
+                progress(done, len(chunks))
+
+        await asyncio.gather(*(check_chunk(chunk_low, chunk_high) for chunk_low, chunk_high in chunks))
+        elapsed = time.perf_counter() - start
+        limit = int(self.settings['max_reported_rows'])
+        counts = {kind: len(ids) for kind, ids in self.differences.items()}
+        return {
+            **result,
+            'range': {'from_id': low, 'until_id': high - 1, 'chunks': len(chunks)},
+            'consistent': not any(counts.values()),
+            'difference_counts': counts,
+            'differences': {kind: sorted(ids)[:limit] for kind, ids in self.differences.items()},
+            'transient_rows': self.transient_rows,
+            'samples': await self.samples(),
+            'stats': self.stats,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(self.stats['rows_compared'] / elapsed, 1) if elapsed > 0 else None
+        }
+
+
+def print_report(report: Dict[str, Any]):
+    stats = report['stats']
+    print(f"\n🔍 CONSISTENCY CHECK: {report['tables']['source']} vs {report['tables']['target']}")
+    print("=" * 60)
+    for note in report['schema']['notes']:
+        print(f"  ⚠️  {note}")
+    if report['range'] is None:
+        print("  📭 Both tables are empty")
+        return
+    print(f"  📏 Ids {report['range']['from_id']:,} - {report['range']['until_id']:,} "
+          f"in {report['range']['chunks']:,} ranges, columns: {', '.join(report['schema']['columns'])}")
+    print(f"  📋 Source rows: {stats['source_rows']:,}  Target rows: {stats['target_rows']:,}")
+    print(f"  🧮 {stats['ranges_compared']:,} range checksums, {stats['ranges_mismatched']:,} mismatched, "
+          f"{stats['leaf_ranges']:,} compared row by row")
+    print(f"  ⏱️  {report['elapsed_seconds']:.1f}s ({report['rows_per_second'] or 0:,.0f} rows/s)")
+    if report['transient_rows']:
+        print(f"  🔄 {report['transient_rows']:,} row(s) differed only until the recheck (still replicating)")
+    if report['consistent']:
+        print("  ✅ Source and target are consistent")
+        return
+    labels = {'missing_in_target': 'Missing on target', 'extra_in_target': 'Only on target',
+              'different': 'Different values'}
+    for kind, count in report['difference_counts'].items():
+        if count:
+            ids = report['differences'][kind]
+            shown = ', '.join(str(i) for i in ids[:10]) + (' ...' if count > 10 else '')
+            print(f"  ❌ {labels[kind]}: {count:,} row(s): {shown}")
+    for sample in report['samples'][:3]:
+        print(f"    id {sample['id']}: source={sample['source']} target={sample['target']}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Verify the target orders table against the source by PK ranges")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--chunk-size', type=int, default=None, help="Ids per top-level range")
+    parser.add_argument('--concurrency', type=int, default=None, help="Ranges compared at once")
+    parser.add_argument('--from-id', type=int, default=None)
+    parser.add_argument('--until-id', type=int, default=None, help="Last id checked (inclusive)")
+    parser.add_argument('--recheck-seconds', type=float, default=None,
+                        help="Delay before differing rows are compared again (0 disables)")
+    return parser.parse_args()
+
+
+async def main():
+    """Main function"""
+    args = parse_args()
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+    settings = {**DEFAULT_SETTINGS, **(config.get('consistency') or {})}
+    for key in ('chunk_size', 'concurrency', 'recheck_seconds'):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+
+    print("🎯 Source vs Target Consistency Check")
+    print(f"🧵 {settings['concurrency']} concurrent ranges of {int(settings['chunk_size']):,} ids")
+
+    def progress(done: int, total: int):
+        if done == total or done % max(1, total // 20) == 0:
+            print(f"  ⏳ {done:,}/{total:,} ranges checked")
+
+    async with DatabasePoolManager.from_config(config) as pools:
+        report = await ConsistencyChecker(pools, settings).run(args.from_id, args.until_id, progress)
+
+    print_report(report)
+    directory = (config.get('results') or {}).get('directory', 'testing-results')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"consistency_check_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\n💾 Report saved to: {path}")
+    if not report['consistent']:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Consumer Lag Time Series for the JDBC Sink Group
+================================================
+
+Lag per partisi untuk consumer group sink (connect-pg-sink-connector):
+- Parse output `kafka-consumer-groups --describe` menjadi record per partisi
+- Atau ambil langsung lewat KafkaAdminMetricsCollector (kafka_admin_metrics)
+- Time series CURRENT-OFFSET / LOG-END-OFFSET / LAG per sample
+- Drain rate (pesan/detik yang dikonsumsi sink), produce rate dan estimasi
+  waktu sampai lag = 0
+
+If the log-end offset grows faster than the sink's committed offset, lag
+builds up and the sink (not Debezium) is the bottleneck. Committed offsets
+advance in steps of the sink's commit interval, so rates are computed over a
+window of samples rather than between two consecutive samples.
+
+Usage:
+    python consumer_lag.py [--duration 60] [--interval 1] [--source protocol|cli]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import json
+import subprocess
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from kafka_admin_metrics import DEFAULT_BOOTSTRAP_SERVERS, MAIN_TOPIC, KafkaAdminMetricsCollector
+
+SINK_GROUP = 'connect-pg-sink-connector'
+KAFKA_CONTAINER = 'debezium-cdc-mirroring-kafka-1'
+
+DESCRIBE_COLUMNS = {
+    'TOPIC': 'topic',
+    'PARTITION': 'partition',
+    'CURRENT-OFFSET': 'current_offset',
+    'LOG-END-OFFSET': 'log_end_offset',
+    'LAG': 'lag',
+    'CONSUMER-ID': 'consumer_id',
+    'HOST': 'host',
+    'CLIENT-ID': 'client_id'
+}
+INTEGER_FIELDS = ('partition', 'current_offset', 'log_end_offset', 'lag')
+
+
+def parse_consumer_group_describe(output: str) -> List[Dict[str, Any]]:
+    """Per-partition records from `kafka-consumer-groups --describe --group ...` output"""
+    records = []
+    header = None
+    for line in output.splitlines():
+        fields = line.split()
+        if not fields:
+            continue
+        if fields[0] == 'GROUP' and 'TOPIC' in fields:
+            header = fields
+            continue
+        if header is None or len(fields) < len(header) - 3:
+            continue  # warnings such as "Consumer group ... has no active members."
+        record = {}
+        for column, value in zip(header, fields):
+            key = DESCRIBE_COLUMNS.get(column)
+            if key is None:
+                continue
+            if key in INTEGER_FIELDS:
+                record[key] = int(value) if value.lstrip('-').isdigit() else None
+            else:
+                record[key] = None if value == '-' else value
+        if record.get('partition') is not None:
+            records.append(record)
+    return records
+
+
+def group_detail_from_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Consumer group entry in the KafkaAdminMetricsCollector shape, from parsed records"""
+    partitions = [
+        {
+            'topic': record.get('topic'),
+            'partition': record['partition'],
+            'committed_offset': record.get('current_offset'),
+            'end_offset': record.get('log_end_offset'),
+            'lag': record.get('lag'),
+            'consumer_id': record.get('consumer_id')
+        }
+        for record in records
+    ]
+    return {'partitions': partitions, 'total_lag': sum(p['lag'] or 0 for p in partitions)}
+
+
+def records_from_native(group_detail: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-partition records from a KafkaAdminMetricsCollector consumer group entry"""
+    return [
+        {
+            'topic': partition['topic'],
+            'partition': partition['partition'],
+            'current_offset': partition['committed_offset'],
+            'log_end_offset': partition['end_offset'],
+            'lag': partition['lag']
+        }
+        for partition in group_detail.get('partitions', [])
+    ]
+
+
+def describe_group_cli(group: str = SINK_GROUP, container: str = KAFKA_CONTAINER) -> str:
+    """Raw `kafka-consumer-groups --describe` output via docker exec"""
+    result = subprocess.run(
+        ['docker', 'exec', container, 'kafka-consumer-groups', '--bootstrap-server', 'localhost:9092',
+         '--describe', '--group', group],
+        capture_output=True, text=True, timeout=30
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"kafka-consumer-groups exited with {result.returncode}")
+    return result.stdout
+
+
+class ConsumerLagTracker:
+    def __init__(self, group: str = SINK_GROUP, topic: Optional[str] = MAIN_TOPIC,
+                 max_samples: int = 3600, rate_window_seconds: float = 30.0):
+        """Bounded time series of per-partition lag for one consumer group"""
+        self.group = group
+        self.topic = topic
+        self.rate_window_seconds = rate_window_seconds
+        self.samples = deque(maxlen=max_samples)
+
+    def add_sample(self, records: List[Dict[str, Any]], timestamp: Optional[float] = None):
+        """Record one observation of every partition (records for other topics are ignored)"""
+        partitions = {}
+        for record in records:
+            if self.topic is not None and record.get('topic') not in (None, self.topic):
+                continue
+            partitions[record['partition']] = {
+                'current_offset': record.get('current_offset'),
+                'log_end_offset': record.get('log_end_offset'),
+                'lag': record.get('lag')
+            }
+        if not partitions:
+            return
+        self.samples.append({
+            'timestamp': timestamp if timestamp is not None else time.time(),
+            'partitions': partitions,
+            'consumed': sum(p['current_offset'] or 0 for p in partitions.values()),
+            'produced': sum(p['log_end_offset'] or 0 for p in partitions.values()),
+            'lag': sum(p['lag'] or 0 for p in partitions.values())
+        })
+
+    def add_describe_output(self, output: str, timestamp: Optional[float] = None):
+        """Record a sample from kafka-consumer-groups text output"""
+        self.add_sample(parse_consumer_group_describe(output), timestamp)
+
+    def add_native_metrics(self, kafka_metrics: Dict[str, Any], timestamp: Optional[float] = None):
+        """Record a sample from collect_kafka_metrics output (protocol or parsed CLI)"""
+        group_detail = kafka_metrics.get('consumer_groups', {}).get(self.group)
+        if isinstance(group_detail, dict):
+            self.add_sample(records_from_native(group_detail), timestamp)
+
+    def _rate(self, key: str) -> Optional[float]:
+        """Offsets per second for key ('consumed'/'produced') over the rate window"""
+        if len(self.samples) < 2:
+            return None
+        latest = self.samples[-1]
+        earliest = latest
+        for sample in reversed(self.samples):
+            if latest['timestamp'] - sample['timestamp'] > self.rate_window_seconds:
+                break
+            earliest = sample
+        if earliest is latest:
+            earliest = self.samples[-2]
+        elapsed = latest['timestamp'] - earliest['timestamp']
+        if elapsed <= 0:
+            return None
+        return (latest[key] - earliest[key]) / elapsed
+
+    def drain_rate(self) -> Optional[float]:
+        """Messages per second consumed (committed) by the sink"""
+        return self._rate('consumed')
+
+    def produce_rate(self) -> Optional[float]:
+        """Messages per second appended to the topic (Debezium output)"""
+        return self._rate('produced')
+
+    def time_to_zero_lag(self) -> Optional[float]:
+        """Seconds until lag reaches zero at current rates (0 when caught up, None if not shrinking)"""
+        if not self.samples:
+            return None
+        lag = self.samples[-1]['lag']
+        if lag == 0:
+            return 0.0
+        drain, produce = self.drain_rate(), self.produce_rate()
+        if drain is None or produce is None or drain - produce <= 0:
+            return None
+        return lag / (drain - produce)
+
+    def summary(self) -> Dict[str, Any]:
+        """Latest lag, rates, time-to-zero estimate and the per-partition series"""
+        if not self.samples:
+            return {'group': self.group, 'topic': self.topic, 'samples': 0}
+        latest = self.samples[-1]
+        drain, produce = self.drain_rate(), self.produce_rate()
+        ttz = self.time_to_zero_lag()
+        lags = [sample['lag'] for sample in self.samples]
+        series = {}
+        for sample in self.samples:
+            for partition, values in sample['partitions'].items():
+                entry = series.setdefault(str(partition), {
+                    'timestamps': [], 'current_offset': [], 'log_end_offset': [], 'lag': []
+                })
+                entry['timestamps'].append(round(sample['timestamp'], 3))
+                entry['current_offset'].append(values['current_offset'])
+                entry['log_end_offset'].append(values['log_end_offset'])
+                entry['lag'].append(values['lag'])
+        return {
+            'group': self.group,
+            'topic': self.topic,
+            'samples': len(self.samples),
+            'latest_lag': latest['lag'],
+            'max_lag': max(lags),
+            'drain_rate_msgs_per_sec': round(drain, 2) if drain is not None else None,
+            'produce_rate_msgs_per_sec': round(produce, 2) if produce is not None else None,
+            'time_to_zero_lag_seconds': round(ttz, 1) if ttz is not None else None,
+            # Lag growing while the topic grows means the sink cannot keep up with Debezium
+            'sink_is_bottleneck': bool(latest['lag'] > 0 and drain is not None and produce is not None
+                                       and produce > drain),
+            'partitions': series
+        }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Track consumer lag of the JDBC sink group")
+    parser.add_argument('--group', default=SINK_GROUP)
+    parser.add_argument('--topic', default=MAIN_TOPIC)
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconds to sample")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between samples")
+    parser.add_argument('--source', choices=('protocol', 'cli'), default='protocol')
+    parser.add_argument('--bootstrap-servers', default=DEFAULT_BOOTSTRAP_SERVERS)
+    args = parser.parse_args()
+
+    tracker = ConsumerLagTracker(args.group, args.topic)
+    collector = KafkaAdminMetricsCollector(args.bootstrap_servers, args.topic) if args.source == 'protocol' else None
+    deadline = time.time() + args.duration
+    try:
+        while time.time() < deadline:
+            if collector is not None:
+                tracker.add_native_metrics(collector.collect(include_log_dirs=False))
+            else:
+                tracker.add_describe_output(describe_group_cli(args.group))
+            latest = tracker.samples[-1] if tracker.samples else None
+            if latest:
+                drain = tracker.drain_rate()
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] lag={latest['lag']:,} "
+                      f"drain={drain or 0:,.1f} msg/s")
+            time.sleep(args.interval)
+    finally:
+        if collector is not None:
+            collector.close()
+
+    summary = tracker.summary()
+    summary.pop('partitions')
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
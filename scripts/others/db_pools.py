@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Shared Database Connection Pools
+================================
+
+Pool koneksi asyncpg yang dibuat sekali per run untuk source dan target:
+- Pool 'source' (database) dan 'target' (target_database) dari config.yaml
+- Pool tambahan bernama (mis. writer untuk mass insert) lewat register()
+- Query monitoring di-prepare sekali per koneksi (statement cache asyncpg)
+- Retry dengan exponential backoff ketika database belum siap
+- Metrics waktu tunggu acquire per pool (histogram)
+
+Opening a connection per measurement costs a TCP + auth handshake that ends
+up inside latency numbers, and every phase churns backends on the databases
+being measured. Pools are opened lazily on first use, so a target database
+that is down does not stop the source from being monitored.
+
+Usage:
+    python db_pools.py [--config config.yaml] [--acquires 100]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+
+import asyncpg
+import yaml
+
+from latency_histogram import LatencyHistogram
+
+# Pool name -> config.yaml section with the connection settings
+DB_CONFIG_KEYS = {'source': 'database', 'target': 'target_database'}
+
+MONITORING_QUERIES = {
+    'database_stats': """
+        SELECT datname, numbackends, xact_commit, xact_rollback,
+               blks_read, blks_hit, tup_returned, tup_fetched,
+               tup_inserted, tup_updated, tup_deleted
+        FROM pg_stat_database
+        WHERE datname = current_database()
+    """,
+    'connections_by_state': """
+        SELECT state, count(*) as count
+        FROM pg_stat_activity
+        WHERE datname = current_database()
+        GROUP BY state
+    """,
+    'active_connections': "SELECT count(*) FROM pg_stat_activity WHERE state = 'active'",
+    'database_size': "SELECT pg_size_pretty(pg_database_size(current_database()))"
+}
+
+SOURCE_QUERIES = {
+    'replication_slots': """
+        SELECT slot_name, plugin, slot_type, database, active,
+               restart_lsn, confirmed_flush_lsn
+        FROM pg_replication_slots
+    """,
+    'wal_status': """
+        SELECT pg_current_wal_lsn() as current_lsn,
+               pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0') as wal_bytes
+    """
+}
+
+# Failures worth retrying: the server is starting, full, or not reachable yet
+RETRYABLE_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.CannotConnectNowError,
+                    asyncpg.TooManyConnectionsError, asyncpg.PostgresConnectionError)
+
+
+class MonitoringConnection(asyncpg.Connection):
+    """asyncpg connection that runs the monitoring queries it warmed at connect time"""
+
+    async def prepare_monitoring(self, queries: Dict[str, str]):
+        """Run every query once so the statement cache holds it prepared for later acquires"""
+        # PreparedStatement objects are invalidated when the pool releases the connection;
+        # the per-connection statement cache survives the release
+        self.monitoring_sql = dict(queries)
+        for sql in queries.values():
+            try:
+                await self.fetch(sql)
+            except asyncpg.PostgresError:
+                pass  # e.g. a server without the view or without privileges on it
+
+    async def _run_monitoring(self, method: str, key: str, *args):
+        sql = getattr(self, 'monitoring_sql', {}).get(key) or {**MONITORING_QUERIES, **SOURCE_QUERIES}[key]
+        return await getattr(self, method)(sql, *args)
+
+    async def fetch_monitoring(self, key: str, *args):
+        return await self._run_monitoring('fetch', key, *args)
+
+    async def fetchrow_monitoring(self, key: str, *args):
+        return await self._run_monitoring('fetchrow', key, *args)
+
+    async def fetchval_monitoring(self, key: str, *args):
+        return await self._run_monitoring('fetchval', key, *args)
+
+
+class DatabasePoolManager:
+    def __init__(self, config: Dict[str, Any], min_size: int = 1, max_size: int = 5,
+                 connect_retries: int = 3, retry_backoff: float = 0.5, max_backoff: float = 8.0,
+                 connect_timeout: float = 10.0, command_timeout: Optional[float] = 60.0):
+        """Lazily opened pools for the databases in config (the parsed config.yaml)"""
+        self.config = config
+        self.connect_retries = connect_retries
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.connect_timeout = connect_timeout
+        self.command_timeout = command_timeout
+        self.specs = {}
+        self.pools = {}
+        self.wait_histograms = {}
+        self.stats = {}
+        self._locks = {}
+        for name, config_key in DB_CONFIG_KEYS.items():
+            queries = {**MONITORING_QUERIES, **SOURCE_QUERIES} if name == 'source' else MONITORING_QUERIES
+            self.register(name, config_key, min_size, max_size, queries)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **overrides) -> 'DatabasePoolManager':
+        """Manager using the database_pool section of config.yaml"""
+        pool_config = config.get('database_pool') or {}
+        settings = {
+            'min_size': int(pool_config.get('min_size', 1)),
+            'max_size': int(pool_config.get('max_size', 5)),
+            'connect_retries': int(pool_config.get('connect_retries', 3)),
+            'retry_backoff': float(pool_config.get('retry_backoff_seconds', 0.5)),
+            'max_backoff': float(pool_config.get('max_backoff_seconds', 8.0)),
+            'connect_timeout': float(pool_config.get('connect_timeout_seconds', 10.0)),
+            'command_timeout': pool_config.get('command_timeout_seconds', 60.0)
+        }
+        settings.update(overrides)
+        return cls(config, **settings)
+
+    def register(self, name: str, config_key: str, min_size: int, max_size: int,
+                 queries: Optional[Dict[str, str]] = None):
+        """Declare a pool; it is created on first use and replaced if its size changes"""
+        spec = {'config_key': config_key, 'min_size': min(min_size, max_size), 'max_size': max_size,
+                'queries': queries or {}}
+        previous = self.specs.get(name)
+        if previous is not None and previous['min_size'] == spec['min_size'] \
+                and previous['max_size'] == spec['max_size'] and previous['config_key'] == config_key:
+            return
+        self.specs[name] = spec
+        self.wait_histograms.setdefault(name, LatencyHistogram())
+        self.stats.setdefault(name, {'acquires': 0, 'acquire_errors': 0, 'connect_attempts': 0,
+                                     'connect_retries': 0, 'connections_opened': 0, 'last_error': None})
+        self._locks.setdefault(name, asyncio.Lock())
+        stale = self.pools.pop(name, None)
+        if stale is not None:
+            stale.terminate()
+
+    async def _init_connection(self, conn, name: str):
+        """Pool init callback: runs once for every new physical connection"""
+        self.stats[name]['connections_opened'] += 1
+        if self.specs[name]['queries']:
+            await conn.prepare_monitoring(self.specs[name]['queries'])
+
+    async def _create_pool(self, name: str) -> asyncpg.Pool:
+        """Create one pool, retrying connection failures with exponential backoff"""
+        spec = self.specs[name]
+        db_config = self.config[spec['config_key']]
+        stats = self.stats[name]
+        delay = self.retry_backoff
+        for attempt in range(self.connect_retries + 1):
+            stats['connect_attempts'] += 1
+            try:
+                return await asyncpg.create_pool(
+                    host=db_config['host'],
+                    port=db_config['port'],
+                    user=db_config['user'],
+                    password=db_config['password'],
+                    database=db_config['database'],
+                    min_size=spec['min_size'],
+                    max_size=spec['max_size'],
+                    timeout=self.connect_timeout,
+                    command_timeout=self.command_timeout,
+                    connection_class=MonitoringConnection,
+                    init=lambda conn: self._init_connection(conn, name)
+                )
+            except RETRYABLE_ERRORS as e:
+                stats['last_error'] = str(e)
+                if attempt == self.connect_retries:
+                    raise
+                stats['connect_retries'] += 1
+                print(f"  ⚠️  {name} database not reachable (attempt {attempt + 1}), retrying in {delay:.1f}s: {e}")
+                # Jitter keeps concurrent callers from retrying in lockstep
+                await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+                delay = min(delay * 2, self.max_backoff)
+
+    async def pool(self, name: str) -> asyncpg.Pool:
+        """The named pool, created on first use"""
+        if name in self.pools:
+            return self.pools[name]
+        async with self._locks[name]:
+            if name not in self.pools:
+                self.pools[name] = await self._create_pool(name)
+        return self.pools[name]
+
+    async def acquire_connection(self, name: str, timeout: Optional[float] = None):
+        """Take a connection from the named pool, recording how long the caller waited"""
+        pool = await self.pool(name)
+        wait_start = time.perf_counter()
+        try:
+            conn = await pool.acquire(timeout=timeout)
+        except Exception:
+            self.stats[name]['acquire_errors'] += 1
+            raise
+        self.wait_histograms[name].record_seconds(time.perf_counter() - wait_start)
+        self.stats[name]['acquires'] += 1
+        return conn
+
+    async def release(self, name: str, conn):
+        """Return a connection taken with acquire_connection()"""
+        await self.pools[name].release(conn)
+
+    @asynccontextmanager
+    async def acquire(self, name: str, timeout: Optional[float] = None):
+        """async with pools.acquire('source') as conn: ..."""
+        conn = await self.acquire_connection(name, timeout)
+        try:
+            yield conn
+        finally:
+            await self.release(name, conn)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Acquire wait-time percentiles, counters and current size of every pool"""
+        metrics = {}
+        for name, spec in self.specs.items():
+            pool = self.pools.get(name)
+            metrics[name] = {
+                **self.stats[name],
+                'open': pool is not None,
+                'min_size': spec['min_size'],
+                'max_size': spec['max_size'],
+                'size': pool.get_size() if pool is not None else 0,
+                'idle': pool.get_idle_size() if pool is not None else 0,
+                'prepared_queries': sorted(spec['queries']),
+                'acquire_wait': self.wait_histograms[name].summary()
+            }
+        return metrics
+
+    async def close(self):
+        """Close every open pool"""
+        pools, self.pools = self.pools, {}
+        for pool in pools.values():
+            try:
+                await asyncio.wait_for(pool.close(), timeout=10)
+            except Exception:
+                pool.terminate()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Exercise the shared source/target pools")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--acquires', type=int, default=100, help="Monitoring queries per database")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    async with DatabasePoolManager.from_config(config) as pools:
+        async def query(name: str):
+            for _ in range(args.acquires):
+                async with pools.acquire(name) as conn:
+                    await conn.fetchrow_monitoring('database_stats')
+
+        results = await asyncio.gather(*(query(name) for name in DB_CONFIG_KEYS), return_exceptions=True)
+        for name, result in zip(DB_CONFIG_KEYS, results):
+            if isinstance(result, Exception):
+                print(f"❌ {name}: {result}")
+        print(json.dumps(pools.metrics(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
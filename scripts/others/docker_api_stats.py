@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Docker Engine API Stats Collector
+=================================
+
+Collector Docker stats langsung lewat Docker Engine API (unix socket):
+- Satu HTTP session untuk semua container, request berjalan bersamaan
+- Nilai numerik CPU, memory, network dan blkio (bukan string hasil format)
+- Tetap mengisi field string lama (cpu_percent, memory_usage, ...) agar
+  extract_container_stats dan report lama tidak berubah
+
+`docker stats --no-stream` blocks for about two seconds per container and
+`docker inspect` forks another process per container. Here every container's
+/stats?stream=false and /json request shares one connection pool, so a full
+capture costs roughly one stats interval regardless of container count.
+
+Usage:
+    python docker_api_stats.py [container ...]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; callers fall back to the docker CLI
+    aiohttp = None
+
+DEFAULT_SOCKET_PATH = '/var/run/docker.sock'
+
+
+def format_binary_bytes(value: float) -> str:
+    """Format bytes like the docker CLI memory column (KiB/MiB/GiB)"""
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if abs(value) < 1024 or unit == 'TiB':
+            return f"{value:.4g}{unit}" if unit != 'B' else f"{int(value)}B"
+        value /= 1024
+
+
+def format_decimal_bytes(value: float) -> str:
+    """Format bytes like the docker CLI net/block columns (kB/MB/GB)"""
+    for unit in ('B', 'kB', 'MB', 'GB', 'TB'):
+        if abs(value) < 1000 or unit == 'TB':
+            return f"{value:.3g}{unit}" if unit != 'B' else f"{int(value)}B"
+        value /= 1000
+
+
+def parse_stats(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Numeric CPU/memory/net/blkio values from one /containers/{id}/stats document"""
+    cpu_stats = raw.get('cpu_stats') or {}
+    precpu_stats = raw.get('precpu_stats') or {}
+    cpu_usage = cpu_stats.get('cpu_usage') or {}
+    precpu_usage = precpu_stats.get('cpu_usage') or {}
+
+    # Same formula as the docker CLI: container share of host CPU time, times CPUs
+    cpu_delta = cpu_usage.get('total_usage', 0) - precpu_usage.get('total_usage', 0)
+    system_delta = cpu_stats.get('system_cpu_usage', 0) - precpu_stats.get('system_cpu_usage', 0)
+    online_cpus = cpu_stats.get('online_cpus') or len(cpu_usage.get('percpu_usage') or []) or 1
+    cpu_percent = cpu_delta / system_delta * online_cpus * 100 if cpu_delta > 0 and system_delta > 0 else 0.0
+
+    memory_stats = raw.get('memory_stats') or {}
+    memory_detail = memory_stats.get('stats') or {}
+    # Page cache is not counted as used memory: 'cache' on cgroup v1, 'inactive_file' on v2
+    cache = memory_detail.get('total_inactive_file', memory_detail.get('inactive_file', memory_detail.get('cache', 0)))
+    memory_usage = max(memory_stats.get('usage', 0) - cache, 0)
+    memory_limit = memory_stats.get('limit', 0)
+    memory_percent = memory_usage / memory_limit * 100 if memory_limit else 0.0
+
+    net_rx = net_tx = 0
+    for interface in (raw.get('networks') or {}).values():
+        net_rx += interface.get('rx_bytes', 0)
+        net_tx += interface.get('tx_bytes', 0)
+
+    blkio_read = blkio_write = 0
+    for entry in (raw.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []:
+        op = str(entry.get('op', '')).lower()
+        if op == 'read':
+            blkio_read += entry.get('value', 0)
+        elif op == 'write':
+            blkio_write += entry.get('value', 0)
+
+    return {
+        'cpu_pct': round(cpu_percent, 2),
+        'online_cpus': online_cpus,
+        'memory_usage_bytes': memory_usage,
+        'memory_limit_bytes': memory_limit,
+        'memory_pct': round(memory_percent, 2),
+        'net_rx_bytes': net_rx,
+        'net_tx_bytes': net_tx,
+        'blkio_read_bytes': blkio_read,
+        'blkio_write_bytes': blkio_write,
+        'pids_current': (raw.get('pids_stats') or {}).get('current', 0)
+    }
+
+
+def legacy_fields(numeric: Dict[str, Any]) -> Dict[str, Any]:
+    """The string fields `docker stats --format` used to produce"""
+    return {
+        'cpu_percent': f"{numeric['cpu_pct']:.2f}%",
+        'memory_usage': f"{format_binary_bytes(numeric['memory_usage_bytes'])} / "
+                        f"{format_binary_bytes(numeric['memory_limit_bytes'])}",
+        'memory_percent': f"{numeric['memory_pct']:.2f}%",
+        'network_io': f"{format_decimal_bytes(numeric['net_rx_bytes'])} / "
+                      f"{format_decimal_bytes(numeric['net_tx_bytes'])}",
+        'block_io': f"{format_decimal_bytes(numeric['blkio_read_bytes'])} / "
+                    f"{format_decimal_bytes(numeric['blkio_write_bytes'])}",
+        'pids': str(numeric['pids_current'])
+    }
+
+
+def docker_api_available(socket_path: str = DEFAULT_SOCKET_PATH) -> bool:
+    """True when aiohttp is installed and the Docker socket exists"""
+    return aiohttp is not None and os.path.exists(socket_path)
+
+
+class DockerStatsCollector:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 10.0,
+                 max_connections: int = 20):
+        """Docker Engine API client over a unix socket"""
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the Docker Engine API collector")
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.session = None
+
+    async def open(self):
+        """Open the pooled HTTP session"""
+        if self.session is None:
+            connector = aiohttp.UnixConnector(path=self.socket_path, limit=self.max_connections)
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, str]] = None) -> Any:
+        """GET a Docker API path and decode the JSON body"""
+        await self.open()
+        # The host part is ignored on a unix socket
+        async with self.session.get(f"http://docker{path}", params=params) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Docker API {path} returned {response.status}: {(await response.text())[:200]}")
+            return await response.json(content_type=None)
+
+    async def container_stats(self, container: str) -> Dict[str, Any]:
+        """One stats snapshot for a container: numeric values plus legacy strings"""
+        raw = await self._get_json(f"/containers/{container}/stats", {'stream': 'false'})
+        numeric = parse_stats(raw)
+        return {
+            **legacy_fields(numeric),
+            **numeric,
+            'read_at': raw.get('read'),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    async def container_info(self, container: str) -> Dict[str, Any]:
+        """State summary from /containers/{id}/json (what `docker inspect` provided)"""
+        inspect_data = await self._get_json(f"/containers/{container}/json")
+        state = inspect_data.get('State', {})
+        return {
+            'id': inspect_data.get('Id'),
+            'status': state.get('Status'),
+            'started_at': state.get('StartedAt'),
+            'restart_count': inspect_data.get('RestartCount', 0)
+        }
+
+    async def _collect_one(self, container: str, include_info: bool) -> Dict[str, Any]:
+        """Stats (and optionally info) for one container; errors are reported inline"""
+        calls = [self.container_stats(container)]
+        if include_info:
+            calls.append(self.container_info(container))
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        stats = results[0]
+        if isinstance(stats, Exception):
+            return {'error': str(stats) or type(stats).__name__}
+        if include_info:
+            info = results[1]
+            if isinstance(info, Exception):
+                stats['info_error'] = str(info)
+            else:
+                stats['info'] = info
+        return stats
+
+    async def collect(self, containers: List[str], include_info: bool = False) -> Dict[str, Any]:
+        """Stats for every container, fetched concurrently"""
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._collect_one(c, include_info) for c in containers))
+        stats = dict(zip(containers, results))
+        collect_ms = round((time.perf_counter() - started) * 1000, 1)
+        for container_stats in stats.values():
+            container_stats['collect_ms'] = collect_ms
+        return stats
+
+
+async def collect_docker_stats(containers: List[str], socket_path: str = DEFAULT_SOCKET_PATH,
+                               include_info: bool = False) -> Dict[str, Any]:
+    """One-shot helper: open a collector, fetch every container, close it"""
+    async with DockerStatsCollector(socket_path) as collector:
+        return await collector.collect(containers, include_info)
+
+
+async def main():
+    """Main function"""
+    containers = sys.argv[1:] or [
+        "debezium-cdc-mirroring-postgres-1",
+        "debezium-cdc-mirroring-kafka-1",
+        "debezium-cdc-mirroring-target-postgres-1",
+        "tutorial-connect-1"
+    ]
+    socket_path = os.environ.get('DOCKER_SOCKET_PATH', DEFAULT_SOCKET_PATH)
+    if not docker_api_available(socket_path):
+        print(f"❌ Docker API not available (aiohttp installed: {aiohttp is not None}, socket: {socket_path})")
+        return
+    stats = await collect_docker_stats(containers, socket_path, include_info=True)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
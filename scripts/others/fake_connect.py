@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Fake Kafka Connect REST Endpoint
+================================
+
+Server REST pengganti Kafka Connect untuk menguji harness tanpa stack Docker:
+- Endpoint yang dipakai ConnectRestClient: /, /connectors (expand status/info),
+  create, config, status, task status, delete, restart, pause/resume/stop,
+  offsets (GET/DELETE, hanya saat STOPPED seperti Kafka 3.6+)
+- Connector pindah ke RUNNING setelah startup delay yang bisa diatur
+- Task gagal (FAILED + trace) untuk config yang juga gagal di Connect asli,
+  mis. JDBC sink tanpa SMT unwrap atau insert.mode yang tidak dikenal
+- Validasi config (400) seperti Debezium: max.queue.size harus > max.batch.size
+- Latency dan error (409 rebalance) suntikan dari scenario (fake_scenario.py);
+  setiap request dicatat dengan key endpoint yang sama seperti ConnectRestClient
+
+Only the control plane is simulated: no records move, so harnesses run
+against it in their deploy-only mode.
+
+Usage:
+    python fake_connect.py [--port 18083] [--startup-delay 0.5] [--latency-ms 3] [--error-rate 0.01]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Any, Optional
+
+from fake_scenario import Scenario
+
+try:
+    from aiohttp import web
+except ImportError:  # aiohttp is optional
+    web = None
+
+JDBC_SINK_CLASS = 'io.confluent.connect.jdbc.JdbcSinkConnector'
+UNWRAP_TRANSFORM = 'io.debezium.transforms.ExtractNewRecordState'
+INSERT_MODES = ('insert', 'upsert', 'update')
+DEBEZIUM_DEFAULTS = {'max.batch.size': 2048, 'max.queue.size': 8192}
+REBALANCE_MESSAGE = ("Cannot complete request momentarily due to stale configuration "
+                     "(typically caused by a concurrent config change)")
+
+
+def config_failure(config: Dict[str, Any]) -> Optional[str]:
+    """Task failure a real worker would report for this config, if any"""
+    if config.get('connector.class') == JDBC_SINK_CLASS:
+        transforms = [alias.strip() for alias in config.get('transforms', '').split(',') if alias.strip()]
+        if not any(config.get(f'transforms.{alias}.type') == UNWRAP_TRANSFORM for alias in transforms):
+            return ("org.apache.kafka.connect.errors.ConnectException: Value schema must be of type Struct "
+                    "with flat fields (Debezium envelope not unwrapped)")
+        if config.get('insert.mode', 'insert') not in INSERT_MODES:
+            return f"org.apache.kafka.common.config.ConfigException: Invalid value {config['insert.mode']} for insert.mode"
+    return None
+
+
+def config_errors(config: Dict[str, Any]) -> List[str]:
+    """Validation errors that make a real worker reject the config with 400"""
+    errors = []
+    if config.get('connector.class', '').startswith('io.debezium.'):
+        try:
+            batch = int(config.get('max.batch.size', DEBEZIUM_DEFAULTS['max.batch.size']))
+            queue = int(config.get('max.queue.size', DEBEZIUM_DEFAULTS['max.queue.size']))
+        except ValueError as e:
+            return [f"Invalid value: {e}"]
+        if queue <= batch:
+            errors.append(f"The 'max.queue.size' value '{queue}' must be larger than max.batch.size")
+    return errors
+
+
+def endpoint_key(request) -> str:
+    """The histogram key ConnectRestClient records this request under"""
+    resource = request.match_info.route.resource
+    template = resource.canonical.replace('{task_id}', '{id}') if resource is not None else request.path
+    if request.method != 'GET':
+        return f"{request.method} {template}"
+    return '/connectors?expand' if template == '/connectors' and 'expand' in request.query else template
+
+
+class FakeConnectServer:
+    def __init__(self, startup_delay: float = 0.5, version: str = '7.6.0-ccs',
+                 scenario: Optional[Scenario] = None):
+        """In-memory connectors behind the Connect REST API
+
+        With a scenario, every request is delayed by its connect_api latency,
+        fails with its connect_api failure rate and is recorded in its call log.
+        """
+        if web is None:
+            raise ImportError("aiohttp is required for the fake Connect server")
+        self.startup_delay = startup_delay
+        self.version = version
+        self.connectors = {}
+        # Like the offsets topic, offsets outlive the connector that wrote them
+        self.offsets = {}
+        self.requests = 0
+        self.scenario = scenario
+        self.runner = None
+
+        @web.middleware
+        async def count_requests(request, handler):
+            self.requests += 1
+            if self.scenario is None:
+                return await handler(request)
+            started = time.time()
+            delay = self.scenario.latency('connect_api')
+            await asyncio.sleep(delay)
+            failed = self.scenario.fails('connect_api')
+            if failed:
+                response = web.json_response({'error_code': 409, 'message': REBALANCE_MESSAGE}, status=409)
+            else:
+                response = await handler(request)
+            self.scenario.record_call('connect_api', delay, failed, started, endpoint=endpoint_key(request),
+                                      status=response.status)
+            return response
+
+        self.app = web.Application(middlewares=[count_requests])
+        self.app.router.add_get('/', self.root)
+        self.app.router.add_get('/connectors', self.list_connectors)
+        self.app.router.add_post('/connectors', self.create_connector)
+        self.app.router.add_get('/connectors/{name}', self.get_connector)
+        self.app.router.add_delete('/connectors/{name}', self.delete_connector)
+        self.app.router.add_get('/connectors/{name}/config', self.get_config)
+        self.app.router.add_put('/connectors/{name}/config', self.put_config)
+        self.app.router.add_get('/connectors/{name}/status', self.get_status)
+        self.app.router.add_get('/connectors/{name}/tasks/{task_id}/status', self.get_task_status)
+        self.app.router.add_post('/connectors/{name}/restart', self.restart)
+        self.app.router.add_put('/connectors/{name}/pause', self.pause)
+        self.app.router.add_put('/connectors/{name}/resume', self.resume)
+        self.app.router.add_put('/connectors/{name}/stop', self.stop_connector)
+        self.app.router.add_get('/connectors/{name}/offsets', self.get_offsets)
+        self.app.router.add_delete('/connectors/{name}/offsets', self.delete_offsets)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 18083) -> str:
+        """Serve in the running event loop; returns the base URL"""
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        port = self.runner.addresses[0][1]  # the bound port when port is 0
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    @staticmethod
+    def _not_found(name: str):
+        return web.json_response({'error_code': 404, 'message': f"Connector {name} not found"}, status=404)
+
+    @staticmethod
+    def _invalid(errors: List[str]):
+        message = (f"Connector configuration is invalid and contains the following {len(errors)} error(s):\n"
+                   + '\n'.join(errors))
+        return web.json_response({'error_code': 400, 'message': message}, status=400)
+
+    def preload(self, name: str, config: Dict[str, Any], running: bool = True):
+        """Deploy a connector directly, already past its startup delay when running"""
+        self._deploy(name, config)
+        if running:
+            self.connectors[name]['created'] -= self.startup_delay
+
+    def _deploy(self, name: str, config: Dict[str, Any]):
+        self.connectors[name] = {'config': {**config, 'name': name}, 'created': time.monotonic(), 'target': 'RUNNING'}
+        if config.get('connector.class', '').startswith('io.debezium.'):
+            prefix = config.get('topic.prefix', config.get('database.server.name', name))
+            self.offsets.setdefault(name, [{'partition': {'server': prefix}, 'offset': {'lsn': 23456789}}])
+
+    def _status(self, name: str) -> Dict[str, Any]:
+        connector = self.connectors[name]
+        config = connector['config']
+        starting = time.monotonic() - connector['created'] < self.startup_delay
+        failure = config_failure(config)
+        state = connector['target'] if connector['target'] != 'RUNNING' else ('UNASSIGNED' if starting else 'RUNNING')
+        tasks = []
+        if not starting and state != 'STOPPED':
+            for task_id in range(int(config.get('tasks.max', 1))):
+                task = {'id': task_id, 'state': state, 'worker_id': 'fake-connect:8083'}
+                if failure and state == 'RUNNING':
+                    task.update({'state': 'FAILED', 'trace': failure})
+                tasks.append(task)
+        connector_type = 'sink' if 'topics' in config or 'topics.regex' in config else 'source'
+        return {'name': name, 'connector': {'state': state, 'worker_id': 'fake-connect:8083'},
+                'tasks': tasks, 'type': connector_type}
+
+    def _info(self, name: str) -> Dict[str, Any]:
+        status = self._status(name)
+        return {'name': name, 'config': self.connectors[name]['config'], 'type': status['type'],
+                'tasks': [{'connector': name, 'task': task['id']} for task in status['tasks']]}
+
+    async def root(self, request):
+        return web.json_response({'version': self.version, 'commit': 'fake', 'kafka_cluster_id': 'fake-cluster'})
+
+    async def list_connectors(self, request):
+        expand = request.query.getall('expand', [])
+        if not expand:
+            return web.json_response(sorted(self.connectors))
+        result = {}
+        for name in sorted(self.connectors):
+            result[name] = {}
+            if 'status' in expand:
+                result[name]['status'] = self._status(name)
+            if 'info' in expand:
+                result[name]['info'] = self._info(name)
+        return web.json_response(result)
+
+    async def create_connector(self, request):
+        body = await request.json()
+        name = body.get('name')
+        if not name or not isinstance(body.get('config'), dict):
+            return web.json_response({'error_code': 400, 'message': "name and config are required"}, status=400)
+        if name in self.connectors:
+            return web.json_response({'error_code': 409, 'message': f"Connector {name} already exists"}, status=409)
+        errors = config_errors(body['config'])
+        if errors:
+            return self._invalid(errors)
+        initial_state = body.get('initial_state', 'RUNNING')
+        if initial_state not in ('RUNNING', 'PAUSED', 'STOPPED'):
+            return web.json_response({'error_code': 400, 'message': f"Invalid initial state {initial_state}"},
+                                     status=400)
+        self._deploy(name, body['config'])
+        self.connectors[name]['target'] = initial_state
+        return web.json_response(self._info(name), status=201)
+
+    async def get_connector(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        return web.json_response(self._info(name))
+
+    async def delete_connector(self, request):
+        name = request.match_info['name']
+        if self.connectors.pop(name, None) is None:
+            return self._not_found(name)
+        return web.Response(status=204)
+
+    async def get_config(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        return web.json_response(self.connectors[name]['config'])
+
+    async def put_config(self, request):
+        name = request.match_info['name']
+        created = name not in self.connectors
+        config = await request.json()
+        errors = config_errors(config)
+        if errors:
+            return self._invalid(errors)
+        self._deploy(name, config)
+        return web.json_response(self._info(name), status=201 if created else 200)
+
+    async def get_status(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        return web.json_response(self._status(name))
+
+    async def get_task_status(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        for task in self._status(name)['tasks']:
+            if str(task['id']) == request.match_info['task_id']:
+                return web.json_response(task)
+        return web.json_response({'error_code': 404, 'message': "Task not found"}, status=404)
+
+    async def restart(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        self.connectors[name]['created'] = time.monotonic()
+        return web.Response(status=204)
+
+    async def pause(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        self.connectors[name]['target'] = 'PAUSED'
+        return web.Response(status=202)
+
+    async def resume(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        self.connectors[name]['target'] = 'RUNNING'
+        return web.Response(status=202)
+
+    async def stop_connector(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        self.connectors[name]['target'] = 'STOPPED'
+        return web.Response(status=204)
+
+    async def get_offsets(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        return web.json_response({'offsets': self.offsets.get(name, [])})
+
+    async def delete_offsets(self, request):
+        name = request.match_info['name']
+        if name not in self.connectors:
+            return self._not_found(name)
+        if self.connectors[name]['target'] != 'STOPPED':
+            return web.json_response({'error_code': 400, 'message': "Connectors must be in the STOPPED state "
+                                                                    "before their offsets can be modified"}, status=400)
+        self.offsets.pop(name, None)
+        return web.json_response({'message': "The offsets for this connector have been reset successfully"})
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Serve a fake Kafka Connect REST API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=18083)
+    parser.add_argument('--startup-delay', type=float, default=0.5, help="Seconds until a new connector is RUNNING")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Mean latency added to every request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests answered with 409")
+    args = parser.parse_args()
+
+    scenario = None
+    if args.latency_ms or args.error_rate:
+        scenario = Scenario({'latency_ms': {'connect_api': args.latency_ms},
+                             'failure_rates': {'connect_api': args.error_rate}})
+    server = FakeConnectServer(args.startup_delay, scenario=scenario)
+    url = await server.start(args.host, args.port)
+    print(f"🧪 Fake Kafka Connect listening on {url} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Fake Docker CLI
+===============
+
+Pengganti perintah `docker` untuk harness stand-in (dipasang di PATH oleh
+fake_stack.py lewat shim `docker`):
+- stats (--no-stream, --format template Go), inspect, ps, version
+- exec ke container Kafka menjalankan fake Kafka CLI (fake_kafka_cli.py)
+- logs dengan --follow, --timestamps, --tail dan --since (RFC 3339, unix,
+  durasi relatif); log postgres ke stderr seperti container aslinya
+- Nilai dari scenario (fake_scenario.py), latency dan failure yang bisa
+  diatur, stream logs yang bisa terputus ("unexpected EOF")
+
+Each invocation is a real process, like the docker CLI, so fork/exec and
+pipe costs stay in the measurement. It imports only the standard library
+and the scenario so its own start-up time stays small next to the
+injected latency.
+
+Usage:
+    FAKE_STACK_STATE=... python fake_docker.py stats --no-stream --format '{{.Name}};{{.CPUPerc}}'
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import json
+import re
+import sys
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from fake_scenario import KAFKA_CONTAINER, Scenario, parse_rfc3339, rfc3339
+import fake_kafka_cli
+
+DAEMON_ERROR = ("Cannot connect to the Docker daemon at unix:///var/run/docker.sock. "
+                "Is the docker daemon running?\n")
+STREAM_ERROR = "error from daemon in stream: Error grabbing logs: unexpected EOF\n"
+ENGINE_VERSION = '24.0.7'
+FOLLOW_POLL_SECONDS = 0.2
+IMAGES = {'postgres': 'debezium/postgres:16', 'kafka': 'confluentinc/cp-kafka:7.6.0',
+          'zookeeper': 'confluentinc/cp-zookeeper:7.6.0', 'connect': 'confluentinc/cp-kafka-connect:7.6.0'}
+UPTIME_SECONDS = 3600  # containers were started this long before the scenario
+TEMPLATE_PATTERN = re.compile(r"\{\{\s*(json\s+)?\.([\w.]*)\s*\}\}")
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ns|us|µs|ms|s|m|h)")
+DURATION_UNITS = {'ns': 1e-9, 'us': 1e-6, 'µs': 1e-6, 'ms': 1e-3, 's': 1, 'm': 60, 'h': 3600}
+
+
+def no_such_container(name: str) -> Tuple[int, str, str]:
+    return 1, '', f"Error response from daemon: No such container: {name}\n"
+
+
+# Same output as docker_api_stats.format_*_bytes, which would import aiohttp here
+
+def format_binary_bytes(value: float) -> str:
+    """Memory column units (KiB/MiB/GiB)"""
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if abs(value) < 1024 or unit == 'TiB':
+            return f"{value:.4g}{unit}" if unit != 'B' else f"{int(value)}B"
+        value /= 1024
+
+
+def format_decimal_bytes(value: float) -> str:
+    """Net/block column units (kB/MB/GB)"""
+    for unit in ('B', 'kB', 'MB', 'GB', 'TB'):
+        if abs(value) < 1000 or unit == 'TB':
+            return f"{value:.3g}{unit}" if unit != 'B' else f"{int(value)}B"
+        value /= 1000
+
+
+def render(template: str, document: Dict[str, Any]) -> str:
+    """Go template subset: {{.Field.Sub}} and {{json .Field}}"""
+    def field(match):
+        value = document
+        for part in filter(None, match.group(2).split('.')):
+            value = value.get(part) if isinstance(value, dict) else None
+        if match.group(1) or isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return '<no value>' if value is None else str(value).lower() if isinstance(value, bool) else str(value)
+    return TEMPLATE_PATTERN.sub(field, template.replace('\\t', '\t').replace('\\n', '\n'))
+
+
+def parse_since(value: str, now: float) -> float:
+    """Epoch seconds for a --since value: RFC 3339, unix timestamp or relative duration"""
+    if 'T' in value:
+        return parse_rfc3339(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PATTERN.findall(value)
+    if not parts or ''.join(number + unit for number, unit in parts) != value:
+        raise ValueError(f'invalid value for "since": {value}')
+    return now - sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+def sample_window(started: float, read: float) -> Tuple[float, float]:
+    """(previous, current) sample times; one second apart when no latency was injected"""
+    return (started, read) if read - started >= 0.1 else (read - 1.0, read)
+
+
+def inspect_document(scenario: Scenario, name: str) -> Dict[str, Any]:
+    """`docker inspect` / GET /containers/{id}/json for one container"""
+    kind = scenario.containers[name]['kind']
+    started = scenario.started_at - UPTIME_SECONDS
+    service = name.rsplit('-', 2)[-2] if name.count('-') >= 2 else name
+    return {
+        'Id': scenario.container_id(name),
+        'Created': rfc3339(started - 5),
+        'Path': '/docker-entrypoint.sh',
+        'Args': [],
+        'State': {'Status': 'running', 'Running': True, 'Paused': False, 'Restarting': False,
+                  'OOMKilled': False, 'Dead': False, 'Pid': 4000 + sorted(scenario.containers).index(name),
+                  'ExitCode': 0, 'Error': '', 'StartedAt': rfc3339(started),
+                  'FinishedAt': '0001-01-01T00:00:00Z'},
+        'Image': f"sha256:{scenario.container_id(kind)}",
+        'Name': f"/{name}",
+        'RestartCount': 0,
+        'Driver': 'overlay2',
+        'HostConfig': {'Memory': 0, 'NanoCpus': 0, 'RestartPolicy': {'Name': 'no', 'MaximumRetryCount': 0}},
+        'Config': {'Hostname': scenario.container_id(name)[:12], 'Image': IMAGES[kind],
+                   'Labels': {'com.docker.compose.project': 'debezium-cdc-mirroring',
+                              'com.docker.compose.service': service}},
+        'NetworkSettings': {'Networks': {'debezium-cdc-mirroring_default': {
+            'IPAddress': f"172.18.0.{2 + sorted(scenario.containers).index(name)}"}}}
+    }
+
+
+def _cpu_stats(scenario: Scenario, name: str, at: float) -> Dict[str, Any]:
+    usage = scenario.cpu_usage_ns(name, at)
+    host_cpus = int(scenario.settings['host_cpus'])
+    return {'cpu_usage': {'total_usage': usage, 'usage_in_kernelmode': usage // 5,
+                          'usage_in_usermode': usage - usage // 5},
+            'system_cpu_usage': int(at * 1e9 * host_cpus), 'online_cpus': host_cpus,
+            'throttling_data': {'periods': 0, 'throttled_periods': 0, 'throttled_time': 0}}
+
+
+def stats_document(scenario: Scenario, name: str, preread: float, read: float) -> Dict[str, Any]:
+    """GET /containers/{id}/stats?stream=false (cgroup v2 layout) sampled at read"""
+    memory = scenario.memory_bytes(name, read)
+    cache = memory // 10
+    io = scenario.io_counters(name, read)
+    return {
+        'read': rfc3339(read),
+        'preread': rfc3339(preread),
+        'name': f"/{name}",
+        'id': scenario.container_id(name),
+        'pids_stats': {'current': scenario.pids(name), 'limit': 4194304},
+        'blkio_stats': {'io_service_bytes_recursive': [
+            {'major': 8, 'minor': 0, 'op': 'read', 'value': io['blkio_read_bytes']},
+            {'major': 8, 'minor': 0, 'op': 'write', 'value': io['blkio_write_bytes']}]},
+        'num_procs': 0,
+        'cpu_stats': _cpu_stats(scenario, name, read),
+        'precpu_stats': _cpu_stats(scenario, name, preread),
+        'memory_stats': {'usage': memory + cache, 'limit': scenario.memory_limit_bytes(),
+                         'stats': {'inactive_file': cache, 'active_file': cache // 2, 'anon': memory}},
+        'networks': {'eth0': {'rx_bytes': io['net_rx_bytes'], 'rx_packets': io['net_rx_bytes'] // 1200,
+                              'rx_errors': 0, 'rx_dropped': 0, 'tx_bytes': io['net_tx_bytes'],
+                              'tx_packets': io['net_tx_bytes'] // 1200, 'tx_errors': 0, 'tx_dropped': 0}}
+    }
+
+
+def stats_row(scenario: Scenario, name: str, preread: float, read: float) -> Dict[str, str]:
+    """Fields of one `docker stats` row"""
+    memory, limit = scenario.memory_bytes(name, read), scenario.memory_limit_bytes()
+    io = scenario.io_counters(name, read)
+    return {
+        'Name': name,
+        'ID': scenario.container_id(name)[:12],
+        'Container': name,
+        'CPUPerc': f"{scenario.cpu_percent_between(name, preread, read):.2f}%",
+        'MemUsage': f"{format_binary_bytes(memory)} / {format_binary_bytes(limit)}",
+        'MemPerc': f"{memory / limit * 100:.2f}%",
+        'NetIO': f"{format_decimal_bytes(io['net_rx_bytes'])} / {format_decimal_bytes(io['net_tx_bytes'])}",
+        'BlockIO': f"{format_decimal_bytes(io['blkio_read_bytes'])} / "
+                   f"{format_decimal_bytes(io['blkio_write_bytes'])}",
+        'PIDs': str(scenario.pids(name))
+    }
+
+
+def _split_options(args: List[str], with_value: Tuple[str, ...]) -> Tuple[Dict[str, Any], List[str]]:
+    """Options (flag -> value or True) and positional arguments"""
+    options, positional = {}, []
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg.startswith('-') and '=' in arg:
+            key, value = arg.split('=', 1)
+            options[key] = value
+        elif arg in with_value and index + 1 < len(args):
+            options[arg] = args[index + 1]
+            index += 1
+        elif arg.startswith('-') and not positional:
+            options[arg] = True
+        else:
+            positional.append(arg)
+        index += 1
+    return options, positional
+
+
+def _option(options: Dict[str, Any], *names: str, default: Any = None) -> Any:
+    for name in names:
+        if name in options:
+            return options[name]
+    return default
+
+
+def version(args: List[str], scenario: Scenario) -> Tuple[int, str, str]:
+    options, _ = _split_options(args, ('--format', '-f'))
+    document = {'Client': {'Version': ENGINE_VERSION, 'ApiVersion': '1.43', 'Os': 'linux'},
+                'Server': {'Version': ENGINE_VERSION, 'ApiVersion': '1.43', 'MinAPIVersion': '1.12', 'Os': 'linux'}}
+    template = _option(options, '--format', '-f')
+    if template:
+        return 0, render(template, document) + '\n', ''
+    return 0, (f"Client:\n Version:           {ENGINE_VERSION}\n API version:       1.43\n\n"
+               f"Server:\n Engine:\n  Version:          {ENGINE_VERSION}\n  API version:      1.43 (minimum version 1.12)\n"), ''
+
+
+def ps(args: List[str], scenario: Scenario) -> Tuple[int, str, str]:
+    options, _ = _split_options(args, ('--format', '-f', '--filter'))
+    rows = []
+    for name in sorted(scenario.containers):
+        rows.append({'ID': scenario.container_id(name)[:12], 'Names': name,
+                     'Image': IMAGES[scenario.containers[name]['kind']], 'State': 'running',
+                     'Status': f"Up {int((time.time() - scenario.started_at + UPTIME_SECONDS) // 60)} minutes"})
+    if _option(options, '-q', '--quiet'):
+        return 0, ''.join(row['ID'] + '\n' for row in rows), ''
+    template = _option(options, '--format')
+    if template:
+        return 0, ''.join(render(template, row) + '\n' for row in rows), ''
+    lines = [f"{'CONTAINER ID':<15}{'IMAGE':<38}{'STATUS':<16}NAMES"]
+    lines += [f"{row['ID']:<15}{row['Image']:<38}{row['Status']:<16}{row['Names']}" for row in rows]
+    return 0, '\n'.join(lines) + '\n', ''
+
+
+def stats(args: List[str], scenario: Scenario, window: Tuple[float, float]) -> Tuple[int, str, str]:
+    """One `docker stats` frame; CPU is averaged over window, like the CLI's two samples"""
+    options, names = _split_options(args, ('--format',))
+    for name in names:
+        if scenario.container(name) is None:
+            return no_such_container(name)
+    names = [scenario.container(name) for name in names] or sorted(scenario.containers)
+    preread, read = window
+    rows = [stats_row(scenario, name, preread, read) for name in names]
+    template = _option(options, '--format')
+    if template:
+        return 0, ''.join(render(template, row) + '\n' for row in rows), ''
+    lines = [f"{'CONTAINER ID':<15}{'NAME':<42}{'CPU %':<10}{'MEM USAGE / LIMIT':<22}{'MEM %':<9}"
+             f"{'NET I/O':<20}{'BLOCK I/O':<20}PIDS"]
+    lines += [f"{row['ID']:<15}{row['Name']:<42}{row['CPUPerc']:<10}{row['MemUsage']:<22}{row['MemPerc']:<9}"
+              f"{row['NetIO']:<20}{row['BlockIO']:<20}{row['PIDs']}" for row in rows]
+    return 0, '\n'.join(lines) + '\n', ''
+
+
+def inspect(args: List[str], scenario: Scenario) -> Tuple[int, str, str]:
+    options, names = _split_options(args, ('--format', '-f', '--type'))
+    documents, errors = [], []
+    for name in names:
+        container = scenario.container(name)
+        if container is None:
+            errors.append(f"Error: No such object: {name}\n")
+        else:
+            documents.append(inspect_document(scenario, container))
+    template = _option(options, '--format', '-f')
+    if template:
+        stdout = ''.join(render(template, document) + '\n' for document in documents)
+    else:
+        stdout = json.dumps(documents, indent=4) + '\n'
+    return (1 if errors else 0), stdout, ''.join(errors)
+
+
+def exec_command(args: List[str], scenario: Scenario) -> Tuple[int, str, str]:
+    """`docker exec`: the Kafka tools exist in the Kafka container only"""
+    index = 0
+    while index < len(args) and args[index].startswith('-'):
+        index += 2 if args[index] in ('-e', '--env', '-u', '--user', '-w', '--workdir') else 1
+    if index >= len(args) - 1:
+        return 1, '', '"docker exec" requires at least 2 arguments.\n'
+    container, command = scenario.container(args[index]), args[index + 1:]
+    if container is None:
+        return no_such_container(args[index])
+    if container == KAFKA_CONTAINER and command[0] in fake_kafka_cli.TOOLS:
+        return fake_kafka_cli.run(command[0], command[1:], scenario)
+    return 126, '', (f'OCI runtime exec failed: exec failed: unable to start container process: exec: '
+                     f'"{command[0]}": executable file not found in $PATH: unknown\n')
+
+
+def _write_lines(lines: List[Dict[str, Any]], timestamps: bool, stream):
+    for line in lines:
+        stream.write((rfc3339(line['time']) + ' ' if timestamps else '') + line['text'] + '\n')
+    stream.flush()
+
+
+def logs(args: List[str], scenario: Scenario) -> Optional[Tuple[int, str, str]]:
+    """Write the log lines directly; returns a result only on errors"""
+    options, names = _split_options(args, ('--tail', '-n', '--since', '--until'))
+    if len(names) != 1:
+        return 1, '', '"docker logs" requires exactly 1 argument.\n'
+    container = scenario.container(names[0])
+    if container is None:
+        return no_such_container(names[0])
+    now = time.time()
+    tail = _option(options, '--tail', '-n', default='all')
+    try:
+        since = parse_since(options['--since'], now) if '--since' in options else None
+        until = parse_since(options['--until'], now) if '--until' in options else None
+        tail = None if tail == 'all' else int(tail)
+    except ValueError as e:
+        return 1, '', f"{e}\n"
+    timestamps = bool(_option(options, '--timestamps', '-t'))
+    follow = bool(_option(options, '--follow', '-f')) and until is None
+    # postgres writes its log to stderr
+    stream = sys.stderr if scenario.containers[container]['kind'] == 'postgres' else sys.stdout
+
+    end = now if until is None else min(now, until)
+    _write_lines(scenario.log_lines(container, since, end, tail), timestamps, stream)
+    if not follow:
+        return None
+    disconnects = scenario.settings['failure_rates'].get('log_disconnects_per_minute', 0)
+    while True:
+        time.sleep(FOLLOW_POLL_SECONDS)
+        if disconnects and scenario.rng.random() < disconnects / 60 * FOLLOW_POLL_SECONDS:
+            return 1, '', STREAM_ERROR
+        now = time.time()
+        _write_lines(scenario.log_lines(container, end, now), timestamps, stream)
+        end = now
+
+
+def run(argv: List[str], scenario: Scenario) -> Optional[Tuple[int, str, str]]:
+    """Run one docker command; (exit code, stdout, stderr) unless it wrote its output itself"""
+    command, args = (argv[0], argv[1:]) if argv else ('', [])
+    kind = 'docker_stats_cli' if command == 'stats' else 'docker_cli'
+    started = time.time()
+    delay = scenario.latency(kind)
+    time.sleep(delay)
+    failed = scenario.fails('docker_cli')
+    detail = {'command': command}
+    if command == 'stats':
+        detail['window'] = sample_window(started, time.time())
+    elif command == 'exec':
+        detail['tool'] = next((arg for arg in args if arg in fake_kafka_cli.TOOLS), None)
+    if command == 'logs':
+        # Recorded before following, which lasts until the caller terminates the process
+        scenario.record_call(kind, delay, failed, started, container=args[-1] if args else None, **detail)
+    if failed:
+        result = 1, '', DAEMON_ERROR
+    elif command == 'version':
+        result = version(args, scenario)
+    elif command == 'ps':
+        result = ps(args, scenario)
+    elif command == 'stats':
+        if '--no-stream' not in args:
+            while True:  # one frame per second until interrupted
+                code, stdout, stderr = stats(args, scenario, sample_window(time.time() - 1.0, time.time()))
+                sys.stdout.write('\033[2J\033[H' + stdout)
+                sys.stdout.flush()
+                time.sleep(1.0)
+        result = stats(args, scenario, detail['window'])
+    elif command == 'inspect':
+        result = inspect(args, scenario)
+    elif command == 'exec':
+        result = exec_command(args, scenario)
+    elif command == 'logs':
+        return logs(args, scenario)
+    else:
+        result = 1, '', f"docker: '{command}' is not a docker command.\nSee 'docker --help'\n"
+    scenario.record_call(kind, delay, failed, started, **detail)
+    return result
+
+
+def main():
+    """Main function"""
+    try:
+        result = run(sys.argv[1:], Scenario.load())
+        if result is not None:
+            code, stdout, stderr = result
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            sys.exit(code)
+    except (BrokenPipeError, KeyboardInterrupt):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
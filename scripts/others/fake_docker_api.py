@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Fake Docker Engine API
+======================
+
+Server Docker Engine API pengganti di unix socket untuk DockerStatsCollector:
+- /_ping, /version, /containers/json
+- /containers/{id}/stats?stream=false dengan precpu_stats (CPU dihitung dari
+  dua sampel seperti Docker asli), /containers/{id}/json
+- 404 "No such container" untuk nama yang tidak dikenal
+- Latency dan failure (500) suntikan dari scenario; setiap panggilan dicatat
+
+A real daemon answers stats?stream=false only after its next sampling
+interval (about one second), which the docker_api_stats latency models;
+every other endpoint uses the docker_api latency.
+
+Usage:
+    FAKE_STACK_STATE=... python fake_docker_api.py [--socket /tmp/fake-docker.sock]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Optional
+
+from fake_scenario import Scenario
+from fake_docker import ENGINE_VERSION, IMAGES, inspect_document, sample_window, stats_document
+
+try:
+    from aiohttp import web
+except ImportError:  # aiohttp is optional
+    web = None
+
+DEFAULT_SOCKET_PATH = '/tmp/fake-docker.sock'
+
+
+class FakeDockerApiServer:
+    def __init__(self, scenario: Scenario):
+        """Docker Engine API endpoints answered from the scenario"""
+        if web is None:
+            raise ImportError("aiohttp is required for the fake Docker API server")
+        self.scenario = scenario
+        self.requests = 0
+        self.runner = None
+        self.socket_path = None
+
+        @web.middleware
+        async def inject(request, handler):
+            self.requests += 1
+            is_stats = request.path.endswith('/stats')
+            kind = 'docker_api_stats' if is_stats else 'docker_api'
+            started = time.time()
+            delay = self.scenario.latency(kind)
+            await asyncio.sleep(delay)
+            request['window'] = sample_window(started, time.time())
+            failed = self.scenario.fails('docker_api')
+            if failed:
+                response = web.json_response({'message': "context deadline exceeded"}, status=500)
+            else:
+                response = await handler(request)
+            detail = {'path': request.path, 'status': response.status}
+            if is_stats:
+                detail['window'] = request['window']
+            self.scenario.record_call(kind, delay, failed, started, **detail)
+            return response
+
+        self.app = web.Application(middlewares=[inject])
+        # Clients may prefix paths with an API version (/v1.43/...)
+        for prefix in ('', '/v{version}'):
+            self.app.router.add_get(prefix + '/_ping', self.ping)
+            self.app.router.add_get(prefix + '/version', self.version)
+            self.app.router.add_get(prefix + '/containers/json', self.list_containers)
+            self.app.router.add_get(prefix + '/containers/{id}/stats', self.container_stats)
+            self.app.router.add_get(prefix + '/containers/{id}/json', self.inspect_container)
+
+    async def start(self, socket_path: str = DEFAULT_SOCKET_PATH) -> str:
+        """Serve on a unix socket in the running event loop; returns the socket path"""
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        await web.UnixSite(self.runner, socket_path).start()
+        self.socket_path = socket_path
+        return socket_path
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _container(self, request) -> Optional[str]:
+        return self.scenario.container(request.match_info['id'])
+
+    @staticmethod
+    def _not_found(name: str):
+        return web.json_response({'message': f"No such container: {name}"}, status=404)
+
+    async def ping(self, request):
+        return web.Response(text='OK', headers={'Api-Version': '1.43'})
+
+    async def version(self, request):
+        return web.json_response({'Version': ENGINE_VERSION, 'ApiVersion': '1.43', 'MinAPIVersion': '1.12',
+                                  'Os': 'linux', 'Arch': 'amd64'})
+
+    async def list_containers(self, request):
+        return web.json_response([
+            {'Id': self.scenario.container_id(name), 'Names': [f"/{name}"],
+             'Image': IMAGES[spec['kind']], 'State': 'running', 'Status': 'Up'}
+            for name, spec in sorted(self.scenario.containers.items())
+        ])
+
+    async def container_stats(self, request):
+        name = self._container(request)
+        if name is None:
+            return self._not_found(request.match_info['id'])
+        if request.query.get('stream', 'true') not in ('false', '0'):
+            return web.json_response({'message': "streaming stats are not supported by the fake daemon"},
+                                     status=501)
+        preread, read = request['window']
+        return web.json_response(stats_document(self.scenario, name, preread, read))
+
+    async def inspect_container(self, request):
+        name = self._container(request)
+        if name is None:
+            return self._not_found(request.match_info['id'])
+        return web.json_response(inspect_document(self.scenario, name))
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Serve a fake Docker Engine API on a unix socket")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH)
+    args = parser.parse_args()
+
+    server = FakeDockerApiServer(Scenario.load())
+    socket_path = await server.start(args.socket)
+    print(f"🧪 Fake Docker API listening on unix://{socket_path} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
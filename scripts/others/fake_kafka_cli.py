@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Fake Kafka CLI Tools
+====================
+
+Pengganti kafka-topics, kafka-consumer-groups dan kafka-broker-api-versions
+untuk harness stand-in (dipanggil lewat `docker exec <kafka> ...` fake):
+- Output dengan format yang sama seperti tools Confluent 7.x
+- Offset dan lag dari scenario (fake_scenario.py) pada saat dipanggil
+- Latency start JVM dan failure (timeout ke broker) yang bisa diatur
+
+Usage:
+    FAKE_STACK_STATE=... python fake_kafka_cli.py kafka-consumer-groups --bootstrap-server localhost:9092 --list
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import sys
+import time
+import zlib
+from typing import List, Tuple
+
+from fake_scenario import Scenario
+
+TOOLS = ('kafka-topics', 'kafka-consumer-groups', 'kafka-broker-api-versions')
+
+INTERNAL_TOPICS = ['__consumer_offsets', 'my_connect_configs', 'my_connect_offsets', 'my_connect_statuses']
+
+BROKER_API_VERSIONS = """kafka:9092 (id: 1 rack: null) -> (
+\tProduce(0): 0 to 9 [usable: 9],
+\tFetch(1): 0 to 15 [usable: 13],
+\tListOffsets(2): 0 to 8 [usable: 7],
+\tMetadata(3): 0 to 12 [usable: 12],
+\tOffsetCommit(8): 0 to 8 [usable: 8],
+\tOffsetFetch(9): 0 to 8 [usable: 8],
+\tFindCoordinator(10): 0 to 4 [usable: 4],
+\tJoinGroup(11): 0 to 9 [usable: 9],
+\tHeartbeat(12): 0 to 4 [usable: 4],
+\tDescribeGroups(15): 0 to 5 [usable: 5],
+\tListGroups(16): 0 to 4 [usable: 4],
+\tApiVersions(18): 0 to 3 [usable: 3],
+\tCreateTopics(19): 0 to 7 [usable: 7],
+\tDescribeLogDirs(35): 0 to 4 [usable: 4]
+)
+"""
+
+TIMEOUT_ERROR = ("Error while executing {command} command : Timed out waiting for a node assignment. Call: {call}\n"
+                 "[{timestamp}] ERROR java.util.concurrent.ExecutionException: "
+                 "org.apache.kafka.common.errors.TimeoutException: Timed out waiting for a node assignment. "
+                 "Call: {call}\n")
+
+
+def _option(args: List[str], name: str):
+    return args[args.index(name) + 1] if name in args and args.index(name) + 1 < len(args) else None
+
+
+def topics(scenario: Scenario) -> List[str]:
+    prefix = scenario.kafka['topic'].split('.')[0]
+    return sorted(INTERNAL_TOPICS + [scenario.kafka['topic'], f"{prefix}.inventory.customers",
+                                     f"{prefix}.inventory.products"])
+
+
+def kafka_topics(args: List[str], scenario: Scenario) -> Tuple[int, str, str]:
+    if '--list' in args:
+        return 0, '\n'.join(topics(scenario)) + '\n', ''
+    if '--describe' in args:
+        topic = _option(args, '--topic')
+        names = [topic] if topic else topics(scenario)
+        if topic and topic not in topics(scenario):
+            return 1, '', (f"Error while executing topic command : Topic '{topic}' does not exist as expected\n")
+        lines = []
+        for name in names:
+            partitions = int(scenario.kafka['partitions']) if name == scenario.kafka['topic'] else 1
+            topic_id = f"{zlib.crc32(name.encode()):08x}Qx2AbRkTfake"
+            lines.append(f"Topic: {name}\tTopicId: {topic_id}\tPartitionCount: {partitions}\t"
+                         f"ReplicationFactor: 1\tConfigs: ")
+            lines += [f"\tTopic: {name}\tPartition: {partition}\tLeader: 1\tReplicas: 1\tIsr: 1"
+                      for partition in range(partitions)]
+        return 0, '\n'.join(lines) + '\n', ''
+    return 1, '', "Command must include exactly one action: --list, --describe, --create, --alter or --delete\n"
+
+
+def kafka_consumer_groups(args: List[str], scenario: Scenario) -> Tuple[int, str, str]:
+    group = scenario.kafka['group']
+    if '--list' in args:
+        return 0, f"{group}\n", ''
+    if '--describe' in args:
+        requested = _option(args, '--group')
+        if requested != group:
+            return 0, f"\nConsumer group '{requested}' does not exist.\n", ''
+        now = time.time()
+        header = (f"{'GROUP':<26}{'TOPIC':<28}{'PARTITION':<11}{'CURRENT-OFFSET':<16}{'LOG-END-OFFSET':<16}"
+                  f"{'LAG':<8}{'CONSUMER-ID':<70}{'HOST':<13}CLIENT-ID")
+        rows = []
+        ends, committed = scenario.end_offsets(now), scenario.committed_offsets(now)
+        for partition, (end, current) in enumerate(zip(ends, committed)):
+            client_id = f"connector-consumer-{group[len('connect-'):]}-{partition}"
+            rows.append(f"{group:<26}{scenario.kafka['topic']:<28}{partition:<11}{current:<16}{end:<16}"
+                        f"{end - current:<8}{client_id + '-6b1f0c5e-3a1d-4c52-9d7e-2f0e4d9a1b7c':<70}"
+                        f"{'/172.18.0.6':<13}{client_id}")
+        return 0, '\n' + header + '\n' + '\n'.join(rows) + '\n', ''
+    return 1, '', "Command must include exactly one action: --list, --describe, --delete, --reset-offsets\n"
+
+
+def run(tool: str, args: List[str], scenario: Scenario) -> Tuple[int, str, str]:
+    """(exit code, stdout, stderr) of one tool invocation, after the injected JVM start latency"""
+    started = time.time()
+    delay = scenario.latency('kafka_cli')
+    time.sleep(delay)
+    failed = scenario.fails('kafka_cli')
+    if failed:
+        command = 'topic' if tool == 'kafka-topics' else 'consumer group'
+        call = 'listTopics' if tool == 'kafka-topics' else 'listConsumerGroups'
+        result = 1, '', TIMEOUT_ERROR.format(command=command, call=call,
+                                             timestamp=time.strftime('%Y-%m-%d %H:%M:%S,000'))
+    elif tool == 'kafka-topics':
+        result = kafka_topics(args, scenario)
+    elif tool == 'kafka-consumer-groups':
+        result = kafka_consumer_groups(args, scenario)
+    elif tool == 'kafka-broker-api-versions':
+        result = 0, BROKER_API_VERSIONS, ''
+    else:
+        result = 127, '', f"{tool}: command not found\n"
+    # Recorded right after the offsets were read, so the call time is when the reported lag was true
+    scenario.record_call('kafka_cli', delay, failed, started, tool=tool, describe='--describe' in args)
+    return result
+
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2 or sys.argv[1] not in TOOLS:
+        sys.stderr.write(f"usage: fake_kafka_cli.py {{{','.join(TOOLS)}}} [options]\n")
+        sys.exit(2)
+    code, stdout, stderr = run(sys.argv[1], sys.argv[2:], Scenario.load())
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
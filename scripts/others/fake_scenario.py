@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Synthetic Stack Scenario for the Stand-in Harness
+=================================================
+
+Model "kebenaran" yang dipakai bersama oleh fake docker CLI/API, fake Kafka
+CLI dan fake Connect:
+- Container dengan CPU/memory/network/blkio sebagai fungsi waktu
+- Offset topic dan consumer group sink (produce vs consume rate -> lag)
+- Baris log per container dengan level dan event CDC yang bisa diatur
+- Latency dan failure rate yang disuntikkan per jenis panggilan
+- Panggilan yang dilayani dicatat (calls.jsonl) beserta latency suntikan
+
+Every value is a deterministic function of the seed and the wall-clock time
+since the scenario started, so separate fake processes agree with each other
+and the benchmark can compute what a collector should have reported at any
+moment. Only the injected latency and failures are random.
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import json
+import math
+import os
+import random
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+# Environment variable pointing the fake CLIs at the running scenario's state file
+STATE_ENV = 'FAKE_STACK_STATE'
+
+MAIN_TOPIC = 'dbserver1.inventory.orders'
+KAFKA_CONTAINER = 'debezium-cdc-mirroring-kafka-1'
+
+DEFAULT_CONTAINERS = {
+    'debezium-cdc-mirroring-postgres-1': {'kind': 'postgres', 'cpu_percent': 25, 'memory_mib': 350,
+                                          'log_lines_per_second': 2},
+    'debezium-cdc-mirroring-kafka-1': {'kind': 'kafka', 'cpu_percent': 15, 'memory_mib': 1100,
+                                       'log_lines_per_second': 1},
+    'debezium-cdc-mirroring-zookeeper-1': {'kind': 'zookeeper', 'cpu_percent': 1, 'memory_mib': 120,
+                                           'log_lines_per_second': 0.2},
+    'debezium-cdc-mirroring-target-postgres-1': {'kind': 'postgres', 'cpu_percent': 20, 'memory_mib': 300,
+                                                 'log_lines_per_second': 1},
+    'tutorial-connect-1': {'kind': 'connect', 'cpu_percent': 40, 'memory_mib': 1400, 'log_lines_per_second': 5}
+}
+
+DEFAULT_SCENARIO = {
+    'seed': 42,
+    'host_cpus': 8,
+    'memory_limit_mib': 7936,
+    'containers': DEFAULT_CONTAINERS,
+    # Mean latency added per call; docker stats without --no-stream waits a sampling interval,
+    # the Kafka CLI tools start a JVM
+    'latency_ms': {'docker_cli': 40, 'docker_stats_cli': 1500, 'kafka_cli': 1800,
+                   'docker_api': 2, 'docker_api_stats': 1000, 'connect_api': 3},
+    'latency_jitter': 0.2,  # +- fraction of the mean, uniform
+    'failure_rates': {'docker_cli': 0.0, 'kafka_cli': 0.0, 'docker_api': 0.0, 'connect_api': 0.0,
+                      'log_disconnects_per_minute': 0.0},
+    'kafka': {'topic': MAIN_TOPIC, 'partitions': 1, 'initial_offset': 10000,
+              'produce_rate': 500, 'consume_rate': 480, 'group': 'connect-pg-sink-connector'},
+    'log_events_per_minute': {'rebalance': 0.5, 'retriable': 1.0, 'task_failure': 0.0,
+                              'jdbc_batch_failure': 0.0, 'offset_commit_failure': 0.0, 'slot_error': 0.0}
+}
+
+# Container kind that emits each CDC event
+EVENT_KINDS = {'rebalance': 'connect', 'retriable': 'connect', 'task_failure': 'connect',
+               'jdbc_batch_failure': 'connect', 'offset_commit_failure': 'connect', 'slot_error': 'postgres'}
+
+# (level, text) per event; each text matches exactly one log_tailer CDC pattern
+EVENT_LINES = {
+    'rebalance': ('INFO', "[Worker clientId=connect-1, groupId=1] Rebalance started "
+                          "(org.apache.kafka.connect.runtime.distributed.WorkerCoordinator)"),
+    'retriable': ('WARN', "[pg-sink-connector|task-0] Write of 500 records failed, remainingRetries=10: "
+                          "org.apache.kafka.connect.errors.RetriableException (io.confluent.connect.jdbc.sink.JdbcSinkTask)"),
+    'task_failure': ('ERROR', "[pg-sink-connector|task-0] WorkerSinkTask{id=pg-sink-connector-0} Task threw an "
+                              "uncaught and unrecoverable exception. Task is being killed and will not recover "
+                              "until manually restarted (org.apache.kafka.connect.runtime.WorkerTask)"),
+    'jdbc_batch_failure': ('ERROR', "[pg-sink-connector|task-0] java.sql.BatchUpdateException: Batch entry 0 "
+                                    "INSERT INTO \"orders\" (\"id\") VALUES (1) was aborted "
+                                    "(io.confluent.connect.jdbc.sink.JdbcSinkTask)"),
+    'offset_commit_failure': ('ERROR', "[pg-sink-connector|task-0] WorkerSinkTask{id=pg-sink-connector-0} "
+                                       "Failed to commit offsets (org.apache.kafka.connect.runtime.WorkerSinkTask)"),
+    'slot_error': ('ERROR', 'replication slot "debezium_slot" is active for PID 4242')
+}
+
+ROUTINE_LINES = {
+    'connect': [('INFO', "[pg-sink-connector|task-0] Completed write of 500 records "
+                         "(io.confluent.connect.jdbc.sink.JdbcSinkTask)"),
+                ('INFO', "[inventory-connector|task-0] 1024 records sent during previous 00:00:10.1, "
+                         "last recorded offset of {server=dbserver1} partition is {lsn_proc=37125720} "
+                         "(io.debezium.connector.common.BaseSourceTask)"),
+                ('WARN', "[Worker clientId=connect-1, groupId=1] Commit of offsets timed out "
+                         "(org.apache.kafka.connect.runtime.WorkerSourceTask)")],
+    'kafka': [('INFO', "[LogLoader partition=dbserver1.inventory.orders-0, dir=/kafka/data] Loaded segment "
+                       "(kafka.log.UnifiedLog$)"),
+              ('INFO', "[GroupCoordinator 1]: Member connector-consumer-pg-sink-connector-0 heartbeat "
+                       "(kafka.coordinator.group.GroupCoordinator)")],
+    'zookeeper': [('INFO', "Processing ruok command from /127.0.0.1:41224 "
+                           "(org.apache.zookeeper.server.NIOServerCnxn)")],
+    'postgres': [('LOG', "checkpoint starting: time"),
+                 ('LOG', "checkpoint complete: wrote 312 buffers (1.9%); 0 WAL file(s) added"),
+                 ('WARNING', "there is no transaction in progress")]
+}
+WARN_SHARE = 0.05  # routine lines that are warnings
+
+
+def deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """base with override applied; nested dicts are merged, other values replaced"""
+    merged = dict(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _unit(*parts: Any) -> float:
+    """Deterministic uniform value in [0, 1) for the given key parts"""
+    return zlib.crc32(':'.join(str(part) for part in parts).encode()) / 2 ** 32
+
+
+def rfc3339(timestamp: float) -> str:
+    """Docker's RFC 3339 nanosecond timestamp (trailing zeros trimmed); microsecond resolution here"""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    fraction = f"{moment.microsecond:06d}".rstrip('0')
+    return moment.strftime('%Y-%m-%dT%H:%M:%S') + (f".{fraction}" if fraction else '') + 'Z'
+
+
+def parse_rfc3339(value: str) -> float:
+    """Epoch seconds from an RFC 3339 timestamp with up to nanosecond precision"""
+    seconds, _, fraction = value.rstrip('Z').partition('.')
+    moment = datetime.strptime(seconds, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+    return moment.timestamp() + (float(f"0.{fraction}") if fraction else 0.0)
+
+
+class Scenario:
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, started_at: Optional[float] = None,
+                 state_dir: Optional[str] = None):
+        """Scenario settings (merged over DEFAULT_SCENARIO) anchored at started_at"""
+        self.settings = deep_merge(DEFAULT_SCENARIO, settings or {})
+        self.started_at = started_at if started_at is not None else time.time()
+        self.state_dir = state_dir
+        self.seed = self.settings['seed']
+        self.containers = self.settings['containers']
+        self.kafka = self.settings['kafka']
+        self.rng = random.Random()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], state_dir: Optional[str] = None) -> 'Scenario':
+        """Scenario from the fake_stack.scenario section of config.yaml"""
+        return cls((config.get('fake_stack') or {}).get('scenario'), state_dir=state_dir)
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump({'settings': self.settings, 'started_at': self.started_at, 'state_dir': self.state_dir}, f)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'Scenario':
+        """Scenario of a running stand-in stack ($FAKE_STACK_STATE by default)"""
+        path = path or os.environ.get(STATE_ENV)
+        if not path:
+            raise RuntimeError(f"{STATE_ENV} is not set; start the stack with fake_stack.py")
+        with open(path, 'r') as f:
+            state = json.load(f)
+        return cls(state['settings'], state['started_at'], state.get('state_dir'))
+
+    # Injected latency and failures
+
+    def latency(self, kind: str) -> float:
+        """Seconds to delay one call of kind"""
+        mean = self.settings['latency_ms'].get(kind, 0) / 1000
+        jitter = self.settings['latency_jitter']
+        return max(0.0, mean * (1 + self.rng.uniform(-jitter, jitter)))
+
+    def fails(self, kind: str) -> bool:
+        return self.rng.random() < self.settings['failure_rates'].get(kind, 0)
+
+    def record_call(self, kind: str, injected_seconds: float, failed: bool = False,
+                    started: Optional[float] = None, **detail):
+        """Append the call to calls.jsonl so the benchmark knows the injected latency
+
+        started is when the injected delay began; without it the delay is taken
+        to end when the call is recorded.
+        """
+        if not self.state_dir:
+            return
+        entry = {'kind': kind, 'time': time.time(), 'injected_seconds': round(injected_seconds, 6),
+                 'failed': failed, **detail}
+        if started is not None:
+            entry['started'] = started
+        # One short write per line; O_APPEND keeps lines from concurrent processes whole
+        with open(os.path.join(self.state_dir, 'calls.jsonl'), 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    @staticmethod
+    def injected_interval(call: Dict[str, Any]) -> Tuple[float, float]:
+        """(start, end) of a recorded call's injected delay"""
+        start = call.get('started', call['time'] - call['injected_seconds'])
+        return start, start + call['injected_seconds']
+
+    def calls(self, since: float = 0.0, until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Recorded calls that ended in [since, until]"""
+        path = os.path.join(self.state_dir or '', 'calls.jsonl')
+        if not self.state_dir or not os.path.exists(path):
+            return []
+        with open(path, 'r') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return [entry for entry in entries if entry['time'] >= since and (until is None or entry['time'] <= until)]
+
+    # Containers
+
+    def container(self, name_or_id: str) -> Optional[str]:
+        """Container name for a name, /name or (prefix of an) id"""
+        name = name_or_id.lstrip('/')
+        if name in self.containers:
+            return name
+        if len(name) >= 12:
+            for candidate in self.containers:
+                if self.container_id(candidate).startswith(name):
+                    return candidate
+        return None
+
+    def container_id(self, name: str) -> str:
+        return ''.join(f"{zlib.crc32(f'{self.seed}:{name}:{i}'.encode()):08x}" for i in range(8))
+
+    def _wave(self, name: str) -> Tuple[float, float]:
+        """(angular frequency, phase) of the container's load wave, one cycle per minute"""
+        return 2 * math.pi / 60, 2 * math.pi * _unit(self.seed, name, 'phase')
+
+    def cpu_percent(self, name: str, at: float) -> float:
+        """Instantaneous CPU percent (100 = one core)"""
+        omega, phase = self._wave(name)
+        base = self.containers[name]['cpu_percent']
+        return base * (1 + 0.25 * math.sin(omega * (at - self.started_at) + phase))
+
+    def cpu_usage_ns(self, name: str, at: float) -> int:
+        """Cumulative CPU time, the integral of cpu_percent"""
+        omega, phase = self._wave(name)
+        base = self.containers[name]['cpu_percent'] / 100 * 1e9
+        elapsed = at - self.started_at
+        return int(base * (elapsed + 0.25 * (math.cos(phase) - math.cos(omega * elapsed + phase)) / omega))
+
+    def cpu_percent_between(self, name: str, start: float, end: float) -> float:
+        """Average CPU percent over [start, end] (what a two-sample collector should report)"""
+        return (self.cpu_usage_ns(name, end) - self.cpu_usage_ns(name, start)) / 1e9 / (end - start) * 100
+
+    def memory_bytes(self, name: str, at: float) -> int:
+        omega, phase = self._wave(name)
+        return int(self.containers[name]['memory_mib'] * 1048576
+                   * (1 + 0.05 * math.sin(omega * (at - self.started_at) + phase)))
+
+    def memory_limit_bytes(self) -> int:
+        return int(self.settings['memory_limit_mib'] * 1048576)
+
+    def io_counters(self, name: str, at: float) -> Dict[str, int]:
+        """Cumulative network and block I/O bytes (rates scale with the container's CPU share)"""
+        elapsed = max(0.0, at - self.started_at)
+        scale = self.containers[name]['cpu_percent'] * 1000
+        return {'net_rx_bytes': int(scale * 40 * elapsed), 'net_tx_bytes': int(scale * 25 * elapsed),
+                'blkio_read_bytes': int(scale * 2 * elapsed), 'blkio_write_bytes': int(scale * 30 * elapsed)}
+
+    def pids(self, name: str) -> int:
+        return {'connect': 72, 'kafka': 95, 'zookeeper': 48, 'postgres': 11}.get(self.containers[name]['kind'], 10)
+
+    # Kafka
+
+    def end_offsets(self, at: float) -> List[int]:
+        """Log end offset per partition of the main topic"""
+        partitions = int(self.kafka['partitions'])
+        produced = self.kafka['produce_rate'] * max(0.0, at - self.started_at)
+        return [int(self.kafka['initial_offset'] + produced / partitions) for _ in range(partitions)]
+
+    def committed_offsets(self, at: float) -> List[int]:
+        """Committed offset per partition of the sink group (never past the end offset)"""
+        partitions = int(self.kafka['partitions'])
+        consumed = self.kafka['consume_rate'] * max(0.0, at - self.started_at)
+        return [min(end, int(self.kafka['initial_offset'] + consumed / partitions))
+                for end in self.end_offsets(at)]
+
+    def total_lag(self, at: float) -> int:
+        return sum(end - committed for end, committed in zip(self.end_offsets(at), self.committed_offsets(at)))
+
+    # Logs
+
+    def _line_count(self, name: str, at: float) -> int:
+        """Lines the container has written up to at"""
+        rate = self.containers[name].get('log_lines_per_second', 0)
+        return max(0, int((at - self.started_at) * rate)) if rate > 0 else 0
+
+    def log_line(self, name: str, index: int) -> Dict[str, Any]:
+        """Line number index of a container: time, level, CDC event (or None) and text"""
+        spec = self.containers[name]
+        rate = spec['log_lines_per_second']
+        at = self.started_at + (index + 1) / rate
+        kind = spec['kind']
+        event = None
+        draw = _unit(self.seed, name, index, 'event')
+        for candidate, per_minute in self.settings['log_events_per_minute'].items():
+            if EVENT_KINDS.get(candidate) != kind or not per_minute:
+                continue
+            probability = per_minute / 60 / rate
+            if draw < probability:
+                event = candidate
+                break
+            draw -= probability
+        if event is not None:
+            level, message = EVENT_LINES[event]
+        else:
+            routine = ROUTINE_LINES[kind]
+            warnings = [line for line in routine if line[0] in ('WARN', 'WARNING')]
+            infos = [line for line in routine if line[0] not in ('WARN', 'WARNING')]
+            pool = warnings if warnings and _unit(self.seed, name, index, 'warn') < WARN_SHARE else infos
+            level, message = pool[int(_unit(self.seed, name, index, 'line') * len(pool))]
+        return {'time': at, 'level': level, 'event': event, 'text': self.format_log(kind, at, level, message)}
+
+    @staticmethod
+    def format_log(kind: str, at: float, level: str, message: str) -> str:
+        """Line in the container's native log format"""
+        moment = datetime.fromtimestamp(at, timezone.utc)
+        if kind == 'postgres':
+            return f"{moment.strftime('%Y-%m-%d %H:%M:%S')}.{moment.microsecond // 1000:03d} UTC [87] {level}:  {message}"
+        return f"[{moment.strftime('%Y-%m-%d %H:%M:%S')},{moment.microsecond // 1000:03d}] {level} {message}"
+
+    def log_lines(self, name: str, since: Optional[float] = None, until: Optional[float] = None,
+                  tail: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lines written in (since, until], optionally only the last tail of them"""
+        if not self.containers[name].get('log_lines_per_second'):
+            return []
+        until = time.time() if until is None else until
+        last = self._line_count(name, until)
+        first = self._line_count(name, since) if since is not None and since > self.started_at else 0
+        if tail is not None:
+            first = max(first, last - tail)
+        return [self.log_line(name, index) for index in range(first, last)]
+
+    def log_truth(self, names: List[str], since: float, until: float) -> Dict[str, int]:
+        """Line, level and event counts the containers wrote in (since, until]"""
+        levels = {'INFO': 'info', 'LOG': 'info', 'WARN': 'warn', 'WARNING': 'warn', 'ERROR': 'error'}
+        counts = Counter()
+        for name in names:
+            for line in self.log_lines(name, since, until):
+                counts['lines'] += 1
+                counts[levels[line['level']]] += 1
+                if line['event']:
+                    counts[line['event']] += 1
+        return dict(counts)
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in Stack
+====================
+
+Menjalankan monitor tanpa Docker, Kafka dan Kafka Connect:
+- Fake Docker CLI (shim `docker` di PATH), fake Docker Engine API di unix
+  socket dan fake Kafka CLI lewat `docker exec`
+- Fake Kafka Connect REST dengan connector dari inventory-source.json dan
+  pg-sink.json
+- Satu scenario bersama (fake_scenario.py): nilai deterministik, latency dan
+  failure suntikan yang diatur di config.yaml (fake_stack)
+- Benchmark collector CDCPerformanceMonitor: overhead (wall dan CPU di luar
+  latency suntikan) dan akurasi (CPU, memory, lag, latency Connect, log)
+
+`serve` keeps the stand-ins running for manual runs of any monitor script:
+export the printed environment and pass the printed config file. `bench`
+starts `serve` in a child process, so the stand-ins' own CPU time is not
+charged to the monitor, runs every collector against it and compares what
+each collector reported with what the scenario says was true at that moment.
+
+Usage:
+    python fake_stack.py serve [--config config.yaml] [--latency-scale 1.0]
+    python fake_stack.py bench [--iterations 5] [--tail-seconds 10] [--latency-scale 0.1]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from statistics import median
+from typing import Dict, List, Any, Optional, Tuple
+
+import yaml
+
+from fake_scenario import STATE_ENV, Scenario, deep_merge
+from fake_connect import FakeConnectServer
+from fake_docker import FOLLOW_POLL_SECONDS
+from fake_docker_api import FakeDockerApiServer
+from connector_tuning import load_connector_template
+from latency_histogram import LatencyHistogram
+
+DEFAULT_SETTINGS = {
+    'connect_port': 18083,
+    'socket_path': '/tmp/fake-docker.sock',
+    'state_dir': None,  # a new temporary directory per run
+    'startup_delay_seconds': 0.5,
+    'connectors': None,  # connector definition files; defaults to results.connector_config_files
+    'scenario': {}
+}
+STATE_FILE = 'state.json'
+CONFIG_FILE = 'config.yaml'
+READY_TIMEOUT_SECONDS = 30
+LEVEL_KEYS = ('lines', 'info', 'warn', 'error')
+
+
+def fake_stack_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    return {**DEFAULT_SETTINGS, **(config.get('fake_stack') or {})}
+
+
+def interval_union(intervals: List[Tuple[float, float]]) -> float:
+    """Seconds covered by at least one interval (overlapping injected delays count once)"""
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def children_cpu_seconds() -> float:
+    """User + system CPU of finished child processes (docker CLI invocations)"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _parse_percent(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except (TypeError, ValueError):
+        return None
+
+
+class FakeStack:
+    def __init__(self, config: Dict[str, Any], state_dir: Optional[str] = None, latency_scale: float = 1.0):
+        """Stand-in Docker, Kafka CLI and Connect sharing one scenario"""
+        self.config = config
+        self.settings = fake_stack_settings(config)
+        self.state_dir = os.path.abspath(state_dir or self.settings['state_dir']
+                                         or tempfile.mkdtemp(prefix='fake-stack-'))
+        self.bin_dir = os.path.join(self.state_dir, 'bin')
+        self.state_path = os.path.join(self.state_dir, STATE_FILE)
+        scenario_settings = self.settings.get('scenario') or {}
+        if latency_scale != 1.0:
+            merged = deep_merge(Scenario().settings, scenario_settings)
+            scenario_settings = deep_merge(scenario_settings, {'latency_ms': {
+                kind: value * latency_scale for kind, value in merged['latency_ms'].items()}})
+        self.scenario = Scenario(scenario_settings, state_dir=self.state_dir)
+        self.connect = None
+        self.docker_api = None
+        self.connect_url = None
+
+    def _write_docker_shim(self):
+        """`docker` on PATH that runs fake_docker.py with this interpreter"""
+        os.makedirs(self.bin_dir, exist_ok=True)
+        shim = os.path.join(self.bin_dir, 'docker')
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_docker.py')
+        with open(shim, 'w') as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+        os.chmod(shim, 0o755)
+
+    def _connector_files(self) -> List[str]:
+        return self.settings['connectors'] or (self.config.get('results') or {}).get(
+            'connector_config_files', ['inventory-source.json', 'pg-sink.json'])
+
+    async def start(self):
+        """Start the servers, then write the state file the fake CLIs read"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        open(os.path.join(self.state_dir, 'calls.jsonl'), 'w').close()
+        self._write_docker_shim()
+
+        self.connect = FakeConnectServer(float(self.settings['startup_delay_seconds']), scenario=self.scenario)
+        for path in self._connector_files():
+            try:
+                name, connector_config = load_connector_template(path)
+                self.connect.preload(name, connector_config)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  Connector {path} not loaded: {e}")
+        self.connect_url = await self.connect.start('127.0.0.1', int(self.settings['connect_port']))
+        self.docker_api = FakeDockerApiServer(self.scenario)
+        await self.docker_api.start(self.settings['socket_path'])
+        self.scenario.save(self.state_path)
+
+    async def stop(self):
+        if self.docker_api is not None:
+            await self.docker_api.stop()
+        if self.connect is not None:
+            await self.connect.stop()
+
+    def environment(self) -> Dict[str, str]:
+        """Variables that route `docker` to the fake CLI"""
+        return {'PATH': self.bin_dir + os.pathsep + os.environ.get('PATH', ''), STATE_ENV: self.state_path}
+
+    def write_config(self) -> str:
+        """config.yaml pointing the monitors at the stand-ins; written last, so it marks the stack ready"""
+        overlay = deep_merge(self.config, {
+            'docker': {'socket_path': self.settings['socket_path'], 'stats_source': 'api'},
+            'kafka': {'metrics_source': 'cli'},
+            'kafka_connect': {'url': self.connect_url},
+            'fake_stack': {'state_dir': self.state_dir}
+        })
+        path = os.path.join(self.state_dir, CONFIG_FILE)
+        with open(path + '.tmp', 'w') as f:
+            yaml.safe_dump(overlay, f, sort_keys=False)
+        os.replace(path + '.tmp', path)
+        return path
+
+
+class StackBenchmark:
+    def __init__(self, state_dir: str, iterations: int = 5, tail_seconds: float = 10.0):
+        """Collector overhead and accuracy against a running stand-in stack"""
+        self.state_dir = state_dir
+        self.iterations = iterations
+        self.tail_seconds = tail_seconds
+        self.scenario = Scenario.load(os.path.join(state_dir, STATE_FILE))
+        self.monitor = None
+
+    # Accuracy checks: what the collector reported vs the scenario at the sampled moment
+
+    def docker_api_accuracy(self, result: Dict[str, Any], calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        windows = {call['path'].split('/')[-2]: call['window'] for call in calls
+                   if call['kind'] == 'docker_api_stats' and not call['failed']}
+        cpu_errors, memory_errors = [], []
+        for name, stats in result.items():
+            if name not in windows or 'cpu_pct' not in stats:
+                continue
+            preread, read = windows[name]
+            cpu_errors.append(abs(stats['cpu_pct'] - self.scenario.cpu_percent_between(name, preread, read)))
+            memory_errors.append(abs(stats['memory_usage_bytes'] - self.scenario.memory_bytes(name, read)))
+        collect_ms = next((stats['collect_ms'] for stats in result.values() if 'collect_ms' in stats), None)
+        return {'backend': self.monitor.docker_stats_backend, 'containers_checked': len(cpu_errors),
+                'cpu_pct_max_error': round(max(cpu_errors), 3) if cpu_errors else None,
+                'memory_max_error_bytes': max(memory_errors) if memory_errors else None,
+                'collect_ms': collect_ms}
+
+    def docker_cli_accuracy(self, result: Dict[str, Any], calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        window = next((call['window'] for call in calls
+                       if call['kind'] == 'docker_stats_cli' and not call['failed']), None)
+        cpu_errors = []
+        if window is not None:
+            for name, stats in result.items():
+                reported = _parse_percent(stats.get('cpu_percent'))
+                if reported is not None and name in self.scenario.containers:
+                    cpu_errors.append(abs(reported - self.scenario.cpu_percent_between(name, *window)))
+        return {'containers_checked': len(cpu_errors),
+                'cpu_pct_max_error': round(max(cpu_errors), 3) if cpu_errors else None}
+
+    def kafka_accuracy(self, result: Dict[str, Any], calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        group = self.scenario.kafka['group']
+        describe = next((call for call in calls if call['kind'] == 'kafka_cli' and call.get('describe')
+                         and call.get('tool') == 'kafka-consumer-groups' and not call['failed']), None)
+        reported = ((result.get('consumer_groups') or {}).get(group) or {}).get('total_lag')
+        if describe is None or reported is None:
+            return {'lag_checked': False}
+        expected = self.scenario.total_lag(describe['time'])
+        return {'lag_checked': True, 'lag': reported, 'expected_lag': expected, 'lag_error': reported - expected}
+
+    def logs_oneshot_accuracy(self, result: Dict[str, Any], calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        reported = expected = missed = 0
+        for call in calls:
+            name = call.get('container')
+            entry = (result.get('containers') or {}).get(name) or {}
+            if call.get('command') != 'logs' or call['failed'] or 'total_lines' not in entry:
+                continue
+            truth = len(self.scenario.log_lines(name, call['time'] - 600, call['time'], tail=100))
+            reported += entry['total_lines']
+            expected += truth
+            missed += abs(truth - entry['total_lines'])
+        return {'lines': reported, 'expected_lines': expected, 'line_errors': missed}
+
+    # Timing
+
+    async def time_collector(self, name: str, collect, accuracy=None) -> Dict[str, Any]:
+        """Run one collector iterations times: wall, injected, overhead and CPU per run"""
+        wall, overhead = LatencyHistogram(), LatencyHistogram()
+        samples = []
+        for _ in range(self.iterations):
+            started, cpu_started, children_started = time.time(), time.process_time(), children_cpu_seconds()
+            result = await collect()
+            ended, cpu_ended, children_ended = time.time(), time.process_time(), children_cpu_seconds()
+            calls = self.scenario.calls(started, ended)
+            injected = interval_union([Scenario.injected_interval(call) for call in calls])
+            wall.record_seconds(ended - started)
+            overhead.record_seconds(max(0.0, ended - started - injected))
+            samples.append({
+                'wall_ms': round((ended - started) * 1000, 1),
+                'injected_ms': round(injected * 1000, 1),
+                'cpu_ms': round((cpu_ended - cpu_started) * 1000, 1),
+                'child_cpu_ms': round((children_ended - children_started) * 1000, 1),
+                'calls': len(calls),
+                'failed_calls': sum(1 for call in calls if call['failed']),
+                'accuracy': accuracy(result, calls) if accuracy else None
+            })
+        summary = {
+            'wall': wall.summary(),
+            'overhead': overhead.summary(),
+            'cpu_ms_avg': round(sum(s['cpu_ms'] for s in samples) / len(samples), 1),
+            'child_cpu_ms_avg': round(sum(s['child_cpu_ms'] for s in samples) / len(samples), 1),
+            'calls_per_run': round(sum(s['calls'] for s in samples) / len(samples), 1),
+            'samples': samples
+        }
+        print(f"  ⏱️  {name:<17} wall p50 {summary['wall']['p50_ms']:>8.1f} ms | "
+              f"overhead p50 {summary['overhead']['p50_ms']:>7.1f} ms | cpu {summary['cpu_ms_avg']:>6.1f} ms "
+              f"+ children {summary['child_cpu_ms_avg']:>6.1f} ms")
+        return summary
+
+    def connect_accuracy(self, since: float, until: float) -> Dict[str, Any]:
+        """Client histogram p50 per endpoint vs the server-side injected p50"""
+        injected = defaultdict(list)
+        for call in self.scenario.calls(since, until):
+            if call['kind'] == 'connect_api':
+                injected[call['endpoint']].append(call['injected_seconds'] * 1000)
+        endpoints = {}
+        for endpoint, histogram in self.monitor.connect_api_histograms.items():
+            measured = histogram.summary().get('p50_ms')
+            expected = round(median(injected[endpoint]), 3) if injected[endpoint] else None
+            endpoints[endpoint] = {'measured_p50_ms': measured, 'injected_p50_ms': expected,
+                                   'bias_ms': round(measured - expected, 3) if expected is not None else None,
+                                   'requests': histogram.summary()['count'],
+                                   'server_requests': len(injected[endpoint])}
+        return endpoints
+
+    async def time_connect(self, name: str, collect) -> Dict[str, Any]:
+        self.monitor.connect_api_histograms.clear()
+        started = time.time()
+        summary = await self.time_collector(name, collect)
+        summary['endpoints'] = self.connect_accuracy(started, time.time())
+        return summary
+
+    async def tail_logs(self) -> Dict[str, Any]:
+        """Follow every container for tail_seconds and compare counts with the lines written"""
+        # No backlog on attach: every counted line was written while following
+        self.monitor.config.setdefault('monitoring', {})['log_backlog_lines'] = 0
+        started, cpu_started, children_started = time.time(), time.process_time(), children_cpu_seconds()
+        await self.monitor.start_log_tailer()
+        await asyncio.sleep(self.tail_seconds)
+        stopped = time.time()
+        summary = await self.monitor.stop_log_tailer()
+        cpu_ms = (time.process_time() - cpu_started) * 1000
+        children_ms = (children_cpu_seconds() - children_started) * 1000
+
+        attached = {}
+        for call in self.scenario.calls(started, stopped):
+            if call.get('command') == 'logs' and not call['failed']:
+                attached.setdefault(call['container'], call['time'])
+        containers = {}
+        for name, stream in (summary or {}).get('containers', {}).items():
+            if name not in attached:
+                continue
+            truth = self.scenario.log_truth([name], attached[name], stopped)
+            keys = list(LEVEL_KEYS) + [key for key in truth if key not in LEVEL_KEYS]
+            containers[name] = {key: {'counted': stream['totals'].get(key, 0), 'written': truth.get(key, 0)}
+                                for key in keys}
+            containers[name]['restarts'] = stream['restarts']
+            # Written but not yet emitted by the last follow poll before the stop
+            containers[name]['in_flight'] = len(self.scenario.log_lines(name, stopped - FOLLOW_POLL_SECONDS, stopped))
+        counted = sum(c['lines']['counted'] for c in containers.values())
+        written = sum(c['lines']['written'] for c in containers.values())
+        print(f"  ⏱️  {'log_tailer':<17} {counted} of {written} lines in {self.tail_seconds:g}s | "
+              f"cpu {cpu_ms:.1f} ms + children {children_ms:.1f} ms")
+        return {'seconds': round(stopped - started, 1), 'cpu_ms': round(cpu_ms, 1),
+                'child_cpu_ms': round(children_ms, 1), 'lines_counted': counted, 'lines_written': written,
+                'containers': containers}
+
+    async def run(self) -> Dict[str, Any]:
+        from comprehensive_performance_monitor import CDCPerformanceMonitor  # heavy; only the bench needs it
+
+        self.monitor = CDCPerformanceMonitor(os.path.join(self.state_dir, CONFIG_FILE))
+        monitor = self.monitor
+        report = {'timestamp': datetime.now().isoformat(), 'iterations': self.iterations,
+                  'scenario': self.scenario.settings, 'collectors': {}}
+        collectors = report['collectors']
+        try:
+            collectors['docker_api'] = await self.time_collector(
+                'docker_api', lambda: monitor.collect_docker_stats(include_info=True), self.docker_api_accuracy)
+            collectors['docker_cli'] = await self.time_collector(
+                'docker_cli', lambda: asyncio.to_thread(monitor.get_detailed_docker_stats), self.docker_cli_accuracy)
+            collectors['kafka_cli'] = await self.time_collector(
+                'kafka_cli', lambda: asyncio.to_thread(monitor.get_kafka_comprehensive_metrics), self.kafka_accuracy)
+            collectors['connect_async'] = await self.time_connect('connect_async', monitor.collect_connect_status)
+            collectors['connect_requests'] = await self.time_connect(
+                'connect_requests', lambda: asyncio.to_thread(monitor.get_kafka_connect_status))
+            collectors['logs_oneshot'] = await self.time_collector(
+                'logs_oneshot', lambda: asyncio.to_thread(monitor.get_docker_logs_analysis),
+                self.logs_oneshot_accuracy)
+            if self.tail_seconds > 0:
+                report['log_tailer'] = await self.tail_logs()
+        finally:
+            await monitor.close_docker_collector()
+            await monitor.close_connect_client()
+        return report
+
+
+def print_accuracy(report: Dict[str, Any]):
+    """Worst error per check over all iterations"""
+    print("\n🎯 Accuracy (reported vs scenario truth)")
+    collectors = report['collectors']
+    for name in ('docker_api', 'docker_cli'):
+        errors = [s['accuracy']['cpu_pct_max_error'] for s in collectors.get(name, {}).get('samples', [])
+                  if s['accuracy'] and s['accuracy']['cpu_pct_max_error'] is not None]
+        if errors:
+            print(f"  🐳 {name:<17} CPU % max error {max(errors):.3f}")
+    lag_errors = [s['accuracy']['lag_error'] for s in collectors.get('kafka_cli', {}).get('samples', [])
+                  if s['accuracy'] and s['accuracy']['lag_checked']]
+    if lag_errors:
+        print(f"  📨 {'kafka_cli':<17} consumer lag max error {max(lag_errors, key=abs)} messages")
+    for name in ('connect_async', 'connect_requests'):
+        for endpoint, entry in collectors.get(name, {}).get('endpoints', {}).items():
+            if entry['bias_ms'] is not None:
+                print(f"  🔌 {name:<17} {endpoint:<40} p50 {entry['measured_p50_ms']:.2f} ms "
+                      f"(injected {entry['injected_p50_ms']:.2f} ms, bias {entry['bias_ms']:+.2f} ms)")
+    oneshot = [s['accuracy'] for s in collectors.get('logs_oneshot', {}).get('samples', []) if s['accuracy']]
+    if oneshot:
+        print(f"  📜 {'logs_oneshot':<17} {sum(a['line_errors'] for a in oneshot)} line count errors "
+              f"over {sum(a['expected_lines'] for a in oneshot)} lines")
+    tailer = report.get('log_tailer')
+    if tailer:
+        for name, counts in tailer['containers'].items():
+            diffs = {key: value['written'] - value['counted'] for key, value in counts.items()
+                     if isinstance(value, dict) and value['written'] != value['counted']}
+            if not diffs:
+                status = '✅ all counted'
+            elif 0 < diffs.get('lines', 0) <= counts['in_flight']:
+                status = f"✅ all counted but {diffs['lines']} line(s) in flight at stop"
+            else:
+                status = f"❌ written - counted: {diffs}"
+            if counts['restarts']:
+                status += f" ({counts['restarts']} reconnects)"
+            print(f"  📜 {name:<42} {status}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Stand-in Docker, Kafka CLI and Connect for the monitors")
+    parser.add_argument('command', choices=['serve', 'bench'])
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--state-dir', help="Directory for the state file, call log and docker shim")
+    parser.add_argument('--latency-scale', type=float, default=1.0, help="Multiply every injected latency")
+    parser.add_argument('--iterations', type=int, default=5, help="bench: runs per collector")
+    parser.add_argument('--tail-seconds', type=float, default=10.0, help="bench: log tailer window (0 skips)")
+    return parser.parse_args()
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        print(f"⚠️  Config file {path} not found, using defaults")
+        return {}
+
+
+async def serve(args):
+    config = load_config(args.config)
+    stack = FakeStack(config, args.state_dir, args.latency_scale)
+    await stack.start()
+    config_path = stack.write_config()
+    environment = stack.environment()
+    print("🧪 Fake stack running (Ctrl+C to stop)")
+    print(f"   🔌 Kafka Connect: {stack.connect_url}")
+    print(f"   🐳 Docker API:    unix://{stack.settings['socket_path']}")
+    print(f"   📁 State:         {stack.state_dir}")
+    print(f"   ⚙️  Config:        {config_path}")
+    print(f"   export PATH=\"{stack.bin_dir}:$PATH\" {STATE_ENV}=\"{environment[STATE_ENV]}\"", flush=True)
+    stop_event = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop_event.set)
+    try:
+        await stop_event.wait()
+    finally:
+        await stack.stop()
+
+
+async def bench(args):
+    config = load_config(args.config)
+    state_dir = os.path.abspath(args.state_dir or tempfile.mkdtemp(prefix='fake-stack-'))
+    command = [sys.executable, os.path.abspath(__file__), 'serve', '--config', args.config,
+               '--state-dir', state_dir, '--latency-scale', str(args.latency_scale)]
+    server = subprocess.Popen(command)
+    try:
+        config_path = os.path.join(state_dir, CONFIG_FILE)
+        deadline = time.time() + READY_TIMEOUT_SECONDS
+        while not os.path.exists(config_path):
+            if server.poll() is not None or time.time() > deadline:
+                raise RuntimeError("fake stack did not start (see the serve output above)")
+            await asyncio.sleep(0.1)
+        print("🎯 Monitor collectors against the stand-in stack")
+        print(f"🔁 {args.iterations} runs per collector, latency scale {args.latency_scale:g}")
+
+        benchmark = StackBenchmark(state_dir, args.iterations, args.tail_seconds)
+        os.environ['PATH'] = os.path.join(state_dir, 'bin') + os.pathsep + os.environ.get('PATH', '')
+        os.environ[STATE_ENV] = os.path.join(state_dir, STATE_FILE)
+        report = await benchmark.run()
+    finally:
+        server.terminate()
+        server.wait()
+
+    print_accuracy(report)
+    directory = (config.get('results') or {}).get('directory', 'testing-results')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"fake_stack_bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\n💾 Report saved to: {path}")
+    if not args.state_dir:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+
+async def main():
+    """Main function"""
+    args = parse_args()
+    if args.command == 'serve':
+        await serve(args)
+    else:
+        await bench(args)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
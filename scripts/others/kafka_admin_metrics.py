@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Native Kafka Admin Metrics Collector
+====================================
+
+Metrics Kafka langsung lewat Kafka protocol (kafka-python), tanpa docker exec:
+- Daftar topic dan metadata partisi (leader, replicas, ISR)
+- Beginning/end offset per partisi
+- Committed offset dan lag per partisi untuk consumer group Connect
+- Ukuran log-dir per topic/partisi (DescribeLogDirs, hanya topic yang diminta)
+
+Every `docker exec ... kafka-topics` starts a JVM inside the broker container,
+costing seconds of CPU on the machine being measured. The admin and consumer
+clients here keep their connections open, so a full capture is a handful of
+small requests and can run every second.
+
+Usage:
+    python kafka_admin_metrics.py [--bootstrap-servers localhost:9092]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import inspect
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+try:
+    from kafka import KafkaAdminClient, KafkaConsumer, TopicPartition
+except ImportError:  # kafka-python is optional; callers fall back to docker exec
+    KafkaAdminClient = KafkaConsumer = TopicPartition = None
+
+DEFAULT_BOOTSTRAP_SERVERS = 'localhost:9092'
+MAIN_TOPIC = 'dbserver1.inventory.orders'
+
+
+def kafka_client_available() -> bool:
+    """True when kafka-python is installed"""
+    return KafkaAdminClient is not None
+
+
+def _field(entry: Any, *names: str, index: Optional[int] = None) -> Any:
+    """Read a field from a response dict (kafka-python 3.x) or tuple (2.x)"""
+    if isinstance(entry, dict):
+        for name in names:
+            if name in entry:
+                return entry[name]
+        return None
+    return entry[index] if index is not None and len(entry) > index else None
+
+
+class KafkaAdminMetricsCollector:
+    def __init__(self, bootstrap_servers: str = DEFAULT_BOOTSTRAP_SERVERS, main_topic: str = MAIN_TOPIC,
+                 group_filter: str = 'connect', client_id: str = 'cdc-performance-monitor',
+                 request_timeout_ms: int = 5000):
+        """Collector over long-lived admin and consumer connections"""
+        if KafkaAdminClient is None:
+            raise ImportError("kafka-python is required for the native Kafka collector")
+        self.bootstrap_servers = bootstrap_servers
+        self.main_topic = main_topic
+        self.group_filter = group_filter
+        self.client_id = client_id
+        self.request_timeout_ms = request_timeout_ms
+        self.admin = None
+        self.consumer = None
+        # kafka-python clients are not safe for concurrent use from several threads
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Open the admin and (group-less) consumer clients"""
+        if self.admin is None:
+            self.admin = KafkaAdminClient(
+                bootstrap_servers=self.bootstrap_servers, client_id=self.client_id,
+                request_timeout_ms=self.request_timeout_ms
+            )
+        if self.consumer is None:
+            # No group_id: used only for offset lookups, never joins or commits
+            self.consumer = KafkaConsumer(
+                bootstrap_servers=self.bootstrap_servers, client_id=f"{self.client_id}-offsets",
+                group_id=None, enable_auto_commit=False, request_timeout_ms=max(self.request_timeout_ms, 10001)
+            )
+
+    def close(self):
+        """Close both clients"""
+        if self.consumer is not None:
+            self.consumer.close()
+            self.consumer = None
+        if self.admin is not None:
+            self.admin.close()
+            self.admin = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def list_topics(self) -> List[str]:
+        """All topic names"""
+        return sorted(self.admin.list_topics())
+
+    def describe_partitions(self, topic: str) -> List[Dict[str, Any]]:
+        """Leader, replicas and ISR for every partition of topic"""
+        partitions = []
+        for topic_metadata in self.admin.describe_topics([topic]):
+            for partition in topic_metadata.get('partitions', []):
+                partitions.append({
+                    'partition': partition.get('partition', partition.get('partition_index')),
+                    'leader': partition.get('leader', partition.get('leader_id')),
+                    'replicas': list(partition.get('replicas', partition.get('replica_nodes', []))),
+                    'isr': list(partition.get('isr', partition.get('isr_nodes', [])))
+                })
+        return sorted(partitions, key=lambda p: p['partition'])
+
+    def list_group_ids(self) -> List[str]:
+        """Consumer group ids (list_consumer_groups on 2.x, list_groups on 3.x)"""
+        if hasattr(self.admin, 'list_consumer_groups'):
+            return sorted(group[0] for group in self.admin.list_consumer_groups())
+        return sorted(_field(group, 'group_id', 'group') for group in self.admin.list_groups())
+
+    def committed_offsets(self, group_id: str) -> Dict[Any, int]:
+        """Committed offset per TopicPartition for one group"""
+        if hasattr(self.admin, 'list_consumer_group_offsets'):
+            offsets = self.admin.list_consumer_group_offsets(group_id)
+        else:
+            offsets = self.admin.list_group_offsets({group_id: None}).get(group_id, {})
+        return {tp: meta.offset for tp, meta in offsets.items() if meta.offset is not None and meta.offset >= 0}
+
+    def log_dir_sizes(self, topics: List[str]) -> Dict[str, Dict[int, int]]:
+        """On-disk bytes per partition for the given topics
+
+        kafka-python 3.x asks every broker about these topics only, so sizes
+        are summed over all replicas; 2.x asks the least loaded broker about
+        every topic, so sizes cover the replicas on that one broker.
+        """
+        if 'topic_partitions' in inspect.signature(self.admin.describe_log_dirs).parameters:
+            response = self.admin.describe_log_dirs(topic_partitions=list(topics))
+        else:
+            response = self.admin.describe_log_dirs()
+        # 2.x returns the raw response object; 3.x a list of per-broker dicts
+        if hasattr(response, 'log_dirs'):
+            broker_log_dirs = [response.log_dirs]
+        else:
+            broker_log_dirs = [broker.get('log_dirs', []) for broker in response]
+
+        sizes = {topic: {} for topic in topics}
+        for log_dirs in broker_log_dirs:
+            for log_dir in log_dirs:
+                for topic_entry in _field(log_dir, 'topics', index=2) or []:
+                    name = _field(topic_entry, 'name', 'topic', index=0)
+                    if name not in sizes:
+                        continue
+                    for partition in _field(topic_entry, 'partitions', index=1) or []:
+                        index = _field(partition, 'partition_index', 'partition', index=0)
+                        size = _field(partition, 'partition_size', 'size', index=1) or 0
+                        sizes[name][index] = sizes[name].get(index, 0) + size
+        return sizes
+
+    def collect(self, include_log_dirs: bool = True) -> Dict[str, Any]:
+        """One structured capture: topics, offsets, connect group lag and log sizes"""
+        with self._lock:
+            return self._collect(include_log_dirs)
+
+    def _collect(self, include_log_dirs: bool) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.connect()
+        metrics = {
+            'timestamp': datetime.now().isoformat(),
+            'source': 'kafka-protocol',
+            'topics': {},
+            'consumer_groups': {},
+            'broker_info': {},
+            'error': None
+        }
+
+        topics = self.list_topics()
+        metrics['topics']['list'] = topics
+        metrics['topics']['count'] = len(topics)
+
+        # Committed offsets of the Connect groups decide which partitions need end offsets
+        groups = self.list_group_ids()
+        metrics['consumer_groups']['list'] = groups
+        metrics['consumer_groups']['count'] = len(groups)
+        committed = {group: self.committed_offsets(group) for group in groups
+                     if self.group_filter in group.lower()}
+
+        main_partitions = self.describe_partitions(self.main_topic) if self.main_topic in topics else []
+        main_tps = [TopicPartition(self.main_topic, p['partition']) for p in main_partitions]
+        all_tps = set(main_tps)
+        for offsets in committed.values():
+            all_tps.update(offsets)
+        end_offsets = self.consumer.end_offsets(list(all_tps)) if all_tps else {}
+        beginning_offsets = self.consumer.beginning_offsets(main_tps) if main_tps else {}
+
+        if main_partitions:
+            sizes = self.log_dir_sizes([self.main_topic]).get(self.main_topic, {}) if include_log_dirs else {}
+            for partition, tp in zip(main_partitions, main_tps):
+                partition['beginning_offset'] = beginning_offsets.get(tp)
+                partition['end_offset'] = end_offsets.get(tp)
+                partition['messages'] = (end_offsets.get(tp) or 0) - (beginning_offsets.get(tp) or 0)
+                if include_log_dirs:
+                    partition['size_bytes'] = sizes.get(partition['partition'], 0)
+            metrics['topics'][self.main_topic] = {
+                'exists': True,
+                'partition_count': len(main_partitions),
+                'end_offset_total': sum(p['end_offset'] or 0 for p in main_partitions),
+                'messages_total': sum(p['messages'] for p in main_partitions),
+                'size_bytes': sum(p.get('size_bytes', 0) for p in main_partitions) if include_log_dirs else None,
+                'partitions': main_partitions
+            }
+
+        for group, offsets in committed.items():
+            partitions = []
+            for tp in sorted(offsets, key=lambda t: (t.topic, t.partition)):
+                end_offset = end_offsets.get(tp)
+                partitions.append({
+                    'topic': tp.topic,
+                    'partition': tp.partition,
+                    'committed_offset': offsets[tp],
+                    'end_offset': end_offset,
+                    'lag': max(end_offset - offsets[tp], 0) if end_offset is not None else None
+                })
+            metrics['consumer_groups'][group] = {
+                'partitions': partitions,
+                'total_lag': sum(p['lag'] or 0 for p in partitions)
+            }
+
+        metrics['broker_info'] = {'accessible': True, 'bootstrap_servers': self.bootstrap_servers}
+        metrics['collect_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return metrics
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Collect Kafka metrics over the Kafka protocol")
+    parser.add_argument('--bootstrap-servers', default=DEFAULT_BOOTSTRAP_SERVERS)
+    parser.add_argument('--topic', default=MAIN_TOPIC)
+    args = parser.parse_args()
+
+    with KafkaAdminMetricsCollector(args.bootstrap_servers, args.topic) as collector:
+        print(json.dumps(collector.collect(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+HDR-Style Latency Histogram
+===========================
+
+Histogram latency dengan memori tetap (gaya HdrHistogram):
+- Bucket log-linear dengan presisi relatif tetap (significant figures)
+- Bisa di-merge antar worker / antar run
+- Serialisasi kompak (sparse + zlib + base64) untuk disimpan di results JSON
+
+Values are recorded in milliseconds and stored internally as integer
+microseconds. Values below 2^sub_bucket_bits microseconds are exact; above
+that the relative error stays below 10^-significant_figures.
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import base64
+import json
+import math
+import zlib
+from array import array
+from typing import Dict, Iterable, Any, Optional
+
+# Percentiles reported by summary()
+SUMMARY_PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    def __init__(self, significant_figures: int = 2, highest_trackable_ms: float = 3600000):
+        """Create an empty histogram covering 0..highest_trackable_ms"""
+        if not 1 <= significant_figures <= 4:
+            raise ValueError("significant_figures must be between 1 and 4")
+        self.significant_figures = significant_figures
+        self.highest_trackable_ms = highest_trackable_ms
+        # Smallest power of two sub-bucket count giving the requested precision
+        self.sub_bucket_bits = math.ceil(math.log2(10 ** significant_figures)) + 1
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.highest_trackable_us = max(int(highest_trackable_ms * 1000), self.sub_bucket_count)
+        self.counts = array('Q', bytes(8 * (self._index_for(self.highest_trackable_us) + 1)))
+        self.total_count = 0
+        self.min_us = None
+        self.max_us = 0
+        self.sum_us = 0
+
+    def _index_for(self, value_us: int) -> int:
+        """Bucket index of an integer microsecond value"""
+        if value_us < self.sub_bucket_count:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.sub_bucket_half + \
+            ((value_us >> shift) - self.sub_bucket_half)
+
+    def _highest_equivalent_us(self, index: int) -> int:
+        """Largest microsecond value that maps to the given index"""
+        if index < self.sub_bucket_count:
+            return index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.sub_bucket_half + 1
+        sub = offset % self.sub_bucket_half + self.sub_bucket_half
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value_ms: float, count: int = 1):
+        """Record a latency in milliseconds (clamped to the trackable range)"""
+        value_us = min(max(int(round(value_ms * 1000)), 0), self.highest_trackable_us)
+        self.counts[self._index_for(value_us)] += count
+        self.total_count += count
+        self.sum_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def record_seconds(self, value_seconds: float, count: int = 1):
+        """Record a latency given in seconds"""
+        self.record(value_seconds * 1000, count)
+
+    def record_many(self, values_ms: Iterable[float]):
+        """Record every millisecond value in values_ms"""
+        for value in values_ms:
+            self.record(value)
+
+    def _check_compatible(self, other: 'LatencyHistogram'):
+        if (other.significant_figures, other.highest_trackable_us) != \
+                (self.significant_figures, self.highest_trackable_us):
+            raise ValueError("Histograms must share significant_figures and highest_trackable_ms to merge")
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Add every count of other into this histogram"""
+        self._check_compatible(other)
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile(self, pct: float) -> float:
+        """Value (ms) at the given percentile"""
+        if self.total_count == 0:
+            return 0.0
+        target = max(1, math.ceil(pct / 100 * self.total_count))
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return min(self._highest_equivalent_us(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def mean(self) -> float:
+        """Mean of recorded values in milliseconds"""
+        return self.sum_us / self.total_count / 1000 if self.total_count else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """count/min/avg/p50/p90/p99/p99.9/max in milliseconds"""
+        if self.total_count == 0:
+            return {'count': 0}
+        summary = {
+            'count': self.total_count,
+            'min_ms': round(self.min_us / 1000, 3),
+            'avg_ms': round(self.mean(), 3)
+        }
+        for pct in SUMMARY_PERCENTILES:
+            summary[f"p{str(pct).replace('.', '_')}_ms"] = round(self.percentile(pct), 3)
+        summary['max_ms'] = round(self.max_us / 1000, 3)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact serializable form: sparse counts, zlib-compressed and base64-encoded"""
+        sparse = [[index, count] for index, count in enumerate(self.counts) if count]
+        encoded = base64.b64encode(zlib.compress(json.dumps(sparse, separators=(',', ':')).encode()))
+        return {
+            'format': 'hdr-sparse-v1',
+            'significant_figures': self.significant_figures,
+            'highest_trackable_ms': self.highest_trackable_ms,
+            'total_count': self.total_count,
+            'min_us': self.min_us,
+            'max_us': self.max_us,
+            'sum_us': self.sum_us,
+            'counts': encoded.decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        """Rebuild a histogram produced by to_dict()"""
+        histogram = cls(data['significant_figures'], data['highest_trackable_ms'])
+        for index, count in json.loads(zlib.decompress(base64.b64decode(data['counts']))):
+            histogram.counts[index] = count
+        histogram.total_count = data['total_count']
+        histogram.min_us = data['min_us']
+        histogram.max_us = data['max_us']
+        histogram.sum_us = data['sum_us']
+        return histogram
+
+
+def merge_histograms(histograms: Iterable[Optional[LatencyHistogram]]) -> LatencyHistogram:
+    """Merge several histograms (None entries are skipped) into a new one"""
+    merged = None
+    for histogram in histograms:
+        if histogram is None:
+            continue
+        if merged is None:
+            merged = LatencyHistogram(histogram.significant_figures, histogram.highest_trackable_ms)
+        merged.merge(histogram)
+    return merged if merged is not None else LatencyHistogram()
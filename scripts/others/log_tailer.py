@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Streaming Docker Log Tailer with CDC Event Classification
+=========================================================
+
+Tail log container secara incremental (`docker logs --follow --timestamps`):
+- Cursor per container (timestamp baris terakhir), lanjut otomatis setelah restart
+- Level (ERROR/WARN/INFO) dari token level, bukan substring di sembarang posisi
+- Event CDC: rebalance, task failure, Retriable exception, error replication
+  slot, kegagalan JDBC batch dan offset commit
+- Hitungan per interval dan per snapshot (tanpa double count antar phase)
+
+Lines are processed once as they arrive: a combined pre-filter regex rejects
+ordinary lines with a single search, and only candidates are matched against
+the individual event patterns. A stack trace belongs to the log record that
+started it, so an exception is counted once per record rather than once per
+"Caused by" line. Memory is bounded by the interval history and the
+recent-line buffers, independent of how many lines are read.
+
+Usage:
+    python log_tailer.py [--duration 60] [--interval 10] [container ...]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+# Level token near the start of a line: Connect/Kafka (log4j), PostgreSQL and ZooKeeper formats
+LEVEL_PATTERN = re.compile(r'\b(TRACE|DEBUG|INFO|LOG|NOTICE|WARN|WARNING|ERROR|FATAL|PANIC|SEVERE)\b')
+LEVEL_SCAN_CHARS = 120
+LEVELS = {
+    'TRACE': 'debug', 'DEBUG': 'debug',
+    'INFO': 'info', 'LOG': 'info', 'NOTICE': 'info',
+    'WARN': 'warn', 'WARNING': 'warn',
+    'ERROR': 'error', 'FATAL': 'error', 'PANIC': 'error', 'SEVERE': 'error'
+}
+
+CDC_EVENT_PATTERNS = {
+    'rebalance': r'[Rr]ebalanc|\(Re-\)joining group|Joined group at generation',
+    'task_failure': r'Task threw an uncaught and unrecoverable exception|Task is being killed and will not recover'
+                    r'|Tolerance exceeded in error handler',
+    'retriable': r'Retriable',
+    'slot_error': r'replication slot "?[\w.-]+"? (?:is active|does not exist|already exists|has been invalidated)'
+                  r'|(?:could not|[Ff]ailed to) (?:start|create|drop)\w* (?:the )?replication (?:slot|stream)'
+                  r'|requested WAL segment \S+ has already been removed',
+    'jdbc_batch_failure': r'BatchUpdateException|Batch entry \d+ .* was aborted',
+    'offset_commit_failure': r'Failed to commit offsets|Commit of offsets threw an unexpected exception'
+}
+EVENT_PATTERNS = {name: re.compile(pattern) for name, pattern in CDC_EVENT_PATTERNS.items()}
+ANY_EVENT_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in CDC_EVENT_PATTERNS.values()))
+
+MAX_STORED_LINE = 500
+STREAM_LIMIT_BYTES = 1024 * 1024
+
+
+def classify_line(text: str) -> Tuple[Optional[str], List[str]]:
+    """(level or None for continuation lines, CDC events) for one log line"""
+    match = LEVEL_PATTERN.search(text, 0, LEVEL_SCAN_CHARS)
+    level = LEVELS[match.group(1)] if match else None
+    if not ANY_EVENT_PATTERN.search(text):
+        return level, []
+    return level, [name for name, pattern in EVENT_PATTERNS.items() if pattern.search(text)]
+
+
+def split_timestamp(line: str) -> Tuple[Optional[str], str]:
+    """Split the RFC 3339 prefix added by `docker logs --timestamps`"""
+    if len(line) > 20 and line[4] == '-' and line[10] == 'T':
+        timestamp, _, text = line.partition(' ')
+        return timestamp, text
+    return None, line
+
+
+def sortable_timestamp(timestamp: str) -> str:
+    """Docker trims trailing zeros of the nanoseconds; pad them so strings compare in time order"""
+    seconds, _, fraction = timestamp.rstrip('Z').partition('.')
+    return f"{seconds}.{fraction:0<9}"
+
+
+class ContainerLogStream:
+    def __init__(self, container: str, interval_seconds: float = 10.0, history_intervals: int = 360,
+                 recent_lines: int = 20):
+        """Incremental counters for one container's log stream"""
+        self.container = container
+        self.interval_seconds = interval_seconds
+        self.totals = Counter()
+        self.window = Counter()  # since the last snapshot()
+        self.intervals = deque(maxlen=history_intervals)
+        self.current_interval = None
+        self.current_counts = Counter()
+        self.recent_errors = deque(maxlen=recent_lines)
+        self.recent_warnings = deque(maxlen=recent_lines)
+        self.event_examples = {name: deque(maxlen=3) for name in CDC_EVENT_PATTERNS}
+        self.record_events = set()
+        self.cursor = None
+        self.restarts = 0
+        self.dropped_lines = 0
+        self.last_error = None
+        self.running = False
+
+    def _count(self, key: str):
+        self.totals[key] += 1
+        self.window[key] += 1
+        self.current_counts[key] += 1
+
+    def process_line(self, text: str, now: Optional[float] = None):
+        """Classify one line and update totals, the snapshot window and the current interval"""
+        now = time.time() if now is None else now
+        interval = int(now // self.interval_seconds)
+        if interval != self.current_interval:
+            if self.current_interval is not None and self.current_counts:
+                self.intervals.append((self.current_interval * self.interval_seconds, self.current_counts))
+            self.current_interval = interval
+            self.current_counts = Counter()
+
+        self._count('lines')
+        level, events = classify_line(text)
+        if level is not None:
+            # A level token starts a new record; stack trace lines have none
+            self.record_events = set()
+            self._count(level)
+            if level == 'error':
+                self.recent_errors.append(text[:MAX_STORED_LINE])
+            elif level == 'warn':
+                self.recent_warnings.append(text[:MAX_STORED_LINE])
+        for event in events:
+            if event in self.record_events:
+                continue
+            self.record_events.add(event)
+            self._count(event)
+            self.event_examples[event].append(text[:MAX_STORED_LINE])
+
+    def process_docker_line(self, line: str, now: Optional[float] = None, skip_until: Optional[str] = None) -> bool:
+        """Process a `--timestamps` line; lines at or before skip_until were already seen"""
+        timestamp, text = split_timestamp(line.rstrip('\r\n'))
+        if timestamp is not None:
+            if skip_until is not None and sortable_timestamp(timestamp) <= skip_until:
+                return False
+            self.cursor = timestamp
+        self.process_line(text, now)
+        return True
+
+    def interval_series(self) -> List[Dict[str, Any]]:
+        """Per-interval counts, oldest first, including the interval in progress"""
+        series = [{'interval_start': start, **counts} for start, counts in self.intervals]
+        if self.current_counts:
+            series.append({'interval_start': self.current_interval * self.interval_seconds, **self.current_counts})
+        return series
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts since the previous snapshot in the get_docker_logs_analysis layout"""
+        window, self.window = self.window, Counter()
+        return {
+            'total_lines': window['lines'],
+            'error_count': window['error'],
+            'warning_count': window['warn'],
+            'info_count': window['info'],
+            'events': {name: window[name] for name in CDC_EVENT_PATTERNS if window[name]},
+            'recent_errors': list(self.recent_errors)[-5:],
+            'recent_warnings': list(self.recent_warnings)[-5:],
+            'cursor': self.cursor,
+            'following': self.running,
+            'restarts': self.restarts,
+            'error': self.last_error if not self.running else None
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Run totals, event examples and the per-interval series"""
+        return {
+            'totals': dict(self.totals),
+            'events': {name: self.totals[name] for name in CDC_EVENT_PATTERNS},
+            'event_examples': {name: list(lines) for name, lines in self.event_examples.items() if lines},
+            'restarts': self.restarts,
+            'dropped_lines': self.dropped_lines,
+            'last_error': self.last_error,
+            'intervals': self.interval_series()
+        }
+
+
+class LogTailer:
+    def __init__(self, containers: List[str], interval_seconds: float = 10.0, history_intervals: int = 360,
+                 backlog_lines: int = 0, docker_command: str = 'docker'):
+        """Follow-mode tailer over several containers; backlog_lines are read on the first attach"""
+        self.interval_seconds = interval_seconds
+        self.backlog_lines = backlog_lines
+        self.docker_command = docker_command
+        self.streams = {
+            container: ContainerLogStream(container, interval_seconds, history_intervals)
+            for container in containers
+        }
+        self.tasks = []
+        self.processes = {}
+        self.stop_event = None
+        self.started_at = None
+
+    async def start(self):
+        """Start one follow task per container"""
+        if self.tasks:
+            return
+        self.stop_event = asyncio.Event()
+        self.started_at = time.time()
+        self.tasks = [asyncio.create_task(self._follow(stream)) for stream in self.streams.values()]
+
+    async def stop(self):
+        """Stop following and terminate the docker logs processes"""
+        if not self.tasks:
+            return
+        self.stop_event.set()
+        for process in list(self.processes.values()):
+            if process.returncode is None:
+                process.terminate()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _follow(self, stream: ContainerLogStream):
+        """Run `docker logs --follow` for one container, resuming from its cursor after exits"""
+        backoff = 1.0
+        while not self.stop_event.is_set():
+            if stream.cursor is not None:
+                window = ['--since', stream.cursor]
+                skip_until = sortable_timestamp(stream.cursor)
+            else:
+                window = ['--tail', str(self.backlog_lines)]
+                skip_until = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    self.docker_command, 'logs', '--follow', '--timestamps', *window, stream.container,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, limit=STREAM_LIMIT_BYTES
+                )
+            except OSError as e:
+                stream.last_error = str(e)
+                break  # docker CLI missing: nothing to retry
+            self.processes[stream.container] = process
+            stream.running = True
+            lines_read = 0
+            try:
+                while True:
+                    try:
+                        line = await process.stdout.readline()
+                    except ValueError:
+                        stream.dropped_lines += 1  # longer than STREAM_LIMIT_BYTES
+                        continue
+                    if not line:
+                        break
+                    lines_read += 1
+                    if stream.process_docker_line(line.decode('utf-8', errors='replace'), skip_until=skip_until):
+                        skip_until = None  # past the resume point
+            finally:
+                stream.running = False
+                if process.returncode is None:
+                    process.terminate()
+                await process.wait()
+                self.processes.pop(stream.container, None)
+
+            if self.stop_event.is_set():
+                break
+            # The container restarted or `docker logs` failed: resume after a pause
+            stream.restarts += 1
+            stream.last_error = f"docker logs exited with {process.returncode}"
+            backoff = 1.0 if lines_read else min(backoff * 2, 30.0)
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-container counts since the previous snapshot, plus an error summary"""
+        logs_analysis = {
+            'source': 'log-tailer',
+            'containers': {name: stream.snapshot() for name, stream in self.streams.items()},
+            'error_summary': {},
+            'timestamp': datetime.now().isoformat()
+        }
+        containers = logs_analysis['containers'].values()
+        logs_analysis['error_summary'] = {
+            'total_errors': sum(c['error_count'] for c in containers),
+            'total_warnings': sum(c['warning_count'] for c in containers),
+            'containers_with_errors': sum(1 for c in containers if c['error_count'] > 0),
+            'events': dict(sum((Counter(c['events']) for c in containers), Counter())),
+            # Cumulative since the tailer started, for alerting across phases
+            'run_total_errors': sum(s.totals['error'] for s in self.streams.values()),
+            'run_total_warnings': sum(s.totals['warn'] for s in self.streams.values())
+        }
+        return logs_analysis
+
+    def summary(self) -> Dict[str, Any]:
+        """Run totals and per-interval event counts for every container"""
+        containers = {name: stream.summary() for name, stream in self.streams.items()}
+        totals = sum((Counter(c['totals']) for c in containers.values()), Counter())
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        return {
+            'interval_seconds': self.interval_seconds,
+            'elapsed_seconds': round(elapsed, 1),
+            'totals': dict(totals),
+            'events': {name: totals[name] for name in CDC_EVENT_PATTERNS},
+            'lines_per_second': round(totals['lines'] / elapsed, 1) if elapsed > 0 else None,
+            'containers': containers
+        }
+
+
+def analyze_lines(container: str, lines: List[str]) -> Dict[str, Any]:
+    """One-shot classification of already fetched lines (no follow mode)"""
+    stream = ContainerLogStream(container)
+    for line in lines:
+        if line:
+            stream.process_line(line)
+    return stream.snapshot()
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Follow container logs and count CDC events")
+    parser.add_argument('containers', nargs='*',
+                        default=['tutorial-connect-1', 'debezium-cdc-mirroring-postgres-1',
+                                 'debezium-cdc-mirroring-kafka-1'])
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconds to follow")
+    parser.add_argument('--interval', type=float, default=10.0, help="Seconds per count interval")
+    parser.add_argument('--backlog', type=int, default=0, help="Existing lines to read per container first")
+    args = parser.parse_args()
+
+    async with LogTailer(args.containers, args.interval, backlog_lines=args.backlog) as tailer:
+        deadline = time.time() + args.duration
+        while time.time() < deadline:
+            await asyncio.sleep(min(args.interval, max(deadline - time.time(), 0)))
+            snapshot = tailer.snapshot()
+            events = snapshot['error_summary']['events']
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] "
+                  f"errors={snapshot['error_summary']['total_errors']} "
+                  f"warnings={snapshot['error_summary']['total_warnings']} "
+                  + " ".join(f"{name}={count}" for name, count in sorted(events.items())))
+        summary = tailer.summary()
+
+    for container in summary['containers'].values():
+        container.pop('intervals')
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
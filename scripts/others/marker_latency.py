@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Marker-Row End-to-End Latency Tracker
+=====================================
+
+Latency CDC per-row menggunakan marker rows:
+- Insert marker row di source dengan RETURNING id + commit timestamp
+- Cari row tersebut di target berdasarkan primary key (bukan COUNT(*))
+- Hitung latency per-row dari kolom _synced_at (SMT addTS di pg-sink.json)
+- Opsional: arrival push via pg_notify (arrival_listener) tanpa polling target
+
+Two latencies are reported for every marker:
+- kafka_latency_ms: source commit -> _synced_at. The sink's InsertField SMT
+  stamps _synced_at with the Kafka record timestamp, so this is exact and
+  independent of how often the target is polled.
+- apply_latency_ms: source commit acknowledged -> row observed on the target.
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+from latency_histogram import LatencyHistogram
+
+MARKER_INSERT_SQL = """
+    INSERT INTO inventory.orders (order_date, purchaser, quantity, product_id)
+    VALUES (CURRENT_DATE, $1, 1, $2)
+    RETURNING id, clock_timestamp() AT TIME ZONE 'UTC' AS committed_at
+"""
+
+# Upper bound on ids looked up per target query
+LOOKUP_CHUNK_SIZE = 1000
+
+
+def _epoch(value) -> Optional[float]:
+    """Convert a timestamp column value to epoch seconds (naive values are UTC)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    # Integer epoch millis when the sink stores the Connect timestamp as a number
+    return float(value) / 1000
+
+
+class MarkerLatencyTracker:
+    def __init__(self, source_conn, target_conn, customer_id: int, product_id: int,
+                 target_table: str = 'orders', poll_interval: float = 0.05,
+                 arrival_listener=None):
+        """Track per-row CDC latency for marker rows written through source_conn"""
+        self.source_conn = source_conn
+        self.target_conn = target_conn
+        self.customer_id = customer_id
+        self.product_id = product_id
+        self.target_table = target_table
+        self.poll_interval = poll_interval
+        self.markers = {}
+        self.pending = set()
+        self.has_synced_at = True
+        self.errors = []
+        # With a TargetArrivalListener the target is never polled
+        self.arrival_listener = arrival_listener
+        if arrival_listener is not None:
+            arrival_listener.add_callback(self.record_arrival)
+
+    async def emit_marker(self) -> int:
+        """Insert one marker row and remember when it was committed"""
+        insert_start = time.time()
+        row = await self.source_conn.fetchrow(MARKER_INSERT_SQL, self.customer_id, self.product_id)
+        commit_ack = time.time()
+        self.markers[row['id']] = {
+            'id': row['id'],
+            'insert_start': insert_start,
+            'commit_ack': commit_ack,
+            'committed_at': _epoch(row['committed_at'])
+        }
+        self.pending.add(row['id'])
+        if self.arrival_listener is not None:
+            arrival = self.arrival_listener.arrivals.get(row['id'])
+            if arrival:
+                self.record_arrival(row['id'], arrival['received_at'], arrival['synced_at'])
+        return row['id']
+
+    def record_arrival(self, marker_id: int, observed_at: float, synced_at: Optional[float] = None):
+        """Mark a marker row as replicated to the target"""
+        marker = self.markers.get(marker_id)
+        if marker is None or marker_id not in self.pending:
+            return
+        self.pending.discard(marker_id)
+        marker['observed_at'] = observed_at
+        if synced_at is not None:
+            marker['synced_at'] = synced_at
+
+    async def poll_target(self):
+        """Look up pending markers on the target by primary key"""
+        pending = sorted(self.pending)
+        for chunk_start in range(0, len(pending), LOOKUP_CHUNK_SIZE):
+            chunk = pending[chunk_start:chunk_start + LOOKUP_CHUNK_SIZE]
+            if self.has_synced_at:
+                try:
+                    rows = await self.target_conn.fetch(
+                        f"SELECT id, _synced_at FROM {self.target_table} WHERE id = ANY($1::int[])", chunk
+                    )
+                except Exception as e:
+                    if '_synced_at' not in str(e):
+                        raise
+                    # addTS SMT disabled: fall back to observation time only
+                    self.has_synced_at = False
+                    continue
+            else:
+                rows = await self.target_conn.fetch(
+                    f"SELECT id FROM {self.target_table} WHERE id = ANY($1::int[])", chunk
+                )
+            observed_at = time.time()
+            for row in rows:
+                synced_at = _epoch(row['_synced_at']) if self.has_synced_at else None
+                self.record_arrival(row['id'], observed_at, synced_at)
+
+    async def run_emitter(self, stop_event: asyncio.Event, rate_per_second: float,
+                          max_markers: Optional[int] = None):
+        """Emit markers at a fixed rate until stopped"""
+        interval = 1.0 / rate_per_second if rate_per_second > 0 else 1.0
+        emitted = 0
+        while not stop_event.is_set() and (max_markers is None or emitted < max_markers):
+            try:
+                await self.emit_marker()
+                emitted += 1
+            except Exception as e:
+                self.errors.append(f"emit: {e}")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_collector(self, stop_event: asyncio.Event, drain_timeout: float = 30.0):
+        """Poll the target until stopped and every marker arrived (or drain_timeout passes)"""
+        drain_deadline = None
+        while True:
+            if stop_event.is_set():
+                if drain_deadline is None:
+                    drain_deadline = time.time() + drain_timeout
+                if not self.pending or time.time() >= drain_deadline:
+                    break
+            if self.arrival_listener is not None:
+                # Arrivals are pushed to record_arrival; just wait for the next one
+                await self.arrival_listener.wait_changed(self.poll_interval)
+                continue
+            if self.pending:
+                try:
+                    await self.poll_target()
+                except Exception as e:
+                    self.errors.append(f"poll: {e}")
+            await asyncio.sleep(self.poll_interval)
+        
+        if self.arrival_listener is not None and self.pending:
+            # One lookup for anything the listener missed
+            try:
+                await self.poll_target()
+            except Exception as e:
+                self.errors.append(f"poll: {e}")
+
+    async def measure(self, stop_event: asyncio.Event, rate_per_second: float = 20.0,
+                      max_markers: Optional[int] = None, drain_timeout: float = 30.0) -> Dict[str, Any]:
+        """Emit markers while the workload runs, then wait for them to replicate"""
+        emitter_done = asyncio.Event()
+
+        async def emitter():
+            try:
+                await self.run_emitter(stop_event, rate_per_second, max_markers)
+            finally:
+                emitter_done.set()
+
+        await asyncio.gather(emitter(), self.run_collector(emitter_done, drain_timeout))
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-marker measurements plus aggregate statistics"""
+        measurements = []
+        for marker in sorted(self.markers.values(), key=lambda m: m['id']):
+            entry = {
+                'marker_id': marker['id'],
+                'insert_timestamp': datetime.fromtimestamp(marker['insert_start']).isoformat(),
+                'status': 'success' if 'observed_at' in marker else 'timeout'
+            }
+            if 'observed_at' in marker:
+                entry['apply_latency_ms'] = round((marker['observed_at'] - marker['commit_ack']) * 1000, 2)
+                entry['total_latency_ms'] = round((marker['observed_at'] - marker['insert_start']) * 1000, 2)
+            if marker.get('synced_at') is not None and marker.get('committed_at') is not None:
+                entry['kafka_latency_ms'] = round((marker['synced_at'] - marker['committed_at']) * 1000, 2)
+            measurements.append(entry)
+
+        successful = [m for m in measurements if m['status'] == 'success']
+        histograms = {name: LatencyHistogram() for name in ('kafka_latency', 'apply_latency', 'total_latency')}
+        for measurement in measurements:
+            for name, histogram in histograms.items():
+                if f'{name}_ms' in measurement:
+                    histogram.record(measurement[f'{name}_ms'])
+        return {
+            'mode': 'marker',
+            'detection': 'notify' if self.arrival_listener is not None else 'poll',
+            'markers_emitted': len(measurements),
+            'markers_arrived': len(successful),
+            'markers_missing': len(measurements) - len(successful),
+            'synced_at_available': self.has_synced_at,
+            'kafka_latency': histograms['kafka_latency'].summary(),
+            'apply_latency': histograms['apply_latency'].summary(),
+            'total_latency': histograms['total_latency'].summary(),
+            'errors': self.errors[-10:],
+            'histograms': {name: histogram.to_dict() for name, histogram in histograms.items()},
+            'measurements': measurements
+        }
@@ -11,16 +11,32 @@ Date: August 2025
 """
 
 import asyncio
-import asyncpg
 import json
 import time
 import yaml
 import subprocess
 import os
-import sys
 from datetime import datetime
-from typing import Dict, List, Any
-import random
+from typing import Dict, List, Any, Optional
+import argparse
+
+from open_loop_load import OpenLoopLoadGenerator, fetch_reference_ids
+from batch_generator import GENERATORS, OrderBatch, create_batch_generator
+from marker_latency import MarkerLatencyTracker
+from arrival_listener import TargetArrivalListener
+from latency_histogram import LatencyHistogram, merge_histograms
+from docker_api_stats import DEFAULT_SOCKET_PATH, collect_docker_stats, docker_api_available
+from row_counts import RowCounter
+from db_pools import DatabasePoolManager
+from results_store import ResultsStore
+from run_metadata import collect_run_metadata, mass_insert_workload
+from kafka_admin_metrics import DEFAULT_BOOTSTRAP_SERVERS, MAIN_TOPIC, KafkaAdminMetricsCollector, kafka_client_available
+
+# Load strategies supported by mass_insert_orders
+INSERT_STRATEGIES = ('executemany', 'copy', 'multirow', 'unnest')
+ORDER_COLUMNS = ('order_date', 'purchaser', 'quantity', 'product_id')
+# PostgreSQL accepts at most 32767 bind parameters per statement
+MULTIROW_MAX_ROWS = 32767 // len(ORDER_COLUMNS)
 
 class CDCMassInsertMonitor:
     def __init__(self, config_path: str = "config.yaml"):
@@ -35,6 +51,22 @@ class CDCMassInsertMonitor:
             "debezium-cdc-mirroring-target-postgres-1",
             "tutorial-connect-1"
         ]
+        self._multirow_sql_cache = {}
+        # 'estimate' (catalog statistics + id watermark) or 'exact' (COUNT(*))
+        self.row_counter = RowCounter((self.config.get('monitoring') or {}).get('row_count_mode', 'estimate'))
+        docker_config = self.config.get('docker') or {}
+        self.docker_socket_path = docker_config.get('socket_path', DEFAULT_SOCKET_PATH)
+        self.docker_stats_source = docker_config.get('stats_source', 'api')
+        kafka_config = self.config.get('kafka') or {}
+        self.kafka_bootstrap_servers = kafka_config.get('bootstrap_servers', DEFAULT_BOOTSTRAP_SERVERS)
+        self.kafka_metrics_source = kafka_config.get('metrics_source', 'protocol')
+        # Kafka admin/consumer clients kept open for the whole test, opened on first capture
+        self.kafka_collector = None
+        # Source/target pools for the whole test, opened on first use
+        self.db_pools = DatabasePoolManager.from_config(self.config)
+        # 'sqlite' streams batches and phases to an append-only store; 'json' writes one file at the end
+        self.results_config = self.config.get('results') or {}
+        self.results_store = None
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
@@ -96,6 +128,16 @@ class CDCMassInsertMonitor:
             
         return stats
 
+    async def capture_docker_stats(self) -> Dict[str, Any]:
+        """Docker stats for all containers via the Engine API, falling back to the docker CLI"""
+        if self.docker_stats_source == 'api' and docker_api_available(self.docker_socket_path):
+            try:
+                return await collect_docker_stats(self.container_names, self.docker_socket_path)
+            except Exception as e:
+                print(f"⚠️  Docker API error ({e}), falling back to docker CLI")
+                self.docker_stats_source = 'cli'
+        return await asyncio.to_thread(self.get_docker_stats)
+
     def get_docker_logs_summary(self, container: str, lines: int = 20) -> Dict[str, Any]:
         """Get recent Docker logs from container"""
         try:
@@ -147,37 +189,63 @@ class CDCMassInsertMonitor:
         except Exception as e:
             return {'error': str(e)}
 
+    def get_kafka_topics_info_native(self) -> Dict[str, Any]:
+        """Kafka topics, offsets and log sizes over the Kafka protocol"""
+        if self.kafka_collector is None:
+            self.kafka_collector = KafkaAdminMetricsCollector(self.kafka_bootstrap_servers)
+        metrics = self.kafka_collector.collect()
+        topics = metrics['topics']['list']
+        topic_details = {}
+        if MAIN_TOPIC in metrics['topics']:
+            topic_details[MAIN_TOPIC] = metrics['topics'][MAIN_TOPIC]
+        return {
+            'source': metrics['source'],
+            'topics': topics,
+            'topic_count': len(topics),
+            'main_topic_details': topic_details,
+            'consumer_groups': {group: detail for group, detail in metrics['consumer_groups'].items()
+                                if isinstance(detail, dict)},
+            'collect_ms': metrics['collect_ms']
+        }
+
+    async def capture_kafka_info(self) -> Dict[str, Any]:
+        """Kafka info over the Kafka protocol, falling back to docker exec CLI tools"""
+        if self.kafka_metrics_source == 'protocol' and kafka_client_available():
+            try:
+                return await asyncio.to_thread(self.get_kafka_topics_info_native)
+            except Exception as e:
+                print(f"⚠️  Kafka protocol collector error ({e}), falling back to docker exec")
+                self.close_kafka_collector()
+                self.kafka_metrics_source = 'cli'
+        return await asyncio.to_thread(self.get_kafka_topics_info)
+
+    def close_kafka_collector(self):
+        """Close the Kafka admin/consumer clients if they were opened"""
+        if self.kafka_collector is not None:
+            try:
+                self.kafka_collector.close()
+            except Exception:
+                pass
+            self.kafka_collector = None
+
     async def get_database_stats(self, db_config: Dict[str, Any], db_name: str) -> Dict[str, Any]:
-        """Get database statistics"""
+        """Get database statistics (db_config is kept for callers; the pool holds the settings)"""
         try:
-            conn = await asyncpg.connect(
-                host=db_config['host'],
-                port=db_config['port'],
-                user=db_config['user'],
-                password=db_config['password'],
-                database=db_config['database']
-            )
-            
-            # Get table count for orders
-            if db_name == "source":
-                count_query = "SELECT COUNT(*) FROM inventory.orders"
-            else:
-                count_query = "SELECT COUNT(*) FROM orders"
+            async with self.db_pools.acquire(db_name) as conn:
+                # Get table count for orders
+                table = "inventory.orders" if db_name == "source" else "orders"
+                count = await self.row_counter.count(conn, table)
                 
-            count = await conn.fetchval(count_query)
-            
-            # Get database size
-            size_query = "SELECT pg_size_pretty(pg_database_size(current_database()))"
-            db_size = await conn.fetchval(size_query)
-            
-            # Get connection count
-            conn_query = "SELECT count(*) FROM pg_stat_activity WHERE state = 'active'"
-            active_connections = await conn.fetchval(conn_query)
-            
-            await conn.close()
+                # Get database size
+                db_size = await conn.fetchval_monitoring('database_size')
+                
+                # Get connection count
+                active_connections = await conn.fetchval_monitoring('active_connections')
             
             return {
-                'orders_count': count,
+                'orders_count': count['rows'],
+                'orders_count_method': count['method'],
+                'orders_max_id': count.get('max_id'),
                 'database_size': db_size,
                 'active_connections': active_connections,
                 'status': 'connected'
@@ -193,8 +261,8 @@ class CDCMassInsertMonitor:
         phase_data = {
             'phase': phase_name,
             'timestamp': datetime.now().isoformat(),
-            'docker_stats': self.get_docker_stats(),
-            'kafka_info': self.get_kafka_topics_info()
+            'docker_stats': await self.capture_docker_stats(),
+            'kafka_info': await self.capture_kafka_info()
         }
         
         # Get database stats
@@ -215,144 +283,409 @@ class CDCMassInsertMonitor:
         
         return phase_data
 
-    async def mass_insert_orders(self, count: int = 100000, batch_size: int = 5000) -> Dict[str, Any]:
-        """Perform mass insert of orders"""
-        print(f"\n🚀 Starting mass insert of {count:,} orders in batches of {batch_size:,}")
-        
-        try:
-            conn = await asyncpg.connect(
-                host=self.config['database']['host'],
-                port=self.config['database']['port'], 
-                user=self.config['database']['user'],
-                password=self.config['database']['password'],
-                database=self.config['database']['database']
+    async def _insert_batch(self, conn, strategy: str, batch: OrderBatch):
+        """Write one batch of orders using the selected load strategy"""
+        if strategy == 'unnest':
+            # Whole columns as array parameters, no per-row tuples at all
+            await conn.execute(
+                """INSERT INTO inventory.orders (order_date, purchaser, quantity, product_id)
+                   SELECT $1::date, purchaser, quantity, product_id
+                   FROM unnest($2::int[], $3::int[], $4::int[]) AS t(purchaser, quantity, product_id)""",
+                batch.order_date, batch.purchaser, batch.quantity, batch.product_id
             )
-            
-            # Get existing customers and products
-            customers = await conn.fetch("SELECT id FROM inventory.customers LIMIT 100")
-            products = await conn.fetch("SELECT id FROM inventory.products LIMIT 100")
-            
-            if not customers or not products:
-                raise Exception("No customers or products found for generating orders")
-            
-            customer_ids = [row['id'] for row in customers]
-            product_ids = [row['id'] for row in products]
-            
-            start_time = time.time()
-            total_inserted = 0
-            batch_times = []
-            
-            # Process in batches
-            for batch_start in range(0, count, batch_size):
-                batch_end = min(batch_start + batch_size, count)
-                current_batch_size = batch_end - batch_start
-                
-                batch_start_time = time.time()
+        elif strategy == 'copy':
+            # Binary COPY protocol, one round trip per batch
+            await conn.copy_records_to_table(
+                'orders',
+                records=batch.rows(),
+                columns=list(ORDER_COLUMNS),
+                schema_name='inventory'
+            )
+        elif strategy == 'multirow':
+            # Multi-row INSERT ... VALUES, chunked to stay under the bind parameter limit
+            orders_data = batch.rows()
+            for chunk_start in range(0, len(orders_data), MULTIROW_MAX_ROWS):
+                chunk = orders_data[chunk_start:chunk_start + MULTIROW_MAX_ROWS]
+                args = [value for row in chunk for value in row]
+                await conn.execute(self._multirow_insert_sql(len(chunk)), *args)
+        else:
+            await conn.executemany(
+                """INSERT INTO inventory.orders (order_date, purchaser, quantity, product_id) 
+                   VALUES ($1, $2, $3, $4)""",
+                batch.rows()
+            )
+
+    def _multirow_insert_sql(self, row_count: int) -> str:
+        """Build (and cache) a multi-row INSERT statement for row_count rows"""
+        sql = self._multirow_sql_cache.get(row_count)
+        if sql is None:
+            width = len(ORDER_COLUMNS)
+            values = ', '.join(
+                '(' + ', '.join(f'${row * width + col + 1}' for col in range(width)) + ')'
+                for row in range(row_count)
+            )
+            sql = (f"INSERT INTO inventory.orders ({', '.join(ORDER_COLUMNS)}) "
+                   f"VALUES {values}")
+            self._multirow_sql_cache[row_count] = sql
+        return sql
+
+    def _batch_stats(self, inserted: int, batch_times: List[tuple], elapsed: float,
+                     histogram: LatencyHistogram) -> Dict[str, Any]:
+        """Summarize throughput and batch latency for a set of batches"""
+        batch_rates = [
+            size / batch_time for size, batch_time in batch_times if batch_time > 0
+        ]
+        times = [batch_time for _, batch_time in batch_times]
+        insert_time = sum(times)
+        return {
+            'total_inserted': inserted,
+            'batch_count': len(times),
+            'avg_ops_per_second': inserted / elapsed if elapsed > 0 else 0,
+            # Per-writer throughput of the write path alone, excluding the inter-batch delay
+            'insert_ops_per_second': inserted / insert_time if insert_time > 0 else 0,
+            'avg_batch_time': insert_time / len(times) if times else 0,
+            'fastest_batch': min(times) if times else 0,
+            'slowest_batch': max(times) if times else 0,
+            'batch_time_percentiles': histogram.summary(),
+            'batch_ops_per_second': {
+                'min': min(batch_rates) if batch_rates else 0,
+                'avg': sum(batch_rates) / len(batch_rates) if batch_rates else 0,
+                'max': max(batch_rates) if batch_rates else 0
+            }
+        }
+
+    async def _insert_worker(self, worker_id: int, pool, queue: asyncio.Queue, strategy: str,
+                             generator, count: int, progress: Dict[str, int],
+                             batch_delay: float) -> Dict[str, Any]:
+        """Drain batches from the shared queue on one pooled connection"""
+        batch_times = []
+        batch_histogram = LatencyHistogram()
+        inserted = 0
+        generate_seconds = 0.0
+        worker_start = time.time()
+        
+        async with pool.acquire() as conn:
+            while True:
+                try:
+                    current_batch_size = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
                 
-                # Generate batch data
-                orders_data = []
-                for i in range(current_batch_size):
-                    purchaser = random.choice(customer_ids)
-                    product_id = random.choice(product_ids)
-                    quantity = random.randint(1, 10)
-                    
-                    orders_data.append((
-                        datetime.now().date(),
-                        purchaser,
-                        quantity,
-                        product_id
-                    ))
+                # Generate batch data (timed apart from the database write)
+                generate_start = time.perf_counter()
+                batch = generator.generate(current_batch_size)
+                generate_seconds += time.perf_counter() - generate_start
                 
                 # Batch insert
-                await conn.executemany(
-                    """INSERT INTO inventory.orders (order_date, purchaser, quantity, product_id) 
-                       VALUES ($1, $2, $3, $4)""",
-                    orders_data
-                )
-                
+                batch_start_time = time.time()
+                await self._insert_batch(conn, strategy, batch)
                 batch_time = time.time() - batch_start_time
-                batch_times.append(batch_time)
-                total_inserted += current_batch_size
+                batch_times.append((current_batch_size, batch_time))
+                batch_histogram.record_seconds(batch_time)
+                if self.results_store is not None:
+                    self.results_store.record(f'insert.w{worker_id}.batch_seconds', batch_start_time + batch_time,
+                                              batch_time)
+                    self.results_store.record(f'insert.w{worker_id}.batch_rows', batch_start_time + batch_time,
+                                              current_batch_size)
+                inserted += current_batch_size
+                progress['inserted'] += current_batch_size
+                progress['batches'] += 1
                 
                 # Progress update
-                progress = (total_inserted / count) * 100
+                percent = (progress['inserted'] / count) * 100
                 ops_per_sec = current_batch_size / batch_time if batch_time > 0 else 0
                 
-                print(f"  📊 Batch {len(batch_times):,}: {current_batch_size:,} orders in {batch_time:.2f}s "
-                      f"({ops_per_sec:.0f} ops/sec) - Progress: {progress:.1f}%")
+                print(f"  📊 Batch {progress['batches']:,} [W{worker_id}]: {current_batch_size:,} orders "
+                      f"in {batch_time:.2f}s ({ops_per_sec:.0f} ops/sec) - Progress: {percent:.1f}%")
                 
                 # Small delay to allow CDC to process
-                await asyncio.sleep(0.1)
+                if batch_delay > 0:
+                    await asyncio.sleep(batch_delay)
+        
+        stats = self._batch_stats(inserted, batch_times, time.time() - worker_start, batch_histogram)
+        stats['worker_id'] = worker_id
+        stats['generate_seconds'] = generate_seconds
+        stats['batch_times'] = batch_times
+        stats['batch_histogram'] = batch_histogram
+        return stats
+
+    async def mass_insert_orders(self, count: int = 100000, batch_size: int = 5000,
+                                 strategy: str = 'executemany', concurrency: int = 1,
+                                 batch_delay: Optional[float] = None,
+                                 generator_kind: str = 'numpy') -> Dict[str, Any]:
+        """Perform mass insert of orders with N concurrent writers"""
+        if strategy not in INSERT_STRATEGIES:
+            return {'error': f"Unknown insert strategy '{strategy}' (choose from {', '.join(INSERT_STRATEGIES)})"}
+        if concurrency < 1:
+            return {'error': f"Concurrency must be at least 1, got {concurrency}"}
+        if batch_delay is None:
+            # A single writer keeps the original pacing; a pool runs flat out
+            batch_delay = 0.1 if concurrency == 1 else 0.0
+            
+        print(f"\n🚀 Starting mass insert of {count:,} orders in batches of {batch_size:,} "
+              f"(strategy: {strategy}, writers: {concurrency})")
+        
+        try:
+            # Writers get their own pool (one connection each); monitoring keeps the source pool
+            self.db_pools.register('writers', 'database', concurrency, concurrency)
+            pool = await self.db_pools.pool('writers')
+            
+            # Get existing customers and products
+            async with self.db_pools.acquire('source') as conn:
+                customers = await conn.fetch("SELECT id FROM inventory.customers LIMIT 100")
+                products = await conn.fetch("SELECT id FROM inventory.products LIMIT 100")
             
-            await conn.close()
+            if not customers or not products:
+                raise Exception("No customers or products found for generating orders")
             
+            customer_ids = [row['id'] for row in customers]
+            product_ids = [row['id'] for row in products]
+            generator = create_batch_generator(generator_kind, customer_ids, product_ids)
+            
+            # Every writer pulls the next batch from one shared queue
+            queue = asyncio.Queue()
+            for batch_start in range(0, count, batch_size):
+                queue.put_nowait(min(batch_size, count - batch_start))
+            progress = {'inserted': 0, 'batches': 0}
+            
+            start_time = time.time()
+            worker_results = await asyncio.gather(*[
+                self._insert_worker(worker_id, pool, queue, strategy, generator,
+                                    count, progress, batch_delay)
+                for worker_id in range(1, concurrency + 1)
+            ])
             total_time = time.time() - start_time
-            avg_ops_per_sec = total_inserted / total_time if total_time > 0 else 0
             
-            return {
-                'total_inserted': total_inserted,
+            all_batch_times = [bt for worker in worker_results for bt in worker.pop('batch_times')]
+            batch_histogram = merge_histograms(worker.pop('batch_histogram') for worker in worker_results)
+            generate_seconds = sum(worker['generate_seconds'] for worker in worker_results)
+            results = self._batch_stats(progress['inserted'], all_batch_times, total_time, batch_histogram)
+            results.update({
+                'strategy': strategy,
+                'generator': type(generator).__name__,
+                # Client-side cost of building rows, kept out of the batch times
+                'generate_seconds': generate_seconds,
+                'generator_rows_per_second': progress['inserted'] / generate_seconds if generate_seconds > 0 else 0,
+                'concurrency': concurrency,
                 'total_time_seconds': total_time,
-                'avg_ops_per_second': avg_ops_per_sec,
-                'batch_count': len(batch_times),
-                'avg_batch_time': sum(batch_times) / len(batch_times) if batch_times else 0,
-                'fastest_batch': min(batch_times) if batch_times else 0,
-                'slowest_batch': max(batch_times) if batch_times else 0
-            }
+                'workers': worker_results,
+                'histograms': {'batch_time': batch_histogram.to_dict()}
+            })
+            return results
             
         except Exception as e:
             print(f"❌ Error in mass insert: {e}")
             return {'error': str(e)}
 
-    async def run_test(self, record_count: int = 100000, batch_size: int = 5000):
+    async def open_loop_insert_orders(self, rate: float, duration_seconds: float,
+                                      ramp_to_rate: Optional[float] = None, rows_per_op: int = 1,
+                                      concurrency: int = 1) -> Dict[str, Any]:
+        """Insert orders on a fixed open-loop schedule instead of batch after batch"""
+        ramp_info = f" ramping to {ramp_to_rate:,.0f} ops/sec" if ramp_to_rate is not None else ""
+        print(f"\n🚀 Starting open-loop load at {rate:,.0f} ops/sec{ramp_info} for {duration_seconds:.0f}s "
+              f"({rows_per_op} row(s)/op, writers: {concurrency})")
+        
+        try:
+            # The writer pool size bounds the load's concurrency
+            self.db_pools.register('writers', 'database', concurrency, concurrency)
+            pool = await self.db_pools.pool('writers')
+            async with self.db_pools.acquire('source') as conn:
+                reference_ids = await fetch_reference_ids(conn)
+            
+            generator = OpenLoopLoadGenerator(
+                pool, reference_ids['customer_ids'], reference_ids['product_ids'],
+                rate=rate, duration_seconds=duration_seconds, ramp_to_rate=ramp_to_rate,
+                rows_per_op=rows_per_op
+            )
+            results = await generator.run()
+            
+            results['concurrency'] = concurrency
+            results['avg_ops_per_second'] = results['achieved_rate_ops'] * rows_per_op
+            results['total_time_seconds'] = results['elapsed_seconds']
+            print(f"  📊 Open-loop: {results['completed_ops']:,}/{results['scheduled_ops']:,} ops, "
+                  f"p99 latency {results['latency'].get('p99_ms', 0):.1f}ms, "
+                  f"max schedule lag {results['schedule_lag'].get('max_ms', 0):.1f}ms")
+            return results
+            
+        except Exception as e:
+            print(f"❌ Error in open-loop insert: {e}")
+            return {'error': str(e)}
+
+    async def start_arrival_listener(self) -> Optional[TargetArrivalListener]:
+        """Install the pg_notify arrival trigger on the target when arrival_detection is 'notify'"""
+        monitoring = self.config.get('monitoring') or {}
+        if monitoring.get('arrival_detection', 'poll') != 'notify':
+            return None
+        try:
+            target_conn = await self.db_pools.acquire_connection('target')
+        except Exception as e:
+            print(f"⚠️  Arrival notifications disabled: {e}")
+            return None
+        listener = TargetArrivalListener(target_conn)
+        try:
+            await listener.start()
+            print(f"🔔 Listening for replicated rows on '{listener.channel}'")
+            return listener
+        except Exception as e:
+            print(f"⚠️  Arrival notifications disabled: {e}")
+            await self.db_pools.release('target', target_conn)
+            return None
+
+    async def stop_arrival_listener(self, listener: Optional[TargetArrivalListener]):
+        """Remove the arrival trigger and return its connection to the pool"""
+        if listener is None:
+            return
+        try:
+            await listener.stop()
+        except Exception as e:
+            print(f"⚠️  Could not remove arrival trigger: {e}")
+        finally:
+            await self.db_pools.release('target', listener.conn)
+
+    async def track_marker_latency(self, stop_event: asyncio.Event,
+                                   arrival_listener: Optional[TargetArrivalListener] = None) -> Dict[str, Any]:
+        """Emit marker rows during the insert and measure their per-row CDC latency"""
+        monitoring = self.config.get('monitoring') or {}
+        if not monitoring.get('enable_latency_tracking', True):
+            await stop_event.wait()
+            return {'enabled': False}
+        
+        source_conn = None
+        try:
+            source_conn = await self.db_pools.acquire_connection('source')
+            if arrival_listener is not None:
+                target_conn = arrival_listener.conn
+            else:
+                target_conn = await self.db_pools.acquire_connection('target')
+        except Exception as e:
+            if source_conn is not None:
+                await self.db_pools.release('source', source_conn)
+            print(f"⚠️  Marker latency tracking disabled: {e}")
+            await stop_event.wait()
+            return {'error': str(e)}
+        
+        try:
+            reference_ids = await fetch_reference_ids(source_conn, limit=1)
+            tracker = MarkerLatencyTracker(
+                source_conn, target_conn,
+                reference_ids['customer_ids'][0], reference_ids['product_ids'][0],
+                arrival_listener=arrival_listener
+            )
+            return await tracker.measure(
+                stop_event,
+                rate_per_second=float(monitoring.get('marker_rate_per_second', 20)),
+                drain_timeout=float(monitoring.get('marker_drain_timeout_seconds', 30))
+            )
+        except Exception as e:
+            await stop_event.wait()
+            return {'error': str(e)}
+        finally:
+            await self.db_pools.release('source', source_conn)
+            if arrival_listener is None:
+                await self.db_pools.release('target', target_conn)
+
+    async def run_test(self, record_count: int = 100000, batch_size: int = 5000,
+                       strategy: str = 'executemany', concurrency: int = 1,
+                       open_loop: Optional[Dict[str, Any]] = None, generator_kind: str = 'numpy'):
         """Run the complete 3-phase mass insert test"""
         print("🎯 CDC Mass Insert Test with 3-Phase Monitoring")
         print("=" * 55)
-        print(f"📈 Target: {record_count:,} records in batches of {batch_size:,}")
+        if open_loop:
+            print(f"📈 Target: open-loop {open_loop['rate']:,.0f} ops/sec for {open_loop['duration_seconds']:.0f}s")
+        else:
+            print(f"📈 Target: {record_count:,} records in batches of {batch_size:,}")
+            print(f"🧰 Load strategy: {strategy} with {concurrency} concurrent writer(s)")
         print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.open_results_store()
+        run_metadata = await self.capture_run_metadata(
+            mass_insert_workload(record_count, batch_size, strategy, concurrency, open_loop)
+        )
         
         # Phase 1: IDLE (before insert)
         print(f"\n📸 PHASE 1: IDLE STATE")
         self.phase_data['idle'] = await self.capture_phase_data('idle')
+        self.store_phase(self.phase_data['idle'])
         
         # Wait a moment
         await asyncio.sleep(2)
         
-        # Phase 2: PROCESSING (during insert)
-        print(f"\n📸 PHASE 2: PROCESSING STATE")
-        processing_start = time.time()
+        # Push-based arrival detection on the target (monitoring.arrival_detection: notify)
+        arrival_listener = await self.start_arrival_listener()
         
-        # Start background monitoring during insert
-        async def monitor_during_insert():
-            await asyncio.sleep(5)  # Let insert start
-            return await self.capture_phase_data('processing')
+        # The trigger slows every sink write, so it is removed even when a phase fails
+        try:
+            # Phase 2: PROCESSING (during insert)
+            print(f"\n📸 PHASE 2: PROCESSING STATE")
+            processing_start = time.time()
         
-        # Start both tasks
-        monitor_task = asyncio.create_task(monitor_during_insert())
-        insert_task = asyncio.create_task(self.mass_insert_orders(record_count, batch_size))
+            # Start background monitoring during insert
+            async def monitor_during_insert():
+                await asyncio.sleep(5)  # Let insert start
+                return await self.capture_phase_data('processing')
         
-        # Wait for both to complete
-        insert_results, processing_data = await asyncio.gather(insert_task, monitor_task)
+            # Marker rows run alongside the insert and stop when it finishes
+            stop_markers = asyncio.Event()
         
-        self.phase_data['processing'] = processing_data
-        processing_time = time.time() - processing_start
+            async def insert_then_stop_markers():
+                try:
+                    if open_loop:
+                        return await self.open_loop_insert_orders(concurrency=concurrency, **open_loop)
+                    return await self.mass_insert_orders(record_count, batch_size, strategy, concurrency,
+                                                         generator_kind=generator_kind)
+                finally:
+                    stop_markers.set()
         
-        # Phase 3: FINAL (after insert, let CDC catch up)
-        print(f"\n⏳ Waiting 10 seconds for CDC to catch up...")
-        await asyncio.sleep(10)
+            # Start all tasks
+            monitor_task = asyncio.create_task(monitor_during_insert())
+            insert_task = asyncio.create_task(insert_then_stop_markers())
+            marker_task = asyncio.create_task(self.track_marker_latency(stop_markers, arrival_listener))
+        
+            # Wait for all to complete
+            insert_results, processing_data, marker_latency = await asyncio.gather(
+                insert_task, monitor_task, marker_task
+            )
+        
+            self.phase_data['processing'] = processing_data
+            self.store_phase(processing_data)
+            processing_time = time.time() - processing_start
+        
+            # Phase 3: FINAL (after insert, let CDC catch up)
+            catch_up = None
+            if arrival_listener is not None:
+                expected = insert_results.get('total_inserted', 0) + marker_latency.get('markers_emitted', 0)
+                timeout = float((self.config.get('test_settings') or {}).get('timeout_seconds', 300))
+                print(f"\n⏳ Waiting for {expected:,} rows to arrive on the target (max {timeout:.0f}s)...")
+                catch_up = await arrival_listener.wait_for_count(expected, timeout)
+                status = "caught up" if catch_up['caught_up'] else "timed out"
+                print(f"  🔔 {catch_up['arrived']:,} rows arrived, {status} after {catch_up['wait_seconds']:.2f}s")
+            else:
+                print(f"\n⏳ Waiting 10 seconds for CDC to catch up...")
+                await asyncio.sleep(10)
+        finally:
+            await self.stop_arrival_listener(arrival_listener)
         
         print(f"\n📸 PHASE 3: FINAL STATE")
         self.phase_data['final'] = await self.capture_phase_data('final')
+        self.store_phase(self.phase_data['final'])
         
         # Compile final results
         self.results = {
             'test_info': {
                 'record_count': record_count,
                 'batch_size': batch_size,
+                'strategy': strategy,
+                'concurrency': concurrency,
+                'generator': generator_kind,
+                'open_loop': open_loop,
                 'start_time': datetime.now().isoformat(),
                 'processing_time_seconds': processing_time
             },
+            'run_metadata': run_metadata,
             'insert_results': insert_results,
+            'marker_latency': marker_latency,
+            'catch_up': catch_up,
             'phase_data': self.phase_data,
+            'database_pools': self.db_pools.metrics(),
             'summary': {
                 'total_phases': 3,
                 'success': 'error' not in insert_results,
@@ -360,24 +693,78 @@ class CDCMassInsertMonitor:
             }
         }
         
+        await self.db_pools.close()
+        self.close_kafka_collector()
+        
         # Save results
         await self.save_results()
         
         # Print summary
         self.print_summary()
 
+    async def capture_run_metadata(self, workload: Dict[str, Any]) -> Dict[str, Any]:
+        """Workload, connector configs and plugin versions, for comparing runs with compare_runs.py"""
+        run_metadata = await collect_run_metadata(self.config, workload)
+        plugins = run_metadata['plugins'].get('plugins', {})
+        if plugins:
+            versions = [f"{name} {plugin.get('version')}" for name, plugin in plugins.items()]
+            print(f"🔌 Plugins: {', '.join(versions)}")
+        if self.results_store is not None:
+            self.results_store.set_meta('run_metadata', run_metadata)
+        return run_metadata
+
+    def open_results_store(self):
+        """Start streaming results to an append-only store when results.format is 'sqlite'"""
+        if self.results_config.get('format', 'sqlite') != 'sqlite':
+            return
+        try:
+            self.results_store = ResultsStore.create(
+                self.results_config.get('directory', 'testing-results'), 'mass_insert_test',
+                flush_interval=float(self.results_config.get('flush_interval_seconds', 1)),
+                blob_threshold=int(self.results_config.get('blob_threshold_bytes', 4096))
+            )
+            print(f"💾 Streaming results to {self.results_store.path}")
+        except Exception as e:
+            print(f"⚠️  Results store unavailable, writing JSON at the end: {e}")
+            self.results_store = None
+
+    def store_phase(self, phase_data: Dict[str, Any]):
+        """Persist a completed phase (log and CLI output go out of line as blobs)"""
+        if self.results_store is not None:
+            self.results_store.put_document('phase', phase_data, phase=phase_data.get('phase'))
+
     async def save_results(self):
-        """Save test results to JSON file"""
+        """Save test results to the results store, or to one JSON file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"mass_insert_test_{timestamp}.json"
         
         # Create testing-results directory if it doesn't exist
-        os.makedirs("testing-results", exist_ok=True)
-        filepath = os.path.join("testing-results", filename)
+        directory = self.results_config.get('directory', 'testing-results')
+        os.makedirs(directory, exist_ok=True)
+        filepath = os.path.join(directory, filename)
+        
+        report = self.results
+        if self.results_store is not None:
+            try:
+                # Phases are already in the store
+                for section, data in self.results.items():
+                    if section != 'phase_data':
+                        self.results_store.put_document(section, data)
+                self.results_store.close()
+                print(f"\n💾 Results store saved to: {self.results_store.path}")
+                report = {
+                    'results_store': self.results_store.path,
+                    'run_metadata': self.results.get('run_metadata'),
+                    'test_info': self.results.get('test_info'),
+                    'summary': self.results.get('summary')
+                }
+            except Exception as e:
+                print(f"❌ Error writing results store, falling back to full JSON: {e}")
+            self.results_store = None
         
         try:
             with open(filepath, 'w') as f:
-                json.dump(self.results, f, indent=2, default=str)
+                json.dump(report, f, indent=2, default=str)
             print(f"\n💾 Results saved to: {filepath}")
         except Exception as e:
             print(f"❌ Error saving results: {e}")
@@ -394,39 +781,113 @@ class CDCMassInsertMonitor:
                 print(f"📊 Records Inserted: {insert_data.get('total_inserted', 0):,}")
                 print(f"⏱️  Total Time: {insert_data.get('total_time_seconds', 0):.2f} seconds")
                 print(f"🚀 Avg Ops/Second: {insert_data.get('avg_ops_per_second', 0):.0f}")
-                print(f"📦 Batches: {insert_data.get('batch_count', 0)}")
+                print(f"👥 Writers: {insert_data.get('concurrency', 1)}")
+                
+                if insert_data.get('mode') == 'open_loop':
+                    latency = insert_data.get('latency', {})
+                    lag = insert_data.get('schedule_lag', {})
+                    print(f"🎯 Offered/Achieved Rate: {insert_data.get('offered_rate_ops', 0):.0f} / "
+                          f"{insert_data.get('achieved_rate_ops', 0):.0f} ops/sec "
+                          f"(target {insert_data.get('final_target_rate_ops', 0):.0f})")
+                    print(f"⏱️  Latency from intended send: p50={latency.get('p50_ms', 0):.1f}ms "
+                          f"p90={latency.get('p90_ms', 0):.1f}ms p99={latency.get('p99_ms', 0):.1f}ms "
+                          f"p99.9={latency.get('p99_9_ms', 0):.1f}ms max={latency.get('max_ms', 0):.1f}ms")
+                    print(f"🐢 Schedule Lag: avg={lag.get('avg_ms', 0):.1f}ms max={lag.get('max_ms', 0):.1f}ms "
+                          f"({lag.get('ops_behind_1ms', 0):,} ops sent >1ms late)")
+                else:
+                    print(f"🧰 Strategy: {insert_data.get('strategy', 'executemany')} "
+                          f"({insert_data.get('generator', 'N/A')})")
+                    print(f"🎲 Generator Rows/Second: {insert_data.get('generator_rows_per_second', 0):,.0f} "
+                          f"({insert_data.get('generate_seconds', 0):.2f}s spent generating)")
+                    print(f"⚡ Insert-only Ops/Second (per writer): {insert_data.get('insert_ops_per_second', 0):.0f}")
+                    print(f"📦 Batches: {insert_data.get('batch_count', 0)}")
+                    print(f"⏱️  Batch Time: avg={insert_data.get('avg_batch_time', 0):.3f}s "
+                          f"min={insert_data.get('fastest_batch', 0):.3f}s "
+                          f"max={insert_data.get('slowest_batch', 0):.3f}s")
+                    percentiles = insert_data.get('batch_time_percentiles', {})
+                    if percentiles.get('count'):
+                        print(f"📈 Batch Time Percentiles: p50={percentiles['p50_ms']:.1f}ms "
+                              f"p90={percentiles['p90_ms']:.1f}ms p99={percentiles['p99_ms']:.1f}ms "
+                              f"p99.9={percentiles['p99_9_ms']:.1f}ms max={percentiles['max_ms']:.1f}ms")
+                    
+                    workers = insert_data.get('workers', [])
+                    if len(workers) > 1:
+                        print(f"\n👥 PER-WORKER THROUGHPUT:")
+                        for worker in workers:
+                            print(f"  W{worker['worker_id']:<4} {worker['total_inserted']:>10,} orders | "
+                                  f"{worker['batch_count']:>5} batches | "
+                                  f"{worker['avg_ops_per_second']:>8.0f} ops/sec | "
+                                  f"avg batch {worker['avg_batch_time']:.3f}s")
             else:
                 print(f"❌ Insert Status: FAILED - {insert_data['error']}")
         
+        # Marker-row CDC latency
+        marker_latency = self.results.get('marker_latency', {})
+        if marker_latency.get('markers_emitted'):
+            print(f"\n⏱️  CDC LATENCY ({marker_latency['markers_arrived']:,}/"
+                  f"{marker_latency['markers_emitted']:,} marker rows arrived):")
+            for label, key in [('Commit → Kafka', 'kafka_latency'), ('Commit → Target', 'apply_latency')]:
+                stats = marker_latency.get(key, {})
+                if stats.get('count'):
+                    print(f"  {label:<16} p50={stats['p50_ms']:.1f}ms p90={stats['p90_ms']:.1f}ms "
+                          f"p99={stats['p99_ms']:.1f}ms p99.9={stats['p99_9_ms']:.1f}ms max={stats['max_ms']:.1f}ms")
+        
         # Database counts summary
-        print(f"\n📊 DATABASE COUNTS BY PHASE:")
+        print(f"\n📊 DATABASE COUNTS BY PHASE ({self.row_counter.mode}):")
         for phase_name, phase_data in self.phase_data.items():
-            source_count = phase_data.get('source_db', {}).get('orders_count', 'N/A')
-            target_count = phase_data.get('target_db', {}).get('orders_count', 'N/A')
-            print(f"  {phase_name.upper():>10}: Source={source_count:>8} | Target={target_count:>8}")
+            source_db = phase_data.get('source_db', {})
+            target_db = phase_data.get('target_db', {})
+            source_count = source_db.get('orders_count')
+            target_count = target_db.get('orders_count')
+            line = f"  {phase_name.upper():>10}: Source={source_count if source_count is not None else 'N/A':>8} | " \
+                   f"Target={target_count if target_count is not None else 'N/A':>8}"
+            if source_db.get('orders_max_id') is not None and target_db.get('orders_max_id') is not None:
+                line += f" | Max ID {source_db['orders_max_id']:,} / {target_db['orders_max_id']:,}"
+            print(line)
         
-        print(f"\n🔍 Full details saved in testing-results/")
+        print(f"\n🔍 Full details saved in {self.results_config.get('directory', 'testing-results')}/")
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="CDC mass insert test with 3-phase monitoring")
+    parser.add_argument('record_count', nargs='?', type=int, default=100000,
+                        help="Number of orders to insert (default: 100000)")
+    parser.add_argument('batch_size', nargs='?', type=int, default=5000,
+                        help="Orders per batch (default: 5000)")
+    parser.add_argument('--strategy', choices=INSERT_STRATEGIES, default='executemany',
+                        help="Load strategy: executemany, binary COPY, multi-row INSERT or unnest() columns")
+    parser.add_argument('--generator', choices=GENERATORS, default='numpy',
+                        help="Batch data generator (numpy falls back to python when unavailable)")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="Number of concurrent writers (default: test_settings.concurrency or 1)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Run an open-loop load at this many ops/sec instead of a mass insert")
+    parser.add_argument('--ramp-to', type=float, default=None,
+                        help="Ramp the open-loop rate linearly up (or down) to this many ops/sec")
+    parser.add_argument('--duration', type=float, default=60,
+                        help="Open-loop run duration in seconds (default: 60)")
+    parser.add_argument('--rows-per-op', type=int, default=1,
+                        help="Rows inserted by each open-loop operation (default: 1)")
+    return parser.parse_args()
 
 async def main():
     """Main function"""
-    if len(sys.argv) > 1:
-        try:
-            record_count = int(sys.argv[1])
-        except ValueError:
-            record_count = 100000
-    else:
-        record_count = 100000
-    
-    if len(sys.argv) > 2:
-        try:
-            batch_size = int(sys.argv[2])
-        except ValueError:
-            batch_size = 5000
-    else:
-        batch_size = 5000
+    args = parse_args()
     
     monitor = CDCMassInsertMonitor()
-    await monitor.run_test(record_count, batch_size)
+    concurrency = args.concurrency
+    if concurrency is None:
+        concurrency = (monitor.config.get('test_settings') or {}).get('concurrency', 1)
+    open_loop = None
+    if args.rate is not None:
+        open_loop = {
+            'rate': args.rate,
+            'duration_seconds': args.duration,
+            'ramp_to_rate': args.ramp_to,
+            'rows_per_op': args.rows_per_op
+        }
+    await monitor.run_test(args.record_count, args.batch_size, args.strategy, concurrency,
+                           open_loop, args.generator)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Open-Loop Constant-Rate Load Generator
+======================================
+
+Generator insert orders dengan jadwal tetap (open-loop):
+- Operasi dijadwalkan pada target rate (ops/sec), opsional ramp linear
+- Latency dihitung dari intended send time (coordinated-omission-correct)
+- Mencatat seberapa jauh generator tertinggal dari jadwal
+
+Closed-loop generators wait for the previous batch before sending the next,
+so a slow database silently lowers the offered load. Here every operation
+has an intended send time fixed up front; latency is measured from that
+time, so queueing caused by a slow database is charged to the database.
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import asyncio
+import math
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from latency_histogram import LatencyHistogram
+
+INSERT_ORDER_SQL = """INSERT INTO inventory.orders (order_date, purchaser, quantity, product_id)
+                      VALUES ($1, $2, $3, $4)"""
+
+
+async def fetch_reference_ids(conn, limit: int = 100) -> Dict[str, List[int]]:
+    """Fetch customer and product ids used to build valid orders"""
+    customers = await conn.fetch(f"SELECT id FROM inventory.customers LIMIT {int(limit)}")
+    products = await conn.fetch(f"SELECT id FROM inventory.products LIMIT {int(limit)}")
+    if not customers or not products:
+        raise Exception("No customers or products found for generating orders")
+    return {
+        'customer_ids': [row['id'] for row in customers],
+        'product_ids': [row['id'] for row in products]
+    }
+
+
+class OpenLoopLoadGenerator:
+    def __init__(self, pool, customer_ids: List[int], product_ids: List[int],
+                 rate: float, duration_seconds: float, ramp_to_rate: Optional[float] = None,
+                 rows_per_op: int = 1, max_in_flight: int = 10000):
+        """Initialize an open-loop generator over an asyncpg pool"""
+        if rate < 0 or (ramp_to_rate is not None and ramp_to_rate < 0):
+            raise ValueError("Rates must be non-negative")
+        if rate == 0 and not ramp_to_rate:
+            raise ValueError("At least one of rate and ramp_to_rate must be positive")
+        self.pool = pool
+        self.customer_ids = customer_ids
+        self.product_ids = product_ids
+        self.rate = float(rate)
+        self.ramp_to_rate = float(ramp_to_rate) if ramp_to_rate is not None else None
+        self.duration_seconds = float(duration_seconds)
+        self.rows_per_op = max(1, int(rows_per_op))
+        self.max_in_flight = max(1, int(max_in_flight))
+
+        end_rate = self.ramp_to_rate if self.ramp_to_rate is not None else self.rate
+        # Area under the (linear) rate curve
+        self.total_ops = int((self.rate + end_rate) / 2 * self.duration_seconds)
+        # N(t) = rate * t + accel * t^2 gives the ops due by offset t
+        self.accel = (end_rate - self.rate) / (2 * self.duration_seconds) if self.duration_seconds > 0 else 0
+
+        self.latency_histogram = LatencyHistogram()
+        self.service_histogram = LatencyHistogram()
+        self.schedule_lag_histogram = LatencyHistogram()
+        self.completed = 0
+        self.final_lag = 0.0
+        self.ops_behind = 0
+        self.errors = 0
+        self.last_error = None
+
+    def intended_offset(self, op_index: int) -> float:
+        """Seconds after start at which operation op_index is due"""
+        if self.accel == 0:
+            return op_index / self.rate
+        # Solve accel * t^2 + rate * t - op_index = 0 for the positive root
+        discriminant = self.rate ** 2 + 4 * self.accel * op_index
+        return (-self.rate + math.sqrt(max(discriminant, 0))) / (2 * self.accel)
+
+    def _generate_rows(self) -> List[tuple]:
+        """Generate the rows written by a single operation"""
+        today = datetime.now().date()
+        return [
+            (today, random.choice(self.customer_ids), random.randint(1, 10), random.choice(self.product_ids))
+            for _ in range(self.rows_per_op)
+        ]
+
+    async def _run_op(self, intended: float, sent: float, in_flight: asyncio.Semaphore):
+        """Execute one operation and record latency from its intended send time"""
+        loop = asyncio.get_running_loop()
+        try:
+            rows = self._generate_rows()
+            async with self.pool.acquire() as conn:
+                if len(rows) == 1:
+                    await conn.execute(INSERT_ORDER_SQL, *rows[0])
+                else:
+                    await conn.executemany(INSERT_ORDER_SQL, rows)
+            done = loop.time()
+            self.latency_histogram.record_seconds(done - intended)
+            self.service_histogram.record_seconds(done - sent)
+            self.completed += 1
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+        finally:
+            in_flight.release()
+
+    async def run(self) -> Dict[str, Any]:
+        """Issue every scheduled operation and return the run statistics"""
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+
+        wall_start = time.time()
+        start = loop.time()
+        for op_index in range(self.total_ops):
+            intended = start + self.intended_offset(op_index)
+            delay = intended - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await in_flight.acquire()
+            sent = loop.time()
+            self.final_lag = sent - intended
+            self.schedule_lag_histogram.record_seconds(self.final_lag)
+            if self.final_lag > 0.001:
+                self.ops_behind += 1
+
+            task = asyncio.create_task(self._run_op(intended, sent, in_flight))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        send_phase_seconds = loop.time() - start
+        if tasks:
+            await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+
+        completed = self.completed
+        end_rate = self.ramp_to_rate if self.ramp_to_rate is not None else self.rate
+        return {
+            'mode': 'open_loop',
+            'start_time': datetime.fromtimestamp(wall_start).isoformat(),
+            'target_rate_ops': self.rate,
+            'ramp_to_rate_ops': self.ramp_to_rate,
+            'duration_seconds': self.duration_seconds,
+            'rows_per_op': self.rows_per_op,
+            'scheduled_ops': self.total_ops,
+            'completed_ops': completed,
+            'failed_ops': self.errors,
+            'last_error': self.last_error,
+            'total_inserted': completed * self.rows_per_op,
+            'elapsed_seconds': round(elapsed, 3),
+            'offered_rate_ops': round(self.total_ops / send_phase_seconds, 2) if send_phase_seconds > 0 else 0,
+            'achieved_rate_ops': round(completed / elapsed, 2) if elapsed > 0 else 0,
+            'final_target_rate_ops': end_rate,
+            # Latency from the intended send time (includes any queueing)
+            'latency': self.latency_histogram.summary(),
+            # Latency from the actual send time (what a closed-loop tool would report)
+            'service_time': self.service_histogram.summary(),
+            'schedule_lag': {
+                **self.schedule_lag_histogram.summary(),
+                'final_lag_ms': round(self.final_lag * 1000, 3),
+                'ops_behind_1ms': self.ops_behind
+            },
+            'histograms': {
+                'latency': self.latency_histogram.to_dict(),
+                'service_time': self.service_histogram.to_dict(),
+                'schedule_lag': self.schedule_lag_histogram.to_dict()
+            }
+        }
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Append-Only Results Store
+=========================
+
+Hasil monitoring ditulis bertahap ke satu file SQLite per run:
+- Sample metric disimpan kolumnar: chunk per metric berisi array timestamp
+  dan value (float64) yang dikompresi zlib
+- Snapshot terstruktur (phase data, summary) sebagai dokumen JSON terkompresi
+- Teks besar (log stdout, output CLI Kafka) dipindah ke tabel blob terpisah
+- Loader membaca satu metric lewat index tanpa mem-parse seluruh file
+
+Data is committed every flush interval in WAL mode, so a crash loses at most
+the last interval instead of the whole run, and the store's status stays
+'running' to mark the run as incomplete. Nothing is ever updated in place:
+each flush appends new chunks, documents and blobs.
+
+Usage:
+    python results_store.py testing-results/comprehensive_20250801_120000.sqlite [metric ...]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from array import array
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE IF NOT EXISTS metrics (metric_id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+    CREATE TABLE IF NOT EXISTS chunks (
+        metric_id INTEGER NOT NULL, first_ts REAL NOT NULL, last_ts REAL NOT NULL,
+        count INTEGER NOT NULL, timestamps BLOB NOT NULL, ts_values BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS chunks_metric ON chunks (metric_id, first_ts);
+    CREATE TABLE IF NOT EXISTS documents (
+        document_id INTEGER PRIMARY KEY, section TEXT NOT NULL, phase TEXT, ts REAL NOT NULL, body BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS documents_section ON documents (section, phase);
+    CREATE TABLE IF NOT EXISTS blobs (
+        blob_id INTEGER PRIMARY KEY, name TEXT, ts REAL NOT NULL, size INTEGER NOT NULL, data BLOB NOT NULL
+    );
+"""
+
+BLOB_REF = '$blob'
+
+
+def _pack(values: List[float]) -> bytes:
+    return zlib.compress(array('d', values).tobytes(), 6)
+
+
+def _unpack(data: bytes) -> List[float]:
+    values = array('d')
+    values.frombytes(zlib.decompress(data))
+    return values.tolist()
+
+
+class ResultsStore:
+    def __init__(self, path: str, flush_interval: float = 1.0, flush_rows: int = 5000,
+                 blob_threshold: int = 4096):
+        """Open (or create) a store at path; samples are buffered and flushed as chunks"""
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.blob_threshold = blob_threshold
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.metric_ids = {name: metric_id for metric_id, name in self.conn.execute("SELECT metric_id, name FROM metrics")}
+        self.buffers = {}
+        self.buffered_rows = 0
+        self.last_flush = time.monotonic()
+        self.blob_bytes = 0
+        self.set_meta('status', 'running')
+        self.set_meta('created_at', datetime.now().isoformat())
+        self.conn.commit()
+
+    @classmethod
+    def create(cls, directory: str = 'testing-results', prefix: str = 'results', **kwargs) -> 'ResultsStore':
+        """New store file named <prefix>_<timestamp>.sqlite in directory"""
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return cls(os.path.join(directory, f"{prefix}_{timestamp}.sqlite"), **kwargs)
+
+    def set_meta(self, key: str, value: Any):
+        """Store one metadata value (JSON encoded)"""
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                          (key, json.dumps(value, default=str)))
+
+    def _metric_id(self, name: str) -> int:
+        metric_id = self.metric_ids.get(name)
+        if metric_id is None:
+            metric_id = self.conn.execute("INSERT INTO metrics (name) VALUES (?)", (name,)).lastrowid
+            self.metric_ids[name] = metric_id
+        return metric_id
+
+    def record(self, name: str, timestamp: float, value: float):
+        """Buffer one numeric sample; flushed as a compressed chunk"""
+        timestamps, values = self.buffers.setdefault(name, ([], []))
+        timestamps.append(timestamp)
+        values.append(float(value))
+        self.buffered_rows += 1
+        if self.buffered_rows >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write buffered samples as one chunk per metric and commit"""
+        for name, (timestamps, values) in self.buffers.items():
+            if timestamps:
+                self.conn.execute(
+                    "INSERT INTO chunks (metric_id, first_ts, last_ts, count, timestamps, ts_values) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._metric_id(name), timestamps[0], timestamps[-1], len(timestamps),
+                     _pack(timestamps), _pack(values))
+                )
+        self.buffers = {}
+        self.buffered_rows = 0
+        self.last_flush = time.monotonic()
+        self.conn.commit()
+
+    def put_blob(self, name: str, text: Any) -> int:
+        """Store a large text/bytes value out of line; returns its blob id"""
+        data = text.encode('utf-8') if isinstance(text, str) else bytes(text)
+        self.blob_bytes += len(data)
+        return self.conn.execute(
+            "INSERT INTO blobs (name, ts, size, data) VALUES (?, ?, ?, ?)",
+            (name, time.time(), len(data), zlib.compress(data, 6))
+        ).lastrowid
+
+    def _externalize(self, value: Any, path: str) -> Any:
+        """Copy of value with long strings replaced by blob references"""
+        if isinstance(value, str) and len(value) >= self.blob_threshold:
+            return {BLOB_REF: self.put_blob(path, value), 'size': len(value)}
+        if isinstance(value, dict):
+            return {key: self._externalize(item, f"{path}.{key}") for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._externalize(item, f"{path}[{index}]") for index, item in enumerate(value)]
+        return value
+
+    def put_document(self, section: str, data: Any, phase: Optional[str] = None,
+                     timestamp: Optional[float] = None) -> int:
+        """Append a compressed JSON document (large strings go to blobs) and commit"""
+        body = json.dumps(self._externalize(data, section if phase is None else f"{section}.{phase}"),
+                          default=str, separators=(',', ':'))
+        document_id = self.conn.execute(
+            "INSERT INTO documents (section, phase, ts, body) VALUES (?, ?, ?, ?)",
+            (section, phase, timestamp if timestamp is not None else time.time(),
+             zlib.compress(body.encode('utf-8'), 6))
+        ).lastrowid
+        self.conn.commit()
+        return document_id
+
+    def close(self, status: str = 'complete'):
+        """Flush, mark the run's status and close the file"""
+        if self.conn is None:
+            return
+        self.flush()
+        self.set_meta('status', status)
+        self.set_meta('closed_at', datetime.now().isoformat())
+        self.conn.commit()
+        self.conn.close()
+        self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close('complete' if exc_type is None else 'failed')
+
+
+class ResultsReader:
+    def __init__(self, path: str):
+        """Read-only access to a results store"""
+        self.path = path
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def meta(self) -> Dict[str, Any]:
+        """Every metadata value"""
+        return {key: json.loads(value) for key, value in self.conn.execute("SELECT key, value FROM meta")}
+
+    def metrics(self) -> List[str]:
+        """Names of every stored metric"""
+        return [row[0] for row in self.conn.execute("SELECT name FROM metrics ORDER BY name")]
+
+    def metric(self, name: str, start: Optional[float] = None,
+               end: Optional[float] = None) -> Tuple[List[float], List[float]]:
+        """(timestamps, values) of one metric, reading only that metric's chunks"""
+        query = ("SELECT c.timestamps, c.ts_values FROM chunks c JOIN metrics m ON m.metric_id = c.metric_id "
+                 "WHERE m.name = ?")
+        params = [name]
+        if start is not None:
+            query += " AND c.last_ts >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND c.first_ts <= ?"
+            params.append(end)
+        timestamps, values = [], []
+        for ts_blob, value_blob in self.conn.execute(query + " ORDER BY c.first_ts", params):
+            for ts, value in zip(_unpack(ts_blob), _unpack(value_blob)):
+                if (start is None or ts >= start) and (end is None or ts <= end):
+                    timestamps.append(ts)
+                    values.append(value)
+        return timestamps, values
+
+    def blob(self, blob_id: int) -> str:
+        """Text of one out-of-line blob"""
+        row = self.conn.execute("SELECT data FROM blobs WHERE blob_id = ?", (blob_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"blob {blob_id} not found")
+        return zlib.decompress(row[0]).decode('utf-8', errors='replace')
+
+    def _resolve(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if BLOB_REF in value:
+                return self.blob(value[BLOB_REF])
+            return {key: self._resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(item) for item in value]
+        return value
+
+    def documents(self, section: str, phase: Optional[str] = None,
+                  resolve_blobs: bool = False) -> List[Dict[str, Any]]:
+        """Every document of a section (optionally one phase), oldest first"""
+        query = "SELECT phase, ts, body FROM documents WHERE section = ?"
+        params = [section]
+        if phase is not None:
+            query += " AND phase = ?"
+            params.append(phase)
+        documents = []
+        for doc_phase, ts, body in self.conn.execute(query + " ORDER BY document_id", params):
+            data = json.loads(zlib.decompress(body))
+            documents.append({'phase': doc_phase, 'timestamp': ts,
+                              'data': self._resolve(data) if resolve_blobs else data})
+        return documents
+
+    def document(self, section: str, phase: Optional[str] = None, resolve_blobs: bool = False) -> Any:
+        """Latest document of a section, or None"""
+        documents = self.documents(section, phase, resolve_blobs)
+        return documents[-1]['data'] if documents else None
+
+    def sections(self) -> List[Tuple[str, Optional[str]]]:
+        """Distinct (section, phase) pairs"""
+        return [tuple(row) for row in
+                self.conn.execute("SELECT DISTINCT section, phase FROM documents ORDER BY section, phase")]
+
+    def time_series(self) -> Dict[str, Any]:
+        """Every metric in the export_time_series layout"""
+        series = {}
+        for name in self.metrics():
+            timestamps, values = self.metric(name)
+            series[name] = {'timestamps': [round(ts, 3) for ts in timestamps], 'values': values}
+        return series
+
+
+def load_metric(path: str, name: str) -> Tuple[List[float], List[float]]:
+    """(timestamps, values) of one metric from a store file"""
+    with ResultsReader(path) as reader:
+        return reader.metric(name)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Inspect a results store")
+    parser.add_argument('path')
+    parser.add_argument('metrics', nargs='*', help="Metrics to print (default: list everything)")
+    args = parser.parse_args()
+
+    with ResultsReader(args.path) as reader:
+        if not args.metrics:
+            print(json.dumps(reader.meta(), indent=2))
+            print(f"\nSections: {', '.join(f'{s}:{p}' if p else s for s, p in reader.sections())}")
+            print(f"Metrics ({len(reader.metrics())}):")
+            for name in reader.metrics():
+                print(f"  {name}")
+            return
+        for name in args.metrics:
+            timestamps, values = reader.metric(name)
+            if not values:
+                print(f"{name}: no samples", file=sys.stderr)
+                continue
+            print(f"{name}: {len(values)} samples, min={min(values):g} "
+                  f"avg={sum(values) / len(values):g} max={max(values):g}")
+
+
+if __name__ == "__main__":
+    main()
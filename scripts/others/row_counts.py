@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Cheap Row-Count and Progress Estimation
+=======================================
+
+Estimasi jumlah row tanpa full scan COUNT(*):
+- max(id) watermark pada primary key (index, O(log n))
+- pg_class.reltuples (estimasi planner setelah ANALYZE/VACUUM)
+- pg_stat_user_tables n_live_tup / n_tup_ins / n_tup_del
+- Mode 'exact' (COUNT(*)) tetap tersedia sebagai opt-in
+
+COUNT(*) scans the whole table, so on large tables every phase capture takes
+minutes and its I/O skews the measurement. In 'estimate' mode one small
+catalog query per table is used instead and its cost does not grow with the
+table. n_live_tup is maintained by the statistics system and trails
+committed inserts by up to about a second; for replication progress compare
+max(id) watermarks, which are exact for the append-only orders table as long
+as one writer commits in id order. Concurrent writers commit out of id order,
+so rows_since() counts the rows above a watermark on both sides instead.
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+from typing import Dict, Any, Optional
+
+ROW_COUNT_MODES = ('estimate', 'exact')
+
+ESTIMATE_SQL = """
+    SELECT c.reltuples::bigint AS reltuples,
+           s.n_live_tup, s.n_tup_ins, s.n_tup_del,
+           (SELECT max({id_column}) FROM {table}) AS max_id
+    FROM pg_class c
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.oid = $1::regclass
+"""
+
+
+class RowCounter:
+    def __init__(self, mode: str = 'estimate', id_column: str = 'id'):
+        """Count rows exactly (COUNT(*)) or estimate them from catalog statistics"""
+        if mode not in ROW_COUNT_MODES:
+            raise ValueError(f"Unknown row count mode '{mode}' (choose from {', '.join(ROW_COUNT_MODES)})")
+        self.mode = mode
+        self.id_column = id_column
+
+    async def count(self, conn, table: str) -> Dict[str, Any]:
+        """Row count of table with the method used and the id watermark"""
+        if self.mode == 'exact':
+            rows = await conn.fetchval(f"SELECT COUNT(*) FROM {table}")
+            return {'rows': rows, 'method': 'exact', 'max_id': None}
+
+        row = await conn.fetchrow(ESTIMATE_SQL.format(id_column=self.id_column, table=table), table)
+        detail = dict(row) if row else {}
+        # n_live_tup is current within a second; reltuples only as of the last ANALYZE (-1 if never)
+        if row is not None and detail.get('max_id') is None:
+            rows, method = 0, 'empty'  # no primary key values at all
+        elif detail.get('n_live_tup') is not None and (detail['n_live_tup'] > 0 or (detail.get('n_tup_ins') or 0) > 0):
+            rows, method = detail['n_live_tup'], 'n_live_tup'
+        elif detail.get('reltuples') is not None and detail['reltuples'] >= 0:
+            rows, method = detail['reltuples'], 'reltuples'
+        else:
+            rows, method = None, 'unavailable'
+        return {'rows': rows, 'method': method, **detail}
+
+    async def count_tables(self, conn, tables: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """count() for every {name: qualified table} entry"""
+        return {name: await self.count(conn, table) for name, table in tables.items()}
+
+    async def max_id(self, conn, table: str) -> Optional[int]:
+        """Primary-key watermark (index lookup, independent of table size)"""
+        return await conn.fetchval(f"SELECT max({self.id_column}) FROM {table}")
+
+
+async def replication_progress(source_conn, target_conn, source_table: str = 'inventory.orders',
+                               target_table: str = 'orders', id_column: str = 'id') -> Dict[str, Any]:
+    """Compare source and target id watermarks instead of counting both tables"""
+    source_max = await source_conn.fetchval(f"SELECT max({id_column}) FROM {source_table}")
+    target_max = await target_conn.fetchval(f"SELECT max({id_column}) FROM {target_table}")
+    return {
+        'source_max_id': source_max,
+        'target_max_id': target_max,
+        'ids_behind': max((source_max or 0) - (target_max or 0), 0),
+        'caught_up': (target_max or 0) >= (source_max or 0)
+    }
+
+
+
+async def rows_since(source_conn, target_conn, since_id: int, source_table: str = 'inventory.orders',
+                     target_table: str = 'orders', id_column: str = 'id') -> Dict[str, Any]:
+    """Count rows above an id watermark on both sides (complete with out-of-order commits)"""
+    source_rows = await source_conn.fetchval(
+        f"SELECT count(*) FROM {source_table} WHERE {id_column} > $1", since_id)
+    target_rows = await target_conn.fetchval(
+        f"SELECT count(*) FROM {target_table} WHERE {id_column} > $1", since_id)
+    return {
+        'since_id': since_id,
+        'source_rows': source_rows,
+        'target_rows': target_rows,
+        'rows_behind': max(source_rows - target_rows, 0),
+        'caught_up': target_rows >= source_rows
+    }
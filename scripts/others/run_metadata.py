@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Run Metadata for Cross-Run Comparison
+=====================================
+
+Identitas setiap run supaya hasilnya bisa dibandingkan antar run:
+- Parameter workload (record_count, batch_size, strategy, concurrency, open-loop)
+- Config connector (live dari Connect REST API, fallback ke file JSON) dengan
+  credential disensor dan hash yang stabil
+- Inventaris plugin di plugins/: versi dan hash setiap jar
+- Commit git dan host tempat run dijalankan
+
+compare_runs.py groups runs whose workload and connector configs are equal
+and then looks at what else changed, so a Debezium or JDBC plugin upgrade
+shows up as a different plugin fingerprint between otherwise identical runs.
+
+Usage:
+    python run_metadata.py [--config config.yaml]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import re
+import socket
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import yaml
+
+from connect_client import DEFAULT_CONNECT_URL, ConnectRestClient, connect_client_available
+
+DEFAULT_PLUGINS_DIRECTORY = 'plugins'
+DEFAULT_CONNECTOR_FILES = ('inventory-source.json', 'pg-sink.json')
+
+# Config values that must not end up in reports
+SECRET_KEY_PATTERN = re.compile(r'password|secret|credentials|sasl\.jaas', re.IGNORECASE)
+REDACTED = '***'
+
+JAR_VERSION_PATTERN = re.compile(r'^(?P<artifact>.+?)-(?P<version>\d[\w.\-]*)\.jar$')
+
+
+def stable_hash(value: Any, length: int = 12) -> str:
+    """Short sha256 of the canonical JSON form of value"""
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:length]
+
+
+def redact_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Connector config with credentials replaced"""
+    return {key: REDACTED if SECRET_KEY_PATTERN.search(key) else value for key, value in config.items()}
+
+
+def connector_fingerprint(config: Dict[str, Any]) -> str:
+    """Hash of a connector config; 'name' is left out because Connect adds it to the config"""
+    return stable_hash({key: str(value) for key, value in redact_config(config).items() if key != 'name'})
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def plugin_inventory(plugins_directory: str = DEFAULT_PLUGINS_DIRECTORY) -> Dict[str, Any]:
+    """Version and jar hashes of every plugin directory, plus one fingerprint for all of them"""
+    plugins = {}
+    if not os.path.isdir(plugins_directory):
+        return {'directory': plugins_directory, 'plugins': plugins, 'fingerprint': None,
+                'error': 'plugins directory not found'}
+    for name in sorted(os.listdir(plugins_directory)):
+        plugin_path = os.path.join(plugins_directory, name)
+        if not os.path.isdir(plugin_path):
+            continue
+        jars = {}
+        for root, _, files in os.walk(plugin_path):
+            for filename in sorted(files):
+                if filename.endswith('.jar'):
+                    jars[filename] = _file_sha256(os.path.join(root, filename))[:16]
+
+        # Confluent Hub packages carry a manifest; plain archives only have versioned jar names
+        version = None
+        manifest_path = os.path.join(plugin_path, 'manifest.json')
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r') as f:
+                    version = json.load(f).get('version')
+            except (OSError, ValueError):
+                pass
+        if version is None:
+            for jar in jars:
+                match = JAR_VERSION_PATTERN.match(jar)
+                if match and match.group('artifact') in name:
+                    version = match.group('version')
+                    break
+        plugins[name] = {'version': version, 'jars': jars, 'fingerprint': stable_hash(jars)}
+
+    return {
+        'directory': plugins_directory,
+        'plugins': plugins,
+        'fingerprint': stable_hash({name: plugin['fingerprint'] for name, plugin in plugins.items()})
+    }
+
+
+def connector_configs_from_files(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Connector configs from the JSON files that are POSTed to Connect"""
+    connectors = {}
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                definition = json.load(f)
+        except (OSError, ValueError):
+            continue
+        config = definition.get('config', {})
+        connectors[definition.get('name', os.path.basename(path))] = {
+            'source': path,
+            'config': redact_config(config),
+            'fingerprint': connector_fingerprint(config)
+        }
+    return connectors
+
+
+async def connector_configs_from_connect(connect_url: str, timeout: float = 5.0) -> Dict[str, Dict[str, Any]]:
+    """Configs of the connectors that are actually deployed"""
+    async with ConnectRestClient(connect_url, timeout=timeout) as client:
+        expanded = await client.connectors_expanded()
+        connectors = {}
+        for name, detail in expanded.items():
+            config = (detail.get('info') or {}).get('config')
+            if config is None:
+                config = await client.get_connector_config(name)
+            connectors[name] = {
+                'source': 'connect',
+                'config': redact_config(config),
+                'fingerprint': connector_fingerprint(config)
+            }
+        return connectors
+
+
+def git_revision() -> Optional[Dict[str, Any]]:
+    """Commit of the working tree and whether it has local changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=5)
+        if commit.returncode != 0:
+            return None
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                capture_output=True, text=True, timeout=5)
+        return {'commit': commit.stdout.strip(), 'dirty': bool(status.stdout.strip())}
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def workload_fingerprint(workload: Dict[str, Any], connectors: Dict[str, Dict[str, Any]]) -> str:
+    """Runs with the same workload parameters and connector configs share this id"""
+    return stable_hash({
+        'workload': workload,
+        'connectors': {name: detail['fingerprint'] for name, detail in connectors.items()}
+    })
+
+
+def mass_insert_workload(record_count: int, batch_size: int, strategy: str = 'executemany',
+                         concurrency: int = 1, open_loop: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Workload parameters of a mass_insert_monitor.py run"""
+    if open_loop:
+        return {
+            'kind': 'mass_insert_open_loop',
+            'rate': float(open_loop['rate']),
+            'ramp_to_rate': float(open_loop['ramp_to_rate']) if open_loop.get('ramp_to_rate') is not None else None,
+            'duration_seconds': float(open_loop.get('duration_seconds', 60)),
+            'rows_per_op': int(open_loop.get('rows_per_op', 1)),
+            'concurrency': int(concurrency)
+        }
+    return {'kind': 'mass_insert', 'record_count': int(record_count), 'batch_size': int(batch_size),
+            'strategy': strategy, 'concurrency': int(concurrency)}
+
+
+def comprehensive_workload(duration_minutes: float, test_settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Workload parameters of a comprehensive_performance_monitor.py run"""
+    workload = {'kind': 'comprehensive', 'duration_minutes': float(duration_minutes), 'open_loop': None}
+    if test_settings.get('open_loop_rate'):
+        ramp_to = test_settings.get('open_loop_ramp_to')
+        workload['open_loop'] = {
+            'rate': float(test_settings['open_loop_rate']),
+            'ramp_to_rate': float(ramp_to) if ramp_to is not None else None,
+            'duration_seconds': float(test_settings.get('open_loop_duration_seconds', 30)),
+            'rows_per_op': int(test_settings.get('open_loop_rows_per_op', 1)),
+            'concurrency': int(test_settings.get('concurrency', 1))
+        }
+    return workload
+
+
+async def collect_run_metadata(config: Dict[str, Any], workload: Dict[str, Any]) -> Dict[str, Any]:
+    """Workload, connector configs, plugins and environment of the run about to start"""
+    results_config = config.get('results') or {}
+    connect_url = (config.get('kafka_connect') or {}).get('url', DEFAULT_CONNECT_URL)
+    connectors, connector_error = {}, None
+    if connect_client_available():
+        try:
+            connectors = await connector_configs_from_connect(connect_url)
+        except Exception as e:
+            connector_error = str(e)
+    if not connectors:
+        connectors = connector_configs_from_files(
+            results_config.get('connector_config_files', list(DEFAULT_CONNECTOR_FILES))
+        )
+    plugins = await asyncio.to_thread(
+        plugin_inventory, results_config.get('plugins_directory', DEFAULT_PLUGINS_DIRECTORY)
+    )
+    return {
+        'captured_at': datetime.now().isoformat(),
+        'workload': workload,
+        'workload_id': workload_fingerprint(workload, connectors),
+        'connectors': connectors,
+        'connector_error': connector_error,
+        'plugins': plugins,
+        'git': git_revision(),
+        'host': {
+            'hostname': socket.gethostname(),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        }
+    }
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Print the metadata a run would record")
+    parser.add_argument('--config', default='config.yaml')
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+    print(json.dumps(await collect_run_metadata(config, {'kind': 'manual'}), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
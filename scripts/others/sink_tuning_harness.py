@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+JDBC Sink Connector Tuning Harness
+==================================
+
+Mengukur efek setting JDBC sink (pg-sink.json) dengan workload yang sama:
+- pg-sink.json sebagai template, override per variant (tasks.max, batch.size,
+  insert.mode, chain SMT on/off)
+- Setiap variant: sink dihapus, workload insert yang identik masuk ke topic,
+  lalu sink variant di-deploy dan backlog diukur sampai target tersusul
+- Throughput sink (rows/s) dari backlog yang sama untuk semua variant
+- Latency end-to-end steady state dengan marker rows setelah backlog habis
+- Template asli di-deploy ulang di akhir
+
+The workload is written while the sink is deleted, so every variant starts
+from the same backlog in Kafka and the drain rate measures the sink alone,
+not Debezium. The sink keeps its name (and so its consumer group offsets)
+across variants; a variant that fails leaves its backlog behind, so the
+template is redeployed and drained before the next variant starts.
+
+Usage:
+    python sink_tuning_harness.py [--variants sink_variants.yaml] [--sweep tasks.max=1,2,4]
+                                  [--connect-url http://localhost:8083] [--deploy-only]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from connect_client import ConnectRestClient
+from connector_tuning import (ConnectorTuningHarness, apply_overrides, redeploy_connector, run_tuning_harness,
+                              tuning_argument_parser)
+from kafka_admin_metrics import MAIN_TOPIC
+from mass_insert_monitor import CDCMassInsertMonitor
+from row_counts import replication_progress, rows_since
+
+DEFAULT_SETTINGS = {
+    'template': 'pg-sink.json',
+    'records': 20000,
+    'batch_size': 1000,
+    'strategy': 'executemany',
+    'concurrency': 1,
+    'repetitions': 1,
+    'latency_seconds': 10,  # marker rows after the backlog drained (0 disables)
+    'startup_timeout_seconds': 60,
+    'publish_timeout_seconds': 120,  # wait for Debezium to publish the workload to Kafka
+    'publish_settle_seconds': 10,  # fixed wait instead, when Kafka offsets cannot be read
+    'drain_timeout_seconds': 300
+}
+
+
+class SinkTuningHarness(ConnectorTuningHarness):
+    section = 'sink_tuning'
+    title = 'JDBC Sink Tuning Harness'
+    workload = 'workload'
+    default_settings = DEFAULT_SETTINGS
+
+    def __init__(self, monitor: CDCMassInsertMonitor, client: ConnectRestClient, name: str,
+                 template: Dict[str, Any], settings: Dict[str, Any], deploy_only: bool = False):
+        """Sink variants measured against the same backlog in the sink's first topic"""
+        super().__init__(monitor, client, name, template, settings, deploy_only,
+                         template.get('topics', MAIN_TOPIC).split(',')[0])
+
+    async def wait_for_published(self, start_offset: Optional[int], records: int) -> Dict[str, Any]:
+        """Wait until Debezium has written the workload to the topic"""
+        start = time.time()
+        if start_offset is None:
+            await asyncio.sleep(float(self.settings['publish_settle_seconds']))
+            return {'method': 'settle', 'wait_seconds': round(time.time() - start, 3)}
+        published = await self.offsets.wait_for_growth(start_offset, records,
+                                                       float(self.settings['publish_timeout_seconds']))
+        return {'method': 'kafka_offsets', 'published': published, 'wait_seconds': round(time.time() - start, 3)}
+
+    async def progress(self, since_id: Optional[int] = None) -> Dict[str, Any]:
+        async with self.monitor.db_pools.acquire('source') as source_conn:
+            async with self.monitor.db_pools.acquire('target') as target_conn:
+                if since_id is not None:
+                    return await rows_since(source_conn, target_conn, since_id)
+                return await replication_progress(source_conn, target_conn)
+
+    async def drain(self, created_at: float, watermark: int) -> Dict[str, Any]:
+        """Follow the target until it has every source row above the watermark"""
+        # Concurrent writers commit out of id order, so max(id) can arrive before lower ids
+        timeout = float(self.settings['drain_timeout_seconds'])
+        first_arrival = None
+        progress = await self.progress(watermark)
+        while not progress['caught_up'] and time.time() - created_at < timeout:
+            await asyncio.sleep(0.25)
+            progress = await self.progress(watermark)
+            if first_arrival is None and progress['target_rows'] > 0:
+                first_arrival = time.time()
+        done = time.time()
+        rows = progress['target_rows']
+        if first_arrival is None and rows > 0:
+            first_arrival = done
+        busy = done - first_arrival if first_arrival is not None else 0
+        return {
+            'caught_up': progress['caught_up'],
+            'rows_behind': progress['rows_behind'],
+            'rows': rows,
+            'first_arrival_seconds': round(first_arrival - created_at, 3) if first_arrival is not None else None,
+            'drain_seconds': round(done - created_at, 3),
+            'rows_per_second': rows / busy if progress['caught_up'] and busy > 0 else None
+        }
+
+    async def run_variant(self, variant: Dict[str, Any], repetition: int) -> Dict[str, Any]:
+        """Delete the sink, queue the workload in Kafka, deploy the variant and measure it"""
+        config = apply_overrides(self.template, variant['overrides'])
+        result = {'variant': variant['name'], 'overrides': variant['overrides'], 'repetition': repetition,
+                  'start_time': datetime.now().isoformat(), 'error': None}
+        timeout = float(self.settings['startup_timeout_seconds'])
+
+        if self.deploy_only:
+            result['deployment'] = await redeploy_connector(self.client, self.name, config, timeout)
+            result['error'] = result['deployment']['error']
+            return result
+
+        await self.client.delete_connector(self.name, missing_ok=True)
+        start_offset = await self.offsets.end_offset()
+        watermark = (await self.progress())['source_max_id'] or 0
+        insert_results = await self.monitor.mass_insert_orders(
+            int(self.settings['records']), int(self.settings['batch_size']), self.settings['strategy'],
+            int(self.settings['concurrency']))
+        if 'error' in insert_results:
+            result['error'] = f"workload insert failed: {insert_results['error']}"
+            return result
+        result['workload'] = {'inserted': insert_results['total_inserted'],
+                              'ingest_ops_per_second': insert_results['avg_ops_per_second'],
+                              'publish': await self.wait_for_published(start_offset, insert_results['total_inserted'])}
+
+        deployment = await redeploy_connector(self.client, self.name, config, timeout, settle_seconds=0)
+        result['deployment'] = deployment
+        if not deployment['running']:
+            result['error'] = deployment['error']
+            return result
+
+        result['drain'] = await self.drain(deployment['created_at'], watermark)
+        if not result['drain']['caught_up']:
+            result['error'] = f"target still {result['drain']['rows_behind']:,} rows behind"
+            return result
+
+        latency_seconds = float(self.settings['latency_seconds'])
+        if latency_seconds > 0:
+            stop_markers = asyncio.Event()
+            asyncio.get_running_loop().call_later(latency_seconds, stop_markers.set)
+            marker_latency = await self.monitor.track_marker_latency(stop_markers)
+            result['latency'] = {key: marker_latency.get(key) for key in ('kafka_latency', 'apply_latency')
+                                 if key in marker_latency}
+        return result
+
+    async def restore_template(self, drain: bool = False) -> Dict[str, Any]:
+        """Redeploy the unmodified template (and let it consume what a failed variant left)"""
+        deployment = await redeploy_connector(self.client, self.name, self.template,
+                                              float(self.settings['startup_timeout_seconds']))
+        if drain and deployment['running'] and not self.deploy_only:
+            before = await self.progress()
+            deployment['drain'] = await self.drain(deployment['created_at'], before['target_max_id'] or 0)
+        return deployment
+
+    async def after_failed_variant(self, result: Dict[str, Any]):
+        print(f"  ♻️  Restoring the template to consume the leftover backlog")
+        await self.restore_template(drain=True)
+
+    def summarize_runs(self, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Mean drain rate and startup time, worst apply p99"""
+        rates = [run['drain']['rows_per_second'] for run in runs if (run.get('drain') or {}).get('rows_per_second')]
+        startups = [run['deployment']['startup_seconds'] for run in runs
+                    if 'startup_seconds' in run.get('deployment', {})]
+        apply_p99 = [run['latency']['apply_latency'].get('p99_ms') for run in runs
+                     if (run.get('latency') or {}).get('apply_latency', {}).get('count')]
+        return {
+            'rows_per_second': sum(rates) / len(rates) if rates else None,
+            'startup_seconds': sum(startups) / len(startups) if startups else None,
+            'apply_p99_ms': max(apply_p99) if apply_p99 else None
+        }
+
+    def ranking_key(self, row: Dict[str, Any]):
+        """Drain rate first (deploy-only runs by startup time)"""
+        return row['failures'] > 0, -(row['rows_per_second'] or 0), row['startup_seconds'] or 0
+
+    def print_variant(self, result: Dict[str, Any]):
+        if result['error']:
+            print(f"  ❌ {result['error']}")
+            return
+        deployment = result['deployment']
+        line = f"  ✅ RUNNING after {deployment['startup_seconds']:.1f}s"
+        drain = result.get('drain')
+        if drain:
+            line += (f", {drain['rows']:,} rows drained in {drain['drain_seconds']:.1f}s "
+                     f"({drain['rows_per_second'] or 0:,.0f} rows/s)")
+        print(line)
+        for key, label in (('kafka_latency', 'Commit → Kafka'), ('apply_latency', 'Commit → Target')):
+            stats = (result.get('latency') or {}).get(key) or {}
+            if stats.get('count'):
+                print(f"  ⏱️  {label:<16} p50={stats['p50_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms")
+
+    def print_ranking(self, ranking: List[Dict[str, Any]]):
+        print(f"\n🏁 SINK VARIANT RANKING")
+        print("=" * 90)
+        print(f"{'#':>3} {'variant':<42} {'rows/s':>10} {'startup s':>10} {'apply p99':>10} {'fail':>5}")
+        for position, row in enumerate(ranking, 1):
+            rate = f"{row['rows_per_second']:,.0f}" if row['rows_per_second'] is not None else 'n/a'
+            startup = f"{row['startup_seconds']:.1f}" if row['startup_seconds'] is not None else 'n/a'
+            p99 = f"{row['apply_p99_ms']:.0f}ms" if row['apply_p99_ms'] is not None else 'n/a'
+            print(f"{position:>3} {row['variant'][:42]:<42} {rate:>10} {startup:>10} {p99:>10} {row['failures']:>5}")
+            for error in row['errors'][:1]:
+                print(f"    ↳ {error[:84]}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    return tuning_argument_parser(SinkTuningHarness, "Measure JDBC sink connector variants against the same workload",
+                                  "tasks.max=1,2,4 or smt=on,off,unwrap+extractKey").parse_args()
+
+
+async def main():
+    """Main function"""
+    await run_tuning_harness(SinkTuningHarness, parse_args())
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n⚠️  Harness interrupted by user")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Replication Slot Lag and WAL Throughput Tracker
+===============================================
+
+Time series lag replication slot Debezium (debezium_slot) di source database:
+- confirmed lag: pg_wal_lsn_diff(pg_current_wal_lsn(), confirmed_flush_lsn)
+- retained WAL: pg_wal_lsn_diff(pg_current_wal_lsn(), restart_lsn)
+- WAL generation rate dan Debezium confirm rate (bytes/detik)
+- Flag ketika slot tertinggal lebih cepat daripada yang bisa dikejar
+
+A slot that falls behind keeps WAL on the source disk until Debezium confirms
+it; when it never catches up the disk fills. Rates are computed over a window
+of samples because Debezium confirms LSNs in steps (on offset flush), not
+continuously.
+
+Usage:
+    python slot_lag.py [--duration 60] [--interval 1] [--slot debezium_slot]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import asyncpg
+import yaml
+
+SLOT_NAME = 'debezium_slot'
+
+# wal_status and safe_wal_size need PostgreSQL 13+
+SLOT_LAG_SQL = """
+    SELECT slot_name, active, wal_status, safe_wal_size,
+           pg_current_wal_lsn()::text AS current_lsn,
+           confirmed_flush_lsn::text AS confirmed_flush_lsn,
+           pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')::bigint AS current_wal_bytes,
+           pg_wal_lsn_diff(confirmed_flush_lsn, '0/0')::bigint AS confirmed_wal_bytes,
+           pg_wal_lsn_diff(pg_current_wal_lsn(), confirmed_flush_lsn)::bigint AS confirmed_lag_bytes,
+           pg_wal_lsn_diff(pg_current_wal_lsn(), restart_lsn)::bigint AS retained_wal_bytes
+    FROM pg_replication_slots
+    WHERE slot_name = $1
+"""
+
+SLOT_LAG_SQL_PG12 = """
+    SELECT slot_name, active, NULL::text AS wal_status, NULL::bigint AS safe_wal_size,
+           pg_current_wal_lsn()::text AS current_lsn,
+           confirmed_flush_lsn::text AS confirmed_flush_lsn,
+           pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')::bigint AS current_wal_bytes,
+           pg_wal_lsn_diff(confirmed_flush_lsn, '0/0')::bigint AS confirmed_wal_bytes,
+           pg_wal_lsn_diff(pg_current_wal_lsn(), confirmed_flush_lsn)::bigint AS confirmed_lag_bytes,
+           pg_wal_lsn_diff(pg_current_wal_lsn(), restart_lsn)::bigint AS retained_wal_bytes
+    FROM pg_replication_slots
+    WHERE slot_name = $1
+"""
+
+
+class SlotLagTracker:
+    def __init__(self, slot_name: str = SLOT_NAME, max_samples: int = 3600,
+                 rate_window_seconds: float = 30.0, min_alert_lag_bytes: int = 16 * 1024 * 1024):
+        """Bounded time series of one replication slot's lag"""
+        self.slot_name = slot_name
+        self.rate_window_seconds = rate_window_seconds
+        # Below one WAL segment of lag, growth is normal batching rather than falling behind
+        self.min_alert_lag_bytes = min_alert_lag_bytes
+        self.samples = deque(maxlen=max_samples)
+        self.query = SLOT_LAG_SQL
+        self.errors = 0
+        self.last_error = None
+
+    async def sample(self, conn, timestamp: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Read the slot once on conn (a source database connection)"""
+        try:
+            try:
+                row = await conn.fetchrow(self.query, self.slot_name)
+            except asyncpg.UndefinedColumnError:
+                # PostgreSQL 12: no wal_status/safe_wal_size; a failing retry is counted below
+                self.query = SLOT_LAG_SQL_PG12
+                row = await conn.fetchrow(self.query, self.slot_name)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            return None
+        if row is None:
+            self.last_error = f"replication slot {self.slot_name} not found"
+            return None
+        sample = {'timestamp': timestamp if timestamp is not None else time.time(), **dict(row)}
+        self.samples.append(sample)
+        return sample
+
+    def _rate(self, key: str) -> Optional[float]:
+        """Bytes per second for key over the rate window"""
+        if len(self.samples) < 2:
+            return None
+        latest = self.samples[-1]
+        earliest = self.samples[-2]
+        for sample in reversed(self.samples):
+            if latest['timestamp'] - sample['timestamp'] > self.rate_window_seconds:
+                break
+            if sample is not latest:
+                earliest = sample
+        elapsed = latest['timestamp'] - earliest['timestamp']
+        if elapsed <= 0 or latest[key] is None or earliest[key] is None:
+            return None
+        return (latest[key] - earliest[key]) / elapsed
+
+    def wal_rate(self) -> Optional[float]:
+        """WAL generated on the source, bytes per second"""
+        return self._rate('current_wal_bytes')
+
+    def confirm_rate(self) -> Optional[float]:
+        """WAL confirmed by Debezium, bytes per second"""
+        return self._rate('confirmed_wal_bytes')
+
+    def falling_behind(self) -> bool:
+        """True when lag is significant and WAL is produced faster than Debezium confirms it"""
+        if not self.samples:
+            return False
+        wal_rate, confirm_rate = self.wal_rate(), self.confirm_rate()
+        lag = self.samples[-1]['confirmed_lag_bytes'] or 0
+        return bool(wal_rate is not None and confirm_rate is not None
+                    and wal_rate > confirm_rate and lag >= self.min_alert_lag_bytes)
+
+    def summary(self) -> Dict[str, Any]:
+        """Latest values, rates, alert state and the lag series"""
+        if not self.samples:
+            return {'slot_name': self.slot_name, 'samples': 0, 'error': self.last_error}
+        latest = self.samples[-1]
+        wal_rate, confirm_rate = self.wal_rate(), self.confirm_rate()
+        growth = wal_rate - confirm_rate if wal_rate is not None and confirm_rate is not None else None
+        seconds_to_exhaust = None
+        if growth and growth > 0 and latest.get('safe_wal_size') is not None:
+            seconds_to_exhaust = round(latest['safe_wal_size'] / growth, 1)
+        return {
+            'slot_name': self.slot_name,
+            'samples': len(self.samples),
+            'active': latest['active'],
+            'wal_status': latest.get('wal_status'),
+            'current_lsn': latest['current_lsn'],
+            'confirmed_flush_lsn': latest['confirmed_flush_lsn'],
+            'confirmed_lag_bytes': latest['confirmed_lag_bytes'],
+            'retained_wal_bytes': latest['retained_wal_bytes'],
+            'max_confirmed_lag_bytes': max(s['confirmed_lag_bytes'] or 0 for s in self.samples),
+            'max_retained_wal_bytes': max(s['retained_wal_bytes'] or 0 for s in self.samples),
+            'safe_wal_size_bytes': latest.get('safe_wal_size'),
+            'wal_rate_bytes_per_sec': round(wal_rate, 1) if wal_rate is not None else None,
+            'confirm_rate_bytes_per_sec': round(confirm_rate, 1) if confirm_rate is not None else None,
+            'lag_growth_bytes_per_sec': round(growth, 1) if growth is not None else None,
+            'seconds_to_wal_exhaustion': seconds_to_exhaust,
+            'falling_behind': self.falling_behind(),
+            'errors': self.errors,
+            'series': {
+                'timestamps': [round(s['timestamp'], 3) for s in self.samples],
+                'confirmed_lag_bytes': [s['confirmed_lag_bytes'] for s in self.samples],
+                'retained_wal_bytes': [s['retained_wal_bytes'] for s in self.samples]
+            }
+        }
+
+    async def run(self, conn, stop_event: asyncio.Event, interval: float = 1.0,
+                  on_sample=None):
+        """Sample every interval seconds until stop_event is set"""
+        while not stop_event.is_set():
+            sample = await self.sample(conn)
+            if sample is not None and on_sample is not None:
+                on_sample(sample)
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Track replication slot lag on the source database")
+    parser.add_argument('--slot', default=SLOT_NAME)
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconds to sample")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between samples")
+    parser.add_argument('--config', default='config.yaml')
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        db_config = yaml.safe_load(f)['database']
+    conn = await asyncpg.connect(
+        host=db_config['host'],
+        port=db_config['port'],
+        user=db_config['user'],
+        password=db_config['password'],
+        database=db_config['database']
+    )
+    tracker = SlotLagTracker(args.slot)
+
+    def report(sample):
+        flag = " ⚠️  FALLING BEHIND" if tracker.falling_behind() else ""
+        wal_rate = tracker.wal_rate()
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] lag={sample['confirmed_lag_bytes'] / 1024:,.0f} KiB "
+              f"retained={sample['retained_wal_bytes'] / 1024:,.0f} KiB "
+              f"wal={(wal_rate or 0) / 1024:,.1f} KiB/s{flag}")
+
+    stop_event = asyncio.Event()
+    asyncio.get_running_loop().call_later(args.duration, stop_event.set)
+    try:
+        await tracker.run(conn, stop_event, args.interval, on_sample=report)
+    finally:
+        await conn.close()
+
+    summary = tracker.summary()
+    summary.pop('series', None)
+    print(json.dumps(summary, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Debezium Source Connector Tuning Harness
+========================================
+
+Mengukur efek setting Debezium (inventory-source.json) terhadap lag saat burst:
+- inventory-source.json sebagai template, override per variant (max.batch.size,
+  max.queue.size, poll.interval.ms, heartbeat.interval.ms, ...)
+- Connector di-register ulang per variant; slot replikasi dan offset di-reset
+  bila variant mengubah slot/publication/snapshot (atau dengan --reset-slot)
+- Burst insert yang sama untuk semua variant, dengan marker rows di dalamnya
+- Commit -> Kafka per marker (_synced_at dari SMT addTS di sink)
+- Perilaku slot lag (slot_lag.py): lag maksimum, WAL tertahan, waktu pulih
+- Perbandingan ber-ranking di akhir; template asli di-register ulang
+
+Re-registering under the same name resumes from the stored offsets and the
+existing slot, which is what a config change does in production. Offsets
+live in the Connect offsets topic, not in the slot, so a reset stops the
+connector and deletes them through the REST API (Kafka 3.6+) before the slot
+is dropped; on older workers only the slot is dropped and Debezium resumes
+from its stored LSN. The confirmed LSN only advances on offset flush
+(worker offset.flush.interval.ms), so slot lag recovery includes that delay.
+
+Usage:
+    python source_tuning_harness.py [--variants source_variants.yaml] [--sweep max.batch.size=2048,8192]
+                                    [--connect-url http://localhost:8083] [--reset-slot] [--deploy-only]
+
+Author: Debezium CDC Pipeline Team
+Date: August 2025
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from connect_client import ConnectRestClient, ConnectRestError
+from connector_tuning import (ConnectorTuningHarness, apply_overrides, redeploy_connector, run_tuning_harness,
+                              tuning_argument_parser)
+from mass_insert_monitor import CDCMassInsertMonitor
+from slot_lag import SLOT_NAME, SlotLagTracker
+
+DEFAULT_SETTINGS = {
+    'template': 'inventory-source.json',
+    'records': 50000,
+    'batch_size': 5000,
+    'strategy': 'executemany',
+    'concurrency': 4,
+    'repetitions': 1,
+    'reset_slot': False,  # reset slot and offsets before every variant, not only when required
+    'settle_seconds': 5,  # after the slot is streaming, before the burst
+    'observe_seconds': 30,  # slot lag sampled at least this long after the burst
+    'slot_sample_interval': 0.5,
+    'startup_timeout_seconds': 120,
+    'publish_timeout_seconds': 180
+}
+
+# Changing any of these makes the stored offsets and slot meaningless for the new config
+SLOT_RESET_KEYS = ('slot.name', 'plugin.name', 'publication.name', 'publication.autocreate.mode',
+                   'table.include.list', 'snapshot.mode', 'topic.prefix', 'database.dbname')
+
+SLOT_STATE_SQL = "SELECT active FROM pg_replication_slots WHERE slot_name = $1"
+
+
+def needs_reset(deployed: Optional[Dict[str, Any]], config: Dict[str, Any]) -> bool:
+    """True when config differs from the deployed one in a slot or offset defining key"""
+    return deployed is not None and any(deployed.get(key) != config.get(key) for key in SLOT_RESET_KEYS)
+
+
+def slot_name(config: Dict[str, Any]) -> str:
+    return config.get('slot.name', SLOT_NAME)
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+class SourceTuningHarness(ConnectorTuningHarness):
+    section = 'source_tuning'
+    title = 'Debezium Source Tuning Harness'
+    workload = 'burst'
+    default_settings = DEFAULT_SETTINGS
+
+    def __init__(self, monitor: CDCMassInsertMonitor, client: ConnectRestClient, name: str,
+                 template: Dict[str, Any], settings: Dict[str, Any], deploy_only: bool = False):
+        """Source variants measured under the same burst"""
+        # Debezium names the topic <topic.prefix>.<schema>.<table>
+        super().__init__(monitor, client, name, template, settings, deploy_only,
+                         f"{template.get('topic.prefix', 'dbserver1')}.inventory.orders")
+        self.deployed = template  # what is registered when the harness starts
+
+    @classmethod
+    def settings_from_args(cls, args: argparse.Namespace) -> Dict[str, Any]:
+        return {'reset_slot': True} if args.reset_slot else {}
+
+    async def reset_offsets(self) -> str:
+        """Stop the registered connector and delete its stored source offsets
+
+        Raises when the offsets cannot be deleted: starting on offsets that
+        point into a dropped slot would make the variant's results meaningless.
+        """
+        try:
+            try:
+                await self.client.stop_connector(self.name)
+            except ConnectRestError as e:
+                if e.status != 404:
+                    raise
+                # A rejected variant left nothing registered, but its offsets are still stored
+                await self.client.create_connector(self.name, self.deployed, initial_state='STOPPED')
+                await self.client.stop_connector(self.name)  # workers before Kafka 3.7 ignore initial_state
+            await self.client.reset_connector_offsets(self.name)
+            return 'reset'
+        except ConnectRestError as e:
+            raise RuntimeError(f"source offsets of {self.name} could not be reset (Kafka 3.6+ required): {e}")
+
+    async def drop_slots(self, names: List[str], timeout: float = 30.0) -> List[str]:
+        """Drop the slots once the deleted connector's tasks released them"""
+        dropped = []
+        async with self.monitor.db_pools.acquire('source') as conn:
+            for name in names:
+                deadline = time.time() + timeout
+                while True:
+                    active = await conn.fetchval(SLOT_STATE_SQL, name)
+                    if active is None:
+                        break
+                    if not active:
+                        await conn.execute("SELECT pg_drop_replication_slot($1)", name)
+                        dropped.append(name)
+                        break
+                    if time.time() > deadline:
+                        raise RuntimeError(f"replication slot {name} still active after {timeout:.0f}s")
+                    await asyncio.sleep(0.5)
+        return dropped
+
+    async def deploy(self, config: Dict[str, Any], reset: bool) -> Dict[str, Any]:
+        """Re-register the connector, resetting offsets and slots first when asked to"""
+        reset_info = {}
+
+        async def drop_old_slots():
+            if not self.deploy_only:
+                names = sorted({slot_name(self.deployed), slot_name(config)})
+                reset_info['slots_dropped'] = await self.drop_slots(names)
+
+        if reset:
+            reset_info['offsets'] = await self.reset_offsets()
+        deployment = await redeploy_connector(self.client, self.name, config,
+                                              float(self.settings['startup_timeout_seconds']),
+                                              before_create=drop_old_slots if reset else None)
+        deployment['reset'] = reset_info if reset else None
+        if deployment['deployed']:
+            # A rejected config leaves the previous slot and offsets in place
+            self.deployed = config
+        return deployment
+
+    async def wait_for_streaming(self, name: str) -> Optional[float]:
+        """Seconds until the slot is active (after any snapshot), None on timeout"""
+        start = time.time()
+        deadline = start + float(self.settings['startup_timeout_seconds'])
+        async with self.monitor.db_pools.acquire('source') as conn:
+            while time.time() < deadline:
+                if await conn.fetchval(SLOT_STATE_SQL, name):
+                    return round(time.time() - start, 3)
+                await asyncio.sleep(0.5)
+        return None
+
+    async def measure_burst(self, name: str) -> Dict[str, Any]:
+        """Fixed burst with marker rows, sampling the slot until it had time to recover"""
+        tracker = SlotLagTracker(name)
+        stop_slot, stop_markers = asyncio.Event(), asyncio.Event()
+        start_offset = await self.offsets.end_offset()
+        async with self.monitor.db_pools.acquire('source') as slot_conn:
+            slot_task = asyncio.create_task(
+                tracker.run(slot_conn, stop_slot, float(self.settings['slot_sample_interval'])))
+            marker_task = asyncio.create_task(self.monitor.track_marker_latency(stop_markers))
+            burst_start = time.time()
+            try:
+                try:
+                    insert_results = await self.monitor.mass_insert_orders(
+                        int(self.settings['records']), int(self.settings['batch_size']), self.settings['strategy'],
+                        int(self.settings['concurrency']))
+                finally:
+                    stop_markers.set()
+                burst_end = time.time()
+                marker_latency = await marker_task
+                expected = insert_results.get('total_inserted', 0) + marker_latency.get('markers_emitted', 0)
+                published = await self.offsets.wait_for_growth(start_offset, expected,
+                                                               float(self.settings['publish_timeout_seconds']))
+                publish_seconds = time.time() - burst_start
+                remaining = float(self.settings['observe_seconds']) - (time.time() - burst_end)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+            finally:
+                stop_slot.set()
+                await asyncio.gather(slot_task, marker_task, return_exceptions=True)
+
+        if 'error' in insert_results:
+            return {'error': f"burst insert failed: {insert_results['error']}"}
+        slot = tracker.summary()
+        recovered = next((sample['timestamp'] for sample in tracker.samples
+                          if sample['timestamp'] >= burst_end
+                          and (sample['confirmed_lag_bytes'] or 0) < tracker.min_alert_lag_bytes), None)
+        slot['lag_recovery_seconds'] = round(recovered - burst_end, 3) if recovered is not None else None
+        publish = None
+        if published is not None:
+            publish = {'messages': published, 'seconds': round(publish_seconds, 3),
+                       'messages_per_second': published / publish_seconds if publish_seconds > 0 else None,
+                       'complete': published >= expected}
+        return {
+            'burst': {'inserted': insert_results['total_inserted'],
+                      'seconds': round(burst_end - burst_start, 3),
+                      'ops_per_second': insert_results['avg_ops_per_second']},
+            'publish': publish,
+            'latency': {key: marker_latency.get(key) for key in ('kafka_latency', 'apply_latency')
+                        if key in marker_latency},
+            'slot': slot,
+            'error': None
+        }
+
+    async def run_variant(self, variant: Dict[str, Any], repetition: int) -> Dict[str, Any]:
+        """Re-register the variant, wait for streaming and measure the burst"""
+        config = apply_overrides(self.template, variant['overrides'])
+        reset = bool(self.settings['reset_slot']) or needs_reset(self.deployed, config)
+        result = {'variant': variant['name'], 'overrides': variant['overrides'], 'repetition': repetition,
+                  'start_time': datetime.now().isoformat(), 'error': None}
+        deployment = await self.deploy(config, reset)
+        result['deployment'] = deployment
+        if not deployment['running']:
+            result['error'] = deployment['error']
+            return result
+        if self.deploy_only:
+            return result
+
+        streaming = await self.wait_for_streaming(slot_name(config))
+        if streaming is None:
+            result['error'] = f"slot {slot_name(config)} not streaming"
+            return result
+        deployment['streaming_seconds'] = streaming
+        await asyncio.sleep(float(self.settings['settle_seconds']))
+        result.update(await self.measure_burst(slot_name(config)))
+        return result
+
+    async def restore_template(self) -> Dict[str, Any]:
+        """Re-register the unmodified template, resetting slot and offsets if a variant changed them"""
+        return await self.deploy(self.template, needs_reset(self.deployed, self.template))
+
+    def summarize_runs(self, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Commit -> Kafka latency (commit -> target without _synced_at), slot lag and publish rate"""
+        p99, p50 = [], []
+        for run in runs:
+            latency = run.get('latency') or {}
+            stats = latency.get('kafka_latency') if (latency.get('kafka_latency') or {}).get('count') \
+                else latency.get('apply_latency')
+            if (stats or {}).get('count'):
+                p99.append(stats['p99_ms'])
+                p50.append(stats['p50_ms'])
+        slots = [run['slot'] for run in runs if run.get('slot', {}).get('samples')]
+        recoveries = [slot['lag_recovery_seconds'] for slot in slots if slot['lag_recovery_seconds'] is not None]
+        rates = [run['publish']['messages_per_second'] for run in runs
+                 if (run.get('publish') or {}).get('messages_per_second')]
+        startups = [run['deployment']['startup_seconds'] for run in runs if 'startup_seconds' in run['deployment']]
+        return {
+            'latency_p50_ms': _mean(p50),
+            'latency_p99_ms': max(p99) if p99 else None,
+            'max_confirmed_lag_bytes': max((slot['max_confirmed_lag_bytes'] for slot in slots), default=None),
+            'max_retained_wal_bytes': max((slot['max_retained_wal_bytes'] for slot in slots), default=None),
+            'lag_recovery_seconds': max(recoveries) if len(recoveries) == len(slots) and recoveries else None,
+            'publish_messages_per_second': _mean(rates),
+            'startup_seconds': _mean(startups)
+        }
+
+    def ranking_key(self, row: Dict[str, Any]):
+        """Latency p99 first, then peak slot lag"""
+        return (row['failures'] > 0,
+                row['latency_p99_ms'] if row['latency_p99_ms'] is not None else float('inf'),
+                row['max_confirmed_lag_bytes'] or 0,
+                row['startup_seconds'] or 0)
+
+    def print_variant(self, result: Dict[str, Any]):
+        if result['error']:
+            print(f"  ❌ {result['error']}")
+            return
+        deployment = result['deployment']
+        reset = deployment.get('reset')
+        line = f"  ✅ RUNNING after {deployment['startup_seconds']:.1f}s"
+        if reset:
+            line += f" (offsets {reset.get('offsets')}, slots dropped: {', '.join(reset.get('slots_dropped', [])) or '-'})"
+        print(line)
+        if 'burst' in result:
+            burst, publish = result['burst'], result.get('publish')
+            line = f"  📈 Burst {burst['inserted']:,} rows in {burst['seconds']:.1f}s"
+            if publish:
+                line += f", in Kafka after {publish['seconds']:.1f}s ({publish['messages_per_second'] or 0:,.0f} msg/s)"
+            print(line)
+        for key, label in (('kafka_latency', 'Commit → Kafka'), ('apply_latency', 'Commit → Target')):
+            stats = (result.get('latency') or {}).get(key) or {}
+            if stats.get('count'):
+                print(f"  ⏱️  {label:<16} p50={stats['p50_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms")
+        slot = result.get('slot')
+        if slot and slot.get('samples'):
+            recovery = slot['lag_recovery_seconds']
+            print(f"  🐘 Slot lag max {slot['max_confirmed_lag_bytes'] / 1048576:,.1f} MiB, "
+                  f"retained max {slot['max_retained_wal_bytes'] / 1048576:,.1f} MiB, "
+                  f"recovered {f'after {recovery:.1f}s' if recovery is not None else 'not within the window'}")
+
+    def print_ranking(self, ranking: List[Dict[str, Any]]):
+        print(f"\n🏁 SOURCE VARIANT RANKING")
+        print("=" * 100)
+        print(f"{'#':>3} {'variant':<40} {'p50 ms':>8} {'p99 ms':>8} {'lag MiB':>8} {'recover s':>10} "
+              f"{'msg/s':>9} {'fail':>5}")
+
+        def cell(value, template):
+            return template.format(value) if value is not None else 'n/a'
+
+        for position, row in enumerate(ranking, 1):
+            lag = row['max_confirmed_lag_bytes'] / 1048576 if row['max_confirmed_lag_bytes'] is not None else None
+            print(f"{position:>3} {row['variant'][:40]:<40} {cell(row['latency_p50_ms'], '{:.1f}'):>8} "
+                  f"{cell(row['latency_p99_ms'], '{:.1f}'):>8} {cell(lag, '{:.1f}'):>8} "
+                  f"{cell(row['lag_recovery_seconds'], '{:.1f}'):>10} "
+                  f"{cell(row['publish_messages_per_second'], '{:,.0f}'):>9} {row['failures']:>5}")
+            for error in row['errors'][:1]:
+                print(f"    ↳ {error[:94]}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = tuning_argument_parser(SourceTuningHarness,
+                                    "Measure Debezium source connector variants under the same burst",
+                                    "max.batch.size=2048,8192 or poll.interval.ms=100,500")
+    parser.add_argument('--reset-slot', action='store_true',
+                        help="Reset offsets and drop the slot before every variant")
+    return parser.parse_args()
+
+
+async def main():
+    """Main function"""
+    await run_tuning_harness(SourceTuningHarness, parse_args())
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n⚠️  Harness interrupted by user")
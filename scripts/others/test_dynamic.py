@@ -4,31 +4,27 @@ Quick test for dynamic data fetching
 """
 
 import asyncio
-import asyncpg
 from random import choice
 
+from db_pools import DatabasePoolManager
+
 async def test_dynamic_data():
     """Test fetching dynamic data from database"""
     
     # Database configuration
-    # Tambahkan retry dan timeout
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            conn = await asyncpg.connect(
-                host='localhost',
-                port=5432,
-                user='postgres',
-                password='postgres',
-                database='inventory',
-                timeout=20.0
-            )
-            break
-        except Exception as e:
-            print(f"Connection attempt {attempt+1} failed: {e}")
-            if attempt == max_retries - 1:
-                raise
-            await asyncio.sleep(2)
+    config = {
+        'database': {
+            'host': 'localhost',
+            'port': 5432,
+            'user': 'postgres',
+            'password': 'postgres',
+            'database': 'inventory'
+        }
+    }
+    
+    # Retry dengan backoff dan timeout ditangani oleh pool manager
+    pools = DatabasePoolManager(config, connect_retries=3, retry_backoff=2.0, connect_timeout=20.0)
+    conn = await pools.acquire_connection('source')
     
     try:
         # Fetch customers
@@ -76,7 +72,8 @@ async def test_dynamic_data():
             print(f"  Total orders now: {count}")
         
     finally:
-        await conn.close()
+        await pools.release('source', conn)
+        await pools.close()
 
 if __name__ == "__main__":
     asyncio.run(test_dynamic_data())